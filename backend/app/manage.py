@@ -13,6 +13,7 @@ import json
 import os
 import pathlib
 import sys
+import time
 import unittest
 
 import click
@@ -107,7 +108,31 @@ def es():
 
 
 @es.command("reindex")
-def es_reindex():
+@click.option(
+    "--batch-size",
+    default=500,
+    show_default=True,
+    help="Number of entries that we send in one bulk request.",
+)
+@click.option(
+    "--processes",
+    default=os.cpu_count() or 1,
+    show_default=True,
+    help="Number of worker processes to reindex the models in parallel.",
+)
+@click.option(
+    "--since",
+    default=None,
+    help="Only send the entries that changed since this iso timestamp (utc).",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Only send the entries that changed since the last reindex.",
+)
+def es_reindex(batch_size, processes, since, resume):
     """Reindex all the models that should be used in the es."""
     from project.api.models import (
         Configuration,
@@ -118,17 +143,189 @@ def es_reindex():
         Platform,
         Site,
     )
+    from project.api.services.search_reindex import (
+        get_throughput,
+        parse_timestamp,
+        reindex_models,
+        reindex_models_incremental,
+    )
 
-    for model_type in [
-        Configuration,
-        Contact,
-        Device,
-        ManufacturerModel,
-        Organization,
-        Platform,
-        Site,
-    ]:
-        model_type.reindex()
+    index_names = [
+        model_type.__tablename__
+        for model_type in [
+            Configuration,
+            Contact,
+            Device,
+            ManufacturerModel,
+            Organization,
+            Platform,
+            Site,
+        ]
+    ]
+    if since and resume:
+        raise click.BadParameter("Please use either --since or --resume.")
+    if since:
+        try:
+            since = parse_timestamp(since)
+        except ValueError:
+            raise click.BadParameter(
+                f"Can't parse {since} as iso timestamp.", param_hint="--since"
+            )
+    if since or resume:
+        results = reindex_models_incremental(
+            index_names,
+            since=since,
+            batch_size=batch_size,
+        )
+    else:
+        results = reindex_models(
+            index_names,
+            batch_size=batch_size,
+            processes=min(processes, len(index_names)),
+        )
+    start = time.monotonic()
+    total = 0
+    for result in results:
+        total += result.count
+        throughput = get_throughput(result.count, result.seconds)
+        print(
+            f"{result.index_name}: done with {result.count} entries "
+            + f"in {result.seconds:.1f}s ({throughput:.1f} entries/s)"
+        )
+    seconds = time.monotonic() - start
+    throughput = get_throughput(total, seconds)
+    print(f"Reindexed {total} entries in {seconds:.1f}s ({throughput:.1f} entries/s)")
+
+
+@es.command("worker")
+@click.option(
+    "--once",
+    is_flag=True,
+    show_default=True,
+    default=False,
+    help="Stop as soon as there are no more pending changes in the outbox.",
+)
+def es_worker(once):
+    """Send the pending changes of the search outbox to the elasticsearch."""
+    from project.api.services.search_outbox import run_outbox_worker
+
+    run_outbox_worker(once=once)
+
+
+@es.command("benchmark-entries")
+@click.option(
+    "--limit",
+    default=100,
+    show_default=True,
+    help="Number of entries that we build per model.",
+)
+@click.argument("index_names", nargs=-1)
+def es_benchmark_entries(limit, index_names):
+    """Compare the queries to build the search entries one by one & in batch."""
+    from project.api.models.mixin import get_searchable_models
+    from project.api.services.search_benchmark import benchmark_search_entries
+
+    if not index_names:
+        index_names = sorted(get_searchable_models().keys())
+    for index_name in index_names:
+        for result in benchmark_search_entries(index_name, limit):
+            queries_per_document = result.queries / max(result.documents, 1)
+            print(
+                f"{result.index_name} ({result.method}): {result.documents} entries, "
+                + f"{result.queries} queries ({queries_per_document:.2f} per entry), "
+                + f"{result.seconds:.2f}s"
+            )
+
+
+@es.command("benchmark-filters")
+@click.option("--q", default=None, help="Search string (like the q parameter).")
+@click.option(
+    "--filter",
+    "filter_",
+    default=None,
+    help="Json api filter list (like the filter parameter).",
+)
+@click.option(
+    "--repetitions",
+    default=10,
+    show_default=True,
+    help="Number of times that we run the search per filter.",
+)
+@click.argument("index_name")
+def es_benchmark_filters(q, filter_, repetitions, index_name):
+    """Compare the search latency for the original & the optimized filters."""
+    from flask import g
+
+    from project.api.datalayers.esalchemy import AndFilter, EsQueryBuilder
+    from project.api.models.mixin import get_searchable_models
+    from project.api.permissions.rules import filter_visible_es
+    from project.api.services.search_benchmark import benchmark_search_filter
+
+    model = get_searchable_models()[index_name]
+    query_builder = EsQueryBuilder().with_request_args({"q": q})
+    if filter_:
+        query_builder.with_filter_args(json.loads(filter_))
+    # We search as anonymous user - so with the visibility filter
+    # for the public entries.
+    g.user = None
+    search_filter = AndFilter.combine_optionals(
+        [query_builder.to_filter(model), filter_visible_es(model)]
+    )
+    for result in benchmark_search_filter(index_name, search_filter, repetitions):
+        print(
+            f"{result.index_name} ({result.method}): {result.hits} hits, "
+            + f"query size {result.query_size}, took {result.took:.2f}ms, "
+            + f"{result.seconds * 1000:.2f}ms per search"
+        )
+
+
+@es.command("benchmark-index")
+@click.option(
+    "--limit",
+    default=1000,
+    show_default=True,
+    help="Number of entries that we put in the index per candidate.",
+)
+@click.option(
+    "--candidates",
+    default=None,
+    help=(
+        "Json dict with the candidate names & their index settings "
+        + '(for example {"edge": {"ngram_type": "edge_ngram"}}).'
+    ),
+)
+@click.option(
+    "--q",
+    multiple=True,
+    help="Search string (like the q parameter). Can be used multiple times.",
+)
+@click.option(
+    "--repetitions",
+    default=10,
+    show_default=True,
+    help="Number of times that we run the searches per candidate.",
+)
+@click.argument("index_name")
+def es_benchmark_index(limit, candidates, q, repetitions, index_name):
+    """Compare size, indexing throughput & search latency for index settings."""
+    from project.api.services.search_benchmark import benchmark_index_settings
+    from project.api.services.search_reindex import get_throughput
+
+    if candidates:
+        candidates = json.loads(candidates)
+    for result in benchmark_index_settings(
+        index_name,
+        candidates=candidates,
+        limit=limit,
+        queries=list(q) or None,
+        repetitions=repetitions,
+    ):
+        throughput = get_throughput(result.documents, result.seconds)
+        print(
+            f"{result.index_name} ({result.candidate}): {result.documents} entries, "
+            + f"{result.size / 1024:.1f} KiB, {throughput:.1f} entries/s, "
+            + f"took {result.took:.2f}ms per search"
+        )
 
 
 @app.after_request
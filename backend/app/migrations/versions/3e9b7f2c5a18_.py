@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Add indexes for the mount & location actions.
+
+Revision ID: 3e9b7f2c5a18
+Revises: d41f6c8a2e95
+Create Date: 2026-10-18 16:21:09.174532
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3e9b7f2c5a18"
+down_revision = "d41f6c8a2e95"
+branch_labels = None
+depends_on = None
+
+# Name, table & columns of the b-tree indexes.
+BTREE_INDEXES = [
+    (
+        "ix_device_mount_action_device_id",
+        "device_mount_action",
+        ["device_id", "begin_date"],
+    ),
+    (
+        "ix_device_mount_action_configuration_id",
+        "device_mount_action",
+        ["configuration_id", "begin_date"],
+    ),
+    (
+        "ix_device_mount_action_parent_platform_id",
+        "device_mount_action",
+        ["parent_platform_id", "configuration_id"],
+    ),
+    (
+        "ix_device_mount_action_parent_device_id",
+        "device_mount_action",
+        ["parent_device_id", "configuration_id"],
+    ),
+    (
+        "ix_platform_mount_action_platform_id",
+        "platform_mount_action",
+        ["platform_id", "begin_date"],
+    ),
+    (
+        "ix_platform_mount_action_configuration_id",
+        "platform_mount_action",
+        ["configuration_id", "begin_date"],
+    ),
+    (
+        "ix_platform_mount_action_parent_platform_id",
+        "platform_mount_action",
+        ["parent_platform_id", "configuration_id"],
+    ),
+    (
+        "ix_configuration_static_location_configuration_id",
+        "configuration_static_location_begin_action",
+        ["configuration_id", "begin_date"],
+    ),
+    (
+        "ix_configuration_dynamic_location_configuration_id",
+        "configuration_dynamic_location_begin_action",
+        ["configuration_id", "begin_date"],
+    ),
+]
+
+# Name & table of the GiST indexes for the time ranges.
+PERIOD_INDEXES = [
+    ("ix_device_mount_action_period", "device_mount_action"),
+    ("ix_platform_mount_action_period", "platform_mount_action"),
+    (
+        "ix_configuration_static_location_period",
+        "configuration_static_location_begin_action",
+    ),
+    (
+        "ix_configuration_dynamic_location_period",
+        "configuration_dynamic_location_begin_action",
+    ),
+]
+
+
+def upgrade():
+    """Add the indexes."""
+    for name, table, columns in BTREE_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table in PERIOD_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [sa.text("tstzrange(begin_date, end_date, '[]')")],
+            unique=False,
+            postgresql_using="gist",
+        )
+
+
+def downgrade():
+    """Remove the indexes."""
+    for name, table in reversed(PERIOD_INDEXES):
+        op.drop_index(name, table_name=table)
+    for name, table, _ in reversed(BTREE_INDEXES):
+        op.drop_index(name, table_name=table)
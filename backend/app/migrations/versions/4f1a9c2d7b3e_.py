@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Add the outbox table for the search index changes.
+
+Revision ID: 4f1a9c2d7b3e
+Revises: bdf856305061
+Create Date: 2026-10-18 08:12:31.412775
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4f1a9c2d7b3e"
+down_revision = "bdf856305061"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the outbox table."""
+    op.create_table(
+        "search_index_outbox_entry",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("index_name", sa.String(length=256), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(length=256), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_search_index_outbox_entry_next_attempt_at"),
+        "search_index_outbox_entry",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Remove the outbox table."""
+    op.drop_index(
+        op.f("ix_search_index_outbox_entry_next_attempt_at"),
+        table_name="search_index_outbox_entry",
+    )
+    op.drop_table("search_index_outbox_entry")
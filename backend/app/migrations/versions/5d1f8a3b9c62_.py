@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Add the precomputed timelines for the configurations.
+
+Revision ID: 5d1f8a3b9c62
+Revises: 8c2d4e6f1a37
+Create Date: 2026-10-18 21:14:05.338120
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import text
+
+from project.api.models.configuration_timeline import rebuild_configuration_timelines
+
+# revision identifiers, used by Alembic.
+revision = "5d1f8a3b9c62"
+down_revision = "8c2d4e6f1a37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the tables & fill them for the existing configurations."""
+    op.create_table(
+        "configuration_timeline_event",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("configuration_id", sa.Integer(), nullable=False),
+        sa.Column("timepoint", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("type", sa.String(length=256), nullable=False),
+        sa.Column("action_id", sa.Integer(), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("label", sa.String(length=256), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["configuration_id"], ["configuration.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_configuration_timeline_event_configuration_id",
+        "configuration_timeline_event",
+        ["configuration_id", "timepoint"],
+        unique=False,
+    )
+    op.create_table(
+        "configuration_timeline_segment",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("configuration_id", sa.Integer(), nullable=False),
+        sa.Column("period", postgresql.TSTZRANGE(), nullable=False),
+        sa.Column(
+            "device_mount_action_ids", postgresql.ARRAY(sa.Integer()), nullable=False
+        ),
+        sa.Column(
+            "platform_mount_action_ids", postgresql.ARRAY(sa.Integer()), nullable=False
+        ),
+        sa.Column(
+            "static_location_action_ids", postgresql.ARRAY(sa.Integer()), nullable=False
+        ),
+        sa.Column(
+            "dynamic_location_action_ids",
+            postgresql.ARRAY(sa.Integer()),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["configuration_id"], ["configuration.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # The btree_gist extension is there since 8c2d4e6f1a37.
+    op.execute(
+        "alter table configuration_timeline_segment "
+        + "add constraint ex_configuration_timeline_segment_configuration_id_period "
+        + "exclude using gist (configuration_id with =, period with &&)"
+    )
+
+    conn = op.get_bind()
+    configuration_ids = [
+        row[0] for row in conn.execute(text("select id from configuration"))
+    ]
+    # We use the very same statements as for the updates within the app.
+    chunk_size = 1000
+    while configuration_ids:
+        chunk, configuration_ids = (
+            configuration_ids[:chunk_size],
+            configuration_ids[chunk_size:],
+        )
+        rebuild_configuration_timelines(conn, chunk)
+
+
+def downgrade():
+    """Remove the tables."""
+    op.drop_table("configuration_timeline_segment")
+    op.drop_index(
+        "ix_configuration_timeline_event_configuration_id",
+        table_name="configuration_timeline_event",
+    )
+    op.drop_table("configuration_timeline_event")
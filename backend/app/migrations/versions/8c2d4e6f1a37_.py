@@ -0,0 +1,93 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Add exclusion constraints for overlapping mounts & locations.
+
+Revision ID: 8c2d4e6f1a37
+Revises: 3e9b7f2c5a18
+Create Date: 2026-10-18 18:02:47.519203
+
+"""
+from alembic import op
+from sqlalchemy.sql import text
+
+# revision identifiers, used by Alembic.
+revision = "8c2d4e6f1a37"
+down_revision = "3e9b7f2c5a18"
+branch_labels = None
+depends_on = None
+
+
+def period(prefix=""):
+    """
+    Return the sql expression for the time range without the end date.
+
+    This is the overlap semantic of the DateTimeRange; entries without
+    duration include their timepoint.
+    """
+    begin_date = prefix + "begin_date"
+    end_date = prefix + "end_date"
+    return (
+        f"tstzrange({begin_date}, {end_date}, "
+        + f"CASE WHEN ({begin_date} = {end_date}) THEN '[]' ELSE '[)' END)"
+    )
+
+
+# Name, table & column of the exclusion constraints.
+EXCLUSION_CONSTRAINTS = [
+    (
+        "ex_device_mount_action_device_id_period",
+        "device_mount_action",
+        "device_id",
+    ),
+    (
+        "ex_platform_mount_action_platform_id_period",
+        "platform_mount_action",
+        "platform_id",
+    ),
+    (
+        "ex_configuration_static_location_configuration_id_period",
+        "configuration_static_location_begin_action",
+        "configuration_id",
+    ),
+    (
+        "ex_configuration_dynamic_location_configuration_id_period",
+        "configuration_dynamic_location_begin_action",
+        "configuration_id",
+    ),
+]
+
+
+def upgrade():
+    """Add the constraints."""
+    conn = op.get_bind()
+    # For the equality of the integer columns in the gist index.
+    conn.execute(text("create extension if not exists btree_gist"))
+    for name, table, column in EXCLUSION_CONSTRAINTS:
+        # Give a readable message for the entries that we must fix
+        # by hand first.
+        overlaps = conn.execute(
+            text(
+                f"select a.id, b.id from {table} a join {table} b "
+                + f"on a.{column} = b.{column} and a.id < b.id "
+                + f"and {period('a.')} && {period('b.')} limit 10"
+            )
+        ).fetchall()
+        if overlaps:
+            raise RuntimeError(
+                f"Overlapping entries in {table} (ids): "
+                + ", ".join(f"{a} & {b}" for a, b in overlaps)
+            )
+        op.execute(
+            f"alter table {table} add constraint {name} "
+            + f"exclude using gist ({column} with =, {period()} with &&)"
+        )
+
+
+def downgrade():
+    """Remove the constraints."""
+    for name, table, _ in reversed(EXCLUSION_CONSTRAINTS):
+        op.drop_constraint(name, table, type_="exclude")
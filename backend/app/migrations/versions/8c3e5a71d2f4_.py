@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Add an index to group the search outbox entries.
+
+Revision ID: 8c3e5a71d2f4
+Revises: 4f1a9c2d7b3e
+Create Date: 2026-10-18 10:41:02.187340
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c3e5a71d2f4"
+down_revision = "4f1a9c2d7b3e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the index."""
+    op.create_index(
+        "ix_search_index_outbox_entry_index_name_entity_id",
+        "search_index_outbox_entry",
+        ["index_name", "entity_id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    """Remove the index."""
+    op.drop_index(
+        "ix_search_index_outbox_entry_index_name_entity_id",
+        table_name="search_index_outbox_entry",
+    )
@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Add GiST indexes for the geo filters.
+
+Revision ID: b7d2e4f19a63
+Revises: 8c3e5a71d2f4
+Create Date: 2026-10-18 14:12:37.503114
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b7d2e4f19a63"
+down_revision = "8c3e5a71d2f4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the indexes."""
+    # Normally geoalchemy creates this index together with the table.
+    # Make sure that we have it.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_site_geometry ON site USING gist (geometry)"
+    )
+    op.create_index(
+        "ix_site_geometry_geography",
+        "site",
+        [sa.text("geography(geometry)")],
+        unique=False,
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "ix_configuration_static_location_point",
+        "configuration_static_location_begin_action",
+        [sa.text("ST_MakePoint(x, y)")],
+        unique=False,
+        postgresql_using="gist",
+    )
+    op.create_index(
+        "ix_configuration_static_location_geography",
+        "configuration_static_location_begin_action",
+        [sa.text("geography(ST_MakePoint(x, y))")],
+        unique=False,
+        postgresql_using="gist",
+    )
+
+
+def downgrade():
+    """Remove the indexes."""
+    op.drop_index(
+        "ix_configuration_static_location_geography",
+        table_name="configuration_static_location_begin_action",
+    )
+    op.drop_index(
+        "ix_configuration_static_location_point",
+        table_name="configuration_static_location_begin_action",
+    )
+    op.drop_index("ix_site_geometry_geography", table_name="site")
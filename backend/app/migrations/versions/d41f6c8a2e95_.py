@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Add search vectors for the full text search in the database.
+
+Revision ID: d41f6c8a2e95
+Revises: b7d2e4f19a63
+Create Date: 2026-10-18 15:03:51.228417
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "d41f6c8a2e95"
+down_revision = "b7d2e4f19a63"
+branch_labels = None
+depends_on = None
+
+# The columns that we use for the search per table.
+# Those are the text_search_columns of the models.
+TEXT_SEARCH_COLUMNS = {
+    "device": [
+        "short_name",
+        "long_name",
+        "description",
+        "serial_number",
+        "manufacturer_name",
+        "model",
+        "inventory_number",
+        "persistent_identifier",
+        "device_type_name",
+        "status_name",
+        "country",
+    ],
+    "platform": [
+        "short_name",
+        "long_name",
+        "description",
+        "serial_number",
+        "manufacturer_name",
+        "model",
+        "inventory_number",
+        "persistent_identifier",
+        "platform_type_name",
+        "status_name",
+        "country",
+    ],
+    "configuration": [
+        "label",
+        "project",
+        "campaign",
+        "description",
+        "status",
+        "persistent_identifier",
+    ],
+    "site": [
+        "label",
+        "description",
+        "persistent_identifier",
+        "street",
+        "street_number",
+        "city",
+        "zip_code",
+        "administrative_area",
+        "country",
+        "building",
+        "room",
+        "site_type_name",
+        "site_usage_name",
+    ],
+    "contact": [
+        "given_name",
+        "family_name",
+        "email",
+        "organization",
+        "orcid",
+        "street",
+        "street_number",
+        "city",
+        "zip_code",
+        "administrative_area",
+        "country",
+        "building",
+        "room",
+    ],
+}
+
+
+def upgrade():
+    """Add the generated columns & the GIN indexes."""
+    for table, columns in TEXT_SEARCH_COLUMNS.items():
+        text = " || ' ' || ".join(f"coalesce({name}, '')" for name in columns)
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(f"to_tsvector('simple', {text})", persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(
+            f"ix_{table}_search_vector",
+            table,
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+        )
+
+
+def downgrade():
+    """Remove the indexes & the columns."""
+    for table in TEXT_SEARCH_COLUMNS.keys():
+        op.drop_index(f"ix_{table}_search_vector", table_name=table)
+        op.drop_column(table, "search_vector")
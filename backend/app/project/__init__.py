@@ -36,6 +36,8 @@ from .extensions.instances import (
     page_parameter_middleware,
     pidinst,
     remove_slash_redirect_middlware,
+    search_cache,
+    search_circuit_breaker,
     well_known_url_config_loader,
 )
 from .urls import api
@@ -51,6 +53,7 @@ from .views import (
     generator_routes,
     login_routes,
     proxy_routes,
+    search_routes,
     sensor_ml_routes,
     upload_routes,
 )
@@ -102,6 +105,8 @@ def create_app():
     pidinst.init_app(app)
     remove_slash_redirect_middlware.init_app(app)
     page_parameter_middleware.init_app(app)
+    search_cache.init_app(app)
+    search_circuit_breaker.init_app(app)
     mqtt.init_app(app)
 
     # shell context for flask cli
@@ -112,7 +117,13 @@ def create_app():
     # add elasticsearch as mentioned here
     # https://blog.miguelgrinberg.com/post/the-flask-mega-tutorial-part-xvi-full-text-search
     app.elasticsearch = (
-        Elasticsearch([app.config["ELASTICSEARCH_URL"]])
+        Elasticsearch(
+            [app.config["ELASTICSEARCH_URL"]],
+            request_timeout=app.config["ELASTICSEARCH_REQUEST_TIMEOUT"],
+            max_retries=app.config["ELASTICSEARCH_MAX_RETRIES"],
+            retry_on_timeout=app.config["ELASTICSEARCH_RETRY_ON_TIMEOUT"],
+            connections_per_node=app.config["ELASTICSEARCH_CONNECTIONS_PER_NODE"],
+        )
         if app.config["ELASTICSEARCH_URL"]
         else None
     )
@@ -127,6 +138,12 @@ def create_app():
     health.add_check(health_check_migrations)
     health.add_check(health_check_minio)
     health.add_check(health_check_pidinst_handler)
+    # The health check object is shared by all the apps that we create
+    # (tests, cli), but we can add every section only once.
+    if "search_cache" not in health.functions:
+        health.add_section("search_cache", search_cache.stats)
+    if "search_circuit_breaker" not in health.functions:
+        health.add_section("search_circuit_breaker", search_circuit_breaker.stats)
     app.add_url_rule(base_url + "/health", "health", view_func=lambda: health.run())
 
     app.register_blueprint(activity_routes)
@@ -147,6 +164,8 @@ def create_app():
     # Routes for the free text field introspection
     app.register_blueprint(free_text_field_routes)
     app.register_blueprint(generator_routes)
+    # Routes that use the full text search (faceted search, ...)
+    app.register_blueprint(search_routes)
     # sensor_ml_routes
     app.jinja_env.lstrip_blocks = True
     app.jinja_env.trim_blocks = True
@@ -9,12 +9,28 @@
 """Classes to help searching in the elasticsearch."""
 
 import csv
+import datetime
 import io
+import re
 from dataclasses import dataclass, field
-from typing import List
+from typing import Any, List
 
-from flask import current_app, request
+import shapely.wkt
+from flask import current_app, g, request
 from flask_rest_jsonapi.data_layers.alchemy import SqlalchemyDataLayer
+from flask_rest_jsonapi.data_layers.filtering.alchemy import create_filters
+from marshmallow import fields
+from shapely.errors import ShapelyError
+from sqlalchemy import and_, func, not_, or_, true
+
+from ..helpers.errors import BadRequestError
+from ..search import (
+    InvalidCursor,
+    freeze_query,
+    is_search_circuit_open,
+    is_search_unavailable,
+    search_unavailable_as_error,
+)
 
 
 @dataclass
@@ -41,6 +57,29 @@ class MultiFieldMatchFilter:
         return result
 
 
+@dataclass
+class MultiFieldBoolPrefixFilter:
+    """
+    Class to search for words & a prefix for the last word.
+
+    Meant for the search_as_you_type fields (with their _2gram &
+    _3gram subfields).
+    """
+
+    query: str
+    fields: List[str]
+
+    def to_query(self):
+        """Convert the filter to a query."""
+        return {
+            "multi_match": {
+                "query": self.query,
+                "type": "bool_prefix",
+                "fields": self.fields,
+            },
+        }
+
+
 @dataclass
 class MultiFieldWildcardFilter:
     """Class to apply a wildcard filter."""
@@ -276,9 +315,227 @@ class AndFilter:
         return None
 
 
+@dataclass
+class TermsFilter:
+    """Class to search for an exact match with one of the values (in one query)."""
+
+    term: str
+    values: List[Any]
+
+    def to_query(self):
+        """Convert the filter to a query."""
+        return {"terms": {f"{self.term}": list(self.values)}}
+
+
+@dataclass
+class BoolFilter:
+    """
+    Class to represent a bool query with all of its clauses.
+
+    The sub filters in must contribute to the score, the ones in
+    filters don't (and the elasticsearch can cache them).
+    """
+
+    must: List[Any] = field(default_factory=list)
+    filters: List[Any] = field(default_factory=list)
+    must_not: List[Any] = field(default_factory=list)
+
+    def to_query(self):
+        """Convert the filter to a query."""
+        result = {}
+        for key, sub_filters in [
+            ("must", self.must),
+            ("filter", self.filters),
+            ("must_not", self.must_not),
+        ]:
+            if sub_filters:
+                result[key] = [f.to_query() for f in sub_filters]
+        return {"bool": result}
+
+
+def parse_coordinate(value, minimum, maximum):
+    """Return the value as float if it is a valid coordinate."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise BadRequestError(f"Invalid coordinate: {value}")
+    try:
+        result = float(value)
+    except ValueError:
+        raise BadRequestError(f"Invalid coordinate: {value}")
+    if not minimum <= result <= maximum:
+        raise BadRequestError(f"Coordinate {value} not in [{minimum}, {maximum}]")
+    return result
+
+
+# Units for the distances (like in the elasticsearch) in meters.
+DISTANCE_UNITS = {
+    "m": 1.0,
+    "km": 1000.0,
+    "mi": 1609.344,
+    "yd": 0.9144,
+    "ft": 0.3048,
+    "nmi": 1852.0,
+}
+
+
+def parse_distance(value):
+    """Return the distance in meters (for values like 5km or 300)."""
+    if isinstance(value, bool):
+        raise BadRequestError(f"Invalid distance: {value}")
+    if isinstance(value, (int, float)):
+        # Like the elasticsearch we use meters as default unit.
+        number, unit = value, "m"
+    elif isinstance(value, str):
+        text = value.strip()
+        unit = "m"
+        for candidate in sorted(DISTANCE_UNITS.keys(), key=len, reverse=True):
+            if text.endswith(candidate):
+                unit = candidate
+                text = text[: -len(candidate)]
+                break
+        try:
+            number = float(text)
+        except ValueError:
+            raise BadRequestError(f"Invalid distance: {value}")
+    else:
+        raise BadRequestError(f"Invalid distance: {value}")
+    if number < 0:
+        raise BadRequestError(f"Invalid distance: {value}")
+    return number * DISTANCE_UNITS[unit]
+
+
+@dataclass
+class GeoBoundingBoxFilter:
+    """
+    Class to search for geometries that intersect a bounding box.
+
+    The coordinates are longitude & latitude values (WGS84) - as
+    in the search index.
+    """
+
+    field: str
+    min_lon: float
+    min_lat: float
+    max_lon: float
+    max_lat: float
+
+    @classmethod
+    def parse(cls, name, val):
+        """Create the filter for a [min_lon, min_lat, max_lon, max_lat] value."""
+        if not isinstance(val, list) or len(val) != 4:
+            raise BadRequestError(
+                "geo_bounding_box needs [min_lon, min_lat, max_lon, max_lat]"
+            )
+        min_lon, max_lon = [parse_coordinate(v, -180, 180) for v in val[0::2]]
+        min_lat, max_lat = [parse_coordinate(v, -90, 90) for v in val[1::2]]
+        if min_lon > max_lon or min_lat > max_lat:
+            raise BadRequestError("geo_bounding_box needs the minimums first")
+        return cls(name, min_lon, min_lat, max_lon, max_lat)
+
+    def to_query(self):
+        """Convert the filter to a query."""
+        return {
+            "geo_bounding_box": {
+                self.field: {
+                    "top_left": {"lat": self.max_lat, "lon": self.min_lon},
+                    "bottom_right": {"lat": self.min_lat, "lon": self.max_lon},
+                }
+            }
+        }
+
+    def to_sql(self, geometry):
+        """Return the sql condition for the geometry expression."""
+        return func.ST_Intersects(
+            geometry,
+            func.ST_MakeEnvelope(
+                self.min_lon, self.min_lat, self.max_lon, self.max_lat
+            ),
+        )
+
+
+@dataclass
+class GeoDistanceFilter:
+    """Class to search for geometries within a distance (in meters) of a point."""
+
+    field: str
+    lat: float
+    lon: float
+    distance: float
+
+    @classmethod
+    def parse(cls, name, val):
+        """Create the filter for a {lat, lon, distance} value."""
+        if not isinstance(val, dict) or not {"lat", "lon", "distance"} <= set(val):
+            raise BadRequestError("geo_distance needs lat, lon & distance")
+        return cls(
+            name,
+            lat=parse_coordinate(val["lat"], -90, 90),
+            lon=parse_coordinate(val["lon"], -180, 180),
+            distance=parse_distance(val["distance"]),
+        )
+
+    def to_query(self):
+        """Convert the filter to a query."""
+        return {
+            "geo_distance": {
+                "distance": f"{self.distance}m",
+                self.field: {"lat": self.lat, "lon": self.lon},
+            }
+        }
+
+    def to_sql(self, geometry):
+        """Return the sql condition for the geometry expression."""
+        # With the geography type postgis computes the distances in
+        # meters (on the spheroid).
+        return func.ST_DWithin(
+            func.geography(geometry),
+            func.geography(func.ST_MakePoint(self.lon, self.lat)),
+            self.distance,
+        )
+
+
+@dataclass
+class GeoShapeIntersectsFilter:
+    """Class to search for geometries that intersect a shape (given as wkt)."""
+
+    field: str
+    wkt: str
+
+    @classmethod
+    def parse(cls, name, val):
+        """Create the filter for a wkt value."""
+        if not isinstance(val, str):
+            raise BadRequestError("geo_intersects needs a wkt string")
+        try:
+            shape = shapely.wkt.loads(val)
+        except ShapelyError:
+            raise BadRequestError("geo_intersects needs a valid wkt string")
+        if shape.is_empty or not shape.is_valid:
+            raise BadRequestError("geo_intersects needs a valid wkt string")
+        return cls(name, shape.wkt)
+
+    def to_query(self):
+        """Convert the filter to a query."""
+        return {
+            "geo_shape": {
+                self.field: {"shape": self.wkt, "relation": "intersects"},
+            }
+        }
+
+    def to_sql(self, geometry):
+        """Return the sql condition for the geometry expression."""
+        return func.ST_Intersects(geometry, func.ST_GeomFromText(self.wkt))
+
+
 class FilterParser:
     """Class to parse the filter settings."""
 
+    # Filter operations for the fields with coordinates.
+    GEO_OPS = {
+        "geo_bounding_box": GeoBoundingBoxFilter,
+        "geo_distance": GeoDistanceFilter,
+        "geo_intersects": GeoShapeIntersectsFilter,
+    }
+
     @classmethod
     def wrap_for_nested_elements(cls, name, inner_filter):
         """
@@ -322,11 +579,16 @@ class FilterParser:
         return result
 
     @classmethod
-    def parse(cls, filter_list):
-        """Parse the list of filters."""
+    def parse(cls, filter_list, model=None):
+        """
+        Parse the list of filters.
+
+        With the model we let it restrict the geo filters
+        (see SearchableMixin.geo_filter_query).
+        """
         if not filter_list:
             return None
-        sub_filters = [cls.parse_single_filter(f) for f in filter_list]
+        sub_filters = [cls.parse_single_filter(f, model) for f in filter_list]
         sub_filters = [f for f in sub_filters if f is not None]
         if not sub_filters:
             return None
@@ -335,7 +597,7 @@ class FilterParser:
         return AndFilter(sub_filters=sub_filters)
 
     @classmethod
-    def parse_single_filter(cls, filter_dict):
+    def parse_single_filter(cls, filter_dict, model=None):
         """Parse a single filter."""
         SUPPORTED_OPS = {
             "eq": lambda name, val: cls.wrap_for_nested_elements(
@@ -364,15 +626,22 @@ class FilterParser:
         }
         # First check if we have a more complex filter
         if "or" in filter_dict.keys():
-            sub_filters = [cls.parse_single_filter(f) for f in filter_dict["or"]]
+            sub_filters = [cls.parse_single_filter(f, model) for f in filter_dict["or"]]
             return OrFilter(sub_filters)
         if "and" in filter_dict.keys():
-            sub_filters = [cls.parse_single_filter(f) for f in filter_dict["and"]]
+            sub_filters = [
+                cls.parse_single_filter(f, model) for f in filter_dict["and"]
+            ]
             return AndFilter(sub_filters)
         # Then check if the op syntax is used (name=x, op=eq, val=value)
         op = filter_dict.get("op")
         if op in SUPPORTED_OPS.keys():
             return SUPPORTED_OPS[op](filter_dict["name"], filter_dict["val"])
+        if op in cls.GEO_OPS.keys():
+            geo_filter = cls.GEO_OPS[op].parse(filter_dict["name"], filter_dict["val"])
+            if model is not None:
+                return model.geo_filter_query(geo_filter)
+            return geo_filter
         # And last, check if we have a simple x:y filter
         if len(filter_dict.keys()) == 1:
             term = [x for x in filter_dict.keys()][0]
@@ -383,6 +652,185 @@ class FilterParser:
         return None
 
 
+class FilterOptimizer:
+    """
+    Class to optimize the filters before we send them to the elasticsearch.
+
+    The query builder, the filter parser & the visibility rules create
+    filters that are easy to read, but verbose for the elasticsearch:
+    AndFilters in AndFilters, one term query per value of an in_ filter
+    and term queries in the scoring must context.
+
+    The optimization flattens the nested and & or filters, merges the
+    term queries for the same field into one terms query and moves the
+    clauses that don't contribute to the score into the filter context
+    (so that the elasticsearch can cache them). The documents that
+    match stay the same.
+    """
+
+    # Filters that don't need to contribute to the score.
+    # Every filter that we don't know here stays in the must context.
+    NON_SCORING_FILTERS = (
+        ExistsFilter,
+        GeoBoundingBoxFilter,
+        GeoDistanceFilter,
+        GeoShapeIntersectsFilter,
+        MustNotFilter,
+        TermEqualsExactStringFilter,
+        TermExactInListFilter,
+        TermHasAnyExactFilter,
+        TermsFilter,
+    )
+    # Filters with a term & values that we can merge into one TermsFilter.
+    TERM_FILTERS = (TermEqualsExactStringFilter, TermHasAnyExactFilter, TermsFilter)
+
+    @classmethod
+    def optimize(cls, filter_):
+        """Return the optimized filter (with the non scoring parts in filter context)."""
+        result = cls.optimize_filter(filter_)
+        if result is None or isinstance(result, BoolFilter):
+            return result
+        if cls.is_scoring(result):
+            return result
+        return BoolFilter(filters=[result])
+
+    @classmethod
+    def canonical_form(cls, filter_):
+        """
+        Return a hashable representation of the filter.
+
+        Filters that differ only in the nesting or the order of
+        their sub filters share the very same canonical form.
+        """
+        optimized = cls.optimize(filter_)
+        if optimized is None:
+            return None
+        return freeze_query(optimized.to_query())
+
+    @classmethod
+    def is_scoring(cls, filter_):
+        """Return true if the filter needs to contribute to the score."""
+        if isinstance(filter_, cls.NON_SCORING_FILTERS):
+            return False
+        if isinstance(filter_, BoolFilter):
+            return bool(filter_.must)
+        if isinstance(filter_, (AndFilter, OrFilter)):
+            return any(cls.is_scoring(f) for f in filter_.sub_filters)
+        if isinstance(filter_, NestedElementFilterWrapper):
+            return cls.is_scoring(filter_.inner_filter)
+        return True
+
+    @classmethod
+    def optimize_filter(cls, filter_):
+        """Optimize a single filter (and its sub filters)."""
+        if isinstance(filter_, AndFilter):
+            return cls.optimize_and_filter(filter_)
+        if isinstance(filter_, OrFilter):
+            return cls.optimize_or_filter(filter_)
+        if isinstance(filter_, TermExactInListFilter):
+            # An empty should clause matches every document, while an
+            # empty terms query matches none. So we keep it as it is.
+            if not filter_.values:
+                return filter_
+            return cls.merge_terms(filter_.term, filter_.values)
+        if isinstance(filter_, MustNotFilter):
+            inner_filter = cls.optimize_filter(filter_.inner_filter)
+            if isinstance(inner_filter, BoolFilter) and inner_filter == BoolFilter(
+                must_not=inner_filter.must_not[:1]
+            ):
+                # Double negation.
+                return inner_filter.must_not[0]
+            return BoolFilter(must_not=[inner_filter])
+        if isinstance(filter_, NestedElementFilterWrapper):
+            return NestedElementFilterWrapper(
+                filter_.path, cls.optimize_filter(filter_.inner_filter)
+            )
+        return filter_
+
+    @classmethod
+    def optimize_and_filter(cls, and_filter):
+        """Flatten the and filter & sort the sub filters into the bool clauses."""
+        result = BoolFilter()
+        for sub_filter in and_filter.sub_filters:
+            sub_filter = cls.optimize_filter(sub_filter)
+            if sub_filter is None:
+                continue
+            if isinstance(sub_filter, BoolFilter):
+                result.must.extend(sub_filter.must)
+                result.filters.extend(sub_filter.filters)
+                result.must_not.extend(sub_filter.must_not)
+            elif cls.is_scoring(sub_filter):
+                result.must.append(sub_filter)
+            else:
+                result.filters.append(sub_filter)
+        result.must = cls.unique(result.must)
+        result.filters = cls.unique(result.filters)
+        result.must_not = cls.unique(result.must_not)
+        clauses = result.must + result.filters
+        if len(clauses) == 1 and not result.must_not:
+            return clauses[0]
+        return result
+
+    @classmethod
+    def optimize_or_filter(cls, or_filter):
+        """Flatten the or filter & merge the term queries for the same field."""
+        sub_filters = []
+        for sub_filter in or_filter.sub_filters:
+            sub_filter = cls.optimize_filter(sub_filter)
+            if isinstance(sub_filter, OrFilter):
+                sub_filters.extend(sub_filter.sub_filters)
+            elif sub_filter is not None:
+                sub_filters.append(sub_filter)
+        # We keep the position of the first term query for the field.
+        values_by_term = {}
+        merged = []
+        for sub_filter in sub_filters:
+            if isinstance(sub_filter, cls.TERM_FILTERS):
+                if sub_filter.term not in values_by_term:
+                    values_by_term[sub_filter.term] = []
+                    merged.append(sub_filter.term)
+                if isinstance(sub_filter, TermsFilter):
+                    values_by_term[sub_filter.term].extend(sub_filter.values)
+                else:
+                    values_by_term[sub_filter.term].append(sub_filter.value)
+            else:
+                merged.append(sub_filter)
+        result = cls.unique(
+            [
+                cls.merge_terms(entry, values_by_term[entry])
+                if isinstance(entry, str)
+                else entry
+                for entry in merged
+            ]
+        )
+        if len(result) == 1:
+            return result[0]
+        return OrFilter(sub_filters=result)
+
+    @classmethod
+    def merge_terms(cls, term, values):
+        """Return one filter that matches if the field has any of the values."""
+        unique_values = []
+        for value in values:
+            if value not in unique_values:
+                unique_values.append(value)
+        if len(unique_values) == 1:
+            return TermEqualsExactStringFilter(term=term, value=unique_values[0])
+        return TermsFilter(term=term, values=unique_values)
+
+    @classmethod
+    def unique(cls, filters):
+        """Remove the filters that would create the very same query."""
+        result = []
+        seen = set()
+        for filter_ in filters:
+            key = freeze_query(filter_.to_query())
+            if key not in seen:
+                seen.add(key)
+                result.append(filter_)
+        return result
+
+
 class EsQueryBuilder:
     """Builder class for an es query."""
 
@@ -470,15 +918,106 @@ class EsQueryBuilder:
                     idx += 1
             sub_filters.append(AndFilter(and_filters).simplify())
         if self.filters:
-            sub_filters.append(FilterParser.parse(filter_list=self.filters))
+            sub_filters.append(
+                FilterParser.parse(filter_list=self.filters, model=model)
+            )
         result = AndFilter(sub_filters).simplify()
         return result
 
 
+class PostgresTextSearch:
+    """
+    Translate the filters for the search string to the full text search of postgres.
+
+    We use the very same parsing as for the elasticsearch (EsQueryBuilder):
+    phrases, negations (-), OR & wildcards. But we search in the
+    search_vector of the model (with the columns of its table only).
+    """
+
+    # Wildcards for prefixes (like sens*) that we can search with the
+    # search_vector (& its GIN index). Others use ilike on the columns.
+    PREFIX_WILDCARD = re.compile(r"^\w+\*$")
+
+    def __init__(self, model):
+        """Init the object."""
+        self.model = model
+
+    def to_sql(self, filter_):
+        """Return the sql condition for the filter."""
+        if isinstance(filter_, AndFilter):
+            return and_(true(), *[self.to_sql(f) for f in filter_.sub_filters])
+        if isinstance(filter_, OrFilter):
+            return or_(*[self.to_sql(f) for f in filter_.sub_filters])
+        if isinstance(filter_, MustNotFilter):
+            return not_(self.to_sql(filter_.inner_filter))
+        if isinstance(filter_, MultiFieldMatchFilter):
+            return self.model.search_vector.op("@@")(
+                func.phraseto_tsquery("simple", filter_.query)
+            )
+        if isinstance(filter_, MultiFieldWildcardFilter):
+            if self.PREFIX_WILDCARD.match(filter_.value):
+                return self.model.search_vector.op("@@")(
+                    func.to_tsquery("simple", f"'{filter_.value[:-1]}':*")
+                )
+            return or_(
+                *[
+                    func.coalesce(getattr(self.model, column), "").ilike(
+                        self.to_like_pattern(filter_.value), escape="\\"
+                    )
+                    for column in self.model.text_search_columns
+                ]
+            )
+        raise ValueError(f"Unsupported filter for the text search: {filter_}")
+
+    @staticmethod
+    def to_like_pattern(value):
+        """Convert the wildcard (with * and ?) to a like pattern."""
+        escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        return escaped.replace("*", "%").replace("?", "_")
+
+
+class EsSourceEntry:
+    """Entry of a search result that we serialize from the search index."""
+
+    def __init__(self, id, **kwargs):
+        """Init the object with the id & the fields of the document."""
+        self.id = id
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+
 class EsSqlalchemyDataLayer(SqlalchemyDataLayer):
-    """Data layer for the elasticsearch (with sqlalchemy under the hood)."""
+    """
+    Data layer for the elasticsearch (with sqlalchemy under the hood).
+
+    With the serialize_from_es_source option in the data layer
+    settings we can skip the database for the list responses - in case
+    all the requested fields (fields[type]=...) are part of the search
+    index, there are no includes & the resource doesn't overwrite
+    after_get_collection.
+
+    With page[cursor] (see the PageParameterMiddleware) we use a point
+    in time & search_after instead of page[number]. This way we can
+    page through all the results - even without a search string.
+
+    The geo filters (geo_bounding_box, geo_distance & geo_intersects)
+    work without the elasticsearch too: Then we use the postgis
+    functions (& the GiST indexes) of the database.
+    """
 
     REWRITABLE_METHODS = SqlalchemyDataLayer.REWRITABLE_METHODS + ("es_query",)
+    # The PageParameterMiddleware rejects page[cursor] for other data layers.
+    supports_page_cursor = True
+    # The schema fields that we can fill with the values of the search index.
+    # (Other fields may need a different representation).
+    ES_SOURCE_FIELD_TYPES = (
+        fields.Boolean,
+        fields.DateTime,
+        fields.Field,
+        fields.Float,
+        fields.Integer,
+        fields.String,
+    )
 
     def get_pagination_parameter(self, paginate_info):
         """
@@ -507,6 +1046,151 @@ class EsSqlalchemyDataLayer(SqlalchemyDataLayer):
         """
         return None
 
+    def get_es_source_fields(self, qs):
+        """
+        Return the schema fields that we can load from the search index.
+
+        Returns a dict with the attribute names as keys & the schema
+        fields as values - or None if we must use the database.
+        """
+        if not getattr(self, "serialize_from_es_source", False):
+            return None
+        # Resources that hook into after_get_collection expect the
+        # model instances.
+        if self.has_after_get_collection_hook():
+            return None
+        # The csv export needs the complete model instances.
+        if request.headers.environ.get("HTTP_ACCEPT") == "text/csv":
+            return None
+        if qs.include:
+            return None
+        schema = qs.schema
+        requested = qs.fields.get(schema.opts.type_)
+        if not requested:
+            return None
+        index_field_names = self.model.search_index_field_names()
+        result = {}
+        for name in requested:
+            if name == "id":
+                continue
+            schema_field = schema._declared_fields[name]
+            if type(schema_field) not in self.ES_SOURCE_FIELD_TYPES:
+                return None
+            attribute = schema_field.attribute or name
+            if attribute not in index_field_names:
+                return None
+            result[attribute] = schema_field
+        return result
+
+    def has_after_get_collection_hook(self):
+        """Return true if the resource overwrites after_get_collection."""
+        method = getattr(self.after_get_collection, "__func__", None)
+        return method is not EsSqlalchemyDataLayer.after_get_collection
+
+    def to_es_source_entry(self, id_, document, source_fields):
+        """Convert a document of the search index to an object for the schema."""
+        values = {}
+        for attribute, schema_field in source_fields.items():
+            value = document.get(attribute)
+            if isinstance(schema_field, fields.DateTime) and isinstance(value, str):
+                value = datetime.datetime.fromisoformat(value)
+            values[attribute] = value
+        return EsSourceEntry(id=id_, **values)
+
+    def get_es_query_builder(self, qs):
+        """Return the query builder with the search string & the filters."""
+        query_builder = EsQueryBuilder()
+        query_builder.with_request_args(request.args)
+        if qs.filters:
+            self.check_geo_filter_fields(qs.filters)
+            query_builder.with_filter_args(qs.filters)
+        return query_builder
+
+    def check_geo_filter_fields(self, filter_list):
+        """Raise an error if we use geo filters on fields without coordinates."""
+        for filter_dict in filter_list:
+            if "or" in filter_dict.keys():
+                self.check_geo_filter_fields(filter_dict["or"])
+            elif "and" in filter_dict.keys():
+                self.check_geo_filter_fields(filter_dict["and"])
+            elif "not" in filter_dict.keys():
+                self.check_geo_filter_fields([filter_dict["not"]])
+            elif filter_dict.get("op") in FilterParser.GEO_OPS.keys():
+                name = filter_dict.get("name")
+                if name not in getattr(self.model, "search_geo_fields", []):
+                    raise BadRequestError(f"Geo filters are not supported for {name}.")
+
+    def get_search_query(self, query_builder, es_filter_query):
+        """Return the (optimized) query for the search index."""
+        search_filter = query_builder.to_filter(self.model)
+        if es_filter_query:
+            search_filter = AndFilter([search_filter, es_filter_query])
+        return FilterOptimizer.optimize(search_filter).to_query()
+
+    def get_search_ordering(self, qs):
+        """Return the sorting for the search index."""
+        ordering = []
+        if qs.sorting:
+            # order can be list of dicts like this:
+            # [{"field": "short_name", "order": "asc"}]
+            # We need to make it ready for the elasticsearch,
+            # which expects it as [{"short_name": "asc"}]
+            for entry in qs.sorting:
+                ordering.append({entry["field"]: entry["order"]})
+        return ordering
+
+    def get_faceted_collection(self, qs, view_kwargs, facets, facet_size):
+        """
+        Return the collection together with the facets for the search.
+
+        The facets are terms aggregations that the elasticsearch computes
+        within the same request - and for the same query (search string,
+        filters & visibility) as the collection.
+
+        Returns the total number of hits, the collection & a dict with
+        the facet names as keys & lists of value & count dicts as values.
+        """
+        if current_app.elasticsearch is None:
+            raise BadRequestError("The faceted search needs the full text search.")
+        query_builder = self.get_es_query_builder(qs)
+        self.before_get_collection(qs, view_kwargs)
+        pagination = self.get_pagination_parameter(qs.pagination)
+        search_query = self.get_search_query(query_builder, self.es_query(view_kwargs))
+        with search_unavailable_as_error():
+            query, object_count, facet_result = self.model.search_with_facets(
+                search_query,
+                pagination["number"],
+                pagination["size"],
+                self.get_search_ordering(qs),
+                facets,
+                facet_size,
+            )
+        if getattr(self, "eagerload_includes", True):
+            query = self.eagerload_includes(query, qs)
+        collection = self.after_get_collection(query.all(), qs, view_kwargs)
+        return object_count, collection, facet_result
+
+    def filter_query(self, query, filter_info, model):
+        """Filter the query - with support for the geo filters."""
+        if filter_info:
+            query = query.filter(*[self.to_sql_filter(f, model) for f in filter_info])
+        return query
+
+    def to_sql_filter(self, filter_dict, model):
+        """Return the sql expression for one filter of the filter list."""
+        if "or" in filter_dict.keys():
+            return or_(*[self.to_sql_filter(f, model) for f in filter_dict["or"]])
+        if "and" in filter_dict.keys():
+            return and_(*[self.to_sql_filter(f, model) for f in filter_dict["and"]])
+        if "not" in filter_dict.keys():
+            return not_(self.to_sql_filter(filter_dict["not"], model))
+        geo_filter_class = FilterParser.GEO_OPS.get(filter_dict.get("op"))
+        if geo_filter_class is None:
+            return create_filters(model, [filter_dict], self.resource)[0]
+        self.check_geo_filter_fields([filter_dict])
+        geo_filter = geo_filter_class.parse(filter_dict["name"], filter_dict.get("val"))
+        return model.geo_filter_sql(geo_filter)
+
     def get_collection(self, qs, view_kwargs, filters=None):
         """
         Return the collection according to the arguments and filters.
@@ -520,20 +1204,101 @@ class EsSqlalchemyDataLayer(SqlalchemyDataLayer):
         #
         # if we don't have our elasticsearch available,
         # then we want just to use the basic json api features
-        # (filtering, sorting, pagination)
-        if current_app.elasticsearch is None:
-            return super().get_collection(qs, view_kwargs, filters)
+        # (filtering, sorting, pagination) - and the full text
+        # search of the database.
+        cursor = g.get("page_cursor")
+        if not self.use_elasticsearch():
+            if cursor is not None:
+                raise BadRequestError("page[cursor] needs the full text search.")
+            return self.get_database_collection(qs, view_kwargs, filters)
 
         # All the filter should be used in the search method.
-        query_builder = EsQueryBuilder()
-        query_builder.with_request_args(request.args)
-        if qs.filters:
-            query_builder.with_filter_args(qs.filters)
+        query_builder = self.get_es_query_builder(qs)
 
         # Also, if we don't get a search string, we do the very same.
-        if not query_builder.is_set():
+        # (But the cursor pagination works with the search index only).
+        if not query_builder.is_set() and cursor is None:
             return super().get_collection(qs, view_kwargs, filters)
 
+        if cursor is not None or not self.use_database_search():
+            # There is no fallback to the database for the cursor pagination
+            # (and none at all if we don't want the search in the database).
+            with search_unavailable_as_error():
+                return self.get_search_collection(
+                    qs, view_kwargs, query_builder, cursor
+                )
+        try:
+            return self.get_search_collection(qs, view_kwargs, query_builder, cursor)
+        except Exception as e:
+            if not is_search_unavailable(e):
+                raise
+            current_app.logger.warning(
+                "Elasticsearch not available, use the database search: %s", e
+            )
+            return self.get_database_collection(qs, view_kwargs, filters)
+
+    def use_elasticsearch(self):
+        """
+        Return True if we want to use the elasticsearch for the lists.
+
+        While the circuit breaker is open we use the database.
+        """
+        if current_app.elasticsearch is None:
+            return False
+        if current_app.config.get("SEARCH_BACKEND") == "postgres":
+            return False
+        if not self.use_database_search():
+            # Nothing to switch to - the circuit breaker gives a 503 then.
+            return True
+        return not is_search_circuit_open()
+
+    def use_database_search(self):
+        """
+        Return True if we can use the full text search of the database.
+
+        This is the case for the postgres search backend - and for the
+        elasticsearch backend only if we enabled the fallback explicitly.
+        """
+        if current_app.config.get("SEARCH_BACKEND") == "postgres":
+            return True
+        return current_app.config.get("SEARCH_DATABASE_FALLBACK", False)
+
+    def get_database_collection(self, qs, view_kwargs, filters=None):
+        """
+        Return the collection with the full text search of the database.
+
+        Without a search string (or without a search vector for the model
+        or without the database search enabled) this is the basic
+        get_collection of the SqlalchemyDataLayer.
+        """
+        query_builder = EsQueryBuilder().with_request_args(request.args)
+        if (
+            not query_builder.q
+            or not hasattr(self.model, "search_vector")
+            or not self.use_database_search()
+        ):
+            return super().get_collection(qs, view_kwargs, filters)
+        text_search = PostgresTextSearch(self.model).to_sql(
+            query_builder.to_filter(self.model)
+        )
+
+        self.before_get_collection(qs, view_kwargs)
+        query = self.query(view_kwargs).filter(text_search)
+        if filters:
+            query = query.filter_by(**filters)
+        if qs.filters:
+            query = self.filter_query(query, qs.filters, self.model)
+        if qs.sorting:
+            query = self.sort_query(query, qs.sorting)
+        object_count = query.count()
+        if getattr(self, "eagerload_includes", True):
+            query = self.eagerload_includes(query, qs)
+        query = self.paginate_query(query, qs.pagination)
+        collection = self.after_get_collection(query.all(), qs, view_kwargs)
+        return object_count, collection
+
+    def get_search_collection(self, qs, view_kwargs, query_builder, cursor):
+        """Return the collection with the search in the elasticsearch."""
         # now we have a search string, so we want to go with our search logic
         # As in the initial get_collection method we give a hook here.
         self.before_get_collection(qs, view_kwargs)
@@ -545,21 +1310,42 @@ class EsSqlalchemyDataLayer(SqlalchemyDataLayer):
         per_page = pagination["size"]
 
         # Then we run our search.
-        search_filter = query_builder.to_filter(self.model)
-        if es_filter_query:
-            search_filter = AndFilter([search_filter, es_filter_query])
-        search_query = search_filter.to_query()
+        search_query = self.get_search_query(query_builder, es_filter_query)
+        ordering = self.get_search_ordering(qs)
+
+        source_fields = self.get_es_source_fields(qs)
+        source_field_names = None
+        if source_fields is not None:
+            source_field_names = list(source_fields.keys())
+
+        if cursor is not None:
+            try:
+                result, object_count, g.next_page_cursor = self.model.search_after(
+                    search_query, per_page, ordering, cursor, source_field_names
+                )
+            except InvalidCursor as e:
+                raise BadRequestError(f"Invalid page[cursor]: {e}")
+        elif source_fields is not None:
+            result, object_count = self.model.search_sources(
+                search_query, page, per_page, ordering, source_field_names
+            )
+        else:
+            # Elasticsearch handles here filtering, pagination & sorting.
+            result, object_count = self.model.search(
+                search_query, page, per_page, ordering
+            )
 
-        ordering = []
-        if qs.sorting:
-            # order can be list of dicts like this:
-            # [{"field": "short_name", "order": "asc"}]
-            # We need to make it ready for the elasticsearch,
-            # which expects it as [{"short_name": "asc"}]
-            for entry in qs.sorting:
-                ordering.append({entry["field"]: entry["order"]})
-        # Elasticsearch handles here filtering, pagination & sorting.
-        query, object_count = self.model.search(search_query, page, per_page, ordering)
+        if source_fields is not None:
+            # All we need is in the search index, so we don't need
+            # to query the database.
+            collection = [
+                self.to_es_source_entry(id_, document, source_fields)
+                for id_, document in result
+            ]
+            collection = self.after_get_collection(collection, qs, view_kwargs)
+            return object_count, collection
+
+        query = result
         # Still we want to include the data if we are asked.
         if getattr(self, "eagerload_includes", True):
             query = self.eagerload_includes(query, qs)
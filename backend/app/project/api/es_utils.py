@@ -6,6 +6,10 @@
 
 """Utility functions to work with elasticsearch content."""
 
+import copy
+import dataclasses
+from typing import List, Optional
+
 
 def settings_with_ngrams(
     analyzer_name: str,
@@ -40,7 +44,6 @@ def settings_with_ngrams(
                     ],
                     "type": "custom",
                     "tokenizer": "uax_url_email",
-
                 },
             },
         },
@@ -48,6 +51,114 @@ def settings_with_ngrams(
     return settings
 
 
+@dataclasses.dataclass
+class IndexSettings:
+    """
+    Configurable settings for a search index.
+
+    The models define the mappings & the analyzers. With those settings
+    we can adjust them without changing the code (see the
+    ELASTICSEARCH_INDEX_SETTINGS config):
+
+    - number of shards & replicas
+    - ngram or edge_ngram for the ngram filters (& the gram sizes)
+    - the fields that keep their text_analyzer subfields (with the
+      ngrams - None for all, a list of field paths otherwise; a path
+      also covers the fields below it)
+    - the limit for the total number of fields
+    - the refresh interval - and the one that we use while we fill
+      a new index in bulk
+    """
+
+    number_of_shards: int = 1
+    number_of_replicas: Optional[int] = None
+    ngram_type: str = "ngram"
+    min_ngram: Optional[int] = None
+    max_ngram: Optional[int] = None
+    text_analyzer_fields: Optional[List[str]] = None
+    total_fields_limit: int = 2000
+    refresh_interval: str = "1s"
+    bulk_refresh_interval: str = "-1"
+
+    @classmethod
+    def from_config(cls, config, index_name, **overrides):
+        """
+        Return the settings for the index.
+
+        The config is a dict with a "default" entry & entries per index
+        name; the later ones win - and the overrides win over all.
+        """
+        options = {}
+        options.update(config.get("default", {}))
+        options.update(config.get(index_name, {}))
+        options.update(overrides)
+        field_names = {f.name for f in dataclasses.fields(cls)}
+        unknown = set(options.keys()) - field_names
+        if unknown:
+            raise ValueError(f"Unknown index settings: {', '.join(sorted(unknown))}")
+        if options.get("ngram_type", "ngram") not in ["ngram", "edge_ngram"]:
+            raise ValueError("ngram_type must be ngram or edge_ngram")
+        return cls(**options)
+
+    def apply(self, definition):
+        """Return a copy of the index definition with the settings applied."""
+        result = copy.deepcopy(definition)
+        settings = result.setdefault("settings", {})
+        index_settings = settings.setdefault("index", {})
+        index_settings["number_of_shards"] = str(self.number_of_shards)
+        if self.number_of_replicas is not None:
+            index_settings["number_of_replicas"] = str(self.number_of_replicas)
+        index_settings["refresh_interval"] = self.refresh_interval
+
+        max_ngram_diff = index_settings.get("max_ngram_diff", 1)
+        for filter_definition in (
+            settings.get("analysis", {}).get("filter", {}).values()
+        ):
+            if filter_definition.get("type") not in ["ngram", "edge_ngram"]:
+                continue
+            filter_definition["type"] = self.ngram_type
+            if self.min_ngram is not None:
+                filter_definition["min_gram"] = self.min_ngram
+            if self.max_ngram is not None:
+                filter_definition["max_gram"] = self.max_ngram
+            max_ngram_diff = max(
+                max_ngram_diff,
+                filter_definition["max_gram"] - filter_definition["min_gram"],
+            )
+        if "max_ngram_diff" in index_settings or max_ngram_diff > 1:
+            index_settings["max_ngram_diff"] = max_ngram_diff
+
+        settings.setdefault("mapping", {}).setdefault("total_fields", {})
+        settings["mapping"]["total_fields"]["limit"] = self.total_fields_limit
+
+        if self.text_analyzer_fields is not None:
+            self.remove_text_analyzer_fields(
+                result.get("mappings", {}).get("properties", {}), prefix=""
+            )
+        return result
+
+    def keeps_text_analyzer(self, path):
+        """Return True if the field should keep the text_analyzer subfield."""
+        for allowed in self.text_analyzer_fields:
+            if path == allowed or path.startswith(allowed + "."):
+                return True
+        return False
+
+    def remove_text_analyzer_fields(self, properties, prefix):
+        """Remove the text_analyzer subfields that we don't want (inplace)."""
+        for name, definition in properties.items():
+            path = f"{prefix}{name}"
+            if "properties" in definition:
+                self.remove_text_analyzer_fields(
+                    definition["properties"], prefix=f"{path}."
+                )
+            fields = definition.get("fields", {})
+            if "text_analyzer" in fields and not self.keeps_text_analyzer(path):
+                del fields["text_analyzer"]
+                if not fields:
+                    del definition["fields"]
+
+
 class ElasticSearchIndexTypes:
     """Class to collect factory method to create the index types easier."""
 
@@ -45,69 +45,59 @@ def build_tree(platform_mounts, device_mounts, f_platform_mount, f_device_mount)
 
     Result at the end are the top level elements (all others are reachable via the
     children entries).
+
+    We use the type & id of the mounted entities as keys for the lists of
+    the children & a set to skip duplicated entries (like the same entity
+    that is mounted several times in the same parent with the very same
+    payload). This way we need linear time - regardless of the number of
+    mounts.
     """
     top_level_elements = []
-    children = {}
+    children = collections.defaultdict(list)
+    added_elements = set()
 
-    for platform_mount in platform_mounts:
-        children.setdefault(TypeIdTuple("platform", platform_mount.platform_id), [])
-        entries = f_platform_mount(platform_mount)
-        element = {
-            **entries,
-            "children": children[TypeIdTuple("platform", platform_mount.platform_id)],
-        }
+    def add_element(parent_key, key, entries):
+        marker = (parent_key, key, _hashable(entries))
+        if marker in added_elements:
+            return
+        added_elements.add(marker)
+        element = {**entries, "children": children[key]}
+        if parent_key is None:
+            top_level_elements.append(element)
+        else:
+            children[parent_key].append(element)
 
+    for platform_mount in platform_mounts:
+        parent_key = None
         if platform_mount.parent_platform_id:
-            children.setdefault(
-                TypeIdTuple("platform", platform_mount.parent_platform_id), []
-            )
-            if (
-                element
-                not in children[
-                    TypeIdTuple("platform", platform_mount.parent_platform_id)
-                ]
-            ):
-                children[
-                    TypeIdTuple("platform", platform_mount.parent_platform_id)
-                ].append(element)
-        else:
-            if element not in top_level_elements:
-                top_level_elements.append(element)
+            parent_key = TypeIdTuple("platform", platform_mount.parent_platform_id)
+        add_element(
+            parent_key,
+            TypeIdTuple("platform", platform_mount.platform_id),
+            f_platform_mount(platform_mount),
+        )
 
     for device_mount in device_mounts:
-        children.setdefault(TypeIdTuple("device", device_mount.device_id), [])
-        entries = f_device_mount(device_mount)
-        element = {
-            **entries,
-            "children": children[TypeIdTuple("device", device_mount.device_id)],
-        }
-
+        parent_key = None
         if device_mount.parent_platform_id:
-            children.setdefault(
-                TypeIdTuple("platform", device_mount.parent_platform_id), []
-            )
-            if (
-                element
-                not in children[
-                    TypeIdTuple("platform", device_mount.parent_platform_id)
-                ]
-            ):
-                children[
-                    TypeIdTuple("platform", device_mount.parent_platform_id)
-                ].append(element)
+            parent_key = TypeIdTuple("platform", device_mount.parent_platform_id)
         elif device_mount.parent_device_id:
-            children.setdefault(
-                TypeIdTuple("device", device_mount.parent_device_id), []
-            )
-            if (
-                element
-                not in children[TypeIdTuple("device", device_mount.parent_device_id)]
-            ):
-                children[TypeIdTuple("device", device_mount.parent_device_id)].append(
-                    element
-                )
-        else:
-            if element not in top_level_elements:
-                top_level_elements.append(element)
+            parent_key = TypeIdTuple("device", device_mount.parent_device_id)
+        add_element(
+            parent_key,
+            TypeIdTuple("device", device_mount.device_id),
+            f_device_mount(device_mount),
+        )
 
     return top_level_elements
+
+
+def _hashable(value):
+    """Return a hashable version of the (nested) payload of a tree element."""
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(_hashable(v) for v in value)
+    return value
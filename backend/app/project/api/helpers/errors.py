@@ -94,6 +94,20 @@ class ConflictError(ErrorResponse):
     status = 409
 
 
+class ExclusionConstraintError(ConflictError):
+    """
+    Error for entries that an exclusion constraint of the database rejects.
+
+    This happens for overlapping time ranges that passed the validators
+    in parallel requests.
+    """
+
+    def __init__(self, *args, constraint_name=None, **kwargs):
+        """Initialize the error with the name of the violated constraint."""
+        super().__init__(*args, **kwargs)
+        self.constraint_name = constraint_name
+
+
 class MethodNotAllowed(ErrorResponse):
     """Default Class to throw HTTP 405 Exception."""
 
@@ -120,6 +134,13 @@ class UnsupportedMediaTypeError(ErrorResponse):
     status = 415
 
 
+class ServiceUnavailableError(ErrorResponse):
+    """Default Class to throw HTTP 503 Exception."""
+
+    title = "Service Unavailable"
+    status = 503
+
+
 class ServiceIsUnreachableError(ErrorResponse):
     """Default Class to throw HTTP 523 Exception extinction."""
 
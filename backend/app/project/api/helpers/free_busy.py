@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Free & busy intervals for the mount timelines of devices & platforms."""
+
+from .date_time_range import DateTimeRange
+
+
+def free_busy_timeline(mounts, begin_date, end_date=None):
+    """
+    Return the busy intervals & the free gaps within the horizon.
+
+    We sweep once over the mounts (sorted by their begin dates) &
+    merge the mounts of the same configuration that follow each other
+    without a gap. Everything in the horizon that is not covered
+    by a mount is free.
+
+    The mounts need the id, begin_date, end_date, configuration_id
+    & configuration_label attributes.
+    An end date of None means that the mount (or the horizon or a
+    free gap) never ends.
+
+    :param mounts: the mounts of one device or platform
+    :param datetime.datetime begin_date: begin of the horizon
+    :param datetime.datetime end_date: end of the horizon
+    :return: dict with the busy & free lists
+    """
+    begin_date = DateTimeRange.tz_aware(begin_date)
+    end_date = DateTimeRange.tz_aware(end_date)
+    busy = []
+    free = []
+    # The time until we know that the instrument is busy.
+    # None if it is busy for ever.
+    cursor = begin_date
+    for mount in sorted(mounts, key=lambda m: DateTimeRange.tz_aware(m.begin_date)):
+        mount_begin_date = DateTimeRange.tz_aware(mount.begin_date)
+        mount_end_date = DateTimeRange.tz_aware(mount.end_date)
+
+        last = busy[-1] if busy else None
+        if (
+            last is not None
+            and last["configuration_id"] == mount.configuration_id
+            and last["end_date"] is not None
+            and last["end_date"] >= mount_begin_date
+        ):
+            if mount_end_date is None or mount_end_date > last["end_date"]:
+                last["end_date"] = mount_end_date
+            last["mounts"].append(mount.id)
+        else:
+            busy.append(
+                {
+                    "begin_date": mount_begin_date,
+                    "end_date": mount_end_date,
+                    "configuration_id": mount.configuration_id,
+                    "configuration_label": mount.configuration_label,
+                    "mounts": [mount.id],
+                }
+            )
+
+        if cursor is None:
+            continue
+        if mount_begin_date > cursor and (end_date is None or cursor < end_date):
+            gap_end_date = mount_begin_date
+            if end_date is not None and end_date < gap_end_date:
+                gap_end_date = end_date
+            free.append({"begin_date": cursor, "end_date": gap_end_date})
+        if mount_end_date is None:
+            cursor = None
+        elif mount_end_date > cursor:
+            cursor = mount_end_date
+
+    if cursor is not None and (end_date is None or cursor < end_date):
+        free.append({"begin_date": cursor, "end_date": end_date})
+    return {"busy": busy, "free": free}
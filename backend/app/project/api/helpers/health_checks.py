@@ -26,7 +26,10 @@ def health_check_elastic_search():
     :return: boolean and a message
     """
     try:
-        _ = requests.get(current_app.config["ELASTICSEARCH_URL"]).content
+        _ = requests.get(
+            current_app.config["ELASTICSEARCH_URL"],
+            timeout=current_app.config.get("ELASTICSEARCH_REQUEST_TIMEOUT"),
+        ).content
         return True, "elastic search ok"
 
     except requests.exceptions.HTTPError as e:
@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""In memory index for time ranges (like the mounts of a device)."""
+
+import bisect
+import collections
+import datetime
+import operator
+
+from .date_time_range import DateTimeRange
+
+# Stands for the missing end date of entries that never end.
+NO_END = datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+
+
+class IntervalIndex:
+    """
+    Index for entries with a begin date & an (optional) end date.
+
+    The entries are sorted by their begin dates. On top of this array
+    we use an implicit balanced tree that knows the latest end date of
+    every subtree. This way we find the overlapping, covering & active
+    entries in O(log n + k) - without checking every single entry.
+
+    The semantic is the very same as for the DateTimeRange:
+    - overlapping: An entry can start right when the other one ends.
+      Entries with the same begin date always overlap.
+    - covering: The entry includes the complete time range.
+    - active: The entry overlaps with the single timepoint.
+
+    We return the entries in the order in that we got them.
+    """
+
+    def __init__(
+        self,
+        entries=(),
+        begin_date=operator.attrgetter("begin_date"),
+        end_date=operator.attrgetter("end_date"),
+    ):
+        """Init the object & sort the entries by their begin dates."""
+        rows = []
+        for position, entry in enumerate(entries):
+            begin = DateTimeRange.tz_aware(begin_date(entry))
+            end = DateTimeRange.tz_aware(end_date(entry)) or NO_END
+            rows.append((begin, position, end, entry))
+        rows.sort(key=operator.itemgetter(0, 1))
+        self.begin_dates = [row[0] for row in rows]
+        self.positions = [row[1] for row in rows]
+        self.end_dates = [row[2] for row in rows]
+        self.entries = [row[3] for row in rows]
+        # The latest end date for the subtree with the root at the index.
+        self.max_end_dates = list(self.end_dates)
+        self._build(0, len(rows))
+
+    @classmethod
+    def group_by(cls, entries, key, **kwargs):
+        """Return a dict with one index per key (for example per device id)."""
+        groups = collections.defaultdict(list)
+        for entry in entries:
+            groups[key(entry)].append(entry)
+        return {
+            group_key: cls(group_entries, **kwargs)
+            for group_key, group_entries in groups.items()
+        }
+
+    def __len__(self):
+        """Return the number of entries."""
+        return len(self.entries)
+
+    def _build(self, low, high):
+        """Fill the max end dates for the subtree of the range & return it."""
+        if low >= high:
+            return None
+        middle = (low + high) // 2
+        result = self.end_dates[middle]
+        for child in [self._build(low, middle), self._build(middle + 1, high)]:
+            if child is not None and child > result:
+                result = child
+        self.max_end_dates[middle] = result
+        return result
+
+    def _ending_after(self, upper, bound, inclusive=False):
+        """
+        Return the indices below upper with an end date after the bound.
+
+        If inclusive is set, we also include those that end with the bound.
+        """
+        result = []
+
+        def is_after(end_date):
+            return end_date >= bound if inclusive else end_date > bound
+
+        def visit(low, high):
+            if low >= high or low >= upper:
+                return
+            middle = (low + high) // 2
+            if not is_after(self.max_end_dates[middle]):
+                # Nothing in this subtree ends late enough.
+                return
+            visit(low, middle)
+            if middle < upper and is_after(self.end_dates[middle]):
+                result.append(middle)
+            visit(middle + 1, high)
+
+        visit(0, len(self.entries))
+        return result
+
+    def _to_entries(self, indices):
+        """Return the entries for the indices in the order in that we got them."""
+        return [
+            self.entries[i] for i in sorted(indices, key=self.positions.__getitem__)
+        ]
+
+    def overlapping(self, begin_date, end_date=None):
+        """Return the entries that overlap with the time range."""
+        begin_date = DateTimeRange.tz_aware(begin_date)
+        end_date = DateTimeRange.tz_aware(end_date) or NO_END
+        same_begin_low = bisect.bisect_left(self.begin_dates, begin_date)
+        same_begin_high = bisect.bisect_right(self.begin_dates, begin_date)
+        # The entries that start before still need to run after our begin.
+        indices = self._ending_after(same_begin_low, begin_date)
+        # All those that start with us or within our time range.
+        later_high = max(
+            same_begin_high, bisect.bisect_left(self.begin_dates, end_date)
+        )
+        indices.extend(range(same_begin_low, later_high))
+        return self._to_entries(indices)
+
+    def covering(self, begin_date, end_date=None):
+        """Return the entries that cover the complete time range."""
+        begin_date = DateTimeRange.tz_aware(begin_date)
+        end_date = DateTimeRange.tz_aware(end_date) or NO_END
+        upper = bisect.bisect_right(self.begin_dates, begin_date)
+        return self._to_entries(self._ending_after(upper, end_date, inclusive=True))
+
+    def active_at(self, timepoint):
+        """Return the entries that are active at the timepoint."""
+        return self.overlapping(timepoint, timepoint)
@@ -19,6 +19,31 @@ from ..models import (
 from ..models.base_model import db
 from .date_time_range import DateTimeRange
 from .errors import BadRequestError, ConflictError, NotFoundError
+from .interval_index import IntervalIndex
+
+
+def query_overlapping_locations(
+    model, configuration_id, expected_date_time_range, ignore_id=None
+):
+    """
+    Return the query for the location actions that overlap with the time range.
+
+    Within one type it is the very same condition as the exclusion
+    constraint in the database, so that we can ask its index.
+    """
+    query = (
+        db.session.query(model)
+        .filter(
+            model.configuration_id == configuration_id,
+            model.half_open_period_overlaps(
+                expected_date_time_range.begin_date, expected_date_time_range.end_date
+            ),
+        )
+        .order_by(model.begin_date)
+    )
+    if ignore_id is not None:
+        query = query.filter(model.id != ignore_id)
+    return query
 
 
 class AbstractLocationActionValidator(abc.ABC):
@@ -223,32 +248,25 @@ class StaticLocationActionValidator(AbstractLocationActionValidator):
     ):
         """Return an action if there is one that intersects with the expected location timeline."""
         # First, check the static location actions.
-        static_location_actions = db.session.query(
-            ConfigurationStaticLocationBeginAction
-        ).filter_by(configuration_id=configuration_id)
-        for static_location_action in static_location_actions:
-            # As we are in the validator for the static location actions & those are what we edit,
-            # it could be necessary that we need to ignore one entry
-            # (the entry that we want to edit for example; it is clear that we don't want to
-            # have intersections with those as errors).
-            if static_location_action.id != ignore_id:
-                action_date_time_range = DateTimeRange(
-                    static_location_action.begin_date, static_location_action.end_date
-                )
-                if expected_date_time_range.overlaps_with(action_date_time_range):
-                    return static_location_action
+        # As we are in the validator for the static location actions & those are what we edit,
+        # it could be necessary that we need to ignore one entry
+        # (the entry that we want to edit for example; it is clear that we don't want to
+        # have intersections with those as errors).
+        static_location_action = query_overlapping_locations(
+            ConfigurationStaticLocationBeginAction,
+            configuration_id,
+            expected_date_time_range,
+            ignore_id,
+        ).first()
+        if static_location_action:
+            return static_location_action
         # Then the dynamic actions.
-        dynamic_location_actions = db.session.query(
-            ConfigurationDynamicLocationBeginAction
-        ).filter_by(configuration_id=configuration_id)
-        for dynamic_location_action in dynamic_location_actions:
-            # Here we don't check for the id, as it is the other type.
-            action_date_time_range = DateTimeRange(
-                dynamic_location_action.begin_date, dynamic_location_action.end_date
-            )
-            if expected_date_time_range.overlaps_with(action_date_time_range):
-                return dynamic_location_action
-        return None
+        # Here we don't check for the id, as it is the other type.
+        return query_overlapping_locations(
+            ConfigurationDynamicLocationBeginAction,
+            configuration_id,
+            expected_date_time_range,
+        ).first()
 
     def _query_existing_location(self, existing_location_id):
         """Find the static location action for the id or return None."""
@@ -307,23 +325,24 @@ class DynamicLocationActionValidator(AbstractLocationActionValidator):
         # We want to have one mount for our configuration, that covers the whole location action.
         # If we would have only mounts that are unmounted before the end of the location action,
         # then we would have the situation that we could not extract coordinates for that time.
-        for device_property in device_properties:
-            device_id = device_property.device_id
-            device_mounts = db.session.query(DeviceMountAction).filter(
-                and_(
-                    DeviceMountAction.device_id == device_id,
-                    DeviceMountAction.configuration_id == configuration_id,
-                )
+        # We load the mounts for all of the devices with one query.
+        device_mounts = db.session.query(DeviceMountAction).filter(
+            and_(
+                DeviceMountAction.device_id.in_(
+                    [device_property.device_id for device_property in device_properties]
+                ),
+                DeviceMountAction.configuration_id == configuration_id,
             )
-            is_covered = False
-            for device_mount in device_mounts:
-                device_mount_date_time_range = DateTimeRange(
-                    device_mount.begin_date, device_mount.end_date
-                )
-                if device_mount_date_time_range.covers(expected_date_time_range):
-                    is_covered = True
-                    break
-            if not is_covered:
+        )
+        indices = IntervalIndex.group_by(
+            device_mounts, key=lambda device_mount: device_mount.device_id
+        )
+        for device_property in device_properties:
+            index = indices.get(device_property.device_id, IntervalIndex())
+            if not index.covering(
+                expected_date_time_range.begin_date,
+                expected_date_time_range.end_date,
+            ):
                 return device_property
 
         return None
@@ -333,32 +352,25 @@ class DynamicLocationActionValidator(AbstractLocationActionValidator):
     ):
         """Return a location that overlaps with the planned one - or None."""
         # First check the static location actions.
-        static_location_actions = db.session.query(
-            ConfigurationStaticLocationBeginAction
-        ).filter_by(configuration_id=configuration_id)
-        for static_location_action in static_location_actions:
-            # We don't filter for the id as this is a different type then we
-            # Check (DynamicLocationActionValidator).
-            action_date_time_range = DateTimeRange(
-                static_location_action.begin_date, static_location_action.end_date
-            )
-            if expected_date_time_range.overlaps_with(action_date_time_range):
-                return static_location_action
+        # We don't filter for the id as this is a different type then we
+        # Check (DynamicLocationActionValidator).
+        static_location_action = query_overlapping_locations(
+            ConfigurationStaticLocationBeginAction,
+            configuration_id,
+            expected_date_time_range,
+        ).first()
+        if static_location_action:
+            return static_location_action
         # Then the dynamic location actions
-        dynamic_location_actions = db.session.query(
-            ConfigurationDynamicLocationBeginAction
-        ).filter_by(configuration_id=configuration_id)
-        for dynamic_location_action in dynamic_location_actions:
-            # Here it can be that we want to update an existing action, so
-            # we don't want to consider overlaps here as problems (say I want to
-            # extend the location for some days more).
-            if dynamic_location_action.id != ignore_id:
-                action_date_time_range = DateTimeRange(
-                    dynamic_location_action.begin_date, dynamic_location_action.end_date
-                )
-                if expected_date_time_range.overlaps_with(action_date_time_range):
-                    return dynamic_location_action
-        return None
+        # Here it can be that we want to update an existing action, so
+        # we don't want to consider overlaps here as problems (say I want to
+        # extend the location for some days more).
+        return query_overlapping_locations(
+            ConfigurationDynamicLocationBeginAction,
+            configuration_id,
+            expected_date_time_range,
+            ignore_id,
+        ).first()
 
     def _query_existing_location(self, existing_location_id):
         """Return the existing location if it is in the db - None otherwise."""
@@ -9,10 +9,10 @@
 """Check functions to ensure consistency for mounts."""
 
 import abc
-import itertools
 
 import dateutil.parser
-from sqlalchemy import and_, or_
+import sqlalchemy
+from sqlalchemy import and_, not_, or_
 
 from ... import db
 from ..models import (
@@ -295,48 +295,42 @@ class AbstractMountActionValidator(abc.ABC):
         self, parent_platform_id, configuration_id, expected_date_time_range
     ):
         """Search for a platform mount action. May return None."""
-        parent_platform_mounts = self._query_parent_platform_mounts(
-            parent_platform_id, configuration_id
-        )
-        for mount_action in parent_platform_mounts:
-            existing_date_time_range = DateTimeRange(
-                mount_action.begin_date, mount_action.end_date
+        return (
+            self._query_parent_platform_mounts(parent_platform_id, configuration_id)
+            .filter(
+                PlatformMountAction.period_covers(
+                    expected_date_time_range.begin_date,
+                    expected_date_time_range.end_date,
+                )
             )
-            if existing_date_time_range.covers(expected_date_time_range):
-                return mount_action
-        return None
+            .first()
+        )
 
     def _get_parent_device_mount(
         self, parent_device_id, configuration_id, expected_date_time_range
     ):
         """Search for a device mount action. May return None."""
-        parent_device_mounts = self._query_parent_device_mounts(
-            parent_device_id, configuration_id
-        )
-        for mount_action in parent_device_mounts:
-            existing_date_time_range = DateTimeRange(
-                mount_action.begin_date, mount_action.end_date
+        return (
+            self._query_parent_device_mounts(parent_device_id, configuration_id)
+            .filter(
+                DeviceMountAction.period_covers(
+                    expected_date_time_range.begin_date,
+                    expected_date_time_range.end_date,
+                )
             )
-            if existing_date_time_range.covers(expected_date_time_range):
-                return mount_action
-        return None
+            .first()
+        )
 
     def _get_overlapping_mount(
         self, object_id, expected_date_time_range, ignore_id=None
     ):
         """Search if we have already an mount action for the object. Return if found."""
-        existing_mount_actions = self._query_existing_mount_actions(
-            object_id, expected_date_time_range.begin_date
-        )
-        for mount_action in existing_mount_actions:
-            # We can ignore the existing mount that we want to update.
-            if not_str_equal(mount_action.id, ignore_id):
-                existing_date_time_range = DateTimeRange(
-                    mount_action.begin_date, mount_action.end_date
-                )
-                if expected_date_time_range.overlaps_with(existing_date_time_range):
-                    return mount_action
-        return None
+        # This is the very same condition as the exclusion constraint
+        # in the database, so we can ask its index.
+        # We ignore the existing mount that we want to update.
+        return self._query_overlapping_mount_actions(
+            object_id, expected_date_time_range, ignore_id
+        ).first()
 
     def _extract_begin_and_end_dates(self, payload_dict):
         """
@@ -507,6 +501,23 @@ class AbstractMountActionValidator(abc.ABC):
             parts.append(f"to {expected_date_time_range.end_date}")
         return " ".join(parts)
 
+    @staticmethod
+    def _not_covered_unless_moved(model, is_moved, expected_date_time_range):
+        """
+        Return the sql condition for the entries that we would lose.
+
+        If we moved the mount (other object or configuration) we lose
+        all of them. Otherwise only those that are not covered by the
+        updated time range anymore.
+        """
+        if is_moved:
+            return sqlalchemy.true()
+        return not_(
+            model.period_covered_by(
+                expected_date_time_range.begin_date, expected_date_time_range.end_date
+            )
+        )
+
     # And here we have all the abstract method that need to be implemented by
     # the sub classes.
     @abc.abstractmethod
@@ -531,8 +542,10 @@ class AbstractMountActionValidator(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def _query_existing_mount_actions(self, object_id, begin_date):
-        """Return the collection of existing mounts for the device/platform."""
+    def _query_overlapping_mount_actions(
+        self, object_id, expected_date_time_range, ignore_id
+    ):
+        """Return the query for the other mounts of the device/platform in the time range."""
         pass
 
     @abc.abstractmethod
@@ -589,83 +602,62 @@ class DeviceMountActionValidator(AbstractMountActionValidator):
         expected_date_time_range,
         updated_configuration_id,
     ):
-        existing_date_time_range = DateTimeRange(
-            existing_mount.begin_date, existing_mount.end_date
+        # Did we change the device or the configuration of our current mount?
+        # In that case we lose everything that refers to the mount.
+        is_moved = not_str_equal(
+            existing_mount.configuration_id, updated_configuration_id
+        ) or not_str_equal(object_id, existing_mount.device_id)
+        device_property_ids = db.session.query(DeviceProperty.id).filter(
+            DeviceProperty.device_id == existing_mount.device_id
         )
-        device_property_ids = [
-            x.id
-            for x in db.session.query(DeviceProperty).filter(
-                DeviceProperty.device_id == existing_mount.device_id
-            )
-        ]
-        dynamic_location_actions = (
+        dynamic_location_action = (
             db.session.query(ConfigurationDynamicLocationBeginAction)
             .filter(
-                and_(
-                    ConfigurationDynamicLocationBeginAction.configuration_id
-                    == existing_mount.configuration_id,
-                    or_(
-                        ConfigurationDynamicLocationBeginAction.x_property_id.in_(
-                            device_property_ids
-                        ),
-                        ConfigurationDynamicLocationBeginAction.y_property_id.in_(
-                            device_property_ids
-                        ),
-                        ConfigurationDynamicLocationBeginAction.z_property_id.in_(
-                            device_property_ids
-                        ),
+                ConfigurationDynamicLocationBeginAction.configuration_id
+                == existing_mount.configuration_id,
+                or_(
+                    ConfigurationDynamicLocationBeginAction.x_property_id.in_(
+                        device_property_ids
                     ),
-                )
+                    ConfigurationDynamicLocationBeginAction.y_property_id.in_(
+                        device_property_ids
+                    ),
+                    ConfigurationDynamicLocationBeginAction.z_property_id.in_(
+                        device_property_ids
+                    ),
+                ),
+                ConfigurationDynamicLocationBeginAction.half_open_period_overlaps(
+                    existing_mount.begin_date, existing_mount.end_date
+                ),
+                self._not_covered_unless_moved(
+                    ConfigurationDynamicLocationBeginAction,
+                    is_moved,
+                    expected_date_time_range,
+                ),
             )
             .order_by(ConfigurationDynamicLocationBeginAction.begin_date)
-            .all()
+            .first()
         )
+        if dynamic_location_action:
+            return dynamic_location_action
 
-        for dynamic_location_action in dynamic_location_actions:
-            end_date = dynamic_location_action.end_date
-            check_date_time_range = DateTimeRange(
-                dynamic_location_action.begin_date, end_date
-            )
-            if existing_date_time_range.overlaps_with(check_date_time_range):
-                if (
-                    not_str_equal(
-                        dynamic_location_action.configuration_id,
-                        updated_configuration_id,
-                    )
-                    or not_str_equal(object_id, existing_mount.device_id)
-                    or not expected_date_time_range.covers(check_date_time_range)
-                ):
-
-                    return dynamic_location_action
-
-        child_device_mount_actions = db.session.query(DeviceMountAction).filter(
-            and_(
+        # The child mounts point with their parent_device_id to
+        # the device of our current mount.
+        return (
+            db.session.query(DeviceMountAction)
+            .filter(
                 DeviceMountAction.parent_device_id == existing_mount.device_id,
                 DeviceMountAction.configuration_id == existing_mount.configuration_id,
+                DeviceMountAction.period_covered_by(
+                    existing_mount.begin_date, existing_mount.end_date
+                ),
+                self._not_covered_unless_moved(
+                    DeviceMountAction, is_moved, expected_date_time_range
+                ),
             )
+            .order_by(DeviceMountAction.begin_date)
+            .first()
         )
-        for mount_action in child_device_mount_actions:
-            check_date_time_range = DateTimeRange(
-                mount_action.begin_date, mount_action.end_date
-            )
-            if existing_date_time_range.covers(check_date_time_range):
-                if (
-                    # Did we changed the platform of our current mount?
-                    # In that case the child mounts would point to the
-                    # wrong parent_device_id
-                    not_str_equal(mount_action.parent_device_id, object_id)
-                    # Or did we changed the configuration?
-                    # If so, we will have all entries with that
-                    # parent_device_id be orphanized
-                    or not_str_equal(
-                        mount_action.configuration_id, updated_configuration_id
-                    )
-                    # Or is just the time range of the child mount
-                    # no longer covered?
-                    or not expected_date_time_range.covers(check_date_time_range)
-                ):
-                    return mount_action
-        return None
 
     @staticmethod
     def _extract_object_id_to_mount(payload_dict):
@@ -681,16 +673,23 @@ class DeviceMountActionValidator(AbstractMountActionValidator):
         )
 
     @staticmethod
-    def _query_existing_mount_actions(object_id, begin_date):
-        return db.session.query(DeviceMountAction).filter(
-            and_(
+    def _query_overlapping_mount_actions(
+        object_id, expected_date_time_range, ignore_id
+    ):
+        query = (
+            db.session.query(DeviceMountAction)
+            .filter(
                 DeviceMountAction.device_id == object_id,
-                or_(
-                    DeviceMountAction.end_date.is_(None),
-                    DeviceMountAction.end_date > begin_date,
+                DeviceMountAction.half_open_period_overlaps(
+                    expected_date_time_range.begin_date,
+                    expected_date_time_range.end_date,
                 ),
             )
+            .order_by(DeviceMountAction.begin_date)
         )
+        if ignore_id is not None:
+            query = query.filter(DeviceMountAction.id != ignore_id)
+        return query
 
     @staticmethod
     def _extract_updated_object_id(payload_dict, existing_mount):
@@ -736,44 +735,30 @@ class PlatformMountActionValidator(AbstractMountActionValidator):
         expected_date_time_range,
         updated_configuration_id,
     ):
-        child_platform_mount_actions = db.session.query(PlatformMountAction).filter(
-            and_(
-                PlatformMountAction.parent_platform_id == existing_mount.platform_id,
-                PlatformMountAction.configuration_id == existing_mount.configuration_id,
-            )
-        )
-        child_device_mount_actions = db.session.query(DeviceMountAction).filter(
-            and_(
-                DeviceMountAction.parent_platform_id == existing_mount.platform_id,
-                DeviceMountAction.configuration_id == existing_mount.configuration_id,
-            )
-        )
-        old_date_time_range = DateTimeRange(
-            existing_mount.begin_date, existing_mount.end_date
-        )
-        for mount_action in itertools.chain(
-            child_platform_mount_actions, child_device_mount_actions
-        ):
-            existing_date_time_range = DateTimeRange(
-                mount_action.begin_date, mount_action.end_date
+        # Did we change the platform or the configuration of our current mount?
+        # In that case the child mounts would point to the wrong
+        # parent_platform_id or would be orphanized in the configuration.
+        is_moved = not_str_equal(
+            existing_mount.configuration_id, updated_configuration_id
+        ) or not_str_equal(object_id, existing_mount.platform_id)
+        for model in [PlatformMountAction, DeviceMountAction]:
+            orphan = (
+                db.session.query(model)
+                .filter(
+                    model.parent_platform_id == existing_mount.platform_id,
+                    model.configuration_id == existing_mount.configuration_id,
+                    model.period_covered_by(
+                        existing_mount.begin_date, existing_mount.end_date
+                    ),
+                    self._not_covered_unless_moved(
+                        model, is_moved, expected_date_time_range
+                    ),
+                )
+                .order_by(model.begin_date)
+                .first()
             )
-            if old_date_time_range.covers(existing_date_time_range):
-                if (
-                    # Did we changed the platform of our current mount?
-                    # In that case the child mounts would point to the
-                    # wrong parent_platform_id
-                    not_str_equal(mount_action.parent_platform_id, object_id)
-                    # Or did we changed the configuration?
-                    # If so, we will have all entries with that
-                    # parent_platform_id be orphanized
-                    or not_str_equal(
-                        mount_action.configuration_id, updated_configuration_id
-                    )
-                    # Or is just the time range of the child mount
-                    # no longer covered?
-                    or not expected_date_time_range.covers(existing_date_time_range)
-                ):
-                    return mount_action
+            if orphan:
+                return orphan
         return None
 
     @staticmethod
@@ -798,16 +783,23 @@ class PlatformMountActionValidator(AbstractMountActionValidator):
             .first()
         )
 
-    def _query_existing_mount_actions(self, object_id, begin_date):
-        return db.session.query(PlatformMountAction).filter(
-            and_(
+    def _query_overlapping_mount_actions(
+        self, object_id, expected_date_time_range, ignore_id
+    ):
+        query = (
+            db.session.query(PlatformMountAction)
+            .filter(
                 PlatformMountAction.platform_id == object_id,
-                or_(
-                    PlatformMountAction.end_date.is_(None),
-                    PlatformMountAction.end_date > begin_date,
+                PlatformMountAction.half_open_period_overlaps(
+                    expected_date_time_range.begin_date,
+                    expected_date_time_range.end_date,
                 ),
             )
+            .order_by(PlatformMountAction.begin_date)
         )
+        if ignore_id is not None:
+            query = query.filter(PlatformMountAction.id != ignore_id)
+        return query
 
     def _build_error_message_blocked(self, mount_action):
         parts = [
@@ -33,6 +33,10 @@ from .configuration_parameter import ConfigurationParameter  # noqa: F401
 from .configuration_parameter_value_change_action import (  # noqa: F401
     ConfigurationParameterValueChangeAction,
 )
+from .configuration_timeline import (  # noqa: F401
+    ConfigurationTimelineEvent,
+    ConfigurationTimelineSegment,
+)
 from .contact import Contact  # noqa: F401
 from .contact_role import (  # noqa: F401
     ConfigurationContactRole,
@@ -77,6 +81,7 @@ from .platform_parameter import PlatformParameter  # noqa: F401
 from .platform_parameter_value_change_action import (  # noqa: F401
     PlatformParameterValueChangeAction,
 )
+from .search_index_outbox import SearchIndexOutboxEntry  # noqa: F401
 from .site import Site  # noqa: F401
 from .site_attachment import SiteAttachment  # noqa: F401
 from .site_image import SiteImage  # noqa: F401
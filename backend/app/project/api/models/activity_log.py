@@ -9,7 +9,7 @@
 import json
 
 from .base_model import db
-from .mixin import CreatedMixin
+from .mixin import CreatedMixin, SearchableMixin
 
 
 class ActivityLog(db.Model, CreatedMixin):
@@ -29,7 +29,14 @@ class ActivityLog(db.Model, CreatedMixin):
             # entry. We use the json serialization in order to ensure that
             # we are super save in storing it to the database - without any
             # further serialization issues.
-            data = json.loads(json.dumps(entity.to_search_entry(), default=str))
+            entry = None
+            if isinstance(entity, SearchableMixin) and entity.id is not None:
+                # This loads the relationships for the entry with some
+                # queries at once (and not one by one).
+                entry = type(entity).build_search_entries([entity.id]).get(entity.id)
+            if entry is None:
+                entry = entity.to_search_entry()
+            data = json.loads(json.dumps(entry, default=str))
         return cls(
             created_by_id=user.id,
             description=description,
@@ -20,6 +20,7 @@ from .mixin import (
     AuditMixin,
     BeforeCommitValidatableMixin,
     SearchableMixin,
+    text_search_vector,
 )
 
 
@@ -46,6 +47,59 @@ class Configuration(
     site = db.relationship("Site", backref="configurations")
     keywords = db.Column(MutableList.as_mutable(db.ARRAY(db.String)), nullable=True)
 
+    search_entry_relationships = [
+        "configuration_contact_roles.contact",
+        "configuration_attachments",
+        "generic_configuration_actions",
+        "configuration_static_location_begin_actions",
+        "configuration_dynamic_location_begin_actions",
+        "platform_mount_actions.platform",
+        "device_mount_actions.device",
+        "configuration_customfields",
+        "configuration_parameters",
+    ]
+    search_facet_fields = [
+        "project",
+        "campaign",
+        "status",
+        "cfg_permission_group",
+        "keywords",
+    ]
+    search_label_fields = ["label"]
+    # The coordinates of the static locations.
+    search_geo_fields = ["locations"]
+    # The columns for the full text search in the database
+    # (if we don't use the elasticsearch).
+    text_search_columns = [
+        "label",
+        "project",
+        "campaign",
+        "description",
+        "status",
+        "persistent_identifier",
+    ]
+    search_vector = text_search_vector(text_search_columns)
+
+    __table_args__ = (
+        db.Index(
+            "ix_configuration_search_vector", "search_vector", postgresql_using="gin"
+        ),
+    )
+
+    @classmethod
+    def geo_filter_sql(cls, geo_filter):
+        """Return the sql condition for a geo filter on the static locations."""
+        from .configuration_location_actions import (
+            ConfigurationStaticLocationBeginAction,
+        )
+
+        return cls.configuration_static_location_begin_actions.any(
+            db.and_(
+                ConfigurationStaticLocationBeginAction.has_wgs84_point(),
+                geo_filter.to_sql(ConfigurationStaticLocationBeginAction.point()),
+            )
+        )
+
     def validate(self):
         """
         Validate the model.
@@ -87,6 +141,11 @@ class Configuration(
                 s.to_search_entry()
                 for s in self.configuration_static_location_begin_actions
             ],
+            "locations": [
+                s.to_geo_point()
+                for s in self.configuration_static_location_begin_actions
+                if s.to_geo_point() is not None
+            ],
             "configuration_dynamic_location_actions": [
                 d.to_search_entry()
                 for d in self.configuration_dynamic_location_begin_actions
@@ -230,6 +289,9 @@ class Configuration(
                             "label": type_keyword_and_full_searchable,
                         },
                     },
+                    # Invalid coordinates should not block the indexing of
+                    # the configuration.
+                    "locations": {"type": "geo_point", "ignore_malformed": True},
                     "configuration_dynamic_location_actions": {
                         "properties": {
                             "begin_description": type_text_full_searchable,
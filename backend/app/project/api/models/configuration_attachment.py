@@ -47,9 +47,7 @@ class ConfigurationAttachment(db.Model, IndirectSearchableMixin, AuditMixin):
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent search entity."""
-        return [self.configuration]
+    search_parent_relationships = ["configuration"]
 
     def get_parent(self):
         """Return parent object."""
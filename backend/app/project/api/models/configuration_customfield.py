@@ -37,9 +37,7 @@ class ConfigurationCustomField(db.Model, IndirectSearchableMixin):
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent entity."""
-        return [self.configuration]
+    search_parent_relationships = ["configuration"]
 
     def get_parent(self):
         """Return parent object."""
@@ -9,11 +9,22 @@
 """Location actions for configurations."""
 
 from .base_model import db
-from .mixin import AuditMixin, IndirectSearchableMixin
+from .mixin import (
+    AuditMixin,
+    ConfigurationTimelineMixin,
+    IndirectSearchableMixin,
+    PeriodMixin,
+    period_exclusion_constraint,
+    period_index,
+)
 
 
 class ConfigurationStaticLocationBeginAction(
-    db.Model, AuditMixin, IndirectSearchableMixin
+    db.Model,
+    AuditMixin,
+    ConfigurationTimelineMixin,
+    IndirectSearchableMixin,
+    PeriodMixin,
 ):
     """
     Static location for a configuration.
@@ -63,9 +74,62 @@ class ConfigurationStaticLocationBeginAction(
         backref=db.backref("configuration_static_location_end_actions"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent search entity."""
-        return [self.configuration]
+    __table_args__ = (
+        # For the geo filters without the elasticsearch.
+        db.Index(
+            "ix_configuration_static_location_point",
+            db.func.ST_MakePoint(x, y),
+            postgresql_using="gist",
+        ),
+        db.Index(
+            "ix_configuration_static_location_geography",
+            db.func.geography(db.func.ST_MakePoint(x, y)),
+            postgresql_using="gist",
+        ),
+        # For the checks of the locations & the mounts.
+        db.Index(
+            "ix_configuration_static_location_configuration_id",
+            configuration_id,
+            begin_date,
+        ),
+        period_index("ix_configuration_static_location_period", begin_date, end_date),
+        # Only one location at the same time for a configuration.
+        period_exclusion_constraint(
+            "ex_configuration_static_location_configuration_id_period",
+            configuration_id,
+            begin_date,
+            end_date,
+        ),
+    )
+
+    @classmethod
+    def point(cls):
+        """Return the sql expression for the point of the location."""
+        return db.func.ST_MakePoint(cls.x, cls.y)
+
+    @classmethod
+    def has_wgs84_point(cls):
+        """Return the sql condition for locations with longitude & latitude."""
+        return db.and_(
+            cls.x.isnot(None),
+            cls.y.isnot(None),
+            db.func.coalesce(cls.epsg_code, "4326") == "4326",
+        )
+
+    def to_geo_point(self):
+        """Return the location as geo point for the search index (or None)."""
+        if self.x is None or self.y is None:
+            return None
+        if self.epsg_code not in [None, "4326"]:
+            # The search index works with longitude & latitude only.
+            return None
+        return {"lat": self.y, "lon": self.x}
+
+    search_parent_relationships = ["configuration"]
+    timeline_attributes = [
+        *ConfigurationTimelineMixin.timeline_attributes,
+        "label",
+    ]
 
     def to_search_entry(self):
         """Return a dict with search information."""
@@ -81,7 +145,11 @@ class ConfigurationStaticLocationBeginAction(
 
 
 class ConfigurationDynamicLocationBeginAction(
-    db.Model, AuditMixin, IndirectSearchableMixin
+    db.Model,
+    AuditMixin,
+    ConfigurationTimelineMixin,
+    IndirectSearchableMixin,
+    PeriodMixin,
 ):
     """
     Dynamic location for a configuration.
@@ -155,6 +223,23 @@ class ConfigurationDynamicLocationBeginAction(
         backref=db.backref("configuration_dynamic_location_end_actions"),
     )
 
+    __table_args__ = (
+        # For the checks of the locations & the mounts.
+        db.Index(
+            "ix_configuration_dynamic_location_configuration_id",
+            configuration_id,
+            begin_date,
+        ),
+        period_index("ix_configuration_dynamic_location_period", begin_date, end_date),
+        # Only one location at the same time for a configuration.
+        period_exclusion_constraint(
+            "ex_configuration_dynamic_location_configuration_id_period",
+            configuration_id,
+            begin_date,
+            end_date,
+        ),
+    )
+
     def to_search_entry(self):
         """Return a dict with search information."""
         return {
@@ -164,9 +249,11 @@ class ConfigurationDynamicLocationBeginAction(
             "label": self.label,
         }
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent search entity."""
-        return [self.configuration]
+    search_parent_relationships = ["configuration"]
+    timeline_attributes = [
+        *ConfigurationTimelineMixin.timeline_attributes,
+        "label",
+    ]
 
     def get_parent(self):
         """Return parent object."""
@@ -41,6 +41,4 @@ class ConfigurationParameter(db.Model, IndirectSearchableMixin, AuditMixin):
             "unit_name": self.unit_name,
         }
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent search entity."""
-        return [self.configuration]
+    search_parent_relationships = ["configuration"]
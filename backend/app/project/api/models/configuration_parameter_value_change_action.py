@@ -40,6 +40,4 @@ class ConfigurationParameterValueChangeAction(
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent search entity."""
-        return [self.configuration_parameter.configuration]
+    search_parent_relationships = ["configuration_parameter.configuration"]
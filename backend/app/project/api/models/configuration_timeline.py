@@ -0,0 +1,430 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Models for the precomputed timelines of the configurations."""
+
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.postgresql import TSTZRANGE, ExcludeConstraint
+from sqlalchemy.sql import text
+
+from .base_model import db
+
+
+class ConfigurationTimelineEvent(db.Model):
+    """
+    Change of the mounts or the locations of a configuration.
+
+    Those entries are derived from the mount & location actions.
+    We update the ones of an action in the very same transaction
+    in that the action changes (see ConfigurationTimelineMixin).
+    """
+
+    DEVICE_MOUNT = "device_mount"
+    DEVICE_UNMOUNT = "device_unmount"
+    PLATFORM_MOUNT = "platform_mount"
+    PLATFORM_UNMOUNT = "platform_unmount"
+    STATIC_LOCATION_BEGIN = "configuration_static_location_begin"
+    STATIC_LOCATION_END = "configuration_static_location_end"
+    DYNAMIC_LOCATION_BEGIN = "configuration_dynamic_location_begin"
+    DYNAMIC_LOCATION_END = "configuration_dynamic_location_end"
+
+    MOUNT_TYPES = [DEVICE_MOUNT, DEVICE_UNMOUNT, PLATFORM_MOUNT, PLATFORM_UNMOUNT]
+    LOCATION_TYPES = [
+        STATIC_LOCATION_BEGIN,
+        STATIC_LOCATION_END,
+        DYNAMIC_LOCATION_BEGIN,
+        DYNAMIC_LOCATION_END,
+    ]
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    configuration_id = db.Column(
+        db.Integer,
+        db.ForeignKey("configuration.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    timepoint = db.Column(db.DateTime(timezone=True), nullable=False)
+    type = db.Column(db.String(256), nullable=False)
+    action_id = db.Column(db.Integer, nullable=False)
+    # The id of the device or platform for the mount events.
+    entity_id = db.Column(db.Integer, nullable=True)
+    # The label for the location events.
+    label = db.Column(db.String(256), nullable=True)
+
+    __table_args__ = (
+        db.Index(
+            "ix_configuration_timeline_event_configuration_id",
+            configuration_id,
+            timepoint,
+        ),
+    )
+
+
+class ConfigurationTimelineSegment(db.Model):
+    """
+    State of a configuration between two events - or right at one.
+
+    We have segments for every single timepoint of the events (as
+    the mounts & locations include their end dates there) and for the
+    time between two of those timepoints. The last segment never ends.
+
+    The exclusion constraint ensures that the segments don't overlap,
+    and its gist index serves the lookup of the state at a timepoint.
+    """
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    configuration_id = db.Column(
+        db.Integer,
+        db.ForeignKey("configuration.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    period = db.Column(TSTZRANGE, nullable=False)
+    device_mount_action_ids = db.Column(db.ARRAY(db.Integer), nullable=False)
+    platform_mount_action_ids = db.Column(db.ARRAY(db.Integer), nullable=False)
+    static_location_action_ids = db.Column(db.ARRAY(db.Integer), nullable=False)
+    dynamic_location_action_ids = db.Column(db.ARRAY(db.Integer), nullable=False)
+
+    __table_args__ = (
+        ExcludeConstraint(
+            (configuration_id, "="),
+            (period, "&&"),
+            name="ex_configuration_timeline_segment_configuration_id_period",
+            using="gist",
+        ),
+    )
+
+    @classmethod
+    def period_contains(cls, timepoint):
+        """Return the sql condition for the segment that includes the timepoint."""
+        return cls.period.op("@>")(db.cast(timepoint, db.DateTime(timezone=True)))
+
+
+# The exclusion constraint alone would let a parallel transaction fail
+# when both touch the same segments - and the segments of one of them
+# could be computed from a stale state of the events.
+# So we serialize the updates of the timeline of a configuration.
+# With read committed every later statement of the transaction then
+# sees the changes of the transaction that had the lock before.
+# "no key update" doesn't block the inserts of new actions (their
+# foreign keys only need a "key share" lock on the configuration).
+LOCK_CONFIGURATIONS = text(
+    "select id from configuration where id in :configuration_ids "
+    + "order by id for no key update"
+).bindparams(bindparam("configuration_ids", expanding=True))
+
+DELETE_EVENTS = text(
+    "delete from configuration_timeline_event "
+    + "where configuration_id in :configuration_ids"
+).bindparams(bindparam("configuration_ids", expanding=True))
+
+# The event types for the actions of the different tables.
+ACTION_EVENT_TYPES = {
+    "device_mount_action": [
+        ConfigurationTimelineEvent.DEVICE_MOUNT,
+        ConfigurationTimelineEvent.DEVICE_UNMOUNT,
+    ],
+    "platform_mount_action": [
+        ConfigurationTimelineEvent.PLATFORM_MOUNT,
+        ConfigurationTimelineEvent.PLATFORM_UNMOUNT,
+    ],
+    "configuration_static_location_begin_action": [
+        ConfigurationTimelineEvent.STATIC_LOCATION_BEGIN,
+        ConfigurationTimelineEvent.STATIC_LOCATION_END,
+    ],
+    "configuration_dynamic_location_begin_action": [
+        ConfigurationTimelineEvent.DYNAMIC_LOCATION_BEGIN,
+        ConfigurationTimelineEvent.DYNAMIC_LOCATION_END,
+    ],
+}
+
+# All the events of the actions - with the action table, so that
+# we can filter them for the changed actions.
+EVENTS = """
+    select configuration_id, begin_date as timepoint,
+        'device_mount' as type, id as action_id, device_id as entity_id,
+        cast(null as varchar) as label, 1 as rank,
+        'device_mount_action' as action_table
+    from device_mount_action
+    union all
+    select configuration_id, end_date, 'device_unmount', id, device_id,
+        null, 2, 'device_mount_action'
+    from device_mount_action where end_date is not null
+    union all
+    select configuration_id, begin_date, 'platform_mount', id, platform_id,
+        null, 3, 'platform_mount_action'
+    from platform_mount_action
+    union all
+    select configuration_id, end_date, 'platform_unmount', id, platform_id,
+        null, 4, 'platform_mount_action'
+    from platform_mount_action where end_date is not null
+    union all
+    select configuration_id, begin_date,
+        'configuration_static_location_begin', id, null, label, 5,
+        'configuration_static_location_begin_action'
+    from configuration_static_location_begin_action
+    union all
+    select configuration_id, end_date,
+        'configuration_static_location_end', id, null, label, 6,
+        'configuration_static_location_begin_action'
+    from configuration_static_location_begin_action
+    where end_date is not null
+    union all
+    select configuration_id, begin_date,
+        'configuration_dynamic_location_begin', id, null, label, 7,
+        'configuration_dynamic_location_begin_action'
+    from configuration_dynamic_location_begin_action
+    union all
+    select configuration_id, end_date,
+        'configuration_dynamic_location_end', id, null, label, 8,
+        'configuration_dynamic_location_begin_action'
+    from configuration_dynamic_location_begin_action
+    where end_date is not null
+"""
+
+# The events sorted by timepoint, devices before platforms & mounts
+# before unmounts (like the timepoint controllers did it before).
+INSERT_EVENTS = text(
+    f"""
+    insert into configuration_timeline_event
+        (configuration_id, timepoint, type, action_id, entity_id, label)
+    select configuration_id, timepoint, type, action_id, entity_id, label
+    from ({EVENTS}) events
+    where configuration_id in :configuration_ids
+    order by configuration_id, timepoint, rank, action_id
+    """
+).bindparams(bindparam("configuration_ids", expanding=True))
+
+INSERT_ACTION_EVENTS = text(
+    f"""
+    insert into configuration_timeline_event
+        (configuration_id, timepoint, type, action_id, entity_id, label)
+    select configuration_id, timepoint, type, action_id, entity_id, label
+    from ({EVENTS}) events
+    where (
+        action_table = 'device_mount_action'
+        and action_id in :device_mount_action
+    ) or (
+        action_table = 'platform_mount_action'
+        and action_id in :platform_mount_action
+    ) or (
+        action_table = 'configuration_static_location_begin_action'
+        and action_id in :configuration_static_location_begin_action
+    ) or (
+        action_table = 'configuration_dynamic_location_begin_action'
+        and action_id in :configuration_dynamic_location_begin_action
+    )
+    order by configuration_id, timepoint, rank, action_id
+    """
+).bindparams(
+    *[bindparam(action_table, expanding=True) for action_table in ACTION_EVENT_TYPES]
+)
+
+# The part of the timeline that we must recompute for the period of
+# the changes: From the last timepoint before the period to the next
+# timepoint after it (both excluded).
+# As all the changed events are within the period, those outer
+# timepoints are the same before & after the changes - so the
+# segments outside stay valid and the ones inside are replaced
+# completely (also when we split or merge them at new or removed
+# timepoints).
+# An empty begin or end of the period means that it is unbounded.
+REGIONS = """
+    periods as (
+        select configuration_id, begin_date, end_date
+        from unnest(
+            cast(:configuration_ids as integer[]),
+            cast(:begin_dates as timestamptz[]),
+            cast(:end_dates as timestamptz[])
+        ) as p(configuration_id, begin_date, end_date)
+    ), regions as (
+        select p.configuration_id, tstzrange(
+            (
+                select max(e.timepoint) from configuration_timeline_event e
+                where e.configuration_id = p.configuration_id
+                and e.timepoint < p.begin_date
+            ),
+            (
+                select min(e.timepoint) from configuration_timeline_event e
+                where e.configuration_id = p.configuration_id
+                and e.timepoint > p.end_date
+            ),
+            '()'
+        ) as region
+        from periods p
+    )
+"""
+
+DELETE_SEGMENTS = text(
+    f"""
+    with {REGIONS}
+    delete from configuration_timeline_segment s
+    using regions r
+    where s.configuration_id = r.configuration_id
+    and r.region @> s.period
+    """
+)
+
+# One segment for every timepoint & one for the time between two
+# of them. The actions include both their begin & end dates - same
+# as the period_contains condition of the PeriodMixin.
+INSERT_SEGMENTS = text(
+    f"""
+    insert into configuration_timeline_segment (
+        configuration_id,
+        period,
+        device_mount_action_ids,
+        platform_mount_action_ids,
+        static_location_action_ids,
+        dynamic_location_action_ids
+    )
+    with {REGIONS}, timepoints as (
+        select r.configuration_id, r.region, e.timepoint,
+            lead(e.timepoint) over (
+                partition by r.configuration_id order by e.timepoint
+            ) as next_timepoint
+        from regions r, lateral (
+            select distinct timepoint
+            from configuration_timeline_event
+            where configuration_id = r.configuration_id
+            and tstzrange(lower(r.region), upper(r.region), '[]') @> timepoint
+        ) e
+    ), segments as (
+        select configuration_id, region,
+            tstzrange(timepoint, timepoint, '[]') as period
+        from timepoints
+        union all
+        select configuration_id, region,
+            tstzrange(timepoint, next_timepoint, '()')
+        from timepoints
+    )
+    select
+        s.configuration_id,
+        s.period,
+        array(
+            select a.id from device_mount_action a
+            where a.configuration_id = s.configuration_id
+            and tstzrange(a.begin_date, a.end_date, '[]') @> s.period
+            order by a.id
+        ),
+        array(
+            select a.id from platform_mount_action a
+            where a.configuration_id = s.configuration_id
+            and tstzrange(a.begin_date, a.end_date, '[]') @> s.period
+            order by a.id
+        ),
+        array(
+            select a.id from configuration_static_location_begin_action a
+            where a.configuration_id = s.configuration_id
+            and tstzrange(a.begin_date, a.end_date, '[]') @> s.period
+            order by a.id
+        ),
+        array(
+            select a.id from configuration_dynamic_location_begin_action a
+            where a.configuration_id = s.configuration_id
+            and tstzrange(a.begin_date, a.end_date, '[]') @> s.period
+            order by a.id
+        )
+    from segments s
+    where s.region @> s.period
+    """
+)
+
+
+def update_configuration_timeline_segments(connection, periods):
+    """
+    Recompute the segments of the configurations within the periods.
+
+    The periods are a dict with the configuration ids as keys & the
+    (begin_date, end_date) tuples as values. The events must be up
+    to date already.
+    """
+    configuration_ids = sorted(periods.keys())
+    parameters = {
+        "configuration_ids": configuration_ids,
+        "begin_dates": [periods[x][0] for x in configuration_ids],
+        "end_dates": [periods[x][1] for x in configuration_ids],
+    }
+    connection.execute(DELETE_SEGMENTS, parameters)
+    connection.execute(INSERT_SEGMENTS, parameters)
+
+
+def rebuild_configuration_timelines(connection, configuration_ids):
+    """
+    Rebuild the events & segments for the configurations completely.
+
+    All of it runs in the database - with a fixed number of statements
+    for all of the configurations.
+    """
+    if not configuration_ids:
+        return
+    parameters = {"configuration_ids": sorted(configuration_ids)}
+    connection.execute(LOCK_CONFIGURATIONS, parameters)
+    connection.execute(DELETE_EVENTS, parameters)
+    connection.execute(INSERT_EVENTS, parameters)
+    update_configuration_timeline_segments(
+        connection, {x: (None, None) for x in configuration_ids}
+    )
+
+
+class ConfigurationTimelineChanges:
+    """
+    Changed actions & the periods of the timelines that they touch.
+
+    We add the actions with their old values (before the flush) and
+    with their new ones (after it). Then we update the events of those
+    actions & the segments in the periods only - so that the costs
+    don't grow with the length of the timelines.
+    """
+
+    def __init__(self):
+        """Init the object without changes."""
+        self.action_ids = {action_table: set() for action_table in ACTION_EVENT_TYPES}
+        self.periods = {}
+
+    def add(self, action_table, action_id, configuration_id, begin_date, end_date):
+        """Add the action with the configuration & the dates that it has."""
+        self.action_ids[action_table].add(action_id)
+        if configuration_id is None or begin_date is None:
+            return
+        if configuration_id not in self.periods:
+            self.periods[configuration_id] = (begin_date, end_date)
+            return
+        old_begin_date, old_end_date = self.periods[configuration_id]
+        if old_end_date is None or end_date is None:
+            new_end_date = None
+        else:
+            new_end_date = max(old_end_date, end_date)
+        self.periods[configuration_id] = (min(old_begin_date, begin_date), new_end_date)
+
+    def apply(self, connection):
+        """Update the events & segments for the changes."""
+        if not self.periods:
+            return
+        connection.execute(
+            LOCK_CONFIGURATIONS, {"configuration_ids": sorted(self.periods.keys())}
+        )
+        event_table = ConfigurationTimelineEvent.__table__
+        connection.execute(
+            event_table.delete().where(
+                db.or_(
+                    *[
+                        db.and_(
+                            event_table.c.type.in_(ACTION_EVENT_TYPES[action_table]),
+                            event_table.c.action_id.in_(sorted(action_ids)),
+                        )
+                        for action_table, action_ids in self.action_ids.items()
+                        if action_ids
+                    ]
+                )
+            )
+        )
+        connection.execute(
+            INSERT_ACTION_EVENTS,
+            {
+                action_table: sorted(action_ids)
+                for action_table, action_ids in self.action_ids.items()
+            },
+        )
+        update_configuration_timeline_segments(connection, self.periods)
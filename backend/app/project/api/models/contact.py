@@ -9,7 +9,13 @@
 """Model for contacts & reference tables."""
 
 from ..es_utils import ElasticSearchIndexTypes, settings_with_ngrams
-from ..models.mixin import AuditMixin, IndirectSearchableMixin, SearchableMixin
+from ..models.mixin import (
+    AuditMixin,
+    IndirectSearchableMixin,
+    SearchableMixin,
+    text_search_vector,
+)
+from ..search import PartialSearchUpdate
 from .base_model import db
 
 platform_contacts = db.Table(
@@ -81,6 +87,31 @@ class Contact(db.Model, AuditMixin, SearchableMixin, IndirectSearchableMixin):
         backref=db.backref("contacts", lazy=True),
     )
 
+    search_facet_fields = ["organization", "country", "city"]
+    search_label_fields = ["given_name", "family_name", "email"]
+    # The columns for the full text search in the database
+    # (if we don't use the elasticsearch).
+    text_search_columns = [
+        "given_name",
+        "family_name",
+        "email",
+        "organization",
+        "orcid",
+        "street",
+        "street_number",
+        "city",
+        "zip_code",
+        "administrative_area",
+        "country",
+        "building",
+        "room",
+    ]
+    search_vector = text_search_vector(text_search_columns)
+
+    __table_args__ = (
+        db.Index("ix_contact_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     def to_search_entry(self):
         """Transform the model to an entry to store in the full text search."""
         # to be included in platforms, devices, etc.
@@ -161,27 +192,29 @@ class Contact(db.Model, AuditMixin, SearchableMixin, IndirectSearchableMixin):
             ),
         }
 
-    def get_parent_search_entities(self):
-        """Return a list with all the devices, platforms & configurations."""
-        # We collect here all the devices, platforms & configurations with that
-        # the contact is associated.
-        # So that we can update their search index information once we
-        # update the contact here (so we have contact information in the
-        # search index for a device).
-        # We don't refer to the contact roles, as they are part of the index
-        # for the device/platform/configuration.
+    # The contact is part of the entries of all the entities with
+    # that it is associated (over the contact roles).
+    search_parent_relationships = [
+        "contact_device_roles.device",
+        "contact_platform_roles.platform",
+        "contact_configuration_roles.configuration",
+        "contact_site_roles.site",
+    ]
+
+    def get_partial_search_updates(self):
+        """Replace the contact in the contact roles of the parents."""
+        entry = self.to_search_entry()
         result = []
-        for device_contact_role in self.contact_device_roles:
-            device = device_contact_role.device
-            result.append(device)
-        for platform_contact_role in self.contact_platform_roles:
-            platform = platform_contact_role.platform
-            result.append(platform)
-        for configuration_contact_role in self.contact_configuration_roles:
-            configuration = configuration_contact_role.configuration
-            result.append(configuration)
-        for site_contact_role in self.contact_site_roles:
-            site = site_contact_role.site
-            result.append(site)
-
+        for index_name in ["device", "platform", "configuration", "site"]:
+            field = f"{index_name}_contact_roles"
+            not_nested_field = f"{field}_not_nested"
+            result.append(
+                PartialSearchUpdate(
+                    index=index_name,
+                    query={"term": {f"{not_nested_field}.contact.id": self.id}},
+                    paths=[(field, "contact"), (not_nested_field, "contact")],
+                    id=self.id,
+                    entry=entry,
+                )
+            )
         return result
@@ -53,9 +53,7 @@ class DeviceContactRole(db.Model, Role, IndirectSearchableMixin):
         db.UniqueConstraint("contact_id", "device_id", "role_name", "role_uri"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the device."""
-        return [self.device]
+    search_parent_relationships = ["device"]
 
     def get_parent(self):
         """Return the parent object (for permission management)."""
@@ -79,9 +77,7 @@ class PlatformContactRole(db.Model, Role, IndirectSearchableMixin):
         db.UniqueConstraint("contact_id", "platform_id", "role_name", "role_uri"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the platform."""
-        return [self.platform]
+    search_parent_relationships = ["platform"]
 
     def get_parent(self):
         """Return the parent object (for permission management)."""
@@ -108,9 +104,7 @@ class ConfigurationContactRole(db.Model, Role, IndirectSearchableMixin):
         db.UniqueConstraint("contact_id", "configuration_id", "role_name", "role_uri"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the configuration."""
-        return [self.configuration]
+    search_parent_relationships = ["configuration"]
 
     def get_parent(self):
         """Return the parent object (for permission management)."""
@@ -133,9 +127,7 @@ class SiteContactRole(db.Model, Role, IndirectSearchableMixin):
         db.UniqueConstraint("contact_id", "site_id", "role_name", "role_uri"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the site."""
-        return [self.site]
+    search_parent_relationships = ["site"]
 
     def get_parent(self):
         """Return the parent object (for permission management)."""
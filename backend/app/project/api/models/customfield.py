@@ -36,9 +36,7 @@ class CustomField(db.Model, IndirectSearchableMixin):
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the device as parent entity."""
-        return [self.device]
+    search_parent_relationships = ["device"]
 
     def get_parent(self):
         """Return parent object."""
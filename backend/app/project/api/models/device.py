@@ -19,7 +19,9 @@ from ..models.mixin import (
     IndirectSearchableMixin,
     PermissionMixin,
     SearchableMixin,
+    text_search_vector,
 )
+from ..search import PartialSearchUpdate
 from .base_model import db
 
 
@@ -54,9 +56,49 @@ class Device(
     country = db.Column(db.String(256), nullable=True)
     has_system_generated_serial_number = db.Column(db.Boolean, default=False)
 
+    search_entry_relationships = [
+        "device_attachments",
+        "device_contact_roles.contact",
+        "device_properties",
+        "customfields",
+        "generic_device_actions",
+        "device_software_update_actions",
+        "device_parameters.device_parameter_value_change_actions",
+    ]
+    search_facet_fields = [
+        "manufacturer_name",
+        "device_type_name",
+        "status_name",
+        "group_ids",
+        "keywords",
+        "country",
+    ]
+    search_label_fields = ["short_name", "long_name"]
+    # The columns for the full text search in the database
+    # (if we don't use the elasticsearch).
+    text_search_columns = [
+        "short_name",
+        "long_name",
+        "description",
+        "serial_number",
+        "manufacturer_name",
+        "model",
+        "inventory_number",
+        "persistent_identifier",
+        "device_type_name",
+        "status_name",
+        "country",
+    ]
+    search_vector = text_search_vector(text_search_columns)
+
+    __table_args__ = (
+        db.Index("ix_device_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     def to_search_entry(self, include_relationships=True):
         """Convert the model to an dict to store in the full text search."""
         result = {
+            "id": self.id,
             "short_name": self.short_name,
             "long_name": self.long_name,
             "description": self.description,
@@ -110,17 +152,20 @@ class Device(
 
         return result
 
-    def get_parent_search_entities(self):
-        """Get the parents where this here is included in the search index."""
-        # This here should only affect configurations - as their search
-        # index entry includes the device.
-        result = []
-        # We only need to check the device mount actions for associated
-        # configurations - as there should be no unmount before an earlier
-        # mount action.
-        for action in self.device_mount_actions:
-            result.append(action.configuration)
-        return result
+    # The search index entries of the configurations include the device.
+    search_parent_relationships = ["device_mount_actions.configuration"]
+
+    def get_partial_search_updates(self):
+        """Replace the device in the mount actions of the configurations."""
+        return [
+            PartialSearchUpdate(
+                index="configuration",
+                query={"term": {"device_mount_actions.device.id": self.id}},
+                paths=[("device_mount_actions", "device")],
+                id=self.id,
+                entry=self.to_search_entry(include_relationships=False),
+            )
+        ]
 
     @staticmethod
     def get_search_index_properties():
@@ -138,6 +183,10 @@ class Device(
         )
 
         return {
+            # The id is needed to update the device in the configurations in place.
+            "id": {
+                "type": "integer",
+            },
             # We won't check the very equal description, so using text right away is fine.
             "description": type_text_full_searchable,
             # We may filter by long_name (keyword), but we also want to search all of its parts.
@@ -238,6 +287,10 @@ class Device(
             },
             "properties": {
                 "properties": {
+                    # The id is needed to update the property in place.
+                    "id": {
+                        "type": "integer",
+                    },
                     # All the "normal" text fields searchable via text & keyword.
                     "label": type_keyword_and_full_searchable,
                     "unit_name": type_keyword_and_full_searchable,
@@ -43,9 +43,7 @@ class DeviceAttachment(db.Model, IndirectSearchableMixin, AuditMixin):
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the device as parent search entity."""
-        return [self.device]
+    search_parent_relationships = ["device"]
 
     def get_parent(self):
         """Return parent object."""
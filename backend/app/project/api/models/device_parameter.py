@@ -42,6 +42,4 @@ class DeviceParameter(db.Model, IndirectSearchableMixin, AuditMixin):
             ],
         }
 
-    def get_parent_search_entities(self):
-        """Return the device as parent search entity."""
-        return [self.device]
+    search_parent_relationships = ["device"]
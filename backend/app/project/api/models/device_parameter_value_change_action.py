@@ -38,6 +38,4 @@ class DeviceParameterValueChangeAction(db.Model, AuditMixin, IndirectSearchableM
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the device as parent search entity."""
-        return [self.device_parameter.device]
+    search_parent_relationships = ["device_parameter.device"]
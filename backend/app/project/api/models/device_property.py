@@ -11,8 +11,9 @@
 
 
 from ..models.device import Device
+from ..search import PartialSearchUpdate
 from .base_model import db
-from .mixin import AuditMixin, IndirectSearchableMixin
+from .mixin import AuditMixin, IndirectSearchableMixin, has_changed_attributes
 
 
 class DeviceProperty(db.Model, IndirectSearchableMixin, AuditMixin):
@@ -54,6 +55,7 @@ class DeviceProperty(db.Model, IndirectSearchableMixin, AuditMixin):
         """Convert the model to a dict to store it in the full text search."""
         # to be included in devices
         return {
+            "id": self.id,
             "label": self.label,
             "unit_name": self.unit_name,
             "unit_uri": self.unit_uri,
@@ -72,9 +74,22 @@ class DeviceProperty(db.Model, IndirectSearchableMixin, AuditMixin):
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the device as parent search entity."""
-        return [self.device]
+    search_parent_relationships = ["device"]
+
+    def get_partial_search_updates(self):
+        """Replace the property in the entry of the device."""
+        # If the property moved to another device, we rebuild the entries.
+        if has_changed_attributes(self, "device_id", "device"):
+            return None
+        return [
+            PartialSearchUpdate(
+                index="device",
+                query={"ids": {"values": [self.device_id]}},
+                paths=[("properties", None)],
+                id=self.id,
+                entry=self.to_search_entry(),
+            )
+        ]
 
     def get_parent(self):
         """Return parent object."""
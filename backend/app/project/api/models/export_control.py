@@ -34,6 +34,4 @@ class ExportControl(db.Model, AuditMixin, IndirectSearchableMixin):
         ),
     )
 
-    def get_parent_search_entities(self):
-        """Return the device as parent search entity."""
-        return [self.manufacturer_model]
+    search_parent_relationships = ["manufacturer_model"]
@@ -35,10 +35,7 @@ class GenericPlatformAction(db.Model, AuditMixin, IndirectSearchableMixin):
         backref=db.backref("generic_platform_actions"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the platform as parent."""
-        # We won't search for the contact of this action, so we skip it here.
-        return [self.platform]
+    search_parent_relationships = ["platform"]
 
     def to_search_entry(self):
         """Return a dict with the search fields."""
@@ -81,10 +78,7 @@ class GenericDeviceAction(db.Model, AuditMixin, IndirectSearchableMixin):
         ),
     )
 
-    def get_parent_search_entities(self):
-        """Return the device as parent."""
-        # We won't search for the contact of this action, so we skip it here.
-        return [self.device]
+    search_parent_relationships = ["device"]
 
     def to_search_entry(self):
         """Return a dict with the search fields."""
@@ -126,10 +120,7 @@ class GenericConfigurationAction(db.Model, AuditMixin, IndirectSearchableMixin):
         backref=db.backref("generic_configuration_actions"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent."""
-        # We won't search for the contact of this action, so we skip it here.
-        return [self.configuration]
+    search_parent_relationships = ["configuration"]
 
     def to_search_entry(self):
         """Return a dict with the search fields."""
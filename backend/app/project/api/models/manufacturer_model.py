@@ -26,6 +26,8 @@ class ManufacturerModel(db.Model, SearchableMixin):
     external_system_url = db.Column(db.String(256), nullable=True)
     created_at = db.Column(db.DateTime(timezone=True), default=utc_now)
 
+    search_entry_relationships = ["export_control"]
+
     def to_search_entry(self):
         """Convert the model to a dict to store in the full text search."""
         export_control = {}
@@ -9,24 +9,46 @@
 """Several mixin classes for our models."""
 
 import collections
+import dataclasses
 import itertools
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import sqlalchemy
+from flask import current_app
+from sqlalchemy.dialects.postgresql import TSVECTOR, ExcludeConstraint
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.mutable import MutableList
+from sqlalchemy.orm import deferred, selectinload
 from sqlalchemy.orm.base import object_state
 
-from ..helpers.errors import ConflictError
+from ..es_utils import IndexSettings
+from ..helpers.errors import ConflictError, ExclusionConstraintError
 from ..helpers.memorize import memorize
 from ..search import (
+    BulkAction,
     add_to_index,
+    bulk,
     create_index,
+    freeze_query,
+    get_search_cache,
+    is_search_circuit_open,
+    is_search_unavailable,
     query_index,
+    query_index_after,
+    query_index_sources,
+    query_index_with_facets,
+    refresh_index,
     remove_from_index,
     remove_index,
+    set_index_watermark,
+    switch_alias,
+    update_embedded_entries,
+    update_index_settings,
+    yield_index_ids,
 )
 from .base_model import db
+from .configuration_timeline import ConfigurationTimelineChanges
 
 
 def utc_now():
@@ -34,6 +56,49 @@ def utc_now():
     return datetime.now(timezone.utc)
 
 
+def use_search_outbox():
+    """
+    Return true if the search index should be updated via the outbox.
+
+    This is also the case if the circuit breaker for the elasticsearch
+    is open - so that we don't lose the changes.
+    """
+    if not current_app.elasticsearch:
+        return False
+    return (
+        current_app.config.get("ELASTICSEARCH_USE_OUTBOX", False)
+        or is_search_circuit_open()
+    )
+
+
+def get_indirect_search_update_debounce():
+    """
+    Return the seconds to debounce the updates for parents of indirect searchables.
+
+    0 means that we update them right away.
+    """
+    if not current_app.elasticsearch:
+        return 0
+    return current_app.config.get("ELASTICSEARCH_INDIRECT_UPDATE_DEBOUNCE", 0)
+
+
+def use_partial_search_updates():
+    """Return true if we can update the embedded entries of the parents only."""
+    return bool(current_app.elasticsearch) and current_app.config.get(
+        "ELASTICSEARCH_PARTIAL_UPDATES", False
+    )
+
+
+def get_searchable_models():
+    """Return a dict with the index names & the searchable model classes."""
+    result = {}
+    for mapper in db.Model.registry.mappers:
+        model = mapper.class_
+        if issubclass(model, SearchableMixin):
+            result[model.__tablename__] = model
+    return result
+
+
 def is_modified(instance):
     """Return true if the object was modified."""
     # This is based on parts of the session.is_modified method that sqlalchemy
@@ -47,6 +112,240 @@ def is_modified(instance):
     return state.modified
 
 
+def has_changed_attributes(instance, *names):
+    """Return true if one of the attributes was changed."""
+    state = object_state(instance)
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+
+def text_search_vector(column_names):
+    """
+    Return a generated tsvector column for the full text search in the database.
+
+    This is what we use if we don't have the elasticsearch. It covers
+    the columns of the table only (no related entities).
+    The column is deferred, so that we don't load it with the entities.
+    """
+    text = " || ' ' || ".join(f"coalesce({name}, '')" for name in column_names)
+    return deferred(
+        db.Column(
+            TSVECTOR,
+            db.Computed(f"to_tsvector('simple', {text})", persisted=True),
+        )
+    )
+
+
+def period_expression(begin_date, end_date):
+    """
+    Return the sql expression for the time range between begin & end date.
+
+    We include both bounds (and the range is open ended if there is no
+    end date). This way it is a superset of the ranges that overlap
+    according to the DateTimeRange - also for entries without duration.
+    """
+    return db.func.tstzrange(begin_date, end_date, db.literal_column("'[]'"))
+
+
+def period_index(name, begin_date, end_date):
+    """Return a GiST index for the time range between begin & end date."""
+    return db.Index(
+        name, period_expression(begin_date, end_date), postgresql_using="gist"
+    )
+
+
+def half_open_period_expression(begin_date, end_date):
+    """
+    Return the sql expression for the time range without the end date.
+
+    This is the overlap semantic of the DateTimeRange: One entry can
+    start right when the other one ends. Entries without duration
+    include their single timepoint.
+    """
+    bounds = db.case(
+        (begin_date == end_date, db.literal_column("'[]'")),
+        else_=db.literal_column("'[)'"),
+    )
+    return db.func.tstzrange(begin_date, end_date, bounds)
+
+
+# The names of the constraints that we create with the
+# period_exclusion_constraint function. Only their violations
+# are conflicts of the time ranges of the user input.
+PERIOD_EXCLUSION_CONSTRAINT_NAMES = set()
+
+
+def period_exclusion_constraint(name, column, begin_date, end_date):
+    """
+    Return a constraint that forbids overlapping time ranges per column value.
+
+    The gist index of the constraint also serves the overlap checks of
+    the validators.
+    """
+    PERIOD_EXCLUSION_CONSTRAINT_NAMES.add(name)
+    return ExcludeConstraint(
+        (column, "="),
+        (half_open_period_expression(begin_date, end_date), "&&"),
+        name=name,
+        using="gist",
+    )
+
+
+EXCLUSION_VIOLATION = "23P01"
+
+
+def raise_exclusion_constraint_error(context):
+    """
+    Raise a ConflictError if the statement violated a period exclusion constraint.
+
+    Violations of other constraints (like the one for the configuration
+    timeline segments) are no user errors, so we keep them as they are.
+    """
+    if getattr(context.original_exception, "pgcode", None) != EXCLUSION_VIOLATION:
+        return
+    constraint_name = context.original_exception.diag.constraint_name
+    if constraint_name not in PERIOD_EXCLUSION_CONSTRAINT_NAMES:
+        return
+    raise ExclusionConstraintError(
+        "The time range overlaps with an existing entry.",
+        constraint_name=constraint_name,
+    )
+
+
+db.event.listen(Engine, "handle_error", raise_exclusion_constraint_error)
+
+
+class PeriodMixin:
+    """
+    Mixin for entries with a begin_date & an (optional) end_date.
+
+    The sql conditions use the very same expressions as the period_index
+    and the period_exclusion_constraint.
+    """
+
+    @classmethod
+    def period(cls):
+        """Return the sql expression for the time range of the entries."""
+        return period_expression(cls.begin_date, cls.end_date)
+
+    @classmethod
+    def period_overlaps(cls, begin_date, end_date=None):
+        """Return the sql condition for entries that overlap the time range."""
+        return cls.period().op("&&")(period_expression(begin_date, end_date))
+
+    @classmethod
+    def period_contains(cls, timepoint):
+        """Return the sql condition for entries that include the timepoint."""
+        return cls.period().op("@>")(db.cast(timepoint, db.DateTime(timezone=True)))
+
+    @classmethod
+    def period_covers(cls, begin_date, end_date=None):
+        """Return the sql condition for entries that cover the whole time range."""
+        return cls.period().op("@>")(period_expression(begin_date, end_date))
+
+    @classmethod
+    def period_covered_by(cls, begin_date, end_date=None):
+        """Return the sql condition for entries that are within the time range."""
+        return period_expression(begin_date, end_date).op("@>")(cls.period())
+
+    @classmethod
+    def half_open_period_overlaps(cls, begin_date, end_date=None):
+        """Return the sql condition for entries that overlap like the DateTimeRange."""
+        return half_open_period_expression(cls.begin_date, cls.end_date).op("&&")(
+            half_open_period_expression(
+                db.literal(begin_date, db.DateTime(timezone=True)),
+                db.literal(end_date, db.DateTime(timezone=True)),
+            )
+        )
+
+
+class ConfigurationTimelineMixin:
+    """
+    Mixin for the actions that change the timeline of their configuration.
+
+    After every flush we update the precomputed timelines of the
+    configurations with changed actions - in the very same transaction.
+    We only touch the events of the changed actions & the segments
+    within their old & new periods.
+    """
+
+    # The attributes that end up in the events. Changes of the other
+    # attributes (like the descriptions) don't touch the timeline.
+    timeline_attributes = [
+        "configuration_id",
+        "configuration",
+        "begin_date",
+        "end_date",
+    ]
+
+    @staticmethod
+    def _changed_actions(session):
+        """Return the changed actions with changes for the timeline."""
+        # The history is still there in the after_flush, so we can
+        # check it in both hooks.
+        return [
+            obj
+            for obj in session.dirty
+            if isinstance(obj, ConfigurationTimelineMixin)
+            and has_changed_attributes(obj, *obj.timeline_attributes)
+        ]
+
+    @staticmethod
+    def _get_value_before_flush(obj, attribute):
+        """Return the value that the attribute had before the changes."""
+        history = sqlalchemy.inspect(obj).attrs[attribute].load_history()
+        if history.unchanged:
+            return history.unchanged[0]
+        if history.deleted:
+            return history.deleted[0]
+        # The attribute was None before.
+        return None
+
+    @classmethod
+    def before_flush(cls, session, flush_context, instances):
+        """Collect the old periods of the changed & deleted actions."""
+        # We must do this before the flush, as we can't load the
+        # attributes of deleted actions afterwards - and the history
+        # of the changed ones is gone.
+        changes = getattr(session, "_timeline_changes", None)
+        if changes is None:
+            changes = ConfigurationTimelineChanges()
+        for obj in itertools.chain(cls._changed_actions(session), session.deleted):
+            if not isinstance(obj, ConfigurationTimelineMixin):
+                continue
+            changes.add(
+                obj.__tablename__,
+                obj.id,
+                *[
+                    cls._get_value_before_flush(obj, attribute)
+                    for attribute in ["configuration_id", "begin_date", "end_date"]
+                ],
+            )
+        session._timeline_changes = changes
+
+    @classmethod
+    def after_flush(cls, session, flush_context):
+        """Update the timelines for the flushed actions."""
+        changes = getattr(session, "_timeline_changes", None)
+        session._timeline_changes = None
+        if changes is None:
+            changes = ConfigurationTimelineChanges()
+        # Now we also know the ids of the new actions.
+        for obj in itertools.chain(session.new, cls._changed_actions(session)):
+            if isinstance(obj, ConfigurationTimelineMixin):
+                changes.add(
+                    obj.__tablename__,
+                    obj.id,
+                    obj.configuration_id,
+                    obj.begin_date,
+                    obj.end_date,
+                )
+        changes.apply(session.connection())
+
+
+db.event.listen(db.session, "before_flush", ConfigurationTimelineMixin.before_flush)
+db.event.listen(db.session, "after_flush", ConfigurationTimelineMixin.after_flush)
+
+
 class CreatedMixin:
     """Mixin to store data about the creation."""
 
@@ -117,6 +416,12 @@ class IndirectSearchableMixin:
     This is what this IndirectSearchableMixin should be used for.
     """
 
+    # The relationship paths to the "parent" search entities (like
+    # "device_parameter.device"). They are the single source for
+    # get_parent_search_entities & the incremental reindex (that finds
+    # the parents for lots of entities with one query).
+    search_parent_relationships = []
+
     def get_parent_search_entities(self):
         """
         Return the list of "parent" search entities.
@@ -129,11 +434,35 @@ class IndirectSearchableMixin:
         multiple entries (devices, platforms, configurations), so
         we need to handle a list of those entries.
 
-        Please also note: We only have a very small set of
-        full searchable entities for the moment (devices, platforms,
-        configurations & contacts).
+        We follow the search_parent_relationships - over lists
+        for the one to many relationships.
+        """
+        result = []
+        for path in self.search_parent_relationships:
+            entities = [self]
+            for name in path.split("."):
+                next_entities = []
+                for entity in entities:
+                    value = getattr(entity, name)
+                    if isinstance(value, list):
+                        next_entities.extend(value)
+                    elif value is not None:
+                        next_entities.append(value)
+                entities = next_entities
+            result.extend(entities)
+        return result
+
+    def get_partial_search_updates(self):
         """
-        return []
+        Return the partial updates for the search entries of the parents.
+
+        If only the entity here changed, we don't need to rebuild the
+        complete entries for all of the parents. Instead we can replace
+        the embedded entries in the search index (see PartialSearchUpdate).
+
+        None means that we need to rebuild the parent entries.
+        """
+        return None
 
 
 class SearchableMixin:
@@ -231,16 +560,96 @@ class SearchableMixin:
     to run the necessary synchronization work.
     """
 
+    # The relationships that we need for the search entry (as paths like
+    # "device_contact_roles.contact"). We use them to load the data for
+    # lots of entities at once (for example for the reindex).
+    search_entry_relationships = []
+    # The keyword fields of the index that we can use for the facets
+    # of the faceted search.
+    search_facet_fields = []
+    # The fields of the index that we return to show a search hit
+    # without loading the entity from the database.
+    search_label_fields = []
+    # The fields with coordinates (geo_point or geo_shape in the index)
+    # that we support for the geo filters.
+    search_geo_fields = []
+
+    @classmethod
+    def geo_filter_sql(cls, geo_filter):
+        """
+        Return the sql condition for a geo filter.
+
+        This is the fallback in case we don't have the elasticsearch.
+        Models with search_geo_fields must override it - without
+        coordinates there is nothing that could match.
+        """
+        return sqlalchemy.false()
+
+    @classmethod
+    def geo_filter_query(cls, geo_filter):
+        """
+        Return the filter for the search index for a geo filter.
+
+        Models can override it to restrict the entries that the
+        geo filter can match (for example by their reference system).
+        """
+        return geo_filter
+
     @classmethod
     def search(cls, query, page, per_page, ordering):
         """
         Search the model with a given query and pagination settings.
 
         Ordering is optional.
+
+        We cache the ids & the total number of hits. As the query contains
+        the visibility filter, callers that can see the same entries share
+        the cache entries.
+        """
+        index_name = cls.__tablename__
+        search_cache = get_search_cache()
+        key = (freeze_query(query), page, per_page, freeze_query(ordering))
+        result = search_cache.get(index_name, key)
+        if result is None:
+            result = query_index(index_name, query, page, per_page, ordering)
+            search_cache.set(index_name, key, result)
+        ids, total = result
+        return cls.query_in_order(ids), total
+
+    @classmethod
+    def search_with_facets(cls, query, page, per_page, ordering, facets, facet_size):
         """
-        ids, total = query_index(cls.__tablename__, query, page, per_page, ordering)
-        if total == 0 or not ids:
-            return cls.query.filter(sqlalchemy.sql.false()), total
+        Search the model & compute the facets for the very same query.
+
+        Returns the query for the entities, the total number of hits
+        & the facets (dict with lists of value & count dicts).
+        """
+        ids, total, facet_result = query_index_with_facets(
+            cls.__tablename__, query, page, per_page, ordering, facets, facet_size
+        )
+        return cls.query_in_order(ids), total, facet_result
+
+    @classmethod
+    def search_after(cls, query, per_page, ordering, cursor, fields=None):
+        """
+        Search the model with the cursor based pagination.
+
+        Without fields we return the query for the entities, otherwise the
+        list of (id, document) tuples from the search index.
+        Returns those results, the total number of hits & the next cursor.
+        """
+        hits, total, next_cursor = query_index_after(
+            cls.__tablename__, query, per_page, ordering, cursor, fields
+        )
+        if fields is not None:
+            return hits, total, next_cursor
+        return cls.query_in_order([id_ for id_, _ in hits]), total, next_cursor
+
+    @classmethod
+    def query_in_order(cls, ids):
+        """Return the query for the entities in the very same order as the ids."""
+        if not ids:
+            return cls.query.filter(sqlalchemy.sql.false())
 
         # Now we build with db case a kind of lookup table that we want
         # to search for.
@@ -251,11 +660,52 @@ class SearchableMixin:
         for i in range(len(ids)):
             when.append((ids[i], i))
 
-        return (
-            cls.query.filter(cls.id.in_(ids)).order_by(db.case(when, value=cls.id)),
-            total,
+        return cls.query.filter(cls.id.in_(ids)).order_by(db.case(when, value=cls.id))
+
+    @classmethod
+    def search_sources(cls, query, page, per_page, ordering, fields):
+        """
+        Search the model & return the stored documents of the search index.
+
+        In contrast to the search method we don't query the database.
+        Returns a list of (id, document) tuples and the total number of hits.
+        """
+        return query_index_sources(
+            cls.__tablename__, query, page, per_page, ordering, fields
         )
 
+    @classmethod
+    @memorize
+    def search_index_field_names(cls):
+        """Return the names of the top level fields in the search index."""
+        if not hasattr(cls, "get_search_index_definition"):
+            return set()
+        return set(cls.get_search_index_definition()["mappings"]["properties"].keys())
+
+    @classmethod
+    @memorize
+    def search_as_you_type_fields(cls):
+        """
+        Return the top level fields that we can use for the suggestions.
+
+        Returns a dict with the field names as keys & the paths to the
+        search_as_you_type fields (with the _2gram & _3gram subfields)
+        as values.
+        """
+        if not hasattr(cls, "get_search_index_definition"):
+            return {}
+        properties = cls.get_search_index_definition()["mappings"]["properties"]
+        result = {}
+        for name, definition in properties.items():
+            if definition.get("type") == "search_as_you_type":
+                result[name] = name
+            elif (
+                definition.get("fields", {}).get("text", {}).get("type")
+                == "search_as_you_type"
+            ):
+                result[name] = f"{name}.text"
+        return result
+
     @classmethod
     def before_commit(cls, session):
         """Prepare the commit stage."""
@@ -275,39 +725,87 @@ class SearchableMixin:
             "update": list(session.dirty),
             "delete": list(session.deleted),
         }
-        # And we want to store the payload here as well
+        # And we want to store the payload here as well (we build
+        # them for all the searchables at once later, see
+        # build_pending_search_entries).
         session._search_add = []
+        # In case we work with the outbox we don't need the payload
+        # now. The worker will load it later.
+        session._search_use_outbox = use_search_outbox()
+        # The updates of the parents of indirect searchables can be
+        # expensive (a device can be part of lots of configurations).
+        # If we debounce them, the worker will update them once the
+        # edits are done.
+        session._search_debounced = []
+        debounce = get_indirect_search_update_debounce()
+        # The very same searchable can be reached multiple times
+        # (for example over several mount actions), but we want to
+        # build the entry only once.
+        seen = set()
+        seen_debounced = set()
+        # For updates we can change the embedded entries in the parents
+        # only (the worker for the outbox always rebuilds the entries).
+        session._search_partial = []
+        use_partial_updates = (
+            use_partial_search_updates() and not session._search_use_outbox
+        )
 
-        for obj in session._changes["add"]:
+        def add_searchables(obj, skip_direct=False, skip_indirect=False):
             for searchable in cls.yield_searchables(obj):
+                indirect = searchable is not obj
+                if not indirect and skip_direct:
+                    continue
+                if indirect and skip_indirect:
+                    continue
+                if indirect and debounce:
+                    if id(searchable) not in seen_debounced:
+                        seen_debounced.add(id(searchable))
+                        session._search_debounced.append(searchable)
+                    continue
+                if id(searchable) in seen:
+                    continue
+                seen.add(id(searchable))
                 session._search_add.append(
-                    SearchModelWithEntry(
-                        model=searchable, entry=searchable.to_search_entry()
-                    )
+                    SearchModelWithEntry(model=searchable, entry=None)
                 )
 
+        for obj in session._changes["add"]:
+            add_searchables(obj)
+
         for obj in session._changes["update"]:
             if is_modified(obj):
                 # only if there are real changes in the obj
-                for searchable in cls.yield_searchables(obj):
-                    session._search_add.append(
-                        SearchModelWithEntry(
-                            model=searchable, entry=searchable.to_search_entry()
-                        )
-                    )
+                partial_updates = None
+                if use_partial_updates and isinstance(obj, IndirectSearchableMixin):
+                    partial_updates = obj.get_partial_search_updates()
+                if partial_updates is not None:
+                    session._search_partial.extend(partial_updates)
+                    add_searchables(obj, skip_indirect=True)
+                else:
+                    add_searchables(obj)
         for obj in session._changes["delete"]:
             # We really don't want the direct searchables that are deleted
             # but we want every associated one
             # We really want to skip this level here and start with the
             # IndirectSearchables
             if isinstance(obj, IndirectSearchableMixin):
-                for parent_obj in obj.get_parent_search_entities():
-                    for searchable in cls.yield_searchables(parent_obj):
-                        session._search_add.append(
-                            SearchModelWithEntry(
-                                model=searchable, entry=searchable.to_search_entry()
-                            )
-                        )
+                add_searchables(obj, skip_direct=True)
+                cls.touch_parent_searchables(session, obj)
+
+    @classmethod
+    def touch_parent_searchables(cls, session, obj):
+        """
+        Set the updated_at of the parents for the deleted indirect searchable.
+
+        The incremental reindex finds the changed entries by their
+        updated_at - and a deleted child can't tell us anymore.
+        """
+        now = utc_now()
+        for searchable in cls.yield_searchables(obj):
+            if searchable is obj or searchable in session.deleted:
+                continue
+            if hasattr(searchable, "updated_at"):
+                searchable.updated_at = now
 
     @classmethod
     def yield_searchables(cls, obj):
@@ -324,8 +822,13 @@ class SearchableMixin:
                 yield from cls.yield_searchables(parent)
 
     @classmethod
-    def after_commit(cls, session):
-        """Update the search after the sqlalchemy commit."""
+    def get_search_index_operations(cls, session):
+        """
+        Return the list of operations for the search index.
+
+        Each entry is a SearchIndexOperation - and each searchable
+        is only included once.
+        """
         ids_to_add = collections.defaultdict(set)
 
         # We are going to collect all the ids for which we need to add or update
@@ -344,6 +847,7 @@ class SearchableMixin:
             if isinstance(obj, SearchableMixin):
                 ids_to_add[obj.__tablename__].discard(obj.id)
 
+        result = []
         ids_processed = collections.defaultdict(set)
         # So, now we have all of those that we want to update,
         # we can start adding them to the search index.
@@ -351,8 +855,12 @@ class SearchableMixin:
             model = search_model_with_entry.model
             if model.id in ids_to_add[model.__tablename__]:
                 if model.id not in ids_processed[model.__tablename__]:
-                    add_to_index(
-                        model.__tablename__, model, search_model_with_entry.entry
+                    result.append(
+                        SearchIndexOperation(
+                            operation="index",
+                            model=model,
+                            entry=search_model_with_entry.entry,
+                        )
                     )
                     ids_processed[model.__tablename__].add(model.id)
 
@@ -360,22 +868,321 @@ class SearchableMixin:
         for obj in session._changes["delete"]:
             if isinstance(obj, SearchableMixin):
                 if obj.id not in ids_processed[obj.__tablename__]:
-                    remove_from_index(obj.__tablename__, obj)
+                    result.append(
+                        SearchIndexOperation(operation="delete", model=obj, entry=None)
+                    )
                     ids_processed[obj.__tablename__].add(obj.id)
+        return result
+
+    @classmethod
+    def build_pending_search_entries(cls, session):
+        """
+        Build the search entries for the searchables of the commit.
+
+        We run this after the validations & load the data for all the
+        entries of one model at once (so we don't need to run some
+        queries for every single searchable).
+        """
+        search_add = getattr(session, "_search_add", None)
+        if not search_add or session._search_use_outbox:
+            return
+        if not current_app.elasticsearch:
+            return
+        # We need the ids of the new elements.
+        session.flush()
+        ids_by_model = collections.defaultdict(set)
+        for search_model_with_entry in search_add:
+            obj = search_model_with_entry.model
+            ids_by_model[type(obj)].add(obj.id)
+        entries_by_model = {
+            model: model.build_search_entries(ids)
+            for model, ids in ids_by_model.items()
+        }
+        result = []
+        for search_model_with_entry in search_add:
+            obj = search_model_with_entry.model
+            entry = entries_by_model[type(obj)].get(obj.id)
+            # If it is no longer in the database, there is nothing to update.
+            if entry is not None:
+                result.append(SearchModelWithEntry(model=obj, entry=entry))
+        session._search_add = result
+
+    @classmethod
+    def write_search_outbox(cls, session):
+        """Store the changes for the search index in the outbox table."""
+        use_outbox = getattr(session, "_search_use_outbox", False)
+        debounced = getattr(session, "_search_debounced", None)
+        if not use_outbox and not debounced:
+            return
+        # We import it here to avoid circular imports.
+        from .search_index_outbox import SearchIndexOutboxEntry
+
+        # We need the ids of the new elements.
+        session.flush()
+        operations = cls.get_search_index_operations(session)
+        now = utc_now()
+        rows = []
+        if use_outbox:
+            rows = [
+                {
+                    "index_name": operation.model.__tablename__,
+                    "entity_id": operation.model.id,
+                    "operation": operation.operation,
+                    "created_at": now,
+                    "next_attempt_at": now,
+                }
+                for operation in operations
+            ]
+        # If we update (or delete) a searchable anyway, we don't
+        # need to add the debounced update.
+        keys_handled = {(op.model.__tablename__, op.model.id) for op in operations}
+        keys_handled.update(
+            (obj.__tablename__, obj.id)
+            for obj in session._changes["delete"]
+            if isinstance(obj, SearchableMixin)
+        )
+        if debounced:
+            next_attempt_at = now + timedelta(
+                seconds=get_indirect_search_update_debounce()
+            )
+            for searchable in debounced:
+                key = (searchable.__tablename__, searchable.id)
+                if key in keys_handled:
+                    continue
+                keys_handled.add(key)
+                rows.append(
+                    {
+                        "index_name": searchable.__tablename__,
+                        "entity_id": searchable.id,
+                        "operation": SearchIndexOutboxEntry.OPERATION_INDEX,
+                        "created_at": now,
+                        "next_attempt_at": next_attempt_at,
+                    }
+                )
+        if rows:
+            session.execute(SearchIndexOutboxEntry.__table__.insert(), rows)
+
+    @classmethod
+    def after_commit(cls, session):
+        """Update the search after the sqlalchemy commit."""
+        # With the outbox the worker will update the search index.
+        if not getattr(session, "_search_use_outbox", False):
+            # The data is already committed, so we don't want to raise
+            # if the elasticsearch went away in the meantime (or the circuit
+            # breaker opened). The next (incremental) reindex fixes the
+            # entries then.
+            unavailable_errors = []
+            for operation in cls.get_search_index_operations(session):
+                model = operation.model
+                try:
+                    if operation.operation == "delete":
+                        remove_from_index(model.__tablename__, model)
+                    else:
+                        add_to_index(model.__tablename__, model, operation.entry)
+                except Exception as e:
+                    if not is_search_unavailable(e):
+                        raise
+                    unavailable_errors.append(e)
+            for partial_update in getattr(session, "_search_partial", None) or []:
+                try:
+                    update_embedded_entries(partial_update)
+                except Exception as e:
+                    if not is_search_unavailable(e):
+                        raise
+                    unavailable_errors.append(e)
+            if unavailable_errors:
+                current_app.logger.warning(
+                    "Could not update %s search index entries: %s",
+                    len(unavailable_errors),
+                    unavailable_errors[0],
+                )
 
         session._changes = None
         session._search_add = None
+        session._search_use_outbox = None
+        session._search_debounced = None
+        session._search_partial = None
 
     @classmethod
-    def reindex(cls):
-        """Recreate the index for the model."""
-        remove_index(cls.__tablename__)
-        idx_definition = cls.get_search_index_definition()
-        create_index(cls.__tablename__, idx_definition)
+    def get_search_entry_load_options(cls):
+        """
+        Return the loader options for the relationships of the search entry.
 
-        for obj in cls.query:
-            entry = obj.to_search_entry()
-            add_to_index(cls.__tablename__, obj, entry)
+        This way we can load the relationships for a bunch of entities
+        with one query per relationship (and not one per entity).
+        """
+        options = []
+        for path in cls.search_entry_relationships:
+            option = None
+            model = cls
+            for name in path.split("."):
+                attribute = getattr(model, name)
+                if option is None:
+                    option = selectinload(attribute)
+                else:
+                    option = option.selectinload(attribute)
+                model = attribute.property.mapper.class_
+            options.append(option)
+        return options
+
+    @classmethod
+    def query_for_search_entries(cls, ids):
+        """Return the query for the entities with the data for the search entries."""
+        return cls.query.filter(cls.id.in_(ids)).options(
+            *cls.get_search_entry_load_options()
+        )
+
+    @classmethod
+    def build_search_entries(cls, ids, batch_size=500):
+        """
+        Build the search entries for the entities with the given ids.
+
+        We need a fixed number of queries per batch - regardless
+        of how many entities there are in the batch.
+
+        Returns a dict with the ids as keys & the entries as values.
+        Ids of entities that are not in the database are skipped.
+        """
+        result = {}
+        ids = sorted(ids)
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:][:batch_size]
+            for obj in cls.query_for_search_entries(batch):
+                result[obj.id] = obj.to_search_entry()
+        return result
+
+    @classmethod
+    def yield_search_entry_batches(cls, query, batch_size=500):
+        """Yield lists of (entity, search entry) tuples for the query."""
+        query = (
+            query.options(*cls.get_search_entry_load_options())
+            .order_by(cls.id)
+            .yield_per(batch_size)
+        )
+        batch = []
+        for obj in query:
+            batch.append((obj, obj.to_search_entry()))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @classmethod
+    def send_to_index(cls, index, query, batch_size=500, progress=None):
+        """
+        Send the search entries for the query with bulk requests to the index.
+
+        The progress callback gets the number of entries that are
+        already in the index.
+        Returns the number of entries that we sent.
+        """
+        count = 0
+        for batch in cls.yield_search_entry_batches(query, batch_size):
+            actions = [
+                BulkAction(operation="index", index=index, id=obj.id, payload=entry)
+                for obj, entry in batch
+            ]
+            errors = [error for error in bulk(actions) if error]
+            if errors:
+                raise RuntimeError(
+                    f"Could not index {len(errors)} entries for {index}: {errors[0]}"
+                )
+            count += len(batch)
+            if progress:
+                progress(count)
+        return count
+
+    @classmethod
+    def get_search_index_settings(cls, **overrides):
+        """Return the configured settings for the search index of the model."""
+        return IndexSettings.from_config(
+            current_app.config.get("ELASTICSEARCH_INDEX_SETTINGS", {}),
+            cls.__tablename__,
+            **overrides,
+        )
+
+    @classmethod
+    def reindex(cls, batch_size=500, progress=None):
+        """
+        Recreate the index for the model.
+
+        We fill a new index (with a version suffix in the name) & let the
+        alias with the name of the table point to it only once all
+        the entries are there. So the search keeps working with the old
+        index until the very end.
+
+        While we fill the new index we use the bulk refresh interval
+        of the index settings (no refreshs by default).
+
+        Returns the number of entries that we sent to the index.
+        """
+        if not current_app.elasticsearch:
+            return 0
+        alias = cls.__tablename__
+        started_at = utc_now()
+        index = f"{alias}_v{started_at:%Y%m%d%H%M%S%f}"
+        index_settings = cls.get_search_index_settings()
+        bulk_settings = dataclasses.replace(
+            index_settings, refresh_interval=index_settings.bulk_refresh_interval
+        )
+        create_index(index, bulk_settings.apply(cls.get_search_index_definition()))
+        try:
+            count = cls.send_to_index(index, cls.query, batch_size, progress)
+            update_index_settings(
+                index, {"index": {"refresh_interval": index_settings.refresh_interval}}
+            )
+            refresh_index(index)
+        except Exception:
+            remove_index(index)
+            raise
+
+        for old_index in switch_alias(alias, index):
+            remove_index(old_index)
+        set_index_watermark(alias, started_at)
+
+        # Changes that were made while we filled the new index ended up
+        # in the old one. So we need to send them once more.
+        if hasattr(cls, "updated_at"):
+            count += cls.send_to_index(
+                alias, cls.query.filter(cls.updated_at >= started_at), batch_size
+            )
+        else:
+            # Without the timestamps we can't tell which entries changed.
+            # Those models are small, so we just send all of them again.
+            count += cls.send_to_index(alias, cls.query, batch_size)
+        # And the entries that we deleted in the meantime are still in
+        # the new index.
+        cls.remove_deleted_from_index(alias, batch_size)
+        return count
+
+    @classmethod
+    def remove_deleted_from_index(cls, index, batch_size=500):
+        """
+        Remove the entries from the index that are no longer in the database.
+
+        Returns the number of removed entries.
+        """
+        count = 0
+        index_ids = yield_index_ids(index, batch_size)
+        while True:
+            ids = list(itertools.islice(index_ids, batch_size))
+            if not ids:
+                return count
+            existing = {
+                row.id for row in db.session.query(cls.id).filter(cls.id.in_(ids))
+            }
+            actions = [
+                BulkAction(operation="delete", index=index, id=id_, payload=None)
+                for id_ in ids
+                if id_ not in existing
+            ]
+            errors = [error for error in bulk(actions) if error]
+            if errors:
+                raise RuntimeError(
+                    f"Could not delete {len(errors)} entries for {index}: {errors[0]}"
+                )
+            count += len(actions)
 
     @classmethod
     @memorize
@@ -440,6 +1247,9 @@ db.event.listen(db.session, "after_commit", SearchableMixin.after_commit)
 SearchModelWithEntry = collections.namedtuple(
     "SearchModelWithEntry", ["model", "entry"]
 )
+SearchIndexOperation = collections.namedtuple(
+    "SearchIndexOperation", ["operation", "model", "entry"]
+)
 
 
 class BeforeCommitValidatableMixin:
@@ -474,6 +1284,12 @@ class BeforeCommitValidatableMixin:
 
 
 db.event.listen(db.session, "before_commit", BeforeCommitValidatableMixin.before_commit)
+# We only want to build the search entries & write to the outbox if all
+# the validations are fine.
+db.event.listen(
+    db.session, "before_commit", SearchableMixin.build_pending_search_entries
+)
+db.event.listen(db.session, "before_commit", SearchableMixin.write_search_outbox)
 
 
 class PermissionMixin(BeforeCommitValidatableMixin):
@@ -8,11 +8,24 @@
 
 """Sqlalchemy model classes for mount actions."""
 
-from ..models.mixin import AuditMixin, IndirectSearchableMixin
+from ..models.mixin import (
+    AuditMixin,
+    ConfigurationTimelineMixin,
+    IndirectSearchableMixin,
+    PeriodMixin,
+    period_exclusion_constraint,
+    period_index,
+)
 from .base_model import db
 
 
-class PlatformMountAction(db.Model, AuditMixin, IndirectSearchableMixin):
+class PlatformMountAction(
+    db.Model,
+    AuditMixin,
+    ConfigurationTimelineMixin,
+    IndirectSearchableMixin,
+    PeriodMixin,
+):
     """Mount of a platform on a configuration."""
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -79,11 +92,33 @@ class PlatformMountAction(db.Model, AuditMixin, IndirectSearchableMixin):
     )
     label = db.Column(db.String(256), nullable=True)
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent for the search."""
-        # We only want to include the mount for the search in the
-        # Configuration.
-        return [self.configuration]
+    __table_args__ = (
+        # For the checks of the mounts & the availabilities.
+        db.Index("ix_platform_mount_action_platform_id", platform_id, begin_date),
+        db.Index(
+            "ix_platform_mount_action_configuration_id", configuration_id, begin_date
+        ),
+        db.Index(
+            "ix_platform_mount_action_parent_platform_id",
+            parent_platform_id,
+            configuration_id,
+        ),
+        period_index("ix_platform_mount_action_period", begin_date, end_date),
+        # A platform can only be mounted once at the same time.
+        period_exclusion_constraint(
+            "ex_platform_mount_action_platform_id_period",
+            platform_id,
+            begin_date,
+            end_date,
+        ),
+    )
+
+    search_parent_relationships = ["configuration"]
+    timeline_attributes = [
+        *ConfigurationTimelineMixin.timeline_attributes,
+        "platform_id",
+        "platform",
+    ]
 
     def to_search_entry(self):
         """Return a dict of search slots."""
@@ -99,7 +134,13 @@ class PlatformMountAction(db.Model, AuditMixin, IndirectSearchableMixin):
         return self.platform
 
 
-class DeviceMountAction(db.Model, AuditMixin, IndirectSearchableMixin):
+class DeviceMountAction(
+    db.Model,
+    AuditMixin,
+    ConfigurationTimelineMixin,
+    IndirectSearchableMixin,
+    PeriodMixin,
+):
     """Mount of a device on a configuration."""
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -184,11 +225,35 @@ class DeviceMountAction(db.Model, AuditMixin, IndirectSearchableMixin):
     )
     label = db.Column(db.String(256), nullable=True)
 
-    def get_parent_search_entities(self):
-        """Return the configuration as parent for the search."""
-        # We only want to include the mount for the search in the
-        # Configuration.
-        return [self.configuration]
+    __table_args__ = (
+        # For the checks of the mounts & the availabilities.
+        db.Index("ix_device_mount_action_device_id", device_id, begin_date),
+        db.Index(
+            "ix_device_mount_action_configuration_id", configuration_id, begin_date
+        ),
+        db.Index(
+            "ix_device_mount_action_parent_platform_id",
+            parent_platform_id,
+            configuration_id,
+        ),
+        db.Index(
+            "ix_device_mount_action_parent_device_id",
+            parent_device_id,
+            configuration_id,
+        ),
+        period_index("ix_device_mount_action_period", begin_date, end_date),
+        # A device can only be mounted once at the same time.
+        period_exclusion_constraint(
+            "ex_device_mount_action_device_id_period", device_id, begin_date, end_date
+        ),
+    )
+
+    search_parent_relationships = ["configuration"]
+    timeline_attributes = [
+        *ConfigurationTimelineMixin.timeline_attributes,
+        "device_id",
+        "device",
+    ]
 
     def to_search_entry(self):
         """Return a dict of search slots."""
@@ -19,7 +19,9 @@ from ..models.mixin import (
     IndirectSearchableMixin,
     PermissionMixin,
     SearchableMixin,
+    text_search_vector,
 )
+from ..search import PartialSearchUpdate
 from .base_model import db
 
 
@@ -54,9 +56,47 @@ class Platform(
     country = db.Column(db.String(256), nullable=True)
     has_system_generated_serial_number = db.Column(db.Boolean, default=False)
 
+    search_entry_relationships = [
+        "platform_attachments",
+        "platform_contact_roles.contact",
+        "generic_platform_actions",
+        "platform_software_update_actions",
+        "platform_parameters.platform_parameter_value_change_actions",
+    ]
+    search_facet_fields = [
+        "manufacturer_name",
+        "platform_type_name",
+        "status_name",
+        "group_ids",
+        "keywords",
+        "country",
+    ]
+    search_label_fields = ["short_name", "long_name"]
+    # The columns for the full text search in the database
+    # (if we don't use the elasticsearch).
+    text_search_columns = [
+        "short_name",
+        "long_name",
+        "description",
+        "serial_number",
+        "manufacturer_name",
+        "model",
+        "inventory_number",
+        "persistent_identifier",
+        "platform_type_name",
+        "status_name",
+        "country",
+    ]
+    search_vector = text_search_vector(text_search_columns)
+
+    __table_args__ = (
+        db.Index("ix_platform_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
     def to_search_entry(self, include_relationships=True):
         """Convert the model to a dict to store it in a full text search."""
         result = {
+            "id": self.id,
             "short_name": self.short_name,
             "long_name": self.long_name,
             "description": self.description,
@@ -105,17 +145,20 @@ class Platform(
             )
         return result
 
-    def get_parent_search_entities(self):
-        """Get the parents where this here is included in the search index."""
-        # This here should only affect configurations - as their search
-        # index entry includes the platform.
-        result = []
-        # We only need to check the platform mount actions for associated
-        # configurations - as there should be no unmount before an earlier
-        # mount action.
-        for action in self.platform_mount_actions:
-            result.append(action.configuration)
-        return result
+    # The search index entries of the configurations include the platform.
+    search_parent_relationships = ["platform_mount_actions.configuration"]
+
+    def get_partial_search_updates(self):
+        """Replace the platform in the mount actions of the configurations."""
+        return [
+            PartialSearchUpdate(
+                index="configuration",
+                query={"term": {"platform_mount_actions.platform.id": self.id}},
+                paths=[("platform_mount_actions", "platform")],
+                id=self.id,
+                entry=self.to_search_entry(include_relationships=False),
+            )
+        ]
 
     @staticmethod
     def get_search_index_properties():
@@ -132,6 +175,10 @@ class Platform(
             )
         )
         return {
+            # The id is needed to update the platform in the configurations in place.
+            "id": {
+                "type": "integer",
+            },
             # Search the description just via text (and not via keyword).
             # We want this to be full searchable, but we don't need to
             # provide any suggestions for.
@@ -40,9 +40,7 @@ class PlatformAttachment(db.Model, IndirectSearchableMixin, AuditMixin):
         # to be included in the platform
         return {"label": self.label, "url": self.url, "description": self.description}
 
-    def get_parent_search_entities(self):
-        """Return the platform as parent."""
-        return [self.platform]
+    search_parent_relationships = ["platform"]
 
     def get_parent(self):
         """Return parent object."""
@@ -42,6 +42,4 @@ class PlatformParameter(db.Model, IndirectSearchableMixin, AuditMixin):
             ],
         }
 
-    def get_parent_search_entities(self):
-        """Return the platform as parent search entity."""
-        return [self.platform]
+    search_parent_relationships = ["platform"]
@@ -38,6 +38,4 @@ class PlatformParameterValueChangeAction(db.Model, AuditMixin, IndirectSearchabl
             "description": self.description,
         }
 
-    def get_parent_search_entities(self):
-        """Return the platform as parent search entity."""
-        return [self.platform_parameter.platform]
+    search_parent_relationships = ["platform_parameter.platform"]
@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Model for the pending changes of the full text search index."""
+
+from .base_model import db
+from .mixin import utc_now
+
+
+class SearchIndexOutboxEntry(db.Model):
+    """
+    Pending change for the full text search index.
+
+    Those entries are written in the very same transaction as the
+    changes of the data itself. So we don't lose any update for the
+    search index - even if the elasticsearch is not reachable in
+    the moment of the commit.
+
+    The `flask es worker` command reads those entries & sends them
+    with bulk requests to the elasticsearch.
+    """
+
+    OPERATION_INDEX = "index"
+    OPERATION_DELETE = "delete"
+
+    id = db.Column(db.BigInteger, primary_key=True, autoincrement=True)
+    index_name = db.Column(db.String(256), nullable=False)
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(256), nullable=False)
+    created_at = db.Column(db.DateTime(timezone=True), default=utc_now, nullable=False)
+    # In case of problems we can try it again later.
+    next_attempt_at = db.Column(
+        db.DateTime(timezone=True), default=utc_now, nullable=False, index=True
+    )
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (
+        # The worker groups the entries by the search index entry.
+        db.Index(
+            "ix_search_index_outbox_entry_index_name_entity_id",
+            "index_name",
+            "entity_id",
+        ),
+    )
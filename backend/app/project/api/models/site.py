@@ -16,6 +16,7 @@ from ..models.mixin import (
     AuditMixin,
     BeforeCommitValidatableMixin,
     SearchableMixin,
+    text_search_vector,
 )
 from .base_model import db
 
@@ -59,6 +60,84 @@ class Site(
     # SiteContactRoles & SiteAttachments have a backref to the sites,
     # so there is no need to put it here explicitly.
     # Configurations also have the backrefs.
+    search_entry_relationships = ["site_contact_roles.contact", "site_attachments"]
+    search_facet_fields = [
+        "site_type_name",
+        "site_usage_name",
+        "group_ids",
+        "keywords",
+        "country",
+        "city",
+    ]
+    search_label_fields = ["label"]
+    search_geo_fields = ["geometry"]
+    # The columns for the full text search in the database
+    # (if we don't use the elasticsearch).
+    text_search_columns = [
+        "label",
+        "description",
+        "persistent_identifier",
+        "street",
+        "street_number",
+        "city",
+        "zip_code",
+        "administrative_area",
+        "country",
+        "building",
+        "room",
+        "site_type_name",
+        "site_usage_name",
+    ]
+    search_vector = text_search_vector(text_search_columns)
+
+    __table_args__ = (
+        db.Index("ix_site_search_vector", "search_vector", postgresql_using="gin"),
+        # For the distance filters (in meters) without the elasticsearch.
+        # The index for the geometry itself is created by geoalchemy.
+        db.Index(
+            "ix_site_geometry_geography",
+            db.func.geography(geometry),
+            postgresql_using="gist",
+        ),
+    )
+
+    @classmethod
+    def has_wgs84_geometry(cls):
+        """Return the sql condition for sites with longitude & latitude."""
+        return db.func.coalesce(cls.epsg_code, "4326") == "4326"
+
+    @classmethod
+    def geo_filter_sql(cls, geo_filter):
+        """
+        Return the sql condition for a geo filter on the geometry.
+
+        The filters work with longitude & latitude, so we don't use
+        the geometries in other reference systems.
+        """
+        return db.and_(cls.has_wgs84_geometry(), geo_filter.to_sql(cls.geometry))
+
+    @classmethod
+    def geo_filter_query(cls, geo_filter):
+        """Return the filter for the search index - for the wgs84 geometries only."""
+        from ..datalayers.esalchemy import (
+            AndFilter,
+            ExistsFilter,
+            MustNotFilter,
+            OrFilter,
+            TermEqualsExactStringFilter,
+        )
+
+        return AndFilter(
+            [
+                geo_filter,
+                OrFilter(
+                    [
+                        TermEqualsExactStringFilter(term="epsg_code", value="4326"),
+                        MustNotFilter(ExistsFilter(field="epsg_code")),
+                    ]
+                ),
+            ]
+        )
 
     def validate(self):
         """
@@ -146,7 +225,9 @@ class Site(
                     "persistent_identifier": type_keyword_and_full_searchable,
                     "label": type_keyword_and_full_searchable,
                     # https://www.elastic.co/guide/en/elasticsearch/reference/current/geo-shape.html#geo-polygon
-                    "geometry": {"type": "geo_shape"},
+                    # Geometries in other reference systems than wgs84
+                    # can't be indexed - but we keep them in the source.
+                    "geometry": {"type": "geo_shape", "ignore_malformed": True},
                     "description": type_text_full_searchable,
                     "epsg_code": type_keyword,
                     "is_internal": {
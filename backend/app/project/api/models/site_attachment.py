@@ -38,9 +38,7 @@ class SiteAttachment(db.Model, IndirectSearchableMixin, AuditMixin):
         # to be included in the sites
         return {"label": self.label, "url": self.url, "description": self.description}
 
-    def get_parent_search_entities(self):
-        """Return the site as parent search entity."""
-        return [self.site]
+    search_parent_relationships = ["site"]
 
     def get_parent(self):
         """Return parent object."""
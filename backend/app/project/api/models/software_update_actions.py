@@ -36,9 +36,7 @@ class DeviceSoftwareUpdateAction(db.Model, AuditMixin, IndirectSearchableMixin):
         backref=db.backref("device_software_update_actions"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the device as parent."""
-        return [self.device]
+    search_parent_relationships = ["device"]
 
     def to_search_entry(self):
         """Return a dict with search information."""
@@ -81,9 +79,7 @@ class PlatformSoftwareUpdateAction(db.Model, AuditMixin, IndirectSearchableMixin
         backref=db.backref("platform_software_update_actions"),
     )
 
-    def get_parent_search_entities(self):
-        """Return the platform as parent."""
-        return [self.platform]
+    search_parent_relationships = ["platform"]
 
     def to_search_entry(self):
         """Return a dict with search information."""
@@ -117,6 +117,10 @@ from .export_control_resources import (  # noqa: F401
     ExportControlDetail,
     ExportControlList,
 )
+from .free_busy_timelines import (  # noqa: F401
+    DeviceFreeBusyTimelines,
+    PlatformFreeBusyTimelines,
+)
 from .generic_configuration_action_attachment_resources import (  # noqa: F401
     GenericConfigurationActionAttachmentDetail,
     GenericConfigurationActionAttachmentList,
@@ -151,7 +155,9 @@ from .manufacturer_model_resources import (  # noqa: F401
 )
 from .mounting_availabilities import (  # noqa: F401
     DeviceAvailabilities,
+    DeviceBulkAvailabilities,
     PlatformAvailabilities,
+    PlatformBulkAvailabilities,
 )
 from .organization_resources import (  # noqa: F401
     OrganizationDetail,
@@ -10,7 +10,8 @@
 import dateutil.parser
 from flask import request
 from flask_rest_jsonapi import ResourceList
-from sqlalchemy import and_, or_
+from marshmallow_jsonapi.flask import Relationship
+from sqlalchemy.orm import RelationshipProperty, contains_eager, selectinload
 
 from ..helpers.configuration_helpers import build_tree
 from ..helpers.errors import (
@@ -21,6 +22,8 @@ from ..helpers.errors import (
 )
 from ..models import (
     Configuration,
+    ConfigurationTimelineEvent,
+    ConfigurationTimelineSegment,
     Device,
     DeviceMountAction,
     Platform,
@@ -36,6 +39,30 @@ from ..schemas.mount_actions_schema import (
 from ..schemas.platform_schema import PlatformSchema
 
 
+def relationship_load_options(model, schema, parent_option=None, skip=()):
+    """
+    Return the loader options for the relationships that the schema dumps.
+
+    This way we load the relationships for all of the entries with
+    one query per relationship (and not one per entry).
+    """
+    options = []
+    for name, field in schema.fields.items():
+        if not isinstance(field, Relationship):
+            continue
+        attribute_name = field.attribute or name
+        if attribute_name in skip:
+            continue
+        attribute = getattr(model, attribute_name, None)
+        if not isinstance(getattr(attribute, "property", None), RelationshipProperty):
+            continue
+        if parent_option is None:
+            options.append(selectinload(attribute))
+        else:
+            options.append(parent_option.selectinload(attribute))
+    return options
+
+
 class ControllerConfigurationMountingActionTimepoints(ResourceList):
     """Controller that returns a list of timepoints for the mounting actions."""
 
@@ -55,55 +82,53 @@ class ControllerConfigurationMountingActionTimepoints(ResourceList):
         device_schema = DeviceSchema()
         platform_schema = PlatformSchema()
 
-        device_mounts = db.session.query(DeviceMountAction).filter(
-            DeviceMountAction.configuration_id == configuration_id,
-        )
-        platform_mounts = db.session.query(PlatformMountAction).filter(
-            PlatformMountAction.configuration_id == configuration_id,
+        # The events are precomputed (see ConfigurationTimelineEvent) &
+        # already sorted. We dump every device & platform only once.
+        events = (
+            db.session.query(ConfigurationTimelineEvent)
+            .filter(
+                ConfigurationTimelineEvent.configuration_id == configuration_id,
+                ConfigurationTimelineEvent.type.in_(
+                    ConfigurationTimelineEvent.MOUNT_TYPES
+                ),
+            )
+            .order_by(
+                ConfigurationTimelineEvent.timepoint, ConfigurationTimelineEvent.id
+            )
+            .all()
         )
+        device_types = [
+            ConfigurationTimelineEvent.DEVICE_MOUNT,
+            ConfigurationTimelineEvent.DEVICE_UNMOUNT,
+        ]
+        device_ids = {e.entity_id for e in events if e.type in device_types}
+        platform_ids = {e.entity_id for e in events if e.type not in device_types}
+        attributes_by_type_and_id = {}
+        if device_ids:
+            for device in db.session.query(Device).filter(Device.id.in_(device_ids)):
+                attributes_by_type_and_id[("device", device.id)] = device_schema.dump(
+                    device
+                )["data"]["attributes"]
+        if platform_ids:
+            for platform in db.session.query(Platform).filter(
+                Platform.id.in_(platform_ids)
+            ):
+                attributes_by_type_and_id[
+                    ("platform", platform.id)
+                ] = platform_schema.dump(platform)["data"]["attributes"]
+
         dates_with_labels = []
-        for device_mount in device_mounts:
+        for event in events:
+            entity_type = "device" if event.type in device_types else "platform"
             dates_with_labels.append(
                 {
-                    "timepoint": device_mount.begin_date,
-                    "type": "device_mount",
-                    "attributes": device_schema.dump(device_mount.device)["data"][
-                        "attributes"
+                    "timepoint": event.timepoint,
+                    "type": event.type,
+                    "attributes": attributes_by_type_and_id[
+                        (entity_type, event.entity_id)
                     ],
                 }
             )
-            if device_mount.end_date:
-                dates_with_labels.append(
-                    {
-                        "timepoint": device_mount.end_date,
-                        "type": "device_unmount",
-                        "attributes": device_schema.dump(device_mount.device)["data"][
-                            "attributes"
-                        ],
-                    }
-                )
-        for platform_mount in platform_mounts:
-            dates_with_labels.append(
-                {
-                    "timepoint": platform_mount.begin_date,
-                    "type": "platform_mount",
-                    "attributes": platform_schema.dump(platform_mount.platform)["data"][
-                        "attributes"
-                    ],
-                }
-            )
-            if platform_mount.end_date:
-                dates_with_labels.append(
-                    {
-                        "timepoint": platform_mount.end_date,
-                        "type": "platform_unmount",
-                        "attributes": platform_schema.dump(platform_mount.platform)[
-                            "data"
-                        ]["attributes"],
-                    }
-                )
-
-        dates_with_labels.sort(key=lambda x: x["timepoint"])
         return dates_with_labels
 
     def label_device(self, device):
@@ -149,36 +174,58 @@ class ControllerConfigurationMountingActions(ResourceList):
         except dateutil.parser.ParserError:
             raise BadRequestError("timepoint must be ISO 8601")
 
+        # The ids of the active mounts are precomputed in the segments
+        # of the configuration timeline.
+        segment = (
+            db.session.query(ConfigurationTimelineSegment)
+            .filter(
+                ConfigurationTimelineSegment.configuration_id == configuration_id,
+                ConfigurationTimelineSegment.period_contains(timepoint),
+            )
+            .one_or_none()
+        )
+        device_mount_action_ids = []
+        platform_mount_action_ids = []
+        if segment:
+            device_mount_action_ids = segment.device_mount_action_ids
+            platform_mount_action_ids = segment.platform_mount_action_ids
+
+        # The mounts with their devices & platforms come with one query each,
+        # all the relationships of the payload with one query per relationship.
         active_device_mounts = (
             db.session.query(DeviceMountAction)
             .join(DeviceMountAction.device)
-            .filter(
-                and_(
-                    DeviceMountAction.configuration_id == configuration_id,
-                    DeviceMountAction.begin_date <= timepoint,
-                    or_(
-                        # an is None check doesn't work for this filter.
-                        DeviceMountAction.end_date == None,  # noqa: E711
-                        DeviceMountAction.end_date >= timepoint,
-                    ),
-                )
+            .options(
+                contains_eager(DeviceMountAction.device),
+                *relationship_load_options(
+                    DeviceMountAction, self.device_mount_action_schema, skip=["device"]
+                ),
+                *relationship_load_options(
+                    Device,
+                    self.device_schema,
+                    parent_option=contains_eager(DeviceMountAction.device),
+                ),
             )
+            .filter(DeviceMountAction.id.in_(device_mount_action_ids))
             .order_by(Device.short_name)
         )
         active_platform_mounts = (
             db.session.query(PlatformMountAction)
             .join(PlatformMountAction.platform)
-            .filter(
-                and_(
-                    PlatformMountAction.configuration_id == configuration_id,
-                    PlatformMountAction.begin_date <= timepoint,
-                    or_(
-                        # an is None check doesn't work for this filter.
-                        PlatformMountAction.end_date == None,  # noqa: E711
-                        PlatformMountAction.end_date >= timepoint,
-                    ),
-                )
+            .options(
+                contains_eager(PlatformMountAction.platform),
+                *relationship_load_options(
+                    PlatformMountAction,
+                    self.platform_mount_action_schema,
+                    skip=["platform"],
+                ),
+                *relationship_load_options(
+                    Platform,
+                    self.platform_schema,
+                    parent_option=contains_eager(PlatformMountAction.platform),
+                ),
             )
+            .filter(PlatformMountAction.id.in_(platform_mount_action_ids))
             .order_by(Platform.short_name)
         )
 
@@ -35,16 +35,21 @@ from .base_resource import (
     query_configuration_set_update_description_and_update_pidinst,
     set_update_description_text_user_and_pidinst,
 )
+from .mixins.exclusion_constraint import ExclusionConstraintMixin
 from .mixins.mqtt_notification import MqttNotificationMixin
 
 
-class ConfigurationDynamicLocationBeginActionList(MqttNotificationMixin, ResourceList):
+class ConfigurationDynamicLocationBeginActionList(
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceList
+):
     """List resource for Configuration dynamic location begin actions (get, post)."""
 
+    validator = DynamicLocationActionValidator()
+
     def before_create_object(self, data, *args, **kwargs):
         """Use jwt to add user id to dataset."""
         data_with_relationships = decode_json_request_data()
-        DynamicLocationActionValidator().validate_create(data_with_relationships)
+        self.validator.validate_create(data_with_relationships)
         add_created_by_id(data)
 
     def query(self, view_kwargs):
@@ -147,7 +152,7 @@ class ConfigurationDynamicLocationBeginActionList(MqttNotificationMixin, Resourc
 
 
 class ConfigurationDynamicLocationBeginActionDetail(
-    MqttNotificationMixin, ResourceDetail
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceDetail
 ):
     """Detail resource for Configuration dynamic location begin actions (get, delete, patch)."""
 
@@ -11,11 +11,7 @@
 from flask_rest_jsonapi import ResourceList
 
 from ..helpers.errors import ForbiddenError, NotFoundError
-from ..models import (
-    Configuration,
-    ConfigurationDynamicLocationBeginAction,
-    ConfigurationStaticLocationBeginAction,
-)
+from ..models import Configuration, ConfigurationTimelineEvent
 from ..models.base_model import db
 from ..permissions.rules import can_see
 
@@ -36,56 +32,29 @@ class ControllerConfigurationLocationActionTimepoints(ResourceList):
         if not can_see(configuration):
             raise ForbiddenError("Authentication required.")
 
-        static_locations = db.session.query(
-            ConfigurationStaticLocationBeginAction
-        ).filter(
-            ConfigurationStaticLocationBeginAction.configuration_id == configuration_id,
-        )
-        dynamic_locations = db.session.query(
-            ConfigurationDynamicLocationBeginAction
-        ).filter(
-            ConfigurationDynamicLocationBeginAction.configuration_id
-            == configuration_id,
-        )
-
-        dates_with_labels = list()
-        for static_location in static_locations:
-            dates_with_labels.append(
-                {
-                    "timepoint": static_location.begin_date,
-                    "id": str(static_location.id),
-                    "type": "configuration_static_location_begin",
-                    "label": static_location.label,
-                }
+        # The events are precomputed (see ConfigurationTimelineEvent)
+        # & already sorted.
+        events = (
+            db.session.query(ConfigurationTimelineEvent)
+            .filter(
+                ConfigurationTimelineEvent.configuration_id == configuration_id,
+                ConfigurationTimelineEvent.type.in_(
+                    ConfigurationTimelineEvent.LOCATION_TYPES
+                ),
             )
-            if static_location.end_date:
-                dates_with_labels.append(
-                    {
-                        "timepoint": static_location.end_date,
-                        "id": str(static_location.id),
-                        "type": "configuration_static_location_end",
-                        "label": static_location.label,
-                    }
-                )
-
-        for dynamic_location in dynamic_locations:
-            dates_with_labels.append(
-                {
-                    "timepoint": dynamic_location.begin_date,
-                    "id": str(dynamic_location.id),
-                    "type": "configuration_dynamic_location_begin",
-                    "label": dynamic_location.label,
-                }
+            .order_by(
+                ConfigurationTimelineEvent.timepoint, ConfigurationTimelineEvent.id
             )
-            if dynamic_location.end_date:
-                dates_with_labels.append(
-                    {
-                        "timepoint": dynamic_location.end_date,
-                        "id": str(dynamic_location.id),
-                        "type": "configuration_dynamic_location_end",
-                        "label": dynamic_location.label,
-                    }
-                )
-        dates_with_labels.sort(key=lambda x: x["timepoint"])
+        )
+
+        dates_with_labels = [
+            {
+                "timepoint": event.timepoint,
+                "id": str(event.action_id),
+                "type": event.type,
+                "label": event.label,
+            }
+            for event in events
+        ]
 
         return dates_with_labels
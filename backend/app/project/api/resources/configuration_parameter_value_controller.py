@@ -9,8 +9,8 @@
 import dateutil.parser
 from flask import g, request
 from flask_rest_jsonapi import ResourceList
+from sqlalchemy.orm import selectinload
 
-from ..helpers.date_time_range import DateTimeRange
 from ..helpers.errors import (
     BadRequestError,
     ForbiddenError,
@@ -18,7 +18,15 @@ from ..helpers.errors import (
     NotFoundError,
     UnauthorizedError,
 )
-from ..models import Configuration
+from ..models import (
+    Configuration,
+    Device,
+    DeviceMountAction,
+    DeviceParameter,
+    Platform,
+    PlatformMountAction,
+    PlatformParameter,
+)
 from ..models.base_model import db
 from ..permissions.rules import can_see
 
@@ -70,66 +78,86 @@ class ControllerConfigurationParameterValues(ResourceList):
                     },
                 }
             )
-        for mount_action in configuration.device_mount_actions:
-            mount_range = DateTimeRange(mount_action.begin_date, mount_action.end_date)
-            if mount_range.overlaps_with(DateTimeRange(timepoint, timepoint)):
-                device = mount_action.device
-                for parameter in device.device_parameters:
-                    latest_action = None
-                    for value_change in parameter.device_parameter_value_change_actions:
-                        if value_change.date <= timepoint:
-                            if (
-                                latest_action is None
-                                or latest_action.date < value_change.date
-                            ):
-                                latest_action = value_change
-                    value = None
-                    if latest_action is not None:
-                        value = latest_action.value
+        device_mount_actions = (
+            db.session.query(DeviceMountAction)
+            .filter(
+                DeviceMountAction.configuration_id == configuration.id,
+                DeviceMountAction.half_open_period_overlaps(timepoint, timepoint),
+            )
+            .options(
+                selectinload(DeviceMountAction.device)
+                .selectinload(Device.device_parameters)
+                .selectinload(DeviceParameter.device_parameter_value_change_actions)
+            )
+            .order_by(DeviceMountAction.id)
+        )
+        for mount_action in device_mount_actions:
+            device = mount_action.device
+            for parameter in device.device_parameters:
+                latest_action = None
+                for value_change in parameter.device_parameter_value_change_actions:
+                    if value_change.date <= timepoint:
+                        if (
+                            latest_action is None
+                            or latest_action.date < value_change.date
+                        ):
+                            latest_action = value_change
+                value = None
+                if latest_action is not None:
+                    value = latest_action.value
 
-                    result.append(
-                        {
-                            "id": str(parameter.id),
-                            "type": "device_parameter",
-                            "attributes": {
-                                "label": parameter.label,
-                                "value": value,
-                                "unit_uri": parameter.unit_uri,
-                                "unit_name": parameter.unit_name,
-                            },
-                        }
-                    )
-        for mount_action in configuration.platform_mount_actions:
-            mount_range = DateTimeRange(mount_action.begin_date, mount_action.end_date)
-            if mount_range.overlaps_with(DateTimeRange(timepoint, timepoint)):
-                platform = mount_action.platform
-                for parameter in platform.platform_parameters:
-                    latest_action = None
-                    for (
-                        value_change
-                    ) in parameter.platform_parameter_value_change_actions:
-                        if value_change.date <= timepoint:
-                            if (
-                                latest_action is None
-                                or latest_action.date < value_change.date
-                            ):
-                                latest_action = value_change
-                    value = None
-                    if latest_action is not None:
-                        value = latest_action.value
+                result.append(
+                    {
+                        "id": str(parameter.id),
+                        "type": "device_parameter",
+                        "attributes": {
+                            "label": parameter.label,
+                            "value": value,
+                            "unit_uri": parameter.unit_uri,
+                            "unit_name": parameter.unit_name,
+                        },
+                    }
+                )
+        platform_mount_actions = (
+            db.session.query(PlatformMountAction)
+            .filter(
+                PlatformMountAction.configuration_id == configuration.id,
+                PlatformMountAction.half_open_period_overlaps(timepoint, timepoint),
+            )
+            .options(
+                selectinload(PlatformMountAction.platform)
+                .selectinload(Platform.platform_parameters)
+                .selectinload(PlatformParameter.platform_parameter_value_change_actions)
+            )
+            .order_by(PlatformMountAction.id)
+        )
+        for mount_action in platform_mount_actions:
+            platform = mount_action.platform
+            for parameter in platform.platform_parameters:
+                latest_action = None
+                for value_change in parameter.platform_parameter_value_change_actions:
+                    if value_change.date <= timepoint:
+                        if (
+                            latest_action is None
+                            or latest_action.date < value_change.date
+                        ):
+                            latest_action = value_change
+                value = None
+                if latest_action is not None:
+                    value = latest_action.value
 
-                    result.append(
-                        {
-                            "id": str(parameter.id),
-                            "type": "platform_parameter",
-                            "attributes": {
-                                "label": parameter.label,
-                                "value": value,
-                                "unit_uri": parameter.unit_uri,
-                                "unit_name": parameter.unit_name,
-                            },
-                        }
-                    )
+                result.append(
+                    {
+                        "id": str(parameter.id),
+                        "type": "platform_parameter",
+                        "attributes": {
+                            "label": parameter.label,
+                            "value": value,
+                            "unit_uri": parameter.unit_uri,
+                            "unit_name": parameter.unit_name,
+                        },
+                    }
+                )
 
         return {
             "data": result,
@@ -145,6 +145,8 @@ class ConfigurationList(MqttNotificationMixin, ResourceList):
         "session": db.session,
         "model": Configuration,
         "class": EsSqlalchemyDataLayer,
+        # Serve list requests with sparse fieldsets from the search index.
+        "serialize_from_es_source": True,
         "methods": {
             "before_create_object": before_create_object,
             "query": query,
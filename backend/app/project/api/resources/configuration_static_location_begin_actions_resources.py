@@ -30,16 +30,21 @@ from .base_resource import (
     query_configuration_set_update_description_and_update_pidinst,
     set_update_description_text_user_and_pidinst,
 )
+from .mixins.exclusion_constraint import ExclusionConstraintMixin
 from .mixins.mqtt_notification import MqttNotificationMixin
 
 
-class ConfigurationStaticLocationBeginActionList(MqttNotificationMixin, ResourceList):
+class ConfigurationStaticLocationBeginActionList(
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceList
+):
     """List resource for Configuration static location begin actions (get, post)."""
 
+    validator = StaticLocationActionValidator()
+
     def before_create_object(self, data, *args, **kwargs):
         """Run some validations before we create the object."""
         data_with_relationships = decode_json_request_data()
-        StaticLocationActionValidator().validate_create(data_with_relationships)
+        self.validator.validate_create(data_with_relationships)
         add_created_by_id(data)
 
     def query(self, view_kwargs):
@@ -97,7 +102,7 @@ class ConfigurationStaticLocationBeginActionList(MqttNotificationMixin, Resource
 
 
 class ConfigurationStaticLocationBeginActionDetail(
-    MqttNotificationMixin, ResourceDetail
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceDetail
 ):
     """Detail resource for Configuration static location begin actions (get, delete, patch)."""
 
@@ -135,6 +135,8 @@ class ContactList(MqttNotificationMixin, ResourceList):
         "session": db.session,
         "model": Contact,
         "class": EsSqlalchemyDataLayer,
+        # Serve list requests with sparse fieldsets from the search index.
+        "serialize_from_es_source": True,
         "methods": {"query": query, "before_create_object": before_create_object},
     }
     permission_classes = [DelegateToCanFunctions]
@@ -25,10 +25,13 @@ from ..resources.base_resource import (
     set_update_description_text_user_and_pidinst,
 )
 from ..schemas.mount_actions_schema import DeviceMountActionSchema
+from .mixins.exclusion_constraint import ExclusionConstraintMixin
 from .mixins.mqtt_notification import MqttNotificationMixin
 
 
-class DeviceMountActionList(MqttNotificationMixin, ResourceList):
+class DeviceMountActionList(
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceList
+):
     """List resource for device mount actions (get, post)."""
 
     validator = DeviceMountActionValidator()
@@ -108,7 +111,9 @@ class DeviceMountActionList(MqttNotificationMixin, ResourceList):
     permission_classes = [DelegateToCanFunctions]
 
 
-class DeviceMountActionDetail(MqttNotificationMixin, ResourceDetail):
+class DeviceMountActionDetail(
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceDetail
+):
     """Detail resource for device mount actions (get, delete, patch)."""
 
     validator = DeviceMountActionValidator()
@@ -151,6 +151,8 @@ class DeviceList(MqttNotificationMixin, CsvListMixin, ResourceList):
         "session": db.session,
         "model": Device,
         "class": EsSqlalchemyDataLayer,
+        # Serve list requests with sparse fieldsets from the search index.
+        "serialize_from_es_source": True,
         "methods": {
             "before_create_object": before_create_object,
             "query": query,
@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Resources for the free & busy timelines of devices & platforms."""
+
+import itertools
+
+from flask import g, request
+from flask_rest_jsonapi import ResourceList
+from marshmallow import Schema, fields
+from sqlalchemy import and_
+
+from ..helpers.date_time_range import DateTimeRange
+from ..helpers.errors import BadRequestError, MethodNotAllowed, UnauthorizedError
+from ..helpers.free_busy import free_busy_timeline
+from ..models import (
+    Configuration,
+    Device,
+    DeviceMountAction,
+    Platform,
+    PlatformMountAction,
+)
+from ..models.base_model import db
+from .mounting_availabilities import extract_time_range_from_request
+
+
+class BusyIntervalSchema(Schema):
+    """Schema for a busy interval."""
+
+    class Meta:
+        """Meta class for the schema."""
+
+        ordered = True
+
+    begin_date = fields.DateTime()
+    end_date = fields.DateTime()
+    configuration_id = fields.Str()
+    configuration_label = fields.Str()
+    mounts = fields.List(fields.Str())
+
+
+class FreeIntervalSchema(Schema):
+    """Schema for a free gap."""
+
+    class Meta:
+        """Meta class for the schema."""
+
+        ordered = True
+
+    begin_date = fields.DateTime()
+    end_date = fields.DateTime()
+
+
+class FreeBusyTimelineSchema(Schema):
+    """Schema for the free & busy timeline of one device or platform."""
+
+    class Meta:
+        """Meta class for the schema."""
+
+        ordered = True
+
+    id = fields.Str()
+    next_free = fields.DateTime()
+    busy = fields.List(fields.Nested(BusyIntervalSchema))
+    free = fields.List(fields.Nested(FreeIntervalSchema))
+
+
+class FreeBusyTimelines(ResourceList):
+    """
+    Base class to return the free & busy timelines for a horizon.
+
+    We load the mounts of all the ids with one query & sweep over
+    the mounts of each device or platform afterwards.
+    """
+
+    model = None
+    mount_model = None
+    mount_model_object_id_attribute = None
+
+    def get(self, *args, **kwargs):
+        """Return the list with the free & busy intervals of the objects."""
+        if not g.user:
+            raise UnauthorizedError("Authentication required.")
+        if "ids" not in request.args.keys():
+            raise BadRequestError("Parameter ids not provided.")
+        try:
+            object_ids = [int(v) for v in request.args["ids"].split(",") if v != ""]
+        except ValueError:
+            raise BadRequestError("ids must be integers")
+        from_time_point, to_time_point = extract_time_range_from_request()
+        try:
+            horizon = DateTimeRange(from_time_point, to_time_point)
+        except ValueError:
+            raise BadRequestError("from must be before to")
+        # As for the availabilities we don't show information about
+        # private objects.
+        object_ids = [
+            x.id
+            for x in db.session.query(self.model.id)
+            .filter(
+                and_(self.model.is_private.is_(False), self.model.id.in_(object_ids))
+            )
+            .order_by(self.model.id)
+        ]
+
+        object_id_column = getattr(
+            self.mount_model, self.mount_model_object_id_attribute
+        )
+        mounts = (
+            db.session.query(
+                object_id_column.label("object_id"),
+                self.mount_model.id,
+                self.mount_model.begin_date,
+                self.mount_model.end_date,
+                self.mount_model.configuration_id,
+                Configuration.label.label("configuration_label"),
+            )
+            .join(Configuration, self.mount_model.configuration_id == Configuration.id)
+            .filter(
+                object_id_column.in_(object_ids),
+                self.mount_model.period_overlaps(horizon.begin_date, horizon.end_date),
+                self.mount_model.half_open_period_overlaps(
+                    horizon.begin_date, horizon.end_date
+                ),
+            )
+            .order_by(object_id_column, self.mount_model.begin_date)
+        )
+        mounts_by_object_id = {
+            object_id: list(object_mounts)
+            for object_id, object_mounts in itertools.groupby(
+                mounts, key=lambda mount: mount.object_id
+            )
+        }
+
+        payload = []
+        for object_id in object_ids:
+            timeline = free_busy_timeline(
+                mounts_by_object_id.get(object_id, []),
+                horizon.begin_date,
+                horizon.end_date,
+            )
+            next_free = None
+            if timeline["free"]:
+                next_free = timeline["free"][0]["begin_date"]
+            payload.append({"id": object_id, "next_free": next_free, **timeline})
+
+        schema = FreeBusyTimelineSchema(many=True)
+        return schema.dump(payload)
+
+    def post(self):
+        """Don't allow the post request."""
+        raise MethodNotAllowed("endpoint is readonly")
+
+
+class DeviceFreeBusyTimelines(FreeBusyTimelines):
+    """Returns the free & busy intervals of devices for a horizon."""
+
+    model = Device
+    mount_model = DeviceMountAction
+    mount_model_object_id_attribute = "device_id"
+
+
+class PlatformFreeBusyTimelines(FreeBusyTimelines):
+    """Returns the free & busy intervals of platforms for a horizon."""
+
+    model = Platform
+    mount_model = PlatformMountAction
+    mount_model_object_id_attribute = "platform_id"
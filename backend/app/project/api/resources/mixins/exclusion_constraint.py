@@ -0,0 +1,38 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Mixin class for the resources with exclusion constraints in the database."""
+
+from ...helpers.errors import ExclusionConstraintError
+from ...helpers.resource_mixin import decode_json_request_data
+
+
+class ExclusionConstraintMixin:
+    """
+    Class to be mixed in into resource classes with a validator.
+
+    The validators check for overlapping time ranges before we write
+    to the database. Parallel requests can pass those checks both - and
+    the exclusion constraint rejects the second one on the commit.
+    In this case we run the validator again, so that we answer with the
+    very same conflict message as for the sequential requests.
+    """
+
+    def post(self, *args, **kwargs):
+        """Run the post request & explain the conflicts of the constraints."""
+        try:
+            return super().post(*args, **kwargs)
+        except ExclusionConstraintError:
+            self.validator.validate_create(decode_json_request_data())
+            raise
+
+    def patch(self, *args, **kwargs):
+        """Run the patch request & explain the conflicts of the constraints."""
+        try:
+            return super().patch(*args, **kwargs)
+        except ExclusionConstraintError:
+            self.validator.validate_update(decode_json_request_data(), kwargs["id"])
+            raise
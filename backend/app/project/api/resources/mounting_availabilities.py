@@ -6,15 +6,25 @@
 
 """Resources for the mounting availabilities."""
 
+import json
+
 import dateutil.parser
-from flask import g, request
+from flask import current_app, g, request, stream_with_context
 from flask_rest_jsonapi import ResourceList
 from marshmallow import Schema, fields
 from sqlalchemy import and_
+from sqlalchemy.orm import contains_eager
 
 from ..helpers.date_time_range import DateTimeRange
 from ..helpers.errors import BadRequestError, MethodNotAllowed, UnauthorizedError
-from ..models import Device, DeviceMountAction, Platform, PlatformMountAction
+from ..helpers.interval_index import IntervalIndex
+from ..models import (
+    Configuration,
+    Device,
+    DeviceMountAction,
+    Platform,
+    PlatformMountAction,
+)
 from ..models.base_model import db
 
 
@@ -33,6 +43,9 @@ class AvailableObjectSchema(Schema):
     configuration_label = fields.Str()
     begin_date = fields.DateTime()
     end_date = fields.DateTime()
+    # Only for the bulk requests: The time range we asked for.
+    from_date = fields.DateTime(data_key="from")
+    to_date = fields.DateTime(data_key="to")
 
 
 class DeviceAvailabilities(ResourceList):
@@ -54,33 +67,45 @@ class DeviceAvailabilities(ResourceList):
         )
         device_ids = [x.id for x in devices]
 
-        device_mounts = db.session.query(DeviceMountAction).filter(
-            DeviceMountAction.device_id.in_(device_ids)
-        )
-
         from_time_point, to_time_point = extract_time_range_from_request()
-
-        payload = []
-        device_ids_add_to_payload = []
         timerange = DateTimeRange(from_time_point, to_time_point)
-        for device_mount in device_mounts:
-            existing_range = DateTimeRange(
-                device_mount.begin_date, device_mount.end_date
+
+        # The sql condition is a prefilter only (it includes the mounts
+        # that end right at the beginning of the time range).
+        # We load the configurations with the very same query (for the labels).
+        device_mounts = (
+            db.session.query(DeviceMountAction)
+            .join(DeviceMountAction.configuration)
+            .options(contains_eager(DeviceMountAction.configuration))
+            .filter(
+                DeviceMountAction.device_id.in_(device_ids),
+                DeviceMountAction.period_overlaps(
+                    timerange.begin_date, timerange.end_date
+                ),
             )
+        )
 
-            if timerange.overlaps_with(existing_range):
+        indices = IntervalIndex.group_by(
+            device_mounts, key=lambda device_mount: device_mount.device_id
+        )
 
+        payload = []
+        device_ids_add_to_payload = []
+        for device_id, index in indices.items():
+            for device_mount in index.overlapping(
+                timerange.begin_date, timerange.end_date
+            ):
                 element_payload = {
-                    "id": device_mount.device.id,
+                    "id": device_mount.device_id,
                     "available": False,
                     "mount": device_mount.id,
-                    "configuration_id": device_mount.configuration.id,
+                    "configuration_id": device_mount.configuration_id,
                     "configuration_label": device_mount.configuration.label,
                     "begin_date": device_mount.begin_date,
                     "end_date": device_mount.end_date,
                 }
                 payload.append(element_payload)
-                device_ids_add_to_payload.append(device_mount.device.id)
+                device_ids_add_to_payload.append(device_id)
 
         add_an_element_if_id_not_in_list(device_ids, payload, device_ids_add_to_payload)
 
@@ -112,33 +137,45 @@ class PlatformAvailabilities(ResourceList):
             and_(Platform.is_private.is_(False), Platform.id.in_(platform_ids))
         )
         platform_ids = [x.id for x in platforms]
-        platform_mounts = db.session.query(PlatformMountAction).filter(
-            PlatformMountAction.platform_id.in_(platform_ids)
-        )
-
         from_time_point, to_time_point = extract_time_range_from_request()
-
-        payload = []
-        platform_ids_add_to_payload = []
         asked_timerange = DateTimeRange(from_time_point, to_time_point)
-        for platform_mount in platform_mounts:
-            existing_range = DateTimeRange(
-                platform_mount.begin_date, platform_mount.end_date
+
+        # The sql condition is a prefilter only (it includes the mounts
+        # that end right at the beginning of the time range).
+        # We load the configurations with the very same query (for the labels).
+        platform_mounts = (
+            db.session.query(PlatformMountAction)
+            .join(PlatformMountAction.configuration)
+            .options(contains_eager(PlatformMountAction.configuration))
+            .filter(
+                PlatformMountAction.platform_id.in_(platform_ids),
+                PlatformMountAction.period_overlaps(
+                    asked_timerange.begin_date, asked_timerange.end_date
+                ),
             )
+        )
 
-            if asked_timerange.overlaps_with(existing_range):
+        indices = IntervalIndex.group_by(
+            platform_mounts, key=lambda platform_mount: platform_mount.platform_id
+        )
 
+        payload = []
+        platform_ids_add_to_payload = []
+        for platform_id, index in indices.items():
+            for platform_mount in index.overlapping(
+                asked_timerange.begin_date, asked_timerange.end_date
+            ):
                 element_payload = {
-                    "id": platform_mount.platform.id,
+                    "id": platform_mount.platform_id,
                     "available": False,
                     "mount": platform_mount.id,
-                    "configuration_id": platform_mount.configuration.id,
+                    "configuration_id": platform_mount.configuration_id,
                     "configuration_label": platform_mount.configuration.label,
                     "begin_date": platform_mount.begin_date,
                     "end_date": platform_mount.end_date,
                 }
                 payload.append(element_payload)
-                platform_ids_add_to_payload.append(platform_mount.platform.id)
+                platform_ids_add_to_payload.append(platform_id)
 
         add_an_element_if_id_not_in_list(
             platform_ids, payload, platform_ids_add_to_payload
@@ -153,6 +190,140 @@ class PlatformAvailabilities(ResourceList):
         raise MethodNotAllowed("endpoint is readonly")
 
 
+class BulkAvailabilities(ResourceList):
+    """
+    Base class to return the availabilities for many ids & time ranges.
+
+    The ids & time ranges are part of the json body of the post request:
+
+    {
+        "ids": [1, 2, 3],
+        "time_ranges": [
+            {"from": "2022-01-01T00:00:00Z", "to": "2022-02-01T00:00:00Z"},
+            {"from": "2023-01-01T00:00:00Z"}
+        ]
+    }
+
+    The overlap checks run in the database (one query per time range),
+    and we stream the entries of the result list.
+    """
+
+    model = None
+    mount_model = None
+    mount_model_object_id_attribute = None
+    # Size of the batches we fetch from the database.
+    batch_size = 1000
+
+    def get(self, *args, **kwargs):
+        """Don't allow the get request."""
+        raise MethodNotAllowed("endpoint is post only")
+
+    def post(self, *args, **kwargs):
+        """Return a list with availability information for the time ranges."""
+        if not g.user:
+            raise UnauthorizedError("Authentication required.")
+        object_ids, time_ranges = extract_ids_and_time_ranges_from_json()
+        # Same as for the get requests: We don't show information about
+        # private objects.
+        object_ids = [
+            x.id
+            for x in db.session.query(self.model.id)
+            .filter(
+                and_(self.model.is_private.is_(False), self.model.id.in_(object_ids))
+            )
+            .order_by(self.model.id)
+        ]
+        schema = AvailableObjectSchema()
+
+        def generate():
+            separator = ""
+            yield "["
+            for time_range in time_ranges:
+                for element_payload in self.availabilities(object_ids, time_range):
+                    yield separator + json.dumps(schema.dump(element_payload))
+                    separator = ","
+            yield "]"
+
+        return current_app.response_class(
+            stream_with_context(generate()), mimetype="application/vnd.api+json"
+        )
+
+    def availabilities(self, object_ids, time_range):
+        """Return the availability information for the time range."""
+        object_id_column = getattr(
+            self.mount_model, self.mount_model_object_id_attribute
+        )
+        # The period_overlaps condition is for the range index, the
+        # half open one for the exact semantic of the DateTimeRange.
+        mounts = (
+            db.session.query(
+                object_id_column,
+                self.mount_model.id,
+                self.mount_model.configuration_id,
+                Configuration.label,
+                self.mount_model.begin_date,
+                self.mount_model.end_date,
+            )
+            .join(Configuration, self.mount_model.configuration_id == Configuration.id)
+            .filter(
+                object_id_column.in_(object_ids),
+                self.mount_model.period_overlaps(
+                    time_range.begin_date, time_range.end_date
+                ),
+                self.mount_model.half_open_period_overlaps(
+                    time_range.begin_date, time_range.end_date
+                ),
+            )
+            .order_by(object_id_column, self.mount_model.begin_date)
+            .yield_per(self.batch_size)
+        )
+        unavailable_ids = set()
+        for (
+            object_id,
+            mount_id,
+            configuration_id,
+            configuration_label,
+            begin_date,
+            end_date,
+        ) in mounts:
+            unavailable_ids.add(object_id)
+            yield {
+                "id": object_id,
+                "available": False,
+                "mount": mount_id,
+                "configuration_id": configuration_id,
+                "configuration_label": configuration_label,
+                "begin_date": begin_date,
+                "end_date": end_date,
+                "from_date": time_range.begin_date,
+                "to_date": time_range.end_date,
+            }
+        for object_id in object_ids:
+            if object_id not in unavailable_ids:
+                yield {
+                    "id": object_id,
+                    "available": True,
+                    "from_date": time_range.begin_date,
+                    "to_date": time_range.end_date,
+                }
+
+
+class DeviceBulkAvailabilities(BulkAvailabilities):
+    """Returns the availabilities of many devices for several time ranges."""
+
+    model = Device
+    mount_model = DeviceMountAction
+    mount_model_object_id_attribute = "device_id"
+
+
+class PlatformBulkAvailabilities(BulkAvailabilities):
+    """Returns the availabilities of many platforms for several time ranges."""
+
+    model = Platform
+    mount_model = PlatformMountAction
+    mount_model_object_id_attribute = "platform_id"
+
+
 def extract_time_range_from_request():
     """
     Extract from and to for datetime interval from request.
@@ -178,6 +349,42 @@ def extract_time_range_from_request():
     return from_time_point, to_time_point
 
 
+def extract_ids_and_time_ranges_from_json():
+    """
+    Extract the ids & the time ranges from the json body of the request.
+
+    :return two lists: the ids and DateTimeRange objects
+    """
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        raise BadRequestError("json body with ids and time_ranges required")
+    ids = payload.get("ids")
+    if not isinstance(ids, list):
+        raise BadRequestError("ids must be a list")
+    try:
+        ids = [int(v) for v in ids]
+    except (TypeError, ValueError):
+        raise BadRequestError("ids must be integers")
+    time_ranges = payload.get("time_ranges")
+    if not isinstance(time_ranges, list) or not time_ranges:
+        raise BadRequestError("time_ranges must be a non empty list")
+    result = []
+    for time_range in time_ranges:
+        if not isinstance(time_range, dict) or not time_range.get("from"):
+            raise BadRequestError("time-point parameters (from and to) are required")
+        try:
+            from_time_point = dateutil.parser.parse(time_range["from"])
+            to_time_point = None
+            if time_range.get("to"):
+                to_time_point = dateutil.parser.parse(time_range["to"])
+            result.append(DateTimeRange(from_time_point, to_time_point))
+        except (dateutil.parser.ParserError, TypeError):
+            raise BadRequestError("time-point must be ISO 8601")
+        except ValueError:
+            raise BadRequestError("from must be before to")
+    return ids, result
+
+
 def add_an_element_if_id_not_in_list(ids, payload, platform_ids_add_to_payload):
     """
     Add an entry as available if it is listed as unavailable before.
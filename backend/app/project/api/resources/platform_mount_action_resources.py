@@ -30,10 +30,13 @@ from ..resources.base_resource import (
     set_update_description_text_user_and_pidinst,
 )
 from ..schemas.mount_actions_schema import PlatformMountActionSchema
+from .mixins.exclusion_constraint import ExclusionConstraintMixin
 from .mixins.mqtt_notification import MqttNotificationMixin
 
 
-class PlatformMountActionList(MqttNotificationMixin, ResourceList):
+class PlatformMountActionList(
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceList
+):
     """List resource for platform mount actions (get, post)."""
 
     validator = PlatformMountActionValidator()
@@ -124,7 +127,9 @@ class PlatformMountActionList(MqttNotificationMixin, ResourceList):
     permission_classes = [DelegateToCanFunctions]
 
 
-class PlatformMountActionDetail(MqttNotificationMixin, ResourceDetail):
+class PlatformMountActionDetail(
+    MqttNotificationMixin, ExclusionConstraintMixin, ResourceDetail
+):
     """Detail resource for platform mount actions (get, delete, patch)."""
 
     validator = PlatformMountActionValidator()
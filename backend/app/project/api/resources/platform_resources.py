@@ -150,6 +150,8 @@ class PlatformList(MqttNotificationMixin, CsvListMixin, ResourceList):
         "session": db.session,
         "model": Platform,
         "class": EsSqlalchemyDataLayer,
+        # Serve list requests with sparse fieldsets from the search index.
+        "serialize_from_es_source": True,
         "methods": {
             "before_create_object": before_create_object,
             "query": query,
@@ -116,6 +116,8 @@ class SiteList(MqttNotificationMixin, ResourceList):
             "before_create_object": before_create_object,
         },
         "class": EsSqlalchemyDataLayer,
+        # Serve list requests with sparse fieldsets from the search index.
+        "serialize_from_es_source": True,
     }
     permission_classes = [DelegateToCanFunctions]
 
@@ -14,57 +14,637 @@ https://blog.miguelgrinberg.com/post/the-flask-mega-tutorial-part-xvi-full-text-
 after most of the source code here was adapted.
 """
 
+import base64
+import binascii
+import collections
+import contextlib
+import datetime
+import hashlib
+import json
+import time
+
+from elasticsearch import ApiError, NotFoundError, TransportError
+from elasticsearch.helpers import scan
 from flask import current_app
 
+from ..extensions.search_circuit_breaker import SearchCircuitOpenError
+from .helpers.errors import ServiceUnavailableError
+
+BulkAction = collections.namedtuple(
+    "BulkAction", ["operation", "index", "id", "payload"]
+)
+# Replace the embedded entries with the given id in the documents
+# that match the query. The paths are (field, key) tuples - with
+# a key we replace element[key] for the elements of the array in the
+# field. Without a key we replace the array element itself.
+PartialSearchUpdate = collections.namedtuple(
+    "PartialSearchUpdate", ["index", "query", "paths", "id", "entry"]
+)
+
+# Painless script for the PartialSearchUpdate.
+# We compare the ids as strings, as they can be stored as numbers
+# or as strings (depending on the mapping of the embedded entry).
+REPLACE_EMBEDDED_ENTRIES_SCRIPT = """
+boolean changed = false;
+for (path in params.paths) {
+  def elements = ctx._source[path.field];
+  if (elements == null) {
+    continue;
+  }
+  for (int i = 0; i < elements.size(); i++) {
+    def element = elements[i];
+    if (path.key == null) {
+      if (element != null && String.valueOf(element.id) == params.id) {
+        elements[i] = params.entry;
+        changed = true;
+      }
+    } else if (element != null && element[path.key] != null) {
+      if (String.valueOf(element[path.key].id) == params.id) {
+        element[path.key] = params.entry;
+        changed = true;
+      }
+    }
+  }
+}
+if (!changed) {
+  ctx.op = 'noop';
+}
+"""
+
+
+# Keys in the queries for that the order of the entries doesn't matter.
+UNORDERED_QUERY_KEYS = {"must", "filter", "should", "must_not", "terms"}
+
+
+def freeze_query(value, unordered=False):
+    """
+    Convert the query (or the ordering) into nested tuples.
+
+    The result is hashable & the order of the clauses in bool & terms
+    queries doesn't matter - so we can use it as key for a cache.
+    """
+    if isinstance(value, dict):
+        return tuple(
+            sorted(
+                (
+                    (
+                        key,
+                        freeze_query(
+                            sub_value,
+                            unordered=unordered or key in UNORDERED_QUERY_KEYS,
+                        ),
+                    )
+                    for key, sub_value in value.items()
+                ),
+                key=repr,
+            )
+        )
+    if isinstance(value, (list, tuple)):
+        entries = [freeze_query(v) for v in value]
+        if unordered:
+            entries = sorted(entries, key=repr)
+        return tuple(entries)
+    return value
+
+
+def is_search_unavailable(error):
+    """
+    Return True if the error means that the elasticsearch is not available.
+
+    Those are connection problems, timeouts & server errors - but not
+    the errors for invalid queries. Also if the circuit breaker doesn't
+    let us send requests anymore.
+    """
+    if isinstance(error, (TransportError, SearchCircuitOpenError)):
+        return True
+    if isinstance(error, ApiError):
+        return error.meta.status >= 500
+    return False
+
+
+def get_search_cache():
+    """Return the cache for the search results."""
+    return current_app.extensions["search_cache"]
+
+
+def get_search_circuit_breaker():
+    """Return the circuit breaker for the search requests."""
+    return current_app.extensions["search_circuit_breaker"]
+
+
+def is_search_circuit_open():
+    """Return True if the circuit breaker doesn't allow search requests."""
+    return get_search_circuit_breaker().is_open()
+
+
+@contextlib.contextmanager
+def search_circuit():
+    """
+    Run the requests to the elasticsearch with the circuit breaker.
+
+    We raise a SearchCircuitOpenError if the circuit is open & record the
+    time & the result of the requests otherwise.
+    """
+    circuit_breaker = get_search_circuit_breaker()
+    if not circuit_breaker.allow_request():
+        raise SearchCircuitOpenError("The circuit breaker for the search is open")
+    start = time.monotonic()
+    try:
+        yield
+    except Exception as e:
+        circuit_breaker.record(time.monotonic() - start, is_search_unavailable(e))
+        raise
+    circuit_breaker.record(time.monotonic() - start, False)
+
+
+@contextlib.contextmanager
+def search_unavailable_as_error():
+    """
+    Give a 503 response if the elasticsearch is not available.
+
+    This is for the endpoints that can't fall back to the database.
+    """
+    try:
+        yield
+    except Exception as e:
+        if not is_search_unavailable(e):
+            raise
+        raise ServiceUnavailableError("The full text search is not available.") from e
+
 
 def add_to_index(index, model, payload):
     """Add an entry to the index in the full text search."""
     if not current_app.elasticsearch:
         return
-    current_app.elasticsearch.index(index=index, id=model.id, document=payload)
+    with search_circuit():
+        current_app.elasticsearch.index(index=index, id=model.id, document=payload)
+    get_search_cache().invalidate(index)
 
 
 def remove_from_index(index, model):
     """Remove an entry from the index in the full text search."""
     if not current_app.elasticsearch:
         return
-    current_app.elasticsearch.delete(index=index, id=model.id)
+    with search_circuit():
+        current_app.elasticsearch.delete(index=index, id=model.id)
+    get_search_cache().invalidate(index)
 
 
-def query_index(index, query, page, per_page, ordering=None):
+def bulk(actions):
     """
-    Query the index with custom filters & pagination settings.
+    Send multiple index & delete operations in one request to the search.
+
+    The actions are BulkAction tuples (the payload is only used for
+    the index operation).
+
+    Returns a list with one entry per action: None if the operation
+    was fine, or the error message otherwise.
+    """
+    if not current_app.elasticsearch or not actions:
+        return [None for _ in actions]
+    operations = []
+    for action in actions:
+        meta = {"_index": action.index, "_id": action.id}
+        if action.operation == "delete":
+            operations.append({"delete": meta})
+        else:
+            operations.append({"index": meta})
+            operations.append(action.payload)
+    with search_circuit():
+        response = current_app.elasticsearch.bulk(operations=operations)
+    for index in {action.index for action in actions}:
+        get_search_cache().invalidate(index)
+    result = []
+    for item in response["items"]:
+        ((operation, item_result),) = item.items()
+        status = item_result.get("status", 200)
+        # If we want to delete an entry that is not in the index, then
+        # we are fine with it.
+        if status < 300 or (operation == "delete" and status == 404):
+            result.append(None)
+        else:
+            result.append(str(item_result.get("error", status)))
+    return result
+
+
+def update_embedded_entries(partial_update, max_attempts=3):
+    """
+    Replace embedded entries in the documents with a scripted update by query.
+
+    This way we don't need to rebuild & send the whole documents if
+    only one included entity changed (a contact that is part of
+    thousands of device entries for example).
+
+    The script is idempotent, so we can just run it again if some
+    of the documents were changed concurrently.
+    Returns the number of updated documents.
+    """
+    if not current_app.elasticsearch:
+        return 0
+    script = {
+        "source": REPLACE_EMBEDDED_ENTRIES_SCRIPT,
+        "lang": "painless",
+        "params": {
+            "paths": [
+                {"field": field, "key": key} for field, key in partial_update.paths
+            ],
+            "id": str(partial_update.id),
+            "entry": partial_update.entry,
+        },
+    }
+    updated = 0
+    for _ in range(max_attempts):
+        with search_circuit():
+            response = current_app.elasticsearch.update_by_query(
+                index=partial_update.index,
+                query=partial_update.query,
+                script=script,
+                conflicts="proceed",
+            )
+        updated += response.get("updated", 0)
+        get_search_cache().invalidate(partial_update.index)
+        if not response.get("version_conflicts"):
+            return updated
+    raise RuntimeError(
+        f"Could not update the embedded entries in {partial_update.index} "
+        + f"due to version conflicts (id: {partial_update.id})"
+    )
+
+
+def get_search_body(query, page, per_page, ordering=None):
+    """
+    Return the body for a search with filters & pagination settings.
 
     Ordering is optional as in any case we sort by the score first.
     Everthing else comes as secondary criteria.
     """
-    if not current_app.elasticsearch:
-        return [], 0
     sort = ["_score"]
     if ordering:
         for entry in ordering:
             sort.append(entry)
-    body = {
+    return {
         "query": query,
         # the from value is the beginning & starts counting with 0
         "from": (page - 1) * per_page,
         "size": per_page,
         "sort": sort,
     }
-    search = current_app.elasticsearch.search(
-        index=index,
-        **body,
-    )
+
+
+def query_index(index, query, page, per_page, ordering=None):
+    """
+    Query the index with custom filters & pagination settings.
+
+    Ordering is optional as in any case we sort by the score first.
+    Everthing else comes as secondary criteria.
+    """
+    if not current_app.elasticsearch:
+        return [], 0
+    body = get_search_body(query, page, per_page, ordering)
+    with search_circuit():
+        search = current_app.elasticsearch.search(
+            index=index,
+            **body,
+            # We only need the ids.
+            source=False,
+        )
     ids = [int(hit["_id"]) for hit in search["hits"]["hits"]]
     return ids, search["hits"]["total"]["value"]
 
 
+def query_index_with_facets(
+    index, query, page, per_page, ordering=None, facets=None, facet_size=20
+):
+    """
+    Query the index & compute terms aggregations for the facets.
+
+    We get the page of hits & the aggregations in one request.
+    Returns the ids, the total number of hits & a dict with the
+    buckets (value & count) per facet.
+    """
+    facets = facets or []
+    if not current_app.elasticsearch:
+        return [], 0, {facet: [] for facet in facets}
+    body = get_search_body(query, page, per_page, ordering)
+    with search_circuit():
+        search = current_app.elasticsearch.search(
+            index=index,
+            **body,
+            source=False,
+            aggregations={
+                facet: {"terms": {"field": facet, "size": facet_size}}
+                for facet in facets
+            },
+        )
+    ids = [int(hit["_id"]) for hit in search["hits"]["hits"]]
+    aggregations = search.get("aggregations", {})
+    facet_result = {
+        facet: [
+            {"value": bucket["key"], "count": bucket["doc_count"]}
+            for bucket in aggregations.get(facet, {}).get("buckets", [])
+        ]
+        for facet in facets
+    }
+    return ids, search["hits"]["total"]["value"], facet_result
+
+
+def multi_query_index_sources(searches, per_page):
+    """
+    Query multiple indices with one msearch request.
+
+    The searches are a list of (index, query, fields) tuples.
+    Returns a list with one (hits, total) tuple per search - with
+    the hits as (id, document) tuples that contain only the fields.
+    Searches that fail (a missing index for example) return no hits.
+    """
+    if not current_app.elasticsearch or not searches:
+        return [([], 0) for _ in searches]
+    body = []
+    for index, query, fields in searches:
+        body.append({"index": index})
+        body.append(
+            {
+                "query": query,
+                "size": per_page,
+                "_source": fields or False,
+                "track_total_hits": True,
+            }
+        )
+    with search_circuit():
+        response = current_app.elasticsearch.msearch(searches=body)
+    result = []
+    for (index, _, _), single_response in zip(searches, response["responses"]):
+        if "error" in single_response:
+            current_app.logger.warning(
+                "Search in %s failed: %s", index, single_response["error"]
+            )
+            result.append(([], 0))
+            continue
+        hits = [
+            (int(hit["_id"]), hit.get("_source", {}))
+            for hit in single_response["hits"]["hits"]
+        ]
+        result.append((hits, single_response["hits"]["total"]["value"]))
+    return result
+
+
+def query_index_labels(index, query, field, size):
+    """
+    Return the ids & the values of one field for the best hits.
+
+    This is meant for the suggestions, so we skip everything that we
+    don't need: No total number of hits & only the ids & the field
+    in the response.
+    Returns a list of (id, value) tuples.
+    """
+    if not current_app.elasticsearch:
+        return []
+    with search_circuit():
+        search = current_app.elasticsearch.search(
+            index=index,
+            query=query,
+            size=size,
+            source=[field],
+            track_total_hits=False,
+            filter_path=["hits.hits._id", "hits.hits._source"],
+        )
+    return [
+        (int(hit["_id"]), hit.get("_source", {}).get(field))
+        for hit in search.get("hits", {}).get("hits", [])
+    ]
+
+
+# How long the elasticsearch should keep the point in time for the
+# cursor pagination between two requests.
+POINT_IN_TIME_KEEP_ALIVE = "5m"
+
+
+class InvalidCursor(ValueError):
+    """Exception for cursors that we can't decode."""
+
+
+def get_cursor_hash(index, query, sort, fields):
+    """
+    Return a hash for the index & the query of the cursor pagination.
+
+    The sort values of a cursor only make sense for the very same
+    search - so we bind the cursors to it.
+    """
+    data = json.dumps([index, query, sort, fields], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def encode_cursor(pit_id, search_after, query_hash):
+    """Encode the point in time, the sort values of the last hit & the query hash."""
+    data = json.dumps({"pit": pit_id, "after": search_after, "query": query_hash})
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor, query_hash):
+    """
+    Decode the cursor to the point in time id & the sort values.
+
+    An empty cursor (or "*") starts the pagination - so both are None.
+    We raise an InvalidCursor if the cursor was created for another
+    index or query.
+    """
+    if cursor in [None, "", "*"]:
+        return None, None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        pit_id = data["pit"]
+        search_after = data["after"]
+        cursor_query_hash = data["query"]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor(str(e))
+    if not isinstance(pit_id, str) or not isinstance(search_after, list):
+        raise InvalidCursor("Unexpected content of the cursor")
+    if cursor_query_hash != query_hash:
+        raise InvalidCursor("The cursor belongs to another search")
+    return pit_id, search_after
+
+
+def close_point_in_time(pit_id):
+    """
+    Close the point in time in the elasticsearch.
+
+    This is just to free the resources early - the elasticsearch
+    removes it after the keep alive anyway. So we ignore the errors.
+    """
+    try:
+        with search_circuit():
+            current_app.elasticsearch.close_point_in_time(id=pit_id)
+    except (ApiError, TransportError, SearchCircuitOpenError) as e:
+        current_app.logger.warning("Could not close the point in time: %s", e)
+
+
+def query_index_after(index, query, per_page, ordering=None, cursor=None, fields=None):
+    """
+    Query the index with a point in time & search_after.
+
+    In contrast to query_index the costs of the request don't grow
+    with the page number & we are not limited by the max_result_window.
+    We use the _shard_doc as tiebreaker, so the order is stable.
+
+    Returns a list of (id, document) tuples (the documents are empty
+    without fields), the total number of hits & the cursor for
+    the next page (None if there are no more hits).
+    """
+    if not current_app.elasticsearch:
+        return [], 0, None
+    es = current_app.elasticsearch
+    sort = ["_score"]
+    if ordering:
+        sort.extend(ordering)
+    sort.append({"_shard_doc": "asc"})
+    query_hash = get_cursor_hash(index, query, sort, fields)
+    pit_id, search_after = decode_cursor(cursor, query_hash)
+    if pit_id is None:
+        with search_circuit():
+            pit_id = es.open_point_in_time(
+                index=index, keep_alive=POINT_IN_TIME_KEEP_ALIVE
+            )["id"]
+    kwargs = {}
+    if search_after is not None:
+        kwargs["search_after"] = search_after
+    # We close the point in time after the last page - and if the
+    # search fails, so that we don't keep it until the keep alive ends.
+    close = True
+    try:
+        with search_circuit():
+            search = es.search(
+                query=query,
+                size=per_page,
+                sort=sort,
+                pit={"id": pit_id, "keep_alive": POINT_IN_TIME_KEEP_ALIVE},
+                source=fields if fields is not None else False,
+                **kwargs,
+            )
+        hits = search["hits"]["hits"]
+        # The point in time id can change between the requests.
+        pit_id = search.get("pit_id", pit_id)
+        next_cursor = None
+        if hits and len(hits) >= per_page:
+            next_cursor = encode_cursor(pit_id, hits[-1]["sort"], query_hash)
+            close = False
+    except NotFoundError:
+        # The point in time is gone (we waited too long for the next page).
+        close = False
+        raise InvalidCursor("The cursor expired")
+    finally:
+        if close:
+            close_point_in_time(pit_id)
+    result = [(int(hit["_id"]), hit.get("_source", {})) for hit in hits]
+    return result, search["hits"]["total"]["value"], next_cursor
+
+
+def query_index_sources(index, query, page, per_page, ordering=None, fields=None):
+    """
+    Query the index like query_index - but return the stored documents.
+
+    The fields restrict the parts of the documents that we load.
+    Returns a list of (id, document) tuples & the total number of hits.
+    """
+    if not current_app.elasticsearch:
+        return [], 0
+    body = get_search_body(query, page, per_page, ordering)
+    with search_circuit():
+        search = current_app.elasticsearch.search(
+            index=index,
+            **body,
+            source=fields if fields is not None else True,
+        )
+    hits = [(int(hit["_id"]), hit.get("_source", {})) for hit in search["hits"]["hits"]]
+    return hits, search["hits"]["total"]["value"]
+
+
 def remove_index(index):
     """Remove an index for the full text search."""
     if not current_app.elasticsearch:
         return
     # if we don't have an index, it is fine
     current_app.elasticsearch.indices.delete(index=index, ignore_unavailable=True)
+    get_search_cache().invalidate(index)
+
+
+def switch_alias(alias, index):
+    """
+    Let the alias point to the index - and only to this one.
+
+    The change is atomic, so the search is working all the time.
+    Returns the list of indices that the alias pointed to before.
+    """
+    if not current_app.elasticsearch:
+        return []
+    indices = current_app.elasticsearch.indices
+    actions = []
+    old_indices = []
+    if indices.exists_alias(name=alias):
+        old_indices = [i for i in indices.get_alias(name=alias).keys() if i != index]
+        for old_index in old_indices:
+            actions.append({"remove": {"index": old_index, "alias": alias}})
+    elif indices.exists(index=alias):
+        # This is an index from the times before we used aliases.
+        # We can remove it in the very same step.
+        actions.append({"remove_index": {"index": alias}})
+    actions.append({"add": {"index": index, "alias": alias, "is_write_index": True}})
+    indices.update_aliases(actions=actions)
+    get_search_cache().invalidate(alias)
+    return old_indices
+
+
+def get_index_meta(index):
+    """Return the _meta data that we stored in the mapping of the index."""
+    if not current_app.elasticsearch:
+        return {}
+    indices = current_app.elasticsearch.indices
+    if not indices.exists(index=index):
+        return {}
+    # The index can be an alias, so we get the mappings of the
+    # concrete index.
+    for mapping in indices.get_mapping(index=index).values():
+        return dict(mapping.get("mappings", {}).get("_meta", {}))
+    return {}
+
+
+def update_index_meta(index, meta):
+    """Update the _meta data in the mapping of the index."""
+    if not current_app.elasticsearch:
+        return
+    new_meta = get_index_meta(index)
+    new_meta.update(meta)
+    current_app.elasticsearch.indices.put_mapping(index=index, meta=new_meta)
+
+
+def get_index_watermark(index):
+    """
+    Return the timestamp of the last (full or incremental) reindex.
+
+    Returns None if we don't know it.
+    """
+    value = get_index_meta(index).get("reindex_watermark")
+    if not value:
+        return None
+    return datetime.datetime.fromisoformat(value)
+
+
+def set_index_watermark(index, timestamp):
+    """Store the timestamp of the last reindex in the index."""
+    update_index_meta(index, {"reindex_watermark": timestamp.isoformat()})
+
+
+def yield_index_ids(index, batch_size=1000):
+    """Yield all the ids of the entries in the index."""
+    if not current_app.elasticsearch:
+        return
+    for hit in scan(
+        current_app.elasticsearch,
+        index=index,
+        query={"query": {"match_all": {}}},
+        _source=False,
+        size=batch_size,
+    ):
+        yield int(hit["_id"])
 
 
 def create_index(index, payload):
@@ -81,7 +661,8 @@ def create_index(index, payload):
         settings["mapping"]["total_fields"] = {}
     # As we have more and more fields (and quite a lot of ngram levels)
     # we need to increase the limit of total fields for the index.
-    settings["mapping"]["total_fields"]["limit"] = 2000
+    # (Unless the index settings give a limit).
+    settings["mapping"]["total_fields"].setdefault("limit", 2000)
 
     current_app.elasticsearch.indices.create(
         index=index,
@@ -89,3 +670,23 @@ def create_index(index, payload):
         mappings=mappings,
         settings=settings,
     )
+
+
+def update_index_settings(index, settings):
+    """Update the (dynamic) settings of the index."""
+    if not current_app.elasticsearch:
+        return
+    current_app.elasticsearch.indices.put_settings(index=index, settings=settings)
+
+
+def refresh_index(index):
+    """Make all the documents of the index searchable."""
+    if not current_app.elasticsearch:
+        return
+    current_app.elasticsearch.indices.refresh(index=index)
+
+
+def get_index_size(index):
+    """Return the size of the index on disk (primaries, in bytes)."""
+    stats = current_app.elasticsearch.indices.stats(index=index, metric="store")
+    return stats["indices"][index]["primaries"]["store"]["size_in_bytes"]
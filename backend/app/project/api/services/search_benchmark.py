@@ -0,0 +1,219 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Functions to measure the costs of the search."""
+
+import collections
+import contextlib
+import json
+import time
+
+import sqlalchemy
+from flask import current_app
+
+from ..datalayers.esalchemy import EsQueryBuilder, FilterOptimizer
+from ..models.base_model import db
+from ..models.mixin import get_searchable_models
+from ..search import create_index, get_index_size, refresh_index, remove_index
+
+SearchEntryBenchmarkResult = collections.namedtuple(
+    "SearchEntryBenchmarkResult",
+    ["index_name", "documents", "method", "queries", "seconds"],
+)
+
+SearchFilterBenchmarkResult = collections.namedtuple(
+    "SearchFilterBenchmarkResult",
+    ["index_name", "method", "query_size", "hits", "took", "seconds"],
+)
+
+IndexBenchmarkResult = collections.namedtuple(
+    "IndexBenchmarkResult",
+    ["index_name", "candidate", "documents", "size", "seconds", "took"],
+)
+
+# The index settings that we compare by default: The configured ones,
+# edge ngrams instead of ngrams & no text_analyzer subfields at all.
+default_index_candidates = {
+    "current": {},
+    "edge_ngram": {"ngram_type": "edge_ngram"},
+    "no_text_analyzer": {"text_analyzer_fields": []},
+}
+
+# Search strings for the patterns of the EsQueryBuilder: terms, phrases,
+# wildcards, negations & alternatives.
+default_index_queries = [
+    "sensor",
+    '"temperature sensor"',
+    "temp*",
+    "sensor -test",
+    "sensor OR logger",
+]
+
+
+class QueryCounter:
+    """Count the sql statements that we send to the database."""
+
+    def __init__(self):
+        """Init the object."""
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        """Count one statement (used as event listener)."""
+        self.count += 1
+
+
+@contextlib.contextmanager
+def count_queries():
+    """Count the queries that are executed within the context."""
+    counter = QueryCounter()
+    engine = db.session.get_bind()
+    sqlalchemy.event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        sqlalchemy.event.remove(engine, "before_cursor_execute", counter)
+
+
+def build_search_entries_one_by_one(model, ids):
+    """Build the entries the way we did it before (lazy loading)."""
+    return {
+        obj.id: obj.to_search_entry() for obj in model.query.filter(model.id.in_(ids))
+    }
+
+
+def benchmark_search_entries(index_name, limit=100):
+    """
+    Compare the queries to build the search entries one by one & in batch.
+
+    Returns a list of SearchEntryBenchmarkResult.
+    """
+    model = get_searchable_models()[index_name]
+    ids = [row.id for row in db.session.query(model.id).order_by(model.id).limit(limit)]
+    result = []
+    for method, function in [
+        ("one_by_one", build_search_entries_one_by_one),
+        ("batch", lambda model, ids: model.build_search_entries(ids)),
+    ]:
+        # We don't want to use the data that we loaded before.
+        db.session.expire_all()
+        start = time.monotonic()
+        with count_queries() as counter:
+            function(model, ids)
+        result.append(
+            SearchEntryBenchmarkResult(
+                index_name=index_name,
+                documents=len(ids),
+                method=method,
+                queries=counter.count,
+                seconds=time.monotonic() - start,
+            )
+        )
+    return result
+
+
+def benchmark_search_filter(index_name, search_filter, repetitions=10, size=20):
+    """
+    Compare the search latency for the original & the optimized filter.
+
+    Returns a list of SearchFilterBenchmarkResult with the size of the
+    (json) query, the number of hits & the average of the time that the
+    elasticsearch reports (took, in ms) & that we measure (seconds).
+    """
+    result = []
+    for method, filter_ in [
+        ("original", search_filter),
+        ("optimized", FilterOptimizer.optimize(search_filter)),
+    ]:
+        query = filter_.to_query()
+        took = 0
+        start = time.monotonic()
+        for _ in range(repetitions):
+            response = current_app.elasticsearch.search(
+                index=index_name,
+                query=query,
+                size=size,
+                source=False,
+                # We want to measure the query, not the cache.
+                request_cache=False,
+            )
+            took += response["took"]
+        result.append(
+            SearchFilterBenchmarkResult(
+                index_name=index_name,
+                method=method,
+                query_size=len(json.dumps(query)),
+                hits=response["hits"]["total"]["value"],
+                took=took / repetitions,
+                seconds=(time.monotonic() - start) / repetitions,
+            )
+        )
+    return result
+
+
+def benchmark_index_settings(
+    index_name, candidates=None, limit=1000, queries=None, repetitions=10, size=20
+):
+    """
+    Compare the costs of the search index for different index settings.
+
+    For each candidate (a name & the overrides for the configured
+    IndexSettings) we fill a temporary index with the entries of the model.
+    We measure the time for the indexing, the size on disk & the average
+    time that the elasticsearch reports (took, in ms) for the queries.
+    The temporary index is removed afterwards.
+
+    Returns a list of IndexBenchmarkResult.
+    """
+    if candidates is None:
+        candidates = default_index_candidates
+    if queries is None:
+        queries = default_index_queries
+    model = get_searchable_models()[index_name]
+    ids = [row.id for row in db.session.query(model.id).order_by(model.id).limit(limit)]
+    search_queries = [
+        FilterOptimizer.optimize(
+            EsQueryBuilder().with_request_args({"q": q}).to_filter(model)
+        ).to_query()
+        for q in queries
+    ]
+    result = []
+    for candidate, overrides in candidates.items():
+        index_settings = model.get_search_index_settings(**overrides)
+        index = f"{index_name}_bench_{candidate}"
+        remove_index(index)
+        create_index(index, index_settings.apply(model.get_search_index_definition()))
+        try:
+            start = time.monotonic()
+            documents = model.send_to_index(
+                index, model.query.filter(model.id.in_(ids))
+            )
+            refresh_index(index)
+            seconds = time.monotonic() - start
+            took = 0
+            for _ in range(repetitions):
+                for query in search_queries:
+                    response = current_app.elasticsearch.search(
+                        index=index,
+                        query=query,
+                        size=size,
+                        source=False,
+                        # We want to measure the query, not the cache.
+                        request_cache=False,
+                    )
+                    took += response["took"]
+            result.append(
+                IndexBenchmarkResult(
+                    index_name=index_name,
+                    candidate=candidate,
+                    documents=documents,
+                    size=get_index_size(index),
+                    seconds=seconds,
+                    took=took / max(repetitions * len(search_queries), 1),
+                )
+            )
+        finally:
+            remove_index(index)
+    return result
@@ -0,0 +1,230 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Functions to send the changes of the search outbox to the elasticsearch."""
+
+import collections
+import datetime
+import time
+
+import sqlalchemy
+from flask import current_app
+
+from ..models.base_model import db
+from ..models.mixin import get_searchable_models, utc_now
+from ..models.search_index_outbox import SearchIndexOutboxEntry
+from ..search import BulkAction, bulk
+
+
+def coalesce_outbox_entries(entries):
+    """
+    Group the outbox entries by the search index entry that they change.
+
+    We don't care how often an entity was changed - we send the latest
+    state to the elasticsearch only once.
+
+    Returns an ordered dict with (index_name, entity_id) as keys &
+    the list of outbox entries as values.
+    """
+    result = collections.OrderedDict()
+    for entry in entries:
+        key = (entry.index_name, entry.entity_id)
+        result.setdefault(key, []).append(entry)
+    return result
+
+
+def get_backoff_delay(attempts, backoff, max_backoff):
+    """Return the seconds to wait for the next try (exponential backoff)."""
+    if attempts <= 0:
+        return 0
+    # We limit the exponent so that we don't deal with giant numbers.
+    return min(max_backoff, backoff * 2 ** min(attempts - 1, 32))
+
+
+def lock_outbox_keys(keys):
+    """
+    Try to get the transaction locks for the search index entries.
+
+    This makes sure that multiple workers don't handle the very same
+    entry at the same time (so that an older state can't overwrite
+    a newer one in the elasticsearch).
+
+    Returns the set of keys that we could lock.
+    """
+    if not keys:
+        return set()
+    index_names = [key[0] for key in keys]
+    entity_ids = [key[1] for key in keys]
+    rows = db.session.execute(
+        sqlalchemy.text(
+            """
+            select t.index_name, t.entity_id,
+            pg_try_advisory_xact_lock(hashtext(t.index_name), t.entity_id) as locked
+            from unnest(cast(:index_names as text[]), cast(:entity_ids as integer[]))
+            as t(index_name, entity_id)
+            """
+        ),
+        {"index_names": index_names, "entity_ids": entity_ids},
+    )
+    return {(row.index_name, row.entity_id) for row in rows if row.locked}
+
+
+def build_bulk_actions(keys):
+    """
+    Build the bulk actions for the given keys.
+
+    We always use the current state of the database: If the entity
+    is still there, we send its search entry; otherwise we delete it
+    from the index.
+
+    Returns a dict with the actions & a dict with the errors that
+    we got while building the search entries.
+    """
+    models = get_searchable_models()
+    ids_by_index = collections.defaultdict(set)
+    for index_name, entity_id in keys:
+        ids_by_index[index_name].add(entity_id)
+
+    actions = {}
+    errors = {}
+    for index_name, ids in ids_by_index.items():
+        model = models.get(index_name)
+        if model is None:
+            for entity_id in ids:
+                errors[(index_name, entity_id)] = f"Unknown index {index_name}"
+            continue
+        existing = {obj.id: obj for obj in model.query_for_search_entries(ids)}
+        for entity_id in ids:
+            key = (index_name, entity_id)
+            obj = existing.get(entity_id)
+            if obj is None:
+                actions[key] = BulkAction(
+                    operation="delete", index=index_name, id=entity_id, payload=None
+                )
+                continue
+            try:
+                actions[key] = BulkAction(
+                    operation="index",
+                    index=index_name,
+                    id=entity_id,
+                    payload=obj.to_search_entry(),
+                )
+            except Exception as e:
+                errors[key] = repr(e)
+    return actions, errors
+
+
+def process_outbox_batch():
+    """
+    Send one batch of the outbox entries to the elasticsearch.
+
+    Returns the number of outbox entries that we handled.
+    """
+    config = current_app.config
+    batch_size = config.get("ELASTICSEARCH_OUTBOX_BATCH_SIZE", 500)
+    max_attempts = config.get("ELASTICSEARCH_OUTBOX_MAX_ATTEMPTS", 10)
+    backoff = config.get("ELASTICSEARCH_OUTBOX_BACKOFF", 2.0)
+    max_backoff = config.get("ELASTICSEARCH_OUTBOX_MAX_BACKOFF", 600.0)
+
+    max_wait = config.get("ELASTICSEARCH_INDIRECT_UPDATE_MAX_WAIT", 60.0)
+
+    now = utc_now()
+    outbox = SearchIndexOutboxEntry
+    # We only want those entries for which the debounce time is over
+    # for all the changes of the very same search index entry.
+    # (But we don't want to wait forever if there are changes all
+    # the time).
+    due_keys = (
+        db.session.query(outbox.index_name, outbox.entity_id)
+        .filter(outbox.attempts < max_attempts)
+        .group_by(outbox.index_name, outbox.entity_id)
+        .having(
+            sqlalchemy.or_(
+                sqlalchemy.func.max(outbox.next_attempt_at) <= now,
+                sqlalchemy.and_(
+                    sqlalchemy.func.max(outbox.attempts) == 0,
+                    sqlalchemy.func.min(outbox.created_at)
+                    <= now - datetime.timedelta(seconds=max_wait),
+                ),
+            )
+        )
+        .order_by(sqlalchemy.func.min(outbox.id))
+        .limit(batch_size)
+        .subquery()
+    )
+    entries = (
+        db.session.query(outbox)
+        .join(
+            due_keys,
+            sqlalchemy.and_(
+                outbox.index_name == due_keys.c.index_name,
+                outbox.entity_id == due_keys.c.entity_id,
+            ),
+        )
+        .filter(outbox.attempts < max_attempts)
+        .order_by(outbox.id)
+        .with_for_update(of=outbox, skip_locked=True)
+        .all()
+    )
+    grouped = coalesce_outbox_entries(entries)
+    locked_keys = lock_outbox_keys(list(grouped.keys()))
+    grouped = collections.OrderedDict(
+        (key, value) for key, value in grouped.items() if key in locked_keys
+    )
+    if not grouped:
+        db.session.rollback()
+        return 0
+
+    actions, errors = build_bulk_actions(grouped.keys())
+    keys_to_send = [key for key in grouped.keys() if key in actions.keys()]
+    try:
+        bulk_results = bulk([actions[key] for key in keys_to_send])
+    except Exception as e:
+        current_app.logger.exception(
+            "Search outbox batch failed for %s", ", ".join(map(str, keys_to_send))
+        )
+        bulk_results = [repr(e) for _ in keys_to_send]
+    for key, error in zip(keys_to_send, bulk_results):
+        if error:
+            errors[key] = error
+
+    handled = 0
+    for key, outbox_entries in grouped.items():
+        handled += len(outbox_entries)
+        error = errors.get(key)
+        if not error:
+            for outbox_entry in outbox_entries:
+                db.session.delete(outbox_entry)
+            continue
+        for outbox_entry in outbox_entries:
+            outbox_entry.attempts += 1
+            outbox_entry.last_error = error
+            outbox_entry.next_attempt_at = now + datetime.timedelta(
+                seconds=get_backoff_delay(outbox_entry.attempts, backoff, max_backoff)
+            )
+            if outbox_entry.attempts >= max_attempts:
+                current_app.logger.error(
+                    "Giving up to update the search index for %s: %s", key, error
+                )
+    db.session.commit()
+    return handled
+
+
+def run_outbox_worker(once=False, sleep=time.sleep):
+    """
+    Process the outbox entries continuously.
+
+    If once is set, we stop as soon as there are no more entries
+    that we can handle right now.
+    """
+    poll_interval = current_app.config.get("ELASTICSEARCH_OUTBOX_POLL_INTERVAL", 1.0)
+    while True:
+        handled = process_outbox_batch()
+        if handled:
+            continue
+        if once:
+            return
+        sleep(poll_interval)
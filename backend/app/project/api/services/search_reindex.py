@@ -0,0 +1,267 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Functions to rebuild the full text search indices."""
+
+import collections
+import datetime
+import itertools
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ..models.base_model import db
+from ..models.mixin import (
+    IndirectSearchableMixin,
+    SearchableMixin,
+    get_searchable_models,
+    utc_now,
+)
+from ..search import get_index_watermark, set_index_watermark
+
+# Transactions that run while we start the incremental reindex can
+# commit entries with an updated_at value before our watermark.
+# So we start a bit earlier when we resume.
+WATERMARK_SAFETY_MARGIN = datetime.timedelta(minutes=5)
+
+ReindexResult = collections.namedtuple(
+    "ReindexResult", ["index_name", "count", "seconds"]
+)
+
+
+def get_throughput(count, seconds):
+    """Return the number of entries per second."""
+    if seconds <= 0:
+        return 0.0
+    return count / seconds
+
+
+def reindex_model(index_name, batch_size=500):
+    """Reindex one model & print the progress."""
+    model = get_searchable_models()[index_name]
+    total = model.query.count()
+    start = time.monotonic()
+
+    def progress(count):
+        seconds = time.monotonic() - start
+        throughput = get_throughput(count, seconds)
+        print(
+            f"{index_name}: {count}/{total} entries ({throughput:.1f} entries/s)",
+            flush=True,
+        )
+
+    count = model.reindex(batch_size=batch_size, progress=progress)
+    return ReindexResult(
+        index_name=index_name, count=count, seconds=time.monotonic() - start
+    )
+
+
+def reindex_model_in_own_process(index_name, batch_size=500):
+    """Create a new app in the worker process & reindex one model."""
+    # We import it here, as this is only needed in the worker processes.
+    from ... import create_app
+
+    app = create_app()
+    with app.app_context():
+        return reindex_model(index_name, batch_size)
+
+
+def reindex_models(index_names, batch_size=500, processes=1):
+    """
+    Reindex the models & yield the results once a model is done.
+
+    With more than one process we run the models in parallel.
+    Every worker process uses its own app with its own database
+    connections.
+    """
+    if processes <= 1:
+        for index_name in index_names:
+            yield reindex_model(index_name, batch_size)
+        return
+    # We don't want to share the connection pools of this process
+    # with the workers, so we don't fork.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+        futures = [
+            executor.submit(reindex_model_in_own_process, index_name, batch_size)
+            for index_name in index_names
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def parse_timestamp(value):
+    """Parse an iso timestamp (we assume utc if there is no timezone)."""
+    result = datetime.datetime.fromisoformat(value)
+    if result.tzinfo is None:
+        result = result.replace(tzinfo=datetime.timezone.utc)
+    return result
+
+
+def chunked(iterable, size):
+    """Yield lists with up to size elements of the iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def has_update_timestamp(model):
+    """Return true if the model has an updated_at column."""
+    return "updated_at" in model.__mapper__.columns.keys()
+
+
+def get_indirect_or_searchable_models():
+    """Return the searchable & indirect searchable models."""
+    return [
+        mapper.class_
+        for mapper in db.Model.registry.mappers
+        if issubclass(mapper.class_, (SearchableMixin, IndirectSearchableMixin))
+    ]
+
+
+def get_models_with_update_timestamps():
+    """Return the searchable & indirect searchable models with updated_at."""
+    return [
+        model
+        for model in get_indirect_or_searchable_models()
+        if has_update_timestamp(model)
+    ]
+
+
+def yield_parent_search_paths(model):
+    """
+    Yield the searchable parents of the model with the relationships to them.
+
+    We follow the search_parent_relationships over multiple levels
+    (same as yield_searchables does it for the entities).
+    """
+    if not issubclass(model, IndirectSearchableMixin):
+        return
+    for path in model.search_parent_relationships:
+        parent = model
+        attributes = []
+        for name in path.split("."):
+            attribute = getattr(parent, name)
+            attributes.append(attribute)
+            parent = attribute.property.mapper.class_
+        if issubclass(parent, SearchableMixin):
+            yield parent, attributes
+        for searchable, more_attributes in yield_parent_search_paths(parent):
+            yield searchable, attributes + more_attributes
+
+
+def get_untracked_index_names():
+    """
+    Return the index names for that we can't find the changed entries.
+
+    Those are the indices of the searchables without updated_at, but
+    also those that include entities without updated_at (like the
+    contact roles for the devices).
+    For those we need the full reindex.
+    """
+    result = set()
+    for model in get_indirect_or_searchable_models():
+        if has_update_timestamp(model):
+            continue
+        if issubclass(model, SearchableMixin):
+            result.add(model.__tablename__)
+        for searchable, _attributes in yield_parent_search_paths(model):
+            result.add(searchable.__tablename__)
+    return result
+
+
+def get_changed_searchable_ids(since_by_index, batch_size=500):
+    """
+    Return the ids of the searchables that changed since the timestamps.
+
+    This includes the searchables that changed themselves, but also
+    those for which one of the included entities changed (the
+    device for an updated device property for example).
+    Deleted entities set the updated_at of their parents (see
+    SearchableMixin.touch_parent_searchables).
+
+    We use one query per model & parent - with the joins over the
+    relationships.
+
+    Returns a dict with the index names as keys & sets of ids as values.
+    """
+    result = collections.defaultdict(set)
+    if not since_by_index:
+        return result
+    for model in get_models_with_update_timestamps():
+        searchables = list(yield_parent_search_paths(model))
+        if issubclass(model, SearchableMixin):
+            searchables.append((model, []))
+        for searchable, attributes in searchables:
+            index_name = searchable.__tablename__
+            since = since_by_index.get(index_name)
+            if since is None:
+                continue
+            query = db.session.query(searchable.id).select_from(model)
+            for attribute in attributes:
+                query = query.join(attribute)
+            query = query.filter(model.updated_at >= since).distinct()
+            result[index_name].update(row.id for row in query.yield_per(batch_size))
+    return result
+
+
+def delete_removed_entries(index_name, batch_size=500):
+    """
+    Delete the entries in the index that are no longer in the database.
+
+    Returns the number of deleted entries.
+    """
+    model = get_searchable_models()[index_name]
+    return model.remove_deleted_from_index(index_name, batch_size)
+
+
+def reindex_models_incremental(index_names, since=None, batch_size=500):
+    """
+    Send only the entries that changed since the timestamp.
+
+    Without a timestamp we use the watermark of the last reindex
+    that we stored in the index. If there is none - or if we can't
+    find the changed entries for the model (see
+    get_untracked_index_names) - we run the full reindex for the model.
+
+    Yields the results once a model is done.
+    """
+    started_at = utc_now()
+    since_by_index = {}
+    untracked_index_names = get_untracked_index_names()
+    for index_name in index_names:
+        if index_name in untracked_index_names:
+            print(f"{index_name}: changes can't be tracked - running full reindex")
+            yield reindex_model(index_name, batch_size)
+            continue
+        if since is not None:
+            since_by_index[index_name] = since
+            continue
+        watermark = get_index_watermark(index_name)
+        if watermark is None:
+            print(f"{index_name}: no watermark found - running full reindex")
+            yield reindex_model(index_name, batch_size)
+        else:
+            since_by_index[index_name] = watermark - WATERMARK_SAFETY_MARGIN
+
+    changed_ids = get_changed_searchable_ids(since_by_index, batch_size)
+    models = get_searchable_models()
+    for index_name in since_by_index.keys():
+        start = time.monotonic()
+        model = models[index_name]
+        count = 0
+        for ids in chunked(sorted(changed_ids[index_name]), batch_size):
+            count += model.send_to_index(
+                index_name, model.query.filter(model.id.in_(ids)), batch_size
+            )
+        count += delete_removed_entries(index_name, batch_size)
+        set_index_watermark(index_name, started_at)
+        yield ReindexResult(
+            index_name=index_name, count=count, seconds=time.monotonic() - start
+        )
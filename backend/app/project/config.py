@@ -89,6 +89,92 @@ class BaseConfig:
     MQTT_TLS_ENABLED = env.bool("MQTT_TLS_ENABLED", False)
     OIDC_ENTITLEMENT_ALLOW_LIST = env.list("OIDC_ENTITLEMENT_ALLOW_LIST", [])
     OIDC_ENTITLEMENT_IGNORE_LIST = env.list("OIDC_ENTITLEMENT_IGNORE_LIST", [])
+    # If enabled we don't update the elasticsearch within the request.
+    # Instead we write the changes in an outbox table (same transaction
+    # as the data changes) & let the `flask es worker` send them in bulk.
+    ELASTICSEARCH_USE_OUTBOX = env.bool("ELASTICSEARCH_USE_OUTBOX", False)
+    ELASTICSEARCH_OUTBOX_BATCH_SIZE = env.int("ELASTICSEARCH_OUTBOX_BATCH_SIZE", 500)
+    ELASTICSEARCH_OUTBOX_MAX_ATTEMPTS = env.int("ELASTICSEARCH_OUTBOX_MAX_ATTEMPTS", 10)
+    # Seconds to wait if there is nothing to do for the worker.
+    ELASTICSEARCH_OUTBOX_POLL_INTERVAL = env.float(
+        "ELASTICSEARCH_OUTBOX_POLL_INTERVAL", 1.0
+    )
+    # Base & maximum of the exponential backoff for failed entries (in seconds).
+    ELASTICSEARCH_OUTBOX_BACKOFF = env.float("ELASTICSEARCH_OUTBOX_BACKOFF", 2.0)
+    ELASTICSEARCH_OUTBOX_MAX_BACKOFF = env.float(
+        "ELASTICSEARCH_OUTBOX_MAX_BACKOFF", 600.0
+    )
+    # Seconds to wait with the updates of the parents of indirect searchables
+    # (configurations for a changed device for example), so that
+    # multiple edits result in only one update. Needs the `flask es worker`.
+    # 0 means that we update them right away.
+    ELASTICSEARCH_INDIRECT_UPDATE_DEBOUNCE = env.float(
+        "ELASTICSEARCH_INDIRECT_UPDATE_DEBOUNCE", 0.0
+    )
+    # But we don't want to wait longer than this (in seconds).
+    ELASTICSEARCH_INDIRECT_UPDATE_MAX_WAIT = env.float(
+        "ELASTICSEARCH_INDIRECT_UPDATE_MAX_WAIT", 60.0
+    )
+    # If enabled we replace the embedded entries of changed contacts,
+    # devices, platforms & device properties in the entries of their
+    # parents only - instead of rebuilding the full parent entries.
+    # Needs a reindex after enabling it (the entries must include the ids).
+    ELASTICSEARCH_PARTIAL_UPDATES = env.bool("ELASTICSEARCH_PARTIAL_UPDATES", False)
+    # Number of search results (ids & totals) that we cache per process
+    # & how long we keep them (in seconds). Writes to an index within the
+    # process invalidate the entries for this index. 0 disables the cache.
+    # It is off by default: Writes of other processes (more gunicorn workers
+    # or the `flask es worker`) don't invalidate it, so those can return
+    # outdated results for up to the ttl. Only enable it if you can live
+    # with that.
+    ELASTICSEARCH_SEARCH_CACHE_SIZE = env.int("ELASTICSEARCH_SEARCH_CACHE_SIZE", 0)
+    ELASTICSEARCH_SEARCH_CACHE_TTL = env.float("ELASTICSEARCH_SEARCH_CACHE_TTL", 30.0)
+    # Backend for the search string (q) of the list endpoints:
+    # - elasticsearch: Use the elasticsearch - and the full text search of
+    #   the database if there is no elasticsearch or if it is not available,
+    #   but only with SEARCH_DATABASE_FALLBACK enabled. Otherwise we ignore
+    #   the search string without elasticsearch & give a 503 if it is not
+    #   available.
+    # - postgres: Always use the full text search of the database.
+    SEARCH_BACKEND = env("SEARCH_BACKEND", "elasticsearch")
+    SEARCH_DATABASE_FALLBACK = env.bool("SEARCH_DATABASE_FALLBACK", False)
+    # Settings for the search indices (used when we create them with a reindex).
+    # Json with a "default" entry & entries per index name, for example:
+    # {"default": {"number_of_replicas": 1}, "device": {"ngram_type": "edge_ngram"}}
+    # See the IndexSettings class for the options.
+    ELASTICSEARCH_INDEX_SETTINGS = env.json("ELASTICSEARCH_INDEX_SETTINGS", {})
+    # Settings for the elasticsearch client: Timeout per request (in seconds),
+    # retries (for connection problems & - if enabled - for timeouts) and
+    # the size of the connection pool per node.
+    ELASTICSEARCH_REQUEST_TIMEOUT = env.float("ELASTICSEARCH_REQUEST_TIMEOUT", 10.0)
+    ELASTICSEARCH_MAX_RETRIES = env.int("ELASTICSEARCH_MAX_RETRIES", 2)
+    ELASTICSEARCH_RETRY_ON_TIMEOUT = env.bool("ELASTICSEARCH_RETRY_ON_TIMEOUT", True)
+    ELASTICSEARCH_CONNECTIONS_PER_NODE = env.int(
+        "ELASTICSEARCH_CONNECTIONS_PER_NODE", 10
+    )
+    # Circuit breaker for the elasticsearch requests (per process).
+    # If at least MIN_CALLS calls within the WINDOW (in seconds) were made &
+    # the share of the failed ones reaches the FAILURE_RATE, we stop to
+    # send requests: The lists use the search of the database & the
+    # changes go to the outbox (so the `flask es worker` needs to run).
+    # Calls that take longer than SLOW_CALL seconds count as failed
+    # (0 to disable). After the RESET_TIMEOUT (in seconds) we try again.
+    ELASTICSEARCH_CIRCUIT_BREAKER = env.bool("ELASTICSEARCH_CIRCUIT_BREAKER", False)
+    ELASTICSEARCH_CIRCUIT_BREAKER_FAILURE_RATE = env.float(
+        "ELASTICSEARCH_CIRCUIT_BREAKER_FAILURE_RATE", 0.5
+    )
+    ELASTICSEARCH_CIRCUIT_BREAKER_MIN_CALLS = env.int(
+        "ELASTICSEARCH_CIRCUIT_BREAKER_MIN_CALLS", 10
+    )
+    ELASTICSEARCH_CIRCUIT_BREAKER_WINDOW = env.float(
+        "ELASTICSEARCH_CIRCUIT_BREAKER_WINDOW", 30.0
+    )
+    ELASTICSEARCH_CIRCUIT_BREAKER_SLOW_CALL = env.float(
+        "ELASTICSEARCH_CIRCUIT_BREAKER_SLOW_CALL", 0.0
+    )
+    ELASTICSEARCH_CIRCUIT_BREAKER_RESET_TIMEOUT = env.float(
+        "ELASTICSEARCH_CIRCUIT_BREAKER_RESET_TIMEOUT", 30.0
+    )
 
 
 class DevelopmentConfig(BaseConfig):
@@ -118,6 +204,8 @@ class TestingConfig(BaseConfig):
     # AssertionError: Popped wrong request context
     PRESERVE_CONTEXT_ON_EXCEPTION = False
     INSTITUTE = None
+    # All the tests share one app - so we don't want to share the cache too.
+    ELASTICSEARCH_SEARCH_CACHE_SIZE = 0
     SQLALCHEMY_ENGINE_OPTIONS = {"connect_args": {"options": "-c timezone=utc"}}
 
 
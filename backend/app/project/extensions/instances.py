@@ -21,6 +21,8 @@ from .page_parameter_middleware import PageParameterMiddleware
 from .pid import Pid
 from .pidinst import Pidinst
 from .redirect import RemoveSlashRedirectMiddlware
+from .search_cache import SearchResultCache
+from .search_circuit_breaker import SearchCircuitBreaker
 
 mqtt = LazyMqttInitWrapper(Mqtt())
 well_known_url_config_loader = WellKnownUrlConfigLoader()
@@ -37,3 +39,5 @@ auth = Auth(
 pidinst = Pidinst(pid=Pid(), b2inst=B2Inst())
 remove_slash_redirect_middlware = RemoveSlashRedirectMiddlware()
 page_parameter_middleware = PageParameterMiddleware()
+search_cache = SearchResultCache()
+search_circuit_breaker = SearchCircuitBreaker()
@@ -5,7 +5,12 @@
 # SPDX-License-Identifier: EUPL-1.2
 
 """Middleware to handle page parameters for the JSON:API."""
-from flask import request
+import json
+import urllib.parse
+
+from flask import current_app, g, request
+from flask_rest_jsonapi import ResourceList
+from werkzeug.datastructures import ImmutableMultiDict
 
 from ..api.helpers.errors import BadRequestError
 
@@ -18,6 +23,14 @@ class PageParameterMiddleware:
     flask_rest_jsonapi library, we can't change the code directly.
     Howver, we can register middlewares that catch this kind of problems
     if we have invalid parameters for page size or page number.
+
+    We also use it for the cursor based pagination (page[cursor]), as
+    the flask_rest_jsonapi only accepts page[number] & page[size]:
+    We take the cursor out of the request arguments & put it in g.page_cursor
+    for the data layer. Once the data layer set g.next_page_cursor we add
+    it to the meta data of the response.
+    For all the other endpoints we return 400 responses for the cursor,
+    so that clients don't get results that ignore it silently.
     """
 
     def __init__(self, app=None):
@@ -28,6 +41,8 @@ class PageParameterMiddleware:
     def init_app(self, app):
         """Register the middleware functions."""
         app.before_request(self.check_page_parameters)
+        app.before_request(self.extract_page_cursor)
+        app.after_request(self.add_next_page_cursor)
 
     def check_page_parameters(self):
         """Return 400 responses if we run into problems with our page parameters."""
@@ -43,3 +58,51 @@ class PageParameterMiddleware:
                 return BadRequestError(
                     "page[number] can not be negative or zero"
                 ).respond()
+
+    def extract_page_cursor(self):
+        """Move the page[cursor] parameter from the request arguments to g."""
+        if "page[cursor]" not in request.args.keys():
+            return None
+        if not self.supports_page_cursor():
+            return BadRequestError(
+                "page[cursor] is not supported for this endpoint"
+            ).respond()
+        if "page[number]" in request.args.keys():
+            return BadRequestError(
+                "page[cursor] can not be combined with page[number]"
+            ).respond()
+        args = request.args.copy()
+        g.page_cursor = args.pop("page[cursor]")
+        request.args = ImmutableMultiDict(args)
+        return None
+
+    @staticmethod
+    def supports_page_cursor():
+        """Return True if the endpoint is a list that can use the cursor."""
+        if request.method != "GET":
+            return False
+        view_function = current_app.view_functions.get(request.endpoint)
+        view_class = getattr(view_function, "view_class", None)
+        if view_class is None or not issubclass(view_class, ResourceList):
+            return False
+        data_layer = getattr(view_class, "_data_layer", None)
+        return getattr(data_layer, "supports_page_cursor", False)
+
+    def add_next_page_cursor(self, response):
+        """Add the cursor for the next page to the meta data of the response."""
+        if "next_page_cursor" not in g or not response.is_json:
+            return response
+        data = response.get_json()
+        if not isinstance(data, dict):
+            return response
+        data.setdefault("meta", {})["next_cursor"] = g.next_page_cursor
+        # The links with the page numbers don't make sense for the cursor.
+        links = data.setdefault("links", {})
+        for key in ["first", "last", "prev", "next"]:
+            links.pop(key, None)
+        if g.next_page_cursor:
+            args = list(request.args.items(multi=True))
+            args.append(("page[cursor]", g.next_page_cursor))
+            links["next"] = request.base_url + "?" + urllib.parse.urlencode(args)
+        response.set_data(json.dumps(data))
+        return response
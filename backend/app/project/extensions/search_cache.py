@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Cache for the results of the full text search."""
+
+import collections
+import threading
+import time
+
+from cachetools import TTLCache
+
+
+class SearchResultCache:
+    """
+    Bounded cache (LRU & TTL) for the results of the search index.
+
+    The keys contain the index name & a generation number for the index.
+    Every time that we write to the index we increase the generation, so
+    that older entries are not used anymore (and they drop out of the
+    cache later).
+
+    The cache is per process. Writes of other processes (for example the
+    `flask es worker`) don't invalidate it - for those the ttl is the
+    maximum time that we return outdated results.
+    """
+
+    # The elasticsearch makes new documents searchable after a refresh
+    # (default: every second). Until then we don't cache the results
+    # of the index.
+    REFRESH_INTERVAL = 1.0
+
+    def __init__(self, app=None):
+        """Init the object."""
+        self.cache = None
+        self.lock = threading.Lock()
+        self.generations = collections.defaultdict(int)
+        self.last_writes = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Init the flask extension."""
+        maxsize = app.config.get("ELASTICSEARCH_SEARCH_CACHE_SIZE", 0)
+        ttl = app.config.get("ELASTICSEARCH_SEARCH_CACHE_TTL", 0)
+        self.cache = None
+        if maxsize > 0 and ttl > 0:
+            self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        app.extensions["search_cache"] = self
+
+    def get(self, index, key):
+        """Return the cached result - or None if there is none."""
+        if self.cache is None:
+            return None
+        with self.lock:
+            result = self.cache.get((index, self.generations[index], key))
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return result
+
+    def set(self, index, key, result):
+        """Store the result for the key."""
+        if self.cache is None:
+            return
+        with self.lock:
+            last_write = self.last_writes.get(index)
+            if last_write and time.monotonic() - last_write < self.REFRESH_INTERVAL:
+                return
+            self.cache[(index, self.generations[index], key)] = result
+
+    def invalidate(self, index):
+        """Drop the cached results of the index (after we wrote to it)."""
+        with self.lock:
+            self.generations[index] += 1
+            self.last_writes[index] = time.monotonic()
+            self.invalidations += 1
+
+    def clear(self):
+        """Remove all of the entries & reset the statistics."""
+        with self.lock:
+            if self.cache is not None:
+                self.cache.clear()
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def stats(self):
+        """Return the hit & miss statistics."""
+        with self.lock:
+            requests = self.hits + self.misses
+            return {
+                "enabled": self.cache is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / requests if requests else None,
+                "invalidations": self.invalidations,
+                "size": self.cache.currsize if self.cache is not None else 0,
+                "maxsize": self.cache.maxsize if self.cache is not None else 0,
+            }
@@ -0,0 +1,193 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Circuit breaker for the calls to the full text search."""
+
+import collections
+import threading
+import time
+
+
+class SearchCircuitOpenError(Exception):
+    """Exception for calls that we don't send while the circuit is open."""
+
+
+class SearchCircuitBreaker:
+    """
+    Circuit breaker for the requests to the elasticsearch.
+
+    We remember the results of the calls within a time window. Once there
+    are enough calls & the share of the failed ones (connection problems,
+    timeouts, server errors - and calls that took too long) reaches the
+    threshold, the circuit opens: We don't send requests anymore, so that
+    the list endpoints use the database search & the commits write the
+    changes to the outbox.
+
+    After the reset timeout the circuit is half open & we let a single
+    request through (the probe). Its result decides if we close or open
+    the circuit again. If we don't get a result within the reset timeout
+    we allow another probe.
+
+    The state is per process.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, app=None):
+        """Init the object."""
+        self.lock = threading.Lock()
+        self.enabled = False
+        self.failure_rate_threshold = 0.5
+        self.minimum_calls = 10
+        self.window = 30.0
+        self.slow_call_threshold = 0.0
+        self.reset_timeout = 30.0
+        self.calls = collections.deque()
+        self.opened_at = None
+        self.probe_started_at = None
+        self.trips = 0
+        self.rejected = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Init the flask extension."""
+        config = app.config
+        self.enabled = config.get("ELASTICSEARCH_CIRCUIT_BREAKER", False)
+        self.failure_rate_threshold = config.get(
+            "ELASTICSEARCH_CIRCUIT_BREAKER_FAILURE_RATE", 0.5
+        )
+        self.minimum_calls = config.get("ELASTICSEARCH_CIRCUIT_BREAKER_MIN_CALLS", 10)
+        self.window = config.get("ELASTICSEARCH_CIRCUIT_BREAKER_WINDOW", 30.0)
+        self.slow_call_threshold = config.get(
+            "ELASTICSEARCH_CIRCUIT_BREAKER_SLOW_CALL", 0.0
+        )
+        self.reset_timeout = config.get(
+            "ELASTICSEARCH_CIRCUIT_BREAKER_RESET_TIMEOUT", 30.0
+        )
+        self.reset()
+        app.extensions["search_circuit_breaker"] = self
+
+    def get_state(self, now):
+        """Return the state (without the lock)."""
+        if self.opened_at is None:
+            return self.CLOSED
+        if now - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def state(self):
+        """Return the current state."""
+        with self.lock:
+            return self.get_state(time.monotonic())
+
+    def can_send(self, now):
+        """Return True if we can send a request now (without the lock)."""
+        state = self.get_state(now)
+        if state == self.CLOSED:
+            return True
+        if state == self.OPEN:
+            return False
+        return (
+            self.probe_started_at is None
+            or now - self.probe_started_at >= self.reset_timeout
+        )
+
+    def allow_request(self):
+        """
+        Return True if we can send a request to the elasticsearch.
+
+        In the half open state this takes the place of the probe.
+        """
+        if not self.enabled:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            if not self.can_send(now):
+                self.rejected += 1
+                return False
+            if self.get_state(now) == self.HALF_OPEN:
+                self.probe_started_at = now
+            return True
+
+    def is_open(self):
+        """
+        Return True if we wouldn't send a request to the elasticsearch.
+
+        Other than allow_request this doesn't take the place of the probe.
+        """
+        if not self.enabled:
+            return False
+        with self.lock:
+            if self.can_send(time.monotonic()):
+                return False
+            self.rejected += 1
+            return True
+
+    def record(self, seconds, failed):
+        """Record the result of a call that took the given seconds."""
+        if not self.enabled:
+            return
+        if self.slow_call_threshold > 0 and seconds >= self.slow_call_threshold:
+            failed = True
+        now = time.monotonic()
+        with self.lock:
+            state = self.get_state(now)
+            if state == self.HALF_OPEN:
+                if failed:
+                    self.trip(now)
+                else:
+                    self.close()
+                return
+            if state == self.OPEN:
+                # Calls that we started before the circuit opened.
+                return
+            self.calls.append((now, failed))
+            while self.calls and now - self.calls[0][0] > self.window:
+                self.calls.popleft()
+            if len(self.calls) < self.minimum_calls:
+                return
+            failures = sum(1 for _, call_failed in self.calls if call_failed)
+            if failures / len(self.calls) >= self.failure_rate_threshold:
+                self.trip(now)
+
+    def trip(self, now):
+        """Open the circuit (without the lock)."""
+        self.opened_at = now
+        self.probe_started_at = None
+        self.trips += 1
+        self.calls.clear()
+
+    def close(self):
+        """Close the circuit (without the lock)."""
+        self.opened_at = None
+        self.probe_started_at = None
+        self.calls.clear()
+
+    def reset(self):
+        """Close the circuit & reset the statistics."""
+        with self.lock:
+            self.close()
+            self.trips = 0
+            self.rejected = 0
+
+    def stats(self):
+        """Return the state & the statistics."""
+        with self.lock:
+            now = time.monotonic()
+            failures = sum(1 for _, failed in self.calls if failed)
+            return {
+                "enabled": self.enabled,
+                "state": self.get_state(now),
+                "calls": len(self.calls),
+                "failures": failures,
+                "failure_rate": failures / len(self.calls) if self.calls else None,
+                "trips": self.trips,
+                "rejected": self.rejected,
+            }
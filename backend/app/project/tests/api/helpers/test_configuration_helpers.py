@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the configuration helpers."""
+
+import collections
+import random
+import time
+import unittest
+
+from project.api.helpers.configuration_helpers import build_tree
+
+PlatformMount = collections.namedtuple(
+    "PlatformMount", ["id", "platform_id", "parent_platform_id"]
+)
+DeviceMount = collections.namedtuple(
+    "DeviceMount", ["id", "device_id", "parent_platform_id", "parent_device_id"]
+)
+
+
+def build_tree_by_comparison(platform_mounts, device_mounts, f_platform, f_device):
+    """Build the tree the way we did it before (comparing the dicts)."""
+    top_level_elements = []
+    children = {}
+    mounts = [("platform", m, m.platform_id, f_platform) for m in platform_mounts]
+    mounts += [("device", m, m.device_id, f_device) for m in device_mounts]
+    for type_, mount, object_id, function in mounts:
+        element = {
+            **function(mount),
+            "children": children.setdefault((type_, object_id), []),
+        }
+        parent_key = None
+        if mount.parent_platform_id:
+            parent_key = ("platform", mount.parent_platform_id)
+        elif getattr(mount, "parent_device_id", None):
+            parent_key = ("device", mount.parent_device_id)
+        siblings = (
+            top_level_elements
+            if parent_key is None
+            else children.setdefault(parent_key, [])
+        )
+        if element not in siblings:
+            siblings.append(element)
+    return top_level_elements
+
+
+def generate_mounts(platforms, devices, seed=42):
+    """Generate platform & device mounts in a random tree."""
+    generator = random.Random(seed)
+    platform_mounts = []
+    for i in range(1, platforms + 1):
+        parent_platform_id = None
+        if i > 1 and generator.random() < 0.8:
+            parent_platform_id = generator.randint(1, i - 1)
+        platform_mounts.append(PlatformMount(i, i, parent_platform_id))
+    device_mounts = []
+    for i in range(1, devices + 1):
+        parent_platform_id = None
+        parent_device_id = None
+        if i > 1 and generator.random() < 0.3:
+            parent_device_id = generator.randint(1, i - 1)
+        elif generator.random() < 0.9:
+            parent_platform_id = generator.randint(1, platforms)
+        device_mounts.append(DeviceMount(i, i, parent_platform_id, parent_device_id))
+    return platform_mounts, device_mounts
+
+
+def platform_to_payload(platform_mount):
+    """Return the payload for a platform mount."""
+    return {
+        "action": {"type": "platform_mount_action", "id": platform_mount.id},
+        "entity": platform_mount.platform_id,
+    }
+
+
+def device_to_payload(device_mount):
+    """Return the payload for a device mount."""
+    return {
+        "action": {"type": "device_mount_action", "id": device_mount.id},
+        "entity": device_mount.device_id,
+    }
+
+
+class TestBuildTree(unittest.TestCase):
+    """Tests for the build_tree function."""
+
+    def test_tree(self):
+        """Ensure we build the nested tree."""
+        tree = build_tree(
+            [PlatformMount(1, 10, None), PlatformMount(2, 20, 10)],
+            [DeviceMount(3, 30, 20, None), DeviceMount(4, 40, None, 30)],
+            platform_to_payload,
+            device_to_payload,
+        )
+        self.assertEqual(
+            tree,
+            [
+                {
+                    "action": {"type": "platform_mount_action", "id": 1},
+                    "entity": 10,
+                    "children": [
+                        {
+                            "action": {"type": "platform_mount_action", "id": 2},
+                            "entity": 20,
+                            "children": [
+                                {
+                                    "action": {"type": "device_mount_action", "id": 3},
+                                    "entity": 30,
+                                    "children": [
+                                        {
+                                            "action": {
+                                                "type": "device_mount_action",
+                                                "id": 4,
+                                            },
+                                            "entity": 40,
+                                            "children": [],
+                                        }
+                                    ],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            ],
+        )
+
+    def test_skip_duplicates(self):
+        """Ensure we add the same entity with the same payload only once."""
+
+        def entity_only(mount):
+            return {"entity": mount.device_id, "tags": ["a", {"b": [1, 2]}]}
+
+        tree = build_tree(
+            [],
+            [DeviceMount(1, 10, None, None), DeviceMount(2, 10, None, None)],
+            platform_to_payload,
+            entity_only,
+        )
+        self.assertEqual(len(tree), 1)
+        # But we keep the different mounts of the same entity.
+        tree = build_tree(
+            [],
+            [DeviceMount(1, 10, None, None), DeviceMount(2, 10, None, None)],
+            platform_to_payload,
+            device_to_payload,
+        )
+        self.assertEqual(len(tree), 2)
+
+    def test_same_result_as_before(self):
+        """Ensure we get the very same trees as with the comparing version."""
+        for seed in range(5):
+            platform_mounts, device_mounts = generate_mounts(30, 100, seed)
+            # Also with duplicated mounts.
+            device_mounts += device_mounts[:10]
+            for f_platform, f_device in [
+                (platform_to_payload, device_to_payload),
+                (
+                    lambda m: {
+                        "action_type": "platform_mount",
+                        "entity": m.platform_id,
+                    },
+                    lambda m: {"action_type": "device_mount", "entity": m.device_id},
+                ),
+            ]:
+                with self.subTest(seed=seed):
+                    self.assertEqual(
+                        build_tree(
+                            platform_mounts, device_mounts, f_platform, f_device
+                        ),
+                        build_tree_by_comparison(
+                            platform_mounts, device_mounts, f_platform, f_device
+                        ),
+                    )
+
+    def test_benchmark(self):
+        """Ensure we are faster than the comparing version for 1000 mounts."""
+
+        def dump(type_, id_):
+            # Similar to the dumps of the schemas - the id comes last.
+            attributes = {f"field_{i}": "value" for i in range(20)}
+            return {"data": {"type": type_, "attributes": attributes, "id": str(id_)}}
+
+        def platform_to_dump(platform_mount):
+            return {
+                "action": dump("platform_mount_action", platform_mount.id),
+                "entity": dump("platform", platform_mount.platform_id),
+            }
+
+        def device_to_dump(device_mount):
+            return {
+                "action": dump("device_mount_action", device_mount.id),
+                "entity": dump("device", device_mount.device_id),
+            }
+
+        # A lot of devices on one platform.
+        platform_mounts = [PlatformMount(1, 1, None)]
+        device_mounts = [DeviceMount(i, i, 1, None) for i in range(1, 1000)]
+
+        started = time.perf_counter()
+        build_tree_by_comparison(
+            platform_mounts, device_mounts, platform_to_dump, device_to_dump
+        )
+        comparison_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        build_tree(platform_mounts, device_mounts, platform_to_dump, device_to_dump)
+        seconds = time.perf_counter() - started
+
+        self.assertLess(seconds, comparison_seconds)
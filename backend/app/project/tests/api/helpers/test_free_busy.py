@@ -0,0 +1,139 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the free & busy timelines."""
+
+import collections
+import datetime
+import time
+import unittest
+
+from project.api.helpers.free_busy import free_busy_timeline
+
+Mount = collections.namedtuple(
+    "Mount",
+    ["id", "begin_date", "end_date", "configuration_id", "configuration_label"],
+)
+
+
+def utc(day):
+    """Return a timezone aware datetime for the day."""
+    return datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc) + (
+        datetime.timedelta(days=day)
+    )
+
+
+def mount(id_, begin_day, end_day=None, configuration_id=1):
+    """Return a mount between the days."""
+    return Mount(
+        id_,
+        utc(begin_day),
+        utc(end_day) if end_day is not None else None,
+        configuration_id,
+        f"configuration {configuration_id}",
+    )
+
+
+class TestFreeBusyTimeline(unittest.TestCase):
+    """Tests for the free_busy_timeline function."""
+
+    def test_without_mounts(self):
+        """Ensure the whole horizon is free if there are no mounts."""
+        self.assertEqual(
+            free_busy_timeline([], utc(0), utc(10)),
+            {"busy": [], "free": [{"begin_date": utc(0), "end_date": utc(10)}]},
+        )
+        self.assertEqual(
+            free_busy_timeline([], utc(0)),
+            {"busy": [], "free": [{"begin_date": utc(0), "end_date": None}]},
+        )
+
+    def test_gaps_between_mounts(self):
+        """Ensure we find the gaps before, between & after the mounts."""
+        result = free_busy_timeline(
+            [mount(2, 5, 6, configuration_id=2), mount(1, 2, 3)], utc(0), utc(10)
+        )
+        self.assertEqual(
+            result["busy"],
+            [
+                {
+                    "begin_date": utc(2),
+                    "end_date": utc(3),
+                    "configuration_id": 1,
+                    "configuration_label": "configuration 1",
+                    "mounts": [1],
+                },
+                {
+                    "begin_date": utc(5),
+                    "end_date": utc(6),
+                    "configuration_id": 2,
+                    "configuration_label": "configuration 2",
+                    "mounts": [2],
+                },
+            ],
+        )
+        self.assertEqual(
+            result["free"],
+            [
+                {"begin_date": utc(0), "end_date": utc(2)},
+                {"begin_date": utc(3), "end_date": utc(5)},
+                {"begin_date": utc(6), "end_date": utc(10)},
+            ],
+        )
+
+    def test_merge_following_mounts(self):
+        """Ensure we merge the mounts of one configuration without gap."""
+        result = free_busy_timeline(
+            [mount(1, 2, 4), mount(2, 4, 6), mount(3, 6, 8, configuration_id=2)],
+            utc(0),
+            utc(10),
+        )
+        self.assertEqual(
+            [(b["begin_date"], b["end_date"], b["mounts"]) for b in result["busy"]],
+            [(utc(2), utc(6), [1, 2]), (utc(6), utc(8), [3])],
+        )
+        self.assertEqual(
+            result["free"],
+            [
+                {"begin_date": utc(0), "end_date": utc(2)},
+                {"begin_date": utc(8), "end_date": utc(10)},
+            ],
+        )
+
+    def test_mounts_outside_of_the_horizon(self):
+        """Ensure we keep the mount dates but only give free gaps in the horizon."""
+        result = free_busy_timeline([mount(1, -5, 2), mount(2, 8)], utc(0), utc(10))
+        self.assertEqual(
+            [(b["begin_date"], b["end_date"]) for b in result["busy"]],
+            [(utc(-5), utc(2)), (utc(8), None)],
+        )
+        self.assertEqual(result["free"], [{"begin_date": utc(2), "end_date": utc(8)}])
+
+    def test_mount_without_end(self):
+        """Ensure there is no free gap after a mount without end date."""
+        result = free_busy_timeline([mount(1, 2)], utc(0))
+        self.assertEqual(result["free"], [{"begin_date": utc(0), "end_date": utc(2)}])
+        result = free_busy_timeline([mount(1, -2)], utc(0))
+        self.assertEqual(result["free"], [])
+
+    def test_naive_datetimes(self):
+        """Ensure we handle naive datetimes as utc."""
+        result = free_busy_timeline(
+            [Mount(1, datetime.datetime(2020, 1, 3), None, 1, "configuration")],
+            datetime.datetime(2020, 1, 1),
+        )
+        self.assertEqual(result["free"], [{"begin_date": utc(0), "end_date": utc(2)}])
+
+    def test_benchmark(self):
+        """Ensure we can build the timelines for hundreds of instruments."""
+        mounts = [
+            mount(i, 2 * i, 2 * i + 1, configuration_id=i % 3) for i in range(1000)
+        ]
+        started = time.perf_counter()
+        for _ in range(500):
+            free_busy_timeline(mounts[:100], utc(0), utc(250))
+        seconds = time.perf_counter() - started
+        self.assertLess(seconds, 5)
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the interval index."""
+
+import collections
+import datetime
+import random
+import time
+import unittest
+
+from project.api.helpers.date_time_range import DateTimeRange
+from project.api.helpers.interval_index import IntervalIndex
+
+Mount = collections.namedtuple("Mount", ["id", "device_id", "begin_date", "end_date"])
+
+
+def utc(day):
+    """Return a timezone aware datetime for the day."""
+    return datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc) + (
+        datetime.timedelta(days=day)
+    )
+
+
+def generate_mounts(number, seed=42):
+    """Generate mounts with random (also overlapping & open) time ranges."""
+    generator = random.Random(seed)
+    result = []
+    for i in range(number):
+        begin_date = utc(generator.randint(0, 1000))
+        end_date = None
+        if generator.random() < 0.9:
+            end_date = begin_date + datetime.timedelta(days=generator.randint(0, 50))
+        result.append(Mount(i, generator.randint(1, 5), begin_date, end_date))
+    return result
+
+
+def overlapping_by_loop(mounts, begin_date, end_date=None):
+    """Return the overlapping mounts the way we did it before."""
+    asked = DateTimeRange(begin_date, end_date)
+    return [
+        m
+        for m in mounts
+        if asked.overlaps_with(DateTimeRange(m.begin_date, m.end_date))
+    ]
+
+
+def covering_by_loop(mounts, begin_date, end_date=None):
+    """Return the covering mounts the way we did it before."""
+    asked = DateTimeRange(begin_date, end_date)
+    return [m for m in mounts if DateTimeRange(m.begin_date, m.end_date).covers(asked)]
+
+
+class TestIntervalIndex(unittest.TestCase):
+    """Tests for the IntervalIndex."""
+
+    def setUp(self):
+        """Set up some random mounts & time ranges to ask for."""
+        self.mounts = generate_mounts(500)
+        self.index = IntervalIndex(self.mounts)
+        generator = random.Random(7)
+        self.time_ranges = [(m.begin_date, m.end_date) for m in self.mounts[:50]]
+        for _ in range(200):
+            begin_date = utc(generator.randint(-10, 1060))
+            end_date = generator.choice(
+                [
+                    None,
+                    begin_date,
+                    begin_date + datetime.timedelta(days=generator.randint(1, 30)),
+                ]
+            )
+            self.time_ranges.append((begin_date, end_date))
+
+    def test_overlapping(self):
+        """Ensure we find the same entries as the DateTimeRange."""
+        for begin_date, end_date in self.time_ranges:
+            with self.subTest(begin_date=begin_date, end_date=end_date):
+                self.assertEqual(
+                    self.index.overlapping(begin_date, end_date),
+                    overlapping_by_loop(self.mounts, begin_date, end_date),
+                )
+
+    def test_covering(self):
+        """Ensure we find the entries that cover the time range."""
+        for begin_date, end_date in self.time_ranges:
+            with self.subTest(begin_date=begin_date, end_date=end_date):
+                self.assertEqual(
+                    self.index.covering(begin_date, end_date),
+                    covering_by_loop(self.mounts, begin_date, end_date),
+                )
+
+    def test_active_at(self):
+        """Ensure the active entries include the begin but not the end."""
+        mount = Mount(1, 1, utc(1), utc(3))
+        index = IntervalIndex([mount])
+        self.assertEqual(index.active_at(utc(1)), [mount])
+        self.assertEqual(index.active_at(utc(2)), [mount])
+        self.assertEqual(index.active_at(utc(3)), [])
+        self.assertEqual(index.active_at(utc(0)), [])
+        for begin_date, _ in self.time_ranges:
+            self.assertEqual(
+                self.index.active_at(begin_date),
+                overlapping_by_loop(self.mounts, begin_date, begin_date),
+            )
+
+    def test_naive_datetimes(self):
+        """Ensure we handle naive datetimes as utc (like the DateTimeRange)."""
+        mount = Mount(1, 1, datetime.datetime(2020, 1, 1), None)
+        index = IntervalIndex([mount])
+        self.assertEqual(index.active_at(utc(5)), [mount])
+        self.assertEqual(index.covering(datetime.datetime(2020, 2, 1)), [mount])
+
+    def test_group_by(self):
+        """Ensure we build one index per key."""
+        indices = IntervalIndex.group_by(self.mounts, key=lambda m: m.device_id)
+        self.assertEqual(sum(len(i) for i in indices.values()), len(self.mounts))
+        begin_date, end_date = utc(100), utc(120)
+        for device_id, index in indices.items():
+            self.assertEqual(
+                index.overlapping(begin_date, end_date),
+                overlapping_by_loop(
+                    [m for m in self.mounts if m.device_id == device_id],
+                    begin_date,
+                    end_date,
+                ),
+            )
+
+    def test_empty(self):
+        """Ensure we can ask an empty index."""
+        index = IntervalIndex([])
+        self.assertEqual(index.overlapping(utc(1)), [])
+        self.assertEqual(index.covering(utc(1), utc(2)), [])
+        self.assertEqual(index.active_at(utc(1)), [])
+
+
+class TestIntervalIndexBenchmark(unittest.TestCase):
+    """Micro benchmark for the index against the loops with the DateTimeRange."""
+
+    def test_benchmark(self):
+        """Ensure the index is faster for short time ranges in long timelines."""
+        mounts = generate_mounts(5000)
+        generator = random.Random(3)
+        time_ranges = []
+        for _ in range(100):
+            begin_date = utc(generator.randint(0, 1000))
+            time_ranges.append((begin_date, begin_date + datetime.timedelta(days=1)))
+
+        started = time.perf_counter()
+        for begin_date, end_date in time_ranges:
+            overlapping_by_loop(mounts, begin_date, end_date)
+        loop_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        index = IntervalIndex(mounts)
+        for begin_date, end_date in time_ranges:
+            index.overlapping(begin_date, end_date)
+        index_seconds = time.perf_counter() - started
+
+        # Including the time to build the index.
+        self.assertLess(index_seconds, loop_seconds)
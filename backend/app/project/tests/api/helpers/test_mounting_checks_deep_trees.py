@@ -0,0 +1,201 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""
+Benchmark like tests for the mount validation on deep mount trees.
+
+The validators should use a fixed number of queries - no matter how
+many child mounts & dynamic locations there are.
+"""
+
+import datetime
+import time
+
+from project.api.helpers.errors import ConflictError
+from project.api.helpers.mounting_checks import (
+    DeviceMountActionValidator,
+    PlatformMountActionValidator,
+)
+from project.api.models import (
+    Configuration,
+    ConfigurationDynamicLocationBeginAction,
+    Contact,
+    Device,
+    DeviceMountAction,
+    DeviceProperty,
+    Platform,
+    PlatformMountAction,
+)
+from project.api.models.base_model import db
+from project.api.services.search_benchmark import count_queries
+from project.tests.base import BaseTestCase
+
+
+def utc(year, month=1, day=1):
+    """Return a timezone aware datetime."""
+    return datetime.datetime(year, month, day, tzinfo=datetime.timezone.utc)
+
+
+class TestMountingChecksDeepTrees(BaseTestCase):
+    """Validate changes in a configuration with deep platform & device trees."""
+
+    platform_depth = 10
+    device_depth = 10
+    devices_on_platform = 200
+    max_queries = 15
+
+    def setUp(self):
+        """Set up the configuration with the mount trees."""
+        super().setUp()
+        self.contact = Contact(
+            given_name="first", family_name="contact", email="first.contact@localhost"
+        )
+        self.configuration = Configuration(label="deep tree", is_public=True)
+        db.session.add_all([self.contact, self.configuration])
+
+        # A chain of platforms, every one mounted on the one before.
+        self.platform_mounts = []
+        parent_platform = None
+        for i in range(self.platform_depth):
+            platform = Platform(short_name=f"platform {i}", is_public=True)
+            mount = PlatformMountAction(
+                platform=platform,
+                parent_platform=parent_platform,
+                configuration=self.configuration,
+                begin_contact=self.contact,
+                begin_date=utc(2020),
+            )
+            db.session.add_all([platform, mount])
+            self.platform_mounts.append(mount)
+            parent_platform = platform
+
+        # A lot of devices on the last platform.
+        self.device_mounts = []
+        for i in range(self.devices_on_platform):
+            device = Device(short_name=f"device {i}", is_public=True)
+            mount = DeviceMountAction(
+                device=device,
+                parent_platform=parent_platform,
+                configuration=self.configuration,
+                begin_contact=self.contact,
+                begin_date=utc(2021),
+            )
+            db.session.add_all([device, mount])
+            self.device_mounts.append(mount)
+
+        # And a chain of devices on the first of them.
+        self.sub_device_mounts = []
+        parent_device = self.device_mounts[0].device
+        for i in range(self.device_depth):
+            device = Device(short_name=f"sub device {i}", is_public=True)
+            mount = DeviceMountAction(
+                device=device,
+                parent_device=parent_device,
+                configuration=self.configuration,
+                begin_contact=self.contact,
+                begin_date=utc(2022),
+            )
+            db.session.add_all([device, mount])
+            self.sub_device_mounts.append(mount)
+            parent_device = device
+
+        # The last of the sub devices gives the coordinates.
+        self.x_property = DeviceProperty(
+            property_name="x", device=self.sub_device_mounts[-1].device
+        )
+        self.dynamic_location = ConfigurationDynamicLocationBeginAction(
+            configuration=self.configuration,
+            begin_contact=self.contact,
+            begin_date=utc(2023),
+            x_property=self.x_property,
+        )
+        db.session.add_all([self.x_property, self.dynamic_location])
+        db.session.commit()
+
+    def validate(self, function, *args):
+        """Run the validation & ensure we only need a few queries."""
+        started = time.monotonic()
+        with count_queries() as counter:
+            try:
+                function(*args)
+            finally:
+                seconds = time.monotonic() - started
+                self.assertLessEqual(counter.count, self.max_queries, seconds)
+
+    def update_payload(self, **attributes):
+        """Return the payload to update the dates of a mount."""
+        return {"attributes": attributes}
+
+    def test_update_platform_in_the_middle(self):
+        """Ensure we can extend a platform mount in the middle of the tree."""
+        mount = self.platform_mounts[self.platform_depth // 2]
+        self.validate(
+            PlatformMountActionValidator().validate_update,
+            self.update_payload(begin_date="2020-01-01T00:00:00Z"),
+            mount.id,
+        )
+
+    def test_update_platform_with_orphans(self):
+        """Ensure we can't stop the last platform mount before its devices."""
+        mount = self.platform_mounts[-1]
+        with self.assertRaises(ConflictError) as context:
+            self.validate(
+                PlatformMountActionValidator().validate_update,
+                self.update_payload(end_date="2020-06-01T00:00:00Z"),
+                mount.id,
+            )
+        self.assertIn("child mount", str(context.exception))
+
+    def test_delete_platform_with_children(self):
+        """Ensure we can't delete a platform mount with child mounts."""
+        with self.assertRaises(ConflictError):
+            self.validate(
+                PlatformMountActionValidator().validate_delete,
+                self.platform_mounts[0].id,
+            )
+
+    def test_update_device_with_dynamic_location(self):
+        """Ensure we keep the mount of the device that gives the coordinates."""
+        mount = self.sub_device_mounts[-1]
+        with self.assertRaises(ConflictError) as context:
+            self.validate(
+                DeviceMountActionValidator().validate_update,
+                self.update_payload(end_date="2023-06-01T00:00:00Z"),
+                mount.id,
+            )
+        self.assertIn("ConfigurationDynamicLocationBeginAction", str(context.exception))
+
+    def test_delete_device_with_children(self):
+        """Ensure we can't delete a device mount with child mounts."""
+        with self.assertRaises(ConflictError):
+            self.validate(
+                DeviceMountActionValidator().validate_delete,
+                self.device_mounts[0].id,
+            )
+
+    def test_delete_leaf_devices(self):
+        """Ensure we can delete the mounts of the devices without children."""
+        for mount in self.device_mounts[1:]:
+            self.validate(DeviceMountActionValidator().validate_delete, mount.id)
+
+    def test_create_on_the_deepest_device(self):
+        """Ensure we find the parent mount at the end of the device chain."""
+        device = Device(short_name="leaf", is_public=True)
+        db.session.add(device)
+        db.session.commit()
+        payload = {
+            "relationships": {
+                "device": {"data": {"id": device.id}},
+                "configuration": {"data": {"id": self.configuration.id}},
+                "parent_device": {"data": {"id": self.sub_device_mounts[-1].device_id}},
+            },
+            "attributes": {"begin_date": "2024-01-01T00:00:00Z"},
+        }
+        self.validate(DeviceMountActionValidator().validate_create, payload)
+        payload["attributes"]["begin_date"] = "2021-01-01T00:00:00Z"
+        with self.assertRaises(ConflictError) as context:
+            self.validate(DeviceMountActionValidator().validate_create, payload)
+        self.assertIn("Parent device is not mounted", str(context.exception))
@@ -26,6 +26,7 @@ from project.api.schemas.mount_actions_schema import (
     PlatformMountActionSchema,
 )
 from project.api.schemas.platform_schema import PlatformSchema
+from project.api.services.search_benchmark import count_queries
 from project.tests.base import BaseTestCase
 
 
@@ -634,3 +635,47 @@ class TestControllerConfigurationsMountingActions(BaseTestCase):
             },
         ]
         self.assertEqual(response.json, expected)
+
+    def test_fixed_number_of_queries(self):
+        """Ensure the number of queries doesn't depend on the number of mounts."""
+        url = f"{base_url}/controller/configurations/{self.configuration.id}/mounting-actions"
+        begin_date = datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)
+
+        def add_mounts(number):
+            platform = Platform(short_name=f"platform {number}", is_internal=True)
+            platform_mount = PlatformMountAction(
+                platform=platform,
+                configuration=self.configuration,
+                begin_contact=self.u.contact,
+                begin_date=begin_date,
+            )
+            db.session.add_all([platform, platform_mount])
+            for i in range(number):
+                device = Device(short_name=f"device {number} {i}", is_internal=True)
+                device_mount = DeviceMountAction(
+                    device=device,
+                    parent_platform=platform,
+                    configuration=self.configuration,
+                    begin_contact=self.u.contact,
+                    begin_date=begin_date,
+                )
+                db.session.add_all([device, device_mount])
+            db.session.commit()
+
+        def count_request_queries():
+            with self.run_requests_as(self.u):
+                with count_queries() as counter:
+                    response = self.client.get(
+                        url, query_string={"timepoint": "2023-01-01T00:00:00Z"}
+                    )
+            self.assertEqual(response.status_code, 200)
+            return counter.count, response.json
+
+        add_mounts(2)
+        few_mounts_queries, _ = count_request_queries()
+        add_mounts(50)
+        many_mounts_queries, tree = count_request_queries()
+
+        self.assertEqual(len(tree), 2)
+        self.assertEqual(sorted(len(element["children"]) for element in tree), [2, 50])
+        self.assertEqual(few_mounts_queries, many_mounts_queries)
@@ -24,6 +24,7 @@ from project.api.models import (
     User,
 )
 from project.api.models.base_model import db
+from project.api.services.search_benchmark import count_queries
 from project.tests.base import BaseTestCase, Fixtures
 
 fixtures = Fixtures()
@@ -589,3 +590,63 @@ class TestControllerConfigurationParameterValues(BaseTestCase):
         )
         self.expect(response.status_code).to_equal(200)
         self.expect(response.json).to_equal({"jsonapi": {"version": "1.0"}, "data": []})
+
+    @fixtures.use(["public_configuration1", "contact1"])
+    def test_queries_dont_depend_on_the_number_of_mounts(
+        self, public_configuration1, contact1
+    ):
+        """Ensure we load the parameters of all the mounted devices at once."""
+        url = f"{base_url}/controller/configurations/{public_configuration1.id}/parameter-values"
+        timepoint = datetime.datetime(2022, 2, 1, tzinfo=datetime.timezone.utc)
+
+        def add_devices(start, stop):
+            for i in range(start, stop):
+                device = Device(
+                    short_name=f"device {i}",
+                    is_public=True,
+                    is_internal=False,
+                    is_private=False,
+                )
+                parameter = DeviceParameter(device=device, label=f"parameter {i}")
+                db.session.add_all(
+                    [
+                        device,
+                        parameter,
+                        DeviceMountAction(
+                            device=device,
+                            configuration=public_configuration1,
+                            begin_date=datetime.datetime(
+                                2019, 1, 1, tzinfo=datetime.timezone.utc
+                            ),
+                            begin_contact=contact1,
+                        ),
+                        DeviceParameterValueChangeAction(
+                            device_parameter=parameter,
+                            value=str(i),
+                            date=datetime.datetime(
+                                2022, 1, 1, tzinfo=datetime.timezone.utc
+                            ),
+                            contact=contact1,
+                            description="",
+                        ),
+                    ]
+                )
+            db.session.commit()
+
+        def get_query_count():
+            db.session.expire_all()
+            with count_queries() as counter:
+                response = self.client.get(
+                    url, query_string={"timepoint": timepoint.isoformat()}
+                )
+            self.expect(response.status_code).to_equal(200)
+            return counter.count, len(response.json["data"])
+
+        add_devices(0, 1)
+        queries_for_one, parameters_for_one = get_query_count()
+        add_devices(1, 5)
+        queries_for_five, parameters_for_five = get_query_count()
+
+        self.expect(parameters_for_one).to_equal(1)
+        self.expect(parameters_for_five).to_equal(5)
+        self.expect(queries_for_five).to_equal(queries_for_one)
@@ -13,6 +13,7 @@ import datetime
 from project import base_url
 from project.api.models import Configuration, Contact, Device, DeviceMountAction, User
 from project.api.models.base_model import db
+from project.api.services.search_benchmark import count_queries
 from project.tests.base import BaseTestCase, fake
 
 
@@ -20,6 +21,7 @@ class TestDeviceAvailabilities(BaseTestCase):
     """Tests for the controller to get the mounting device availabilities."""
 
     url = f"{base_url}/controller/device-availabilities"
+    bulk_url = f"{base_url}/controller/device-availabilities/bulk"
 
     def setUp(self):
         """Set up some example data that will be used in most of  the tests."""
@@ -481,3 +483,140 @@ class TestDeviceAvailabilities(BaseTestCase):
             )
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json, [])
+
+    def test_number_of_queries(self):
+        """Ensure the number of queries doesn't depend on the number of mounts."""
+
+        def add_mounts(number):
+            for i in range(number):
+                self.configuration = Configuration(
+                    label=f"configuration {number} {i}", is_internal=True
+                )
+                self.mount_a_device()
+
+        def count_request_queries():
+            ids = ",".join([str(x.id) for x in db.session.query(Device)])
+            with self.run_requests_as(self.u):
+                with count_queries() as counter:
+                    response = self.client.get(
+                        self.url,
+                        query_string={"from": "2022-01-01T00:00:00Z", "ids": ids},
+                    )
+            self.assertEqual(response.status_code, 200)
+            return counter.count, response.json
+
+        add_mounts(2)
+        few_mounts_queries, _ = count_request_queries()
+        add_mounts(20)
+        many_mounts_queries, data = count_request_queries()
+
+        self.assertEqual(len(data), 22)
+        self.assertEqual(len({entry["configuration_label"] for entry in data}), 22)
+        self.assertEqual(few_mounts_queries, many_mounts_queries)
+
+    def test_bulk_post_without_user(self):
+        """Ensure we get 401 if we don't provide user information."""
+        response = self.client.post(
+            self.bulk_url,
+            json={"ids": [], "time_ranges": [{"from": "2022-01-01T00:00:00Z"}]},
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_bulk_get_is_not_allowed(self):
+        """Ensure we can use the bulk endpoint with post requests only."""
+        with self.run_requests_as(self.u):
+            response = self.client.get(self.bulk_url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_bulk_post_with_invalid_payload(self):
+        """Ensure we get 400 if we miss ids or valid time ranges."""
+        for payload in [
+            {},
+            {"time_ranges": [{"from": "2022-01-01T00:00:00Z"}]},
+            {"ids": ["one"], "time_ranges": [{"from": "2022-01-01T00:00:00Z"}]},
+            {"ids": [1]},
+            {"ids": [1], "time_ranges": [{"to": "2022-01-01T00:00:00Z"}]},
+            {"ids": [1], "time_ranges": [{"from": "someday"}]},
+        ]:
+            with self.subTest(payload=payload):
+                with self.run_requests_as(self.u):
+                    response = self.client.post(self.bulk_url, json=payload)
+                self.assertEqual(response.status_code, 400)
+
+    def test_bulk_post_with_multiple_time_ranges(self):
+        """Ensure we get the availabilities for all the time ranges."""
+        device_1, mount_action_1 = self.mount_a_device(
+            begin_date=datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc),
+            end_date=datetime.datetime(2022, 1, 30, tzinfo=datetime.timezone.utc),
+        )
+        device_2, mount_action_2 = self.mount_a_device()
+        private_device = Device(
+            short_name="private device",
+            is_private=True,
+        )
+        db.session.add(private_device)
+        db.session.commit()
+
+        with self.run_requests_as(self.u):
+            response = self.client.post(
+                self.bulk_url,
+                json={
+                    "ids": [device_1.id, device_2.id, private_device.id],
+                    "time_ranges": [
+                        {"from": "2022-01-01T00:00:00Z", "to": "2022-01-15T00:00:00Z"},
+                        # Right after the first mount ended.
+                        {"from": "2022-01-30T00:00:00Z", "to": "2022-02-01T00:00:00Z"},
+                        {"from": "2023-01-01T00:00:00Z"},
+                    ],
+                },
+            )
+        self.assertEqual(response.status_code, 200)
+        expected_output = [
+            {
+                "id": str(device_1.id),
+                "available": False,
+                "mount": str(mount_action_1.id),
+                "configuration_id": str(self.configuration.id),
+                "configuration_label": self.configuration.label,
+                "begin_date": "2022-01-01T00:00:00+00:00",
+                "end_date": "2022-01-30T00:00:00+00:00",
+                "from": "2022-01-01T00:00:00+00:00",
+                "to": "2022-01-15T00:00:00+00:00",
+            },
+            {
+                "id": str(device_2.id),
+                "available": True,
+                "from": "2022-01-01T00:00:00+00:00",
+                "to": "2022-01-15T00:00:00+00:00",
+            },
+            {
+                "id": str(device_1.id),
+                "available": True,
+                "from": "2022-01-30T00:00:00+00:00",
+                "to": "2022-02-01T00:00:00+00:00",
+            },
+            {
+                "id": str(device_2.id),
+                "available": True,
+                "from": "2022-01-30T00:00:00+00:00",
+                "to": "2022-02-01T00:00:00+00:00",
+            },
+            {
+                "id": str(device_2.id),
+                "available": False,
+                "mount": str(mount_action_2.id),
+                "configuration_id": str(self.configuration.id),
+                "configuration_label": self.configuration.label,
+                "begin_date": "2022-12-01T00:00:00+00:00",
+                "end_date": None,
+                "from": "2023-01-01T00:00:00+00:00",
+                "to": None,
+            },
+            {
+                "id": str(device_1.id),
+                "available": True,
+                "from": "2023-01-01T00:00:00+00:00",
+                "to": None,
+            },
+        ]
+        self.assertEqual(response.json, expected_output)
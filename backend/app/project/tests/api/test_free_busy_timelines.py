@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the free & busy timelines of devices & platforms."""
+
+import datetime
+
+from project import base_url
+from project.api.models import (
+    Configuration,
+    Contact,
+    Device,
+    DeviceMountAction,
+    Platform,
+    PlatformMountAction,
+    User,
+)
+from project.api.models.base_model import db
+from project.tests.base import BaseTestCase
+
+
+def utc(year, month=1, day=1):
+    """Return a timezone aware datetime."""
+    return datetime.datetime(year, month, day, tzinfo=datetime.timezone.utc)
+
+
+class TestFreeBusyTimelines(BaseTestCase):
+    """Tests for the free & busy timeline controllers."""
+
+    device_url = f"{base_url}/controller/device-free-busy"
+    platform_url = f"{base_url}/controller/platform-free-busy"
+
+    def setUp(self):
+        """Set up a user & two configurations."""
+        super().setUp()
+        contact = Contact(given_name="D", family_name="U", email="d.u@localhost")
+        self.u = User(subject="du", contact=contact)
+        self.configuration_1 = Configuration(label="first", is_internal=True)
+        self.configuration_2 = Configuration(label="second", is_internal=True)
+        db.session.add_all(
+            [contact, self.u, self.configuration_1, self.configuration_2]
+        )
+        db.session.commit()
+
+    def test_get_without_user(self):
+        """Ensure we get 401 if we don't provide user information."""
+        response = self.client.get(self.device_url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_get_with_invalid_parameters(self):
+        """Ensure we get 400 if we miss ids or a valid time range."""
+        for query_string in [
+            {"from": "2022-01-01T00:00:00Z"},
+            {"ids": "1"},
+            {"ids": "1", "from": "someday"},
+            {"ids": "one", "from": "2022-01-01T00:00:00Z"},
+            {
+                "ids": "1",
+                "from": "2022-01-01T00:00:00Z",
+                "to": "2021-01-01T00:00:00Z",
+            },
+        ]:
+            with self.subTest(query_string=query_string):
+                with self.run_requests_as(self.u):
+                    response = self.client.get(
+                        self.device_url, query_string=query_string
+                    )
+                self.assertEqual(response.status_code, 400)
+
+    def test_device_timelines(self):
+        """Ensure we get the merged busy intervals & the free gaps."""
+        busy_device = Device(short_name="busy", is_internal=True)
+        free_device = Device(short_name="free", is_internal=True)
+        private_device = Device(short_name="private", is_private=True)
+        mounts = [
+            DeviceMountAction(
+                device=busy_device,
+                configuration=configuration,
+                begin_contact=self.u.contact,
+                begin_date=begin_date,
+                end_date=end_date,
+            )
+            for configuration, begin_date, end_date in [
+                (self.configuration_1, utc(2022, 1), utc(2022, 2)),
+                (self.configuration_1, utc(2022, 2), utc(2022, 3)),
+                (self.configuration_2, utc(2022, 5), None),
+            ]
+        ]
+        db.session.add_all([busy_device, free_device, private_device, *mounts])
+        db.session.commit()
+
+        with self.run_requests_as(self.u):
+            response = self.client.get(
+                self.device_url,
+                query_string={
+                    "ids": f"{busy_device.id},{free_device.id},{private_device.id}",
+                    "from": "2021-12-01T00:00:00Z",
+                    "to": "2022-12-01T00:00:00Z",
+                },
+            )
+        self.assertEqual(response.status_code, 200)
+        expected_output = [
+            {
+                "id": str(busy_device.id),
+                "next_free": "2021-12-01T00:00:00+00:00",
+                "busy": [
+                    {
+                        "begin_date": "2022-01-01T00:00:00+00:00",
+                        "end_date": "2022-03-01T00:00:00+00:00",
+                        "configuration_id": str(self.configuration_1.id),
+                        "configuration_label": "first",
+                        "mounts": [str(mounts[0].id), str(mounts[1].id)],
+                    },
+                    {
+                        "begin_date": "2022-05-01T00:00:00+00:00",
+                        "end_date": None,
+                        "configuration_id": str(self.configuration_2.id),
+                        "configuration_label": "second",
+                        "mounts": [str(mounts[2].id)],
+                    },
+                ],
+                "free": [
+                    {
+                        "begin_date": "2021-12-01T00:00:00+00:00",
+                        "end_date": "2022-01-01T00:00:00+00:00",
+                    },
+                    {
+                        "begin_date": "2022-03-01T00:00:00+00:00",
+                        "end_date": "2022-05-01T00:00:00+00:00",
+                    },
+                ],
+            },
+            {
+                "id": str(free_device.id),
+                "next_free": "2021-12-01T00:00:00+00:00",
+                "busy": [],
+                "free": [
+                    {
+                        "begin_date": "2021-12-01T00:00:00+00:00",
+                        "end_date": "2022-12-01T00:00:00+00:00",
+                    },
+                ],
+            },
+        ]
+        self.assertEqual(response.json, expected_output)
+
+    def test_platform_timelines(self):
+        """Ensure we give the next free time of a platform without end of horizon."""
+        platform = Platform(short_name="platform", is_internal=True)
+        mount = PlatformMountAction(
+            platform=platform,
+            configuration=self.configuration_1,
+            begin_contact=self.u.contact,
+            begin_date=utc(2022, 1),
+            end_date=utc(2022, 6),
+        )
+        db.session.add_all([platform, mount])
+        db.session.commit()
+
+        with self.run_requests_as(self.u):
+            response = self.client.get(
+                self.platform_url,
+                query_string={"ids": str(platform.id), "from": "2022-02-01T00:00:00Z"},
+            )
+        self.assertEqual(response.status_code, 200)
+        [timeline] = response.json
+        self.assertEqual(timeline["next_free"], "2022-06-01T00:00:00+00:00")
+        self.assertEqual(
+            timeline["free"],
+            [{"begin_date": "2022-06-01T00:00:00+00:00", "end_date": None}],
+        )
+        self.assertEqual(timeline["busy"][0]["mounts"], [str(mount.id)])
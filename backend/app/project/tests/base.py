@@ -476,6 +476,10 @@ class BaseTestCase(TestCase, ExpectMixin):
         db.drop_all()
         # To make sure we have postgis ready.
         db.session.connection().execute(text("create extension if not exists postgis"))
+        # And btree_gist for the exclusion constraints.
+        db.session.connection().execute(
+            text("create extension if not exists btree_gist")
+        )
         db.session.commit()
         db.create_all()
         db.session.commit()
@@ -0,0 +1,327 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the precomputed timelines of the configurations."""
+
+import datetime
+
+import pytz
+
+from project.api.models import (
+    Configuration,
+    ConfigurationStaticLocationBeginAction,
+    ConfigurationTimelineEvent,
+    ConfigurationTimelineSegment,
+    Contact,
+    Device,
+    DeviceMountAction,
+    Platform,
+    PlatformMountAction,
+)
+from project.api.models.base_model import db
+from project.api.models.configuration_timeline import rebuild_configuration_timelines
+from project.tests.base import BaseTestCase
+
+
+def utc(year, month=1, day=1):
+    """Return a timezone aware datetime."""
+    return datetime.datetime(year, month, day, tzinfo=pytz.utc)
+
+
+class TestConfigurationTimeline(BaseTestCase):
+    """Tests for the ConfigurationTimelineEvent & Segment models."""
+
+    def setUp(self):
+        """Set up a configuration with a platform & a device mount."""
+        super().setUp()
+        self.contact = Contact(
+            given_name="first", family_name="contact", email="first.contact@localhost"
+        )
+        self.configuration = Configuration(label="first", is_public=True)
+        self.other_configuration = Configuration(label="second", is_public=True)
+        self.platform = Platform(short_name="platform", is_public=True)
+        self.device = Device(short_name="device", is_public=True)
+        self.platform_mount = PlatformMountAction(
+            configuration=self.configuration,
+            platform=self.platform,
+            begin_contact=self.contact,
+            begin_date=utc(2022, 1),
+        )
+        self.device_mount = DeviceMountAction(
+            configuration=self.configuration,
+            device=self.device,
+            parent_platform=self.platform,
+            begin_contact=self.contact,
+            begin_date=utc(2022, 2),
+            end_date=utc(2022, 3),
+        )
+        self.static_location = ConfigurationStaticLocationBeginAction(
+            configuration=self.configuration,
+            begin_contact=self.contact,
+            begin_date=utc(2022, 1),
+            label="home",
+        )
+        db.session.add_all(
+            [
+                self.contact,
+                self.configuration,
+                self.other_configuration,
+                self.platform,
+                self.device,
+                self.platform_mount,
+                self.device_mount,
+                self.static_location,
+            ]
+        )
+        db.session.commit()
+
+    def events(self, configuration):
+        """Return the type, timepoint & action id of the events."""
+        return [
+            (event.type, event.timepoint, event.action_id)
+            for event in db.session.query(ConfigurationTimelineEvent)
+            .filter_by(configuration_id=configuration.id)
+            .order_by(
+                ConfigurationTimelineEvent.timepoint, ConfigurationTimelineEvent.id
+            )
+        ]
+
+    def segment(self, configuration, timepoint):
+        """Return the segment of the configuration at the timepoint."""
+        return (
+            db.session.query(ConfigurationTimelineSegment)
+            .filter(
+                ConfigurationTimelineSegment.configuration_id == configuration.id,
+                ConfigurationTimelineSegment.period_contains(timepoint),
+            )
+            .one_or_none()
+        )
+
+    def segments(self, configuration):
+        """Return the periods & action ids of all the segments."""
+        return [
+            (
+                segment.period.lower,
+                segment.period.upper,
+                segment.period.bounds,
+                segment.device_mount_action_ids,
+                segment.platform_mount_action_ids,
+                segment.static_location_action_ids,
+                segment.dynamic_location_action_ids,
+            )
+            for segment in db.session.query(ConfigurationTimelineSegment)
+            .filter_by(configuration_id=configuration.id)
+            .order_by(ConfigurationTimelineSegment.period)
+        ]
+
+    def assert_same_as_rebuild(self, configuration):
+        """Ensure the incremental updates give the same as a full rebuild."""
+        events = self.events(configuration)
+        segments = self.segments(configuration)
+        rebuild_configuration_timelines(db.session.connection(), [configuration.id])
+        self.assertEqual(self.events(configuration), events)
+        self.assertEqual(self.segments(configuration), segments)
+
+    def test_events(self):
+        """Ensure we store the events sorted by timepoint."""
+        self.assertEqual(
+            self.events(self.configuration),
+            [
+                ("platform_mount", utc(2022, 1), self.platform_mount.id),
+                (
+                    "configuration_static_location_begin",
+                    utc(2022, 1),
+                    self.static_location.id,
+                ),
+                ("device_mount", utc(2022, 2), self.device_mount.id),
+                ("device_unmount", utc(2022, 3), self.device_mount.id),
+            ],
+        )
+        self.assertEqual(self.events(self.other_configuration), [])
+
+    def test_segments(self):
+        """Ensure we store the active actions for every segment."""
+        self.assertIsNone(self.segment(self.configuration, utc(2021, 12)))
+        for timepoint, device_mount_ids in [
+            (utc(2022, 1), []),
+            (utc(2022, 1, 15), []),
+            (utc(2022, 2), [self.device_mount.id]),
+            (utc(2022, 2, 15), [self.device_mount.id]),
+            # Including the end date.
+            (utc(2022, 3), [self.device_mount.id]),
+            (utc(2022, 3, 15), []),
+            (utc(2030, 1), []),
+        ]:
+            with self.subTest(timepoint=timepoint):
+                segment = self.segment(self.configuration, timepoint)
+                self.assertEqual(segment.device_mount_action_ids, device_mount_ids)
+                self.assertEqual(
+                    segment.platform_mount_action_ids, [self.platform_mount.id]
+                )
+                self.assertEqual(
+                    segment.static_location_action_ids, [self.static_location.id]
+                )
+                self.assertEqual(segment.dynamic_location_action_ids, [])
+
+    def test_update(self):
+        """Ensure we update the timeline if we change an action."""
+        self.device_mount.end_date = utc(2022, 4)
+        db.session.add(self.device_mount)
+        db.session.commit()
+
+        self.assertIn(
+            ("device_unmount", utc(2022, 4), self.device_mount.id),
+            self.events(self.configuration),
+        )
+        self.assertEqual(
+            self.segment(self.configuration, utc(2022, 3, 15)).device_mount_action_ids,
+            [self.device_mount.id],
+        )
+        self.assert_same_as_rebuild(self.configuration)
+
+    def test_update_without_timeline_changes(self):
+        """Ensure we keep the timeline if only other attributes change."""
+
+        def segment_ids():
+            return sorted(
+                segment.id
+                for segment in db.session.query(ConfigurationTimelineSegment).filter_by(
+                    configuration_id=self.configuration.id
+                )
+            )
+
+        ids_before = segment_ids()
+        self.device_mount.begin_description = "changed description"
+        db.session.add(self.device_mount)
+        db.session.commit()
+
+        self.assertEqual(segment_ids(), ids_before)
+        self.assert_same_as_rebuild(self.configuration)
+
+    def test_split_segment(self):
+        """Ensure we split the segments for the timepoints of a new action."""
+        device_mount = DeviceMountAction(
+            configuration=self.configuration,
+            device=self.device,
+            parent_platform=self.platform,
+            begin_contact=self.contact,
+            begin_date=utc(2022, 5),
+            end_date=utc(2022, 6),
+        )
+        db.session.add(device_mount)
+        db.session.commit()
+
+        self.assertEqual(
+            self.segment(self.configuration, utc(2022, 4)).period.upper,
+            utc(2022, 5),
+        )
+        self.assertEqual(
+            self.segment(self.configuration, utc(2022, 5, 15)).device_mount_action_ids,
+            [device_mount.id],
+        )
+        self.assertEqual(
+            self.segment(self.configuration, utc(2022, 7)).period.lower,
+            utc(2022, 6),
+        )
+        self.assert_same_as_rebuild(self.configuration)
+
+    def test_merge_segments(self):
+        """Ensure we merge the segments if timepoints are gone."""
+        self.device_mount.begin_date = utc(2022, 1)
+        self.device_mount.end_date = None
+        db.session.add(self.device_mount)
+        db.session.commit()
+
+        # There are no timepoints after the begin anymore.
+        segment = self.segment(self.configuration, utc(2022, 2, 15))
+        self.assertEqual(segment.period.lower, utc(2022, 1))
+        self.assertIsNone(segment.period.upper)
+        self.assertEqual(segment.device_mount_action_ids, [self.device_mount.id])
+        self.assert_same_as_rebuild(self.configuration)
+
+    def test_add_before_first_timepoint(self):
+        """Ensure we add the segments up to the former first timepoint."""
+        device_mount = DeviceMountAction(
+            configuration=self.configuration,
+            device=self.device,
+            parent_platform=None,
+            begin_contact=self.contact,
+            begin_date=utc(2021, 1),
+            end_date=utc(2021, 2),
+        )
+        db.session.add(device_mount)
+        db.session.commit()
+
+        segment = self.segment(self.configuration, utc(2021, 6))
+        self.assertEqual(segment.period.lower, utc(2021, 2))
+        self.assertEqual(segment.period.upper, utc(2022, 1))
+        self.assertEqual(segment.device_mount_action_ids, [])
+        self.assert_same_as_rebuild(self.configuration)
+
+    def test_delete(self):
+        """Ensure we update the timeline if we delete an action."""
+        device_mount_id = self.device_mount.id
+        db.session.delete(self.device_mount)
+        db.session.commit()
+
+        self.assertNotIn(
+            device_mount_id,
+            [action_id for _, _, action_id in self.events(self.configuration)],
+        )
+        self.assertEqual(
+            self.segment(self.configuration, utc(2022, 2, 15)).device_mount_action_ids,
+            [],
+        )
+        self.assert_same_as_rebuild(self.configuration)
+
+    def test_move_to_other_configuration(self):
+        """Ensure we update both timelines if we move an action."""
+        self.device_mount.parent_platform = None
+        self.device_mount.configuration = self.other_configuration
+        db.session.add(self.device_mount)
+        db.session.commit()
+
+        self.assertEqual(
+            [type_ for type_, _, _ in self.events(self.configuration)],
+            ["platform_mount", "configuration_static_location_begin"],
+        )
+        self.assertEqual(
+            self.events(self.other_configuration),
+            [
+                ("device_mount", utc(2022, 2), self.device_mount.id),
+                ("device_unmount", utc(2022, 3), self.device_mount.id),
+            ],
+        )
+        self.assertEqual(
+            self.segment(
+                self.other_configuration, utc(2022, 2, 15)
+            ).device_mount_action_ids,
+            [self.device_mount.id],
+        )
+        self.assert_same_as_rebuild(self.configuration)
+        self.assert_same_as_rebuild(self.other_configuration)
+
+    def test_delete_configuration(self):
+        """Ensure we remove the timeline together with the configuration."""
+        configuration_id = self.other_configuration.id
+        device_mount = DeviceMountAction(
+            configuration=self.other_configuration,
+            device=self.device,
+            begin_contact=self.contact,
+            begin_date=utc(2023, 1),
+        )
+        db.session.add(device_mount)
+        db.session.commit()
+        db.session.delete(device_mount)
+        db.session.delete(self.other_configuration)
+        db.session.commit()
+
+        self.assertEqual(
+            db.session.query(ConfigurationTimelineSegment)
+            .filter_by(configuration_id=configuration_id)
+            .count(),
+            0,
+        )
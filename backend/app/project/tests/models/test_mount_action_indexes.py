@@ -0,0 +1,203 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Query plan tests for the indexes of the mount actions."""
+
+import datetime
+
+import pytz
+from sqlalchemy import and_, or_
+
+from project.api.models import (
+    Configuration,
+    Contact,
+    Device,
+    DeviceMountAction,
+    Platform,
+    PlatformMountAction,
+)
+from project.api.models.base_model import db
+from project.tests.base import BaseTestCase
+
+
+def yield_plan_nodes(plan):
+    """Yield the nodes of the (json) query plan recursively."""
+    yield plan
+    for sub_plan in plan.get("Plans", []):
+        yield from yield_plan_nodes(sub_plan)
+
+
+class TestMountActionIndexes(BaseTestCase):
+    """Ensure the queries of the mount checks don't scan the whole tables."""
+
+    number_of_configurations = 100
+    number_of_devices = 2000
+    number_of_platforms = 500
+    mounts_per_device = 10
+
+    def setUp(self):
+        """Set up a large synthetic dataset of mounts."""
+        super().setUp()
+        contact = Contact(
+            given_name="first", family_name="contact", email="first.contact@localhost"
+        )
+        db.session.add(contact)
+        db.session.commit()
+
+        def insert(model, rows):
+            db.session.execute(model.__table__.insert(), rows)
+
+        insert(
+            Configuration,
+            [
+                {"id": i, "label": f"configuration {i}", "is_public": True}
+                for i in range(1, self.number_of_configurations + 1)
+            ],
+        )
+        insert(
+            Device,
+            [
+                {"id": i, "short_name": f"device {i}", "is_public": True}
+                for i in range(1, self.number_of_devices + 1)
+            ],
+        )
+        insert(
+            Platform,
+            [
+                {"id": i, "short_name": f"platform {i}", "is_public": True}
+                for i in range(1, self.number_of_platforms + 1)
+            ],
+        )
+        start = datetime.datetime(2020, 1, 1, tzinfo=pytz.UTC)
+        device_mounts = []
+        for device_id in range(1, self.number_of_devices + 1):
+            for i in range(self.mounts_per_device):
+                # Short mounts spread over the years, so that only
+                # a few of them are active at the same time.
+                begin_date = start + datetime.timedelta(days=300 * i + device_id % 300)
+                device_mounts.append(
+                    {
+                        "device_id": device_id,
+                        "configuration_id": 1
+                        + (device_id + i) % self.number_of_configurations,
+                        "parent_platform_id": 1
+                        + (device_id + i) % self.number_of_platforms,
+                        "begin_date": begin_date,
+                        "end_date": begin_date + datetime.timedelta(days=1),
+                        "begin_contact_id": contact.id,
+                    }
+                )
+        insert(DeviceMountAction, device_mounts)
+        platform_mounts = []
+        for platform_id in range(1, self.number_of_platforms + 1):
+            for i in range(self.mounts_per_device):
+                begin_date = start + datetime.timedelta(
+                    days=300 * i + platform_id % 300
+                )
+                platform_mounts.append(
+                    {
+                        "platform_id": platform_id,
+                        "configuration_id": 1
+                        + (platform_id + i) % self.number_of_configurations,
+                        "begin_date": begin_date,
+                        "end_date": begin_date + datetime.timedelta(days=1),
+                        "begin_contact_id": contact.id,
+                    }
+                )
+        insert(PlatformMountAction, platform_mounts)
+        db.session.commit()
+        db.session.execute("ANALYZE device_mount_action")
+        db.session.execute("ANALYZE platform_mount_action")
+        self.timepoint = start + datetime.timedelta(days=95)
+
+    def explain(self, query):
+        """Return the nodes of the query plan."""
+        statement = query.statement.compile(dialect=db.engine.dialect)
+        connection = db.session.connection()
+        result = connection.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(statement), statement.params
+        ).scalar()
+        return list(yield_plan_nodes(result[0]["Plan"]))
+
+    def assert_uses_index(self, query, table):
+        """Ensure we use an index & don't run a sequential scan for the table."""
+        nodes = self.explain(query)
+        relation_nodes = [n for n in nodes if n.get("Relation Name") == table]
+        self.assertTrue(relation_nodes)
+        for node in relation_nodes:
+            self.assertNotEqual(node["Node Type"], "Seq Scan", nodes)
+        self.assertTrue(any(n.get("Index Name", "").startswith("ix_") for n in nodes))
+
+    def test_mounts_of_a_device(self):
+        """Ensure we use an index for the existing mounts of a device."""
+        query = db.session.query(DeviceMountAction).filter(
+            and_(
+                DeviceMountAction.device_id == 42,
+                or_(
+                    DeviceMountAction.end_date.is_(None),
+                    DeviceMountAction.end_date > self.timepoint,
+                ),
+            )
+        )
+        self.assert_uses_index(query, "device_mount_action")
+
+    def test_mounts_of_a_platform(self):
+        """Ensure we use an index for the existing mounts of a platform."""
+        query = db.session.query(PlatformMountAction).filter(
+            PlatformMountAction.platform_id == 42
+        )
+        self.assert_uses_index(query, "platform_mount_action")
+
+    def test_child_mounts(self):
+        """Ensure we use an index for the mounts on a parent platform."""
+        query = db.session.query(DeviceMountAction).filter(
+            and_(
+                DeviceMountAction.parent_platform_id == 42,
+                DeviceMountAction.configuration_id == 43,
+            )
+        )
+        self.assert_uses_index(query, "device_mount_action")
+
+    def test_active_mounts_of_a_configuration(self):
+        """Ensure we use an index for the mounts of a configuration at a timepoint."""
+        query = db.session.query(DeviceMountAction).filter(
+            and_(
+                DeviceMountAction.configuration_id == 42,
+                DeviceMountAction.period_contains(self.timepoint),
+            )
+        )
+        self.assert_uses_index(query, "device_mount_action")
+
+    def test_mounts_in_time_range(self):
+        """Ensure we can use the range index for the availabilities."""
+        query = db.session.query(DeviceMountAction).filter(
+            DeviceMountAction.period_overlaps(
+                self.timepoint, self.timepoint + datetime.timedelta(days=1)
+            )
+        )
+        nodes = self.explain(query)
+        self.assertIn(
+            "ix_device_mount_action_period", [n.get("Index Name") for n in nodes]
+        )
+
+    def test_period_semantics(self):
+        """Ensure the range conditions include both bounds."""
+        mount = db.session.query(DeviceMountAction).filter_by(device_id=1).first()
+        for timepoint, expected in [
+            (mount.begin_date, True),
+            (mount.end_date, True),
+            (mount.end_date + datetime.timedelta(seconds=1), False),
+        ]:
+            with self.subTest(timepoint=timepoint):
+                found = (
+                    db.session.query(DeviceMountAction.id)
+                    .filter(
+                        DeviceMountAction.id == mount.id,
+                        DeviceMountAction.period_contains(timepoint),
+                    )
+                    .first()
+                )
+                self.assertEqual(found is not None, expected)
@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the exclusion constraints of the mount & location actions."""
+
+import datetime
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytz
+from sqlalchemy.dialects import postgresql
+
+from project import base_url
+from project.api.helpers.errors import ExclusionConstraintError
+from project.api.helpers.mounting_checks import DeviceMountActionValidator
+from project.api.models import (
+    Configuration,
+    ConfigurationStaticLocationBeginAction,
+    Contact,
+    Device,
+    DeviceMountAction,
+    User,
+)
+from project.api.models.base_model import db
+from project.api.models.mixin import raise_exclusion_constraint_error
+from project.tests.base import BaseTestCase
+
+
+class TestRaiseExclusionConstraintError(unittest.TestCase):
+    """Tests for the translation of the database errors."""
+
+    def test_exclusion_violation(self):
+        """Ensure we raise a ConflictError with the name of the constraint."""
+        context = MagicMock()
+        context.original_exception.pgcode = "23P01"
+        context.original_exception.diag.constraint_name = (
+            "ex_device_mount_action_device_id_period"
+        )
+        with self.assertRaises(ExclusionConstraintError) as error:
+            raise_exclusion_constraint_error(context)
+        self.assertEqual(error.exception.status, 409)
+        self.assertEqual(
+            error.exception.constraint_name, "ex_device_mount_action_device_id_period"
+        )
+
+    def test_other_exclusion_violation(self):
+        """Ensure we keep the violations of the other exclusion constraints."""
+        context = MagicMock()
+        context.original_exception.pgcode = "23P01"
+        context.original_exception.diag.constraint_name = (
+            "ex_configuration_timeline_segment_configuration_id_period"
+        )
+        self.assertIsNone(raise_exclusion_constraint_error(context))
+
+    def test_other_errors(self):
+        """Ensure we keep the other errors as they are."""
+        context = MagicMock()
+        context.original_exception.pgcode = "23505"
+        self.assertIsNone(raise_exclusion_constraint_error(context))
+
+    def test_half_open_period_overlaps(self):
+        """Ensure we exclude the end date from the time range."""
+        condition = DeviceMountAction.half_open_period_overlaps(
+            datetime.datetime(2022, 1, 1, tzinfo=pytz.UTC)
+        )
+        sql = str(condition.compile(dialect=postgresql.dialect()))
+        self.assertIn(
+            "tstzrange(device_mount_action.begin_date, device_mount_action.end_date, "
+            + "CASE WHEN (device_mount_action.begin_date = device_mount_action.end_date) "
+            + "THEN '[]' ELSE '[)' END) && tstzrange(",
+            sql,
+        )
+
+
+class TestPeriodExclusionConstraints(BaseTestCase):
+    """Ensure the database rejects overlapping time ranges."""
+
+    url = base_url + "/device-mount-actions"
+
+    def setUp(self):
+        """Set up a device & a configuration with a mount."""
+        super().setUp()
+        self.contact = Contact(
+            given_name="first", family_name="contact", email="first.contact@localhost"
+        )
+        self.user = User(contact=self.contact, subject=self.contact.email)
+        self.device = Device(short_name="wind sensor", is_public=True)
+        self.configuration = Configuration(label="weather station", is_public=True)
+        self.mount = DeviceMountAction(
+            device=self.device,
+            configuration=self.configuration,
+            begin_contact=self.contact,
+            begin_date=datetime.datetime(2022, 1, 1, tzinfo=pytz.UTC),
+            end_date=datetime.datetime(2023, 1, 1, tzinfo=pytz.UTC),
+        )
+        db.session.add_all(
+            [self.contact, self.user, self.device, self.configuration, self.mount]
+        )
+        db.session.commit()
+
+    def add_mount(self, begin_date, end_date):
+        """Add another mount for the device."""
+        mount = DeviceMountAction(
+            device=self.device,
+            configuration=self.configuration,
+            begin_contact=self.contact,
+            begin_date=begin_date,
+            end_date=end_date,
+        )
+        db.session.add(mount)
+        db.session.commit()
+        return mount
+
+    def test_overlapping_mount(self):
+        """Ensure we can't mount a device twice at the same time."""
+        with self.assertRaises(ExclusionConstraintError) as error:
+            self.add_mount(datetime.datetime(2022, 6, 1, tzinfo=pytz.UTC), None)
+        self.assertEqual(
+            error.exception.constraint_name, "ex_device_mount_action_device_id_period"
+        )
+        db.session.rollback()
+
+    def test_adjacent_mount(self):
+        """Ensure we can mount the device again right when the last mount ends."""
+        mount = self.add_mount(self.mount.end_date, None)
+        self.assertIsNotNone(mount.id)
+
+    def test_mount_without_duration(self):
+        """Ensure entries without duration block their timepoint."""
+        with self.assertRaises(ExclusionConstraintError):
+            self.add_mount(self.mount.begin_date, self.mount.begin_date)
+        db.session.rollback()
+
+    def test_overlapping_static_location(self):
+        """Ensure we can't have two static locations at the same time."""
+        for year in [2022, 2023]:
+            db.session.add(
+                ConfigurationStaticLocationBeginAction(
+                    configuration=self.configuration,
+                    begin_contact=self.contact,
+                    begin_date=datetime.datetime(year, 1, 1, tzinfo=pytz.UTC),
+                )
+            )
+        with self.assertRaises(ExclusionConstraintError) as error:
+            db.session.commit()
+        self.assertEqual(
+            error.exception.constraint_name,
+            "ex_configuration_static_location_configuration_id_period",
+        )
+        db.session.rollback()
+
+    def test_parallel_post(self):
+        """Ensure we answer with the validator message if only the constraint fails."""
+        # We simulate a parallel request that added its mount after our
+        # validator checked for overlapping mounts.
+        get_overlapping_mount = DeviceMountActionValidator._get_overlapping_mount
+        results = [None]
+
+        def fake_get_overlapping_mount(validator, *args, **kwargs):
+            if results:
+                return results.pop()
+            return get_overlapping_mount(validator, *args, **kwargs)
+
+        payload = {
+            "data": {
+                "type": "device_mount_action",
+                "attributes": {
+                    "begin_date": "2022-06-01T00:00:00Z",
+                },
+                "relationships": {
+                    "device": {"data": {"type": "device", "id": self.device.id}},
+                    "begin_contact": {
+                        "data": {"type": "contact", "id": self.contact.id}
+                    },
+                    "configuration": {
+                        "data": {"type": "configuration", "id": self.configuration.id}
+                    },
+                },
+            }
+        }
+        with patch.object(
+            DeviceMountActionValidator,
+            "_get_overlapping_mount",
+            fake_get_overlapping_mount,
+        ):
+            with self.run_requests_as(self.user):
+                response = self.client.post(
+                    self.url,
+                    data=json.dumps(payload),
+                    content_type="application/vnd.api+json",
+                )
+        self.assertEqual(response.status_code, 409)
+        detail = response.json["errors"][0]["detail"]
+        self.assertIn("Device is blocked due to usage in weather station", detail)
+        self.assertEqual(db.session.query(DeviceMountAction).count(), 1)
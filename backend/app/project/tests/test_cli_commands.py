@@ -21,6 +21,7 @@ from manage import (
     b2inst_update_device,
     b2inst_update_platform,
     deactivate_a_user,
+    es_reindex,
     loaddata,
     reactivate_a_user,
 )
@@ -75,6 +76,15 @@ class TestCliCommands(BaseTestCase):
         assert "Can't find" in result.stderr
         assert "testuser1@ufz.test" in result.stderr
 
+    def test_es_reindex_with_invalid_since(self):
+        """Ensure we tell that we can't parse the since timestamp."""
+        runner = CliRunner()
+        result = runner.invoke(
+            es_reindex, ["--since", "yesterday"], env={"FLASK_APP": "manage"}
+        )
+        assert result.exit_code == 2
+        assert "Can't parse yesterday" in result.stderr
+
     def test_deactivate_a_user_but_not_destination_user_found(self):
         """Ensure we stop if we don't find a user for substitution while we are asked for that."""
         with no_expire():
@@ -0,0 +1,184 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the cursor based pagination with the full text search."""
+
+import base64
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from elasticsearch import ConnectionError
+
+from project import base_url, db
+from project.api.models import Device
+from project.api.search import (
+    InvalidCursor,
+    decode_cursor,
+    encode_cursor,
+    get_cursor_hash,
+)
+from project.tests.base import BaseTestCase
+
+
+class TestCursorEncoding(unittest.TestCase):
+    """Tests for the encoding of the cursors."""
+
+    def test_roundtrip(self):
+        """Ensure we get the point in time & the sort values back."""
+        cursor = encode_cursor("pit-1", [1.5, "abc", 42], "hash")
+        self.assertEqual(decode_cursor(cursor, "hash"), ("pit-1", [1.5, "abc", 42]))
+
+    def test_start(self):
+        """Ensure that an empty cursor starts the pagination."""
+        self.assertEqual(decode_cursor("", "hash"), (None, None))
+        self.assertEqual(decode_cursor("*", "hash"), (None, None))
+
+    def test_invalid(self):
+        """Ensure we raise an InvalidCursor for cursors we don't understand."""
+        for cursor in ["no-base-64!", encode_cursor("pit", None, "hash"), "e30="]:
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor, "hash")
+
+    def test_other_search(self):
+        """Ensure we raise an InvalidCursor for cursors of other searches."""
+        query_hash = get_cursor_hash("device", {"match_all": {}}, ["_score"], None)
+        cursor = encode_cursor("pit", [1.0], query_hash)
+        for other_query_hash in [
+            get_cursor_hash("platform", {"match_all": {}}, ["_score"], None),
+            get_cursor_hash("device", {"match": {"x": "y"}}, ["_score"], None),
+            get_cursor_hash("device", {"match_all": {}}, ["id"], None),
+        ]:
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(cursor, other_query_hash)
+
+
+class TestCursorPagination(BaseTestCase):
+    """Tests for the page[cursor] parameter."""
+
+    url = base_url + "/devices"
+
+    def setUp(self):
+        """Set up the tests with some devices & a fake elasticsearch."""
+        super().setUp()
+        self.devices = [
+            Device(short_name=f"device {i}", is_public=True) for i in range(3)
+        ]
+        db.session.add_all(self.devices)
+        db.session.commit()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.open_point_in_time.return_value = {"id": "pit-1"}
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def search_result(self, devices):
+        """Return a fake search result for the devices."""
+        return {
+            "pit_id": "pit-2",
+            "hits": {
+                "total": {"value": 3},
+                "hits": [
+                    {"_id": str(d.id), "sort": [1.0, i]} for i, d in enumerate(devices)
+                ],
+            },
+        }
+
+    def test_first_and_last_page(self):
+        """Ensure we can walk through the pages with the cursor."""
+        self.app.elasticsearch.search.return_value = self.search_result(
+            self.devices[:2]
+        )
+        response = self.client.get(self.url + "?page[cursor]=*&page[size]=2")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [d["id"] for d in response.json["data"]],
+            [str(d.id) for d in self.devices[:2]],
+        )
+        self.assertEqual(response.json["meta"]["count"], 3)
+        next_cursor = response.json["meta"]["next_cursor"]
+        cursor_data = json.loads(base64.urlsafe_b64decode(next_cursor))
+        self.assertEqual(cursor_data["pit"], "pit-2")
+        self.assertEqual(cursor_data["after"], [1.0, 1])
+        self.assertIn("page%5Bcursor%5D=", response.json["links"]["next"])
+        call = self.app.elasticsearch.search.call_args
+        self.assertEqual(call.kwargs["pit"]["id"], "pit-1")
+        self.assertEqual(call.kwargs["sort"][-1], {"_shard_doc": "asc"})
+        self.assertNotIn("search_after", call.kwargs)
+        self.assertNotIn("from_", call.kwargs)
+
+        self.app.elasticsearch.search.return_value = self.search_result(
+            self.devices[2:]
+        )
+        response = self.client.get(
+            self.url, query_string={"page[cursor]": next_cursor, "page[size]": 2}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json["data"]), 1)
+        self.assertIsNone(response.json["meta"]["next_cursor"])
+        self.assertNotIn("next", response.json["links"])
+        call = self.app.elasticsearch.search.call_args
+        self.assertEqual(call.kwargs["pit"]["id"], "pit-2")
+        self.assertEqual(call.kwargs["search_after"], [1.0, 1])
+        self.app.elasticsearch.close_point_in_time.assert_called_once_with(id="pit-2")
+
+    def test_invalid_cursor(self):
+        """Ensure we return a 400 for invalid cursors."""
+        response = self.client.get(self.url + "?page[cursor]=abc")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_and_page_number(self):
+        """Ensure we can't combine the cursor with the page number."""
+        response = self.client.get(self.url + "?page[cursor]=*&page[number]=2")
+        self.assertEqual(response.status_code, 400)
+
+    def test_without_elasticsearch(self):
+        """Ensure we return a 400 if we have no full text search."""
+        self.app.elasticsearch = None
+        response = self.client.get(self.url + "?page[cursor]=*")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_of_other_search(self):
+        """Ensure we return a 400 if the cursor belongs to another search."""
+        self.app.elasticsearch.search.return_value = self.search_result(
+            self.devices[:2]
+        )
+        response = self.client.get(self.url + "?page[cursor]=*&page[size]=2")
+        next_cursor = response.json["meta"]["next_cursor"]
+
+        response = self.client.get(
+            self.url,
+            query_string={
+                "page[cursor]": next_cursor,
+                "page[size]": 2,
+                "q": "other",
+            },
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_close_point_in_time_on_error(self):
+        """Ensure we close the point in time if the search fails."""
+        self.app.elasticsearch.search.side_effect = ConnectionError("timeout")
+        response = self.client.get(self.url + "?page[cursor]=*&page[size]=2")
+        self.assertEqual(response.status_code, 503)
+        self.app.elasticsearch.close_point_in_time.assert_called_once_with(id="pit-1")
+
+    def test_ignore_errors_on_closing(self):
+        """Ensure we don't fail the last page if we can't close the point in time."""
+        self.app.elasticsearch.search.return_value = self.search_result(self.devices)
+        self.app.elasticsearch.close_point_in_time.side_effect = ConnectionError(
+            "timeout"
+        )
+        response = self.client.get(self.url + "?page[cursor]=*&page[size]=5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json["data"]), 3)
+
+    def test_other_endpoint(self):
+        """Ensure we return a 400 for endpoints without the cursor pagination."""
+        response = self.client.get(base_url + "/device-mount-actions?page[cursor]=*")
+        self.assertEqual(response.status_code, 400)
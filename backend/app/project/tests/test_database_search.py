@@ -0,0 +1,187 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the full text search in the database."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from elasticsearch import ApiError, ConnectionError
+from sqlalchemy.dialects import postgresql
+
+from project import base_url, db
+from project.api.datalayers.esalchemy import (
+    AndFilter,
+    MultiFieldMatchFilter,
+    MultiFieldWildcardFilter,
+    MustNotFilter,
+    OrFilter,
+    PostgresTextSearch,
+)
+from project.api.models import Device
+from project.api.search import is_search_unavailable
+from project.tests.base import BaseTestCase
+
+
+def to_sql(condition):
+    """Return the sql string for the condition."""
+    return str(
+        condition.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+class TestPostgresTextSearch(unittest.TestCase):
+    """Tests for the translation of the search filters to sql."""
+
+    def setUp(self):
+        """Set up the translator for the devices."""
+        self.text_search = PostgresTextSearch(Device)
+
+    def test_phrase(self):
+        """Ensure we search for phrases in the search vector."""
+        sql = to_sql(
+            self.text_search.to_sql(
+                MultiFieldMatchFilter(query="wind speed", type_="phrase", fields=[])
+            )
+        )
+        self.assertEqual(
+            sql, "device.search_vector @@ phraseto_tsquery('simple', 'wind speed')"
+        )
+
+    def test_combinations(self):
+        """Ensure we keep the and, or & not semantics."""
+        sql = to_sql(
+            self.text_search.to_sql(
+                AndFilter(
+                    [
+                        OrFilter(
+                            [
+                                MultiFieldMatchFilter("a", "phrase", []),
+                                MultiFieldMatchFilter("b", "phrase", []),
+                            ]
+                        ),
+                        MustNotFilter(MultiFieldMatchFilter("c", "phrase", [])),
+                    ]
+                )
+            )
+        )
+        self.assertEqual(
+            sql,
+            "((device.search_vector @@ phraseto_tsquery('simple', 'a')) "
+            + "OR (device.search_vector @@ phraseto_tsquery('simple', 'b'))) "
+            + "AND NOT (device.search_vector @@ phraseto_tsquery('simple', 'c'))",
+        )
+
+    def test_prefix_wildcard(self):
+        """Ensure we use the search vector for prefixes."""
+        sql = to_sql(self.text_search.to_sql(MultiFieldWildcardFilter("sens*", [])))
+        self.assertEqual(
+            sql, "device.search_vector @@ to_tsquery('simple', '''sens'':*')"
+        )
+
+    def test_other_wildcards(self):
+        """Ensure we use ilike for the other wildcards."""
+        sql = to_sql(self.text_search.to_sql(MultiFieldWildcardFilter("*100_?", [])))
+        self.assertIn("coalesce(device.short_name, '') ILIKE", sql)
+        self.assertEqual(sql.count("ILIKE"), len(Device.text_search_columns))
+        self.assertEqual(PostgresTextSearch.to_like_pattern("*100_?"), "%100\\__")
+
+    def test_search_unavailable(self):
+        """Ensure we fall back to the database for connection & server errors."""
+        self.assertTrue(is_search_unavailable(ConnectionError("refused")))
+        self.assertTrue(
+            is_search_unavailable(ApiError("error", MagicMock(status=503), {}))
+        )
+        self.assertFalse(
+            is_search_unavailable(ApiError("error", MagicMock(status=400), {}))
+        )
+        self.assertFalse(is_search_unavailable(ValueError()))
+
+
+class TestDatabaseSearch(BaseTestCase):
+    """Tests for the search of the list endpoints in the database."""
+
+    url = base_url + "/devices"
+
+    def setUp(self):
+        """Set up some devices."""
+        super().setUp()
+        self.sensor = Device(
+            short_name="Wind sensor", long_name="Ultrasonic anemometer", is_public=True
+        )
+        self.logger = Device(
+            short_name="Data logger", manufacturer_name="Campbell", is_public=True
+        )
+        self.camera = Device(short_name="Camera 100", is_public=True)
+        db.session.add_all([self.sensor, self.logger, self.camera])
+        db.session.commit()
+        self.app.config["SEARCH_DATABASE_FALLBACK"] = True
+
+    def tearDown(self):
+        """Remove the fake elasticsearch & reset the backend."""
+        self.app.elasticsearch = None
+        self.app.config["SEARCH_BACKEND"] = "elasticsearch"
+        self.app.config["SEARCH_DATABASE_FALLBACK"] = False
+        super().tearDown()
+
+    def get_ids(self, q):
+        """Return the ids of the devices that we find for the search string."""
+        response = self.client.get(self.url, query_string={"q": q})
+        self.assertEqual(response.status_code, 200)
+        return {entry["id"] for entry in response.json["data"]}
+
+    def test_search_without_elasticsearch(self):
+        """Ensure we use the search string even if we have no elasticsearch."""
+        self.assertEqual(self.get_ids("wind"), {str(self.sensor.id)})
+        self.assertEqual(self.get_ids('"data logger"'), {str(self.logger.id)})
+        self.assertEqual(
+            self.get_ids("wind OR campbell"),
+            {str(self.sensor.id), str(self.logger.id)},
+        )
+        self.assertEqual(
+            self.get_ids("-wind"), {str(self.logger.id), str(self.camera.id)}
+        )
+        self.assertEqual(self.get_ids("anemo*"), {str(self.sensor.id)})
+        self.assertEqual(self.get_ids("*era 1*"), set())
+        self.assertEqual(self.get_ids("*era*"), {str(self.camera.id)})
+
+    def test_failover(self):
+        """Ensure we search in the database if the elasticsearch is down."""
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.side_effect = ConnectionError("refused")
+        self.assertEqual(self.get_ids("wind"), {str(self.sensor.id)})
+        self.app.elasticsearch.search.assert_called()
+
+    def test_postgres_backend(self):
+        """Ensure we don't ask the elasticsearch if we want the database."""
+        self.app.elasticsearch = MagicMock()
+        self.app.config["SEARCH_BACKEND"] = "postgres"
+        self.assertEqual(self.get_ids("logger"), {str(self.logger.id)})
+        self.app.elasticsearch.search.assert_not_called()
+
+    def test_without_fallback(self):
+        """Ensure we ignore the search string without the fallback."""
+        self.app.config["SEARCH_DATABASE_FALLBACK"] = False
+        self.assertEqual(
+            self.get_ids("wind"),
+            {str(self.sensor.id), str(self.logger.id), str(self.camera.id)},
+        )
+
+    def test_unavailable_without_fallback(self):
+        """Ensure we give a 503 if the elasticsearch is down & we have no fallback."""
+        self.app.config["SEARCH_DATABASE_FALLBACK"] = False
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.side_effect = ConnectionError("refused")
+        response = self.client.get(self.url, query_string={"q": "wind"})
+        self.assertEqual(response.status_code, 503)
+
+    def test_postgres_backend_without_fallback(self):
+        """Ensure the postgres backend doesn't need the fallback setting."""
+        self.app.config["SEARCH_DATABASE_FALLBACK"] = False
+        self.app.config["SEARCH_BACKEND"] = "postgres"
+        self.assertEqual(self.get_ids("logger"), {str(self.logger.id)})
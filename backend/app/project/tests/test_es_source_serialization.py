@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the list responses that we serialize from the search index."""
+
+from unittest.mock import MagicMock, patch
+
+from project import base_url, db
+from project.api.models import Device
+from project.api.resources import DeviceList
+from project.tests.base import BaseTestCase
+
+
+class TestEsSourceSerialization(BaseTestCase):
+    """Tests for the serialize_from_es_source option of the data layer."""
+
+    url = base_url + "/devices"
+
+    def setUp(self):
+        """Set up the tests with a fake elasticsearch."""
+        super().setUp()
+        self.device = Device(
+            short_name="db short name", long_name="db long name", is_public=True
+        )
+        db.session.add(self.device)
+        db.session.commit()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.return_value = {
+            "hits": {
+                "total": {"value": 1},
+                "hits": [
+                    {
+                        "_id": str(self.device.id),
+                        "_source": {
+                            "short_name": "es short name",
+                            "updated_at": "2026-01-02T03:04:05+00:00",
+                        },
+                    }
+                ],
+            }
+        }
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def test_sparse_fields_from_the_source(self):
+        """Ensure we use the documents of the index if they have all the fields."""
+        response = self.client.get(
+            self.url + "?q=short&fields[device]=short_name,updated_at"
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json["data"]
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]["id"], str(self.device.id))
+        self.assertEqual(data[0]["attributes"]["short_name"], "es short name")
+        self.assertEqual(
+            data[0]["attributes"]["updated_at"], "2026-01-02T03:04:05+00:00"
+        )
+        self.assertEqual(response.json["meta"]["count"], 1)
+        call = self.app.elasticsearch.search.call_args
+        self.assertEqual(sorted(call.kwargs["source"]), ["short_name", "updated_at"])
+
+    def test_fallback_for_fields_that_are_not_in_the_index(self):
+        """Ensure we use the database if a field is not in the index."""
+        response = self.client.get(
+            self.url + "?q=short&fields[device]=short_name,schema_version"
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json["data"]
+        self.assertEqual(data[0]["attributes"]["short_name"], "db short name")
+        call = self.app.elasticsearch.search.call_args
+        self.assertFalse(call.kwargs["source"])
+
+    def test_fallback_without_sparse_fields(self):
+        """Ensure we use the database if we need all the fields."""
+        response = self.client.get(self.url + "?q=short")
+        self.assertEqual(response.status_code, 200)
+        data = response.json["data"]
+        self.assertEqual(data[0]["attributes"]["short_name"], "db short name")
+
+    def test_fallback_with_includes(self):
+        """Ensure we use the database if we want to include other resources."""
+        response = self.client.get(
+            self.url + "?q=short&fields[device]=short_name&include=created_by"
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json["data"]
+        self.assertEqual(data[0]["attributes"]["short_name"], "db short name")
+
+    def test_fallback_with_after_get_collection_hook(self):
+        """Ensure the after_get_collection hooks still get the model instances."""
+        collections = []
+
+        def after_get_collection(collection, qs, view_kwargs):
+            collections.append(collection)
+            return collection
+
+        with patch.object(
+            DeviceList._data_layer, "after_get_collection", after_get_collection
+        ):
+            response = self.client.get(self.url + "?q=short&fields[device]=short_name")
+        self.assertEqual(response.status_code, 200)
+        data = response.json["data"]
+        self.assertEqual(data[0]["attributes"]["short_name"], "db short name")
+        self.assertEqual(collections, [[self.device]])
@@ -8,13 +8,21 @@
 
 """Tests for the es query builder & filter classes."""
 
+import json
 import unittest
 
+from sqlalchemy.dialects import postgresql
+
 from project.api.datalayers.esalchemy import (
     AndFilter,
+    BoolFilter,
     EsQueryBuilder,
     ExistsFilter,
+    FilterOptimizer,
     FilterParser,
+    GeoBoundingBoxFilter,
+    GeoDistanceFilter,
+    GeoShapeIntersectsFilter,
     MultiFieldMatchFilter,
     MultiFieldWildcardFilter,
     MustNotFilter,
@@ -22,7 +30,10 @@ from project.api.datalayers.esalchemy import (
     OrFilter,
     TermEqualsExactStringFilter,
     TermExactInListFilter,
+    TermsFilter,
 )
+from project.api.helpers.errors import BadRequestError
+from project.api.models import Device, Site
 
 
 class FakeModel:
@@ -768,3 +779,413 @@ class TestFilterParser(unittest.TestCase):
 
         expected = ExistsFilter(field="manufacturer_name")
         self.assertEqual(output_filter, expected)
+
+
+def lookup(document, name):
+    """Return the (not null) values of the field in the document."""
+    values = [document]
+    for part in name.split("."):
+        next_values = []
+        for value in values:
+            if isinstance(value, dict) and value.get(part) is not None:
+                sub_value = value[part]
+                if isinstance(sub_value, list):
+                    next_values.extend(sub_value)
+                else:
+                    next_values.append(sub_value)
+        values = next_values
+    return values
+
+
+def matches(query, document):
+    """
+    Check if the document matches the query.
+
+    This is a very reduced version of what the elasticsearch does,
+    but enough to compare the results of our filters.
+    """
+    kind, body = list(query.items())[0]
+    if kind == "term":
+        name, settings = list(body.items())[0]
+        return settings["value"] in lookup(document, name)
+    if kind == "terms":
+        name, values = list(body.items())[0]
+        return any(v in values for v in lookup(document, name))
+    if kind == "exists":
+        return bool(lookup(document, body["field"]))
+    if kind == "multi_match":
+        return any(body["query"] in v for v in document.values() if isinstance(v, str))
+    if kind == "nested":
+        return any(
+            matches(body["query"], {**document, body["path"]: element})
+            for element in document.get(body["path"], [])
+        )
+    if kind == "bool":
+        required = body.get("must", []) + body.get("filter", [])
+        if not all(matches(q, document) for q in required):
+            return False
+        if any(matches(q, document) for q in body.get("must_not", [])):
+            return False
+        # The elasticsearch needs one should clause only if there are
+        # no must or filter clauses.
+        if body.get("should") and not required:
+            return any(matches(q, document) for q in body["should"])
+        return True
+    raise ValueError(f"Unsupported query: {kind}")
+
+
+class TestGeoFilters(unittest.TestCase):
+    """Test the parsing of the geo filters."""
+
+    def test_parse_geo_bounding_box(self):
+        """Test the bounding box with [min_lon, min_lat, max_lon, max_lat]."""
+        filter_raw = [
+            {"name": "geometry", "op": "geo_bounding_box", "val": [12, 52.1, 13.5, 53]}
+        ]
+        output_filter = FilterParser.parse(filter_raw)
+
+        self.assertEqual(
+            output_filter, GeoBoundingBoxFilter("geometry", 12, 52.1, 13.5, 53)
+        )
+        self.assertEqual(
+            output_filter.to_query(),
+            {
+                "geo_bounding_box": {
+                    "geometry": {
+                        "top_left": {"lat": 53, "lon": 12},
+                        "bottom_right": {"lat": 52.1, "lon": 13.5},
+                    }
+                }
+            },
+        )
+
+    def test_parse_geo_distance(self):
+        """Test the distance filter with different units."""
+        for distance, meters in [("5km", 5000), (300, 300), ("2.5 m", 2.5)]:
+            with self.subTest(distance=distance):
+                filter_raw = [
+                    {
+                        "name": "locations",
+                        "op": "geo_distance",
+                        "val": {"lat": 52.38, "lon": 13.06, "distance": distance},
+                    }
+                ]
+                output_filter = FilterParser.parse(filter_raw)
+                self.assertEqual(
+                    output_filter, GeoDistanceFilter("locations", 52.38, 13.06, meters)
+                )
+        self.assertEqual(
+            output_filter.to_query(),
+            {
+                "geo_distance": {
+                    "distance": "2.5m",
+                    "locations": {"lat": 52.38, "lon": 13.06},
+                }
+            },
+        )
+
+    def test_parse_geo_intersects(self):
+        """Test the intersects filter with a wkt shape."""
+        filter_raw = [
+            {
+                "name": "geometry",
+                "op": "geo_intersects",
+                "val": "POLYGON((0 0, 1 0, 1 1, 0 1, 0 0))",
+            }
+        ]
+        output_filter = FilterParser.parse(filter_raw)
+        self.assertEqual(
+            output_filter,
+            GeoShapeIntersectsFilter("geometry", "POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0))"),
+        )
+        self.assertEqual(
+            output_filter.to_query(),
+            {
+                "geo_shape": {
+                    "geometry": {
+                        "shape": "POLYGON ((0 0, 1 0, 1 1, 0 1, 0 0))",
+                        "relation": "intersects",
+                    }
+                }
+            },
+        )
+
+    def test_parse_geo_filter_for_model(self):
+        """Ensure the model can restrict the geo filters."""
+        filter_raw = [
+            {"name": "geometry", "op": "geo_bounding_box", "val": [12, 52, 13, 53]}
+        ]
+        output_filter = FilterOptimizer.optimize(FilterParser.parse(filter_raw, Site))
+        self.assertEqual(
+            output_filter.to_query(),
+            {
+                "bool": {
+                    "filter": [
+                        GeoBoundingBoxFilter("geometry", 12, 52, 13, 53).to_query(),
+                        {
+                            "bool": {
+                                "should": [
+                                    {"term": {"epsg_code": {"value": "4326"}}},
+                                    {
+                                        "bool": {
+                                            "must_not": [
+                                                {"exists": {"field": "epsg_code"}}
+                                            ]
+                                        }
+                                    },
+                                ]
+                            }
+                        },
+                    ]
+                }
+            },
+        )
+
+    def test_geo_filter_sql_without_geo_fields(self):
+        """Ensure models without coordinates don't match any geo filter."""
+        condition = Device.geo_filter_sql(
+            GeoBoundingBoxFilter("geometry", 12, 52, 13, 53)
+        )
+        self.assertEqual(str(condition.compile(dialect=postgresql.dialect())), "false")
+
+    def test_invalid_values(self):
+        """Ensure that we raise errors for invalid values."""
+        for op, val in [
+            ("geo_bounding_box", [1, 2, 3]),
+            ("geo_bounding_box", [13, 53, 12, 52]),
+            ("geo_bounding_box", [0, 0, 200, 1]),
+            ("geo_bounding_box", "abc"),
+            ("geo_distance", {"lat": 52, "lon": 13}),
+            ("geo_distance", {"lat": 52, "lon": 13, "distance": "far"}),
+            ("geo_distance", {"lat": 100, "lon": 13, "distance": "1km"}),
+            ("geo_intersects", "POLYGON(("),
+            ("geo_intersects", 42),
+        ]:
+            with self.subTest(op=op, val=val):
+                with self.assertRaises(BadRequestError):
+                    FilterParser.parse([{"name": "geometry", "op": op, "val": val}])
+
+    def test_filter_context(self):
+        """Ensure the geo filters don't contribute to the score."""
+        optimized = FilterOptimizer.optimize(
+            GeoDistanceFilter("locations", 52.38, 13.06, 1000)
+        )
+        self.assertEqual(
+            optimized,
+            BoolFilter(filters=[GeoDistanceFilter("locations", 52.38, 13.06, 1000)]),
+        )
+
+
+class TestFilterOptimizer(unittest.TestCase):
+    """
+    This are the test cases for the FilterOptimizer.
+
+    The optimized filters should match the very same documents,
+    but with smaller queries.
+    """
+
+    documents = [
+        {
+            "id": 1,
+            "short_name": "temperature sensor",
+            "is_public": True,
+            "is_internal": False,
+            "is_private": False,
+            "archived": False,
+            "created_by_id": 1,
+            "manufacturer_name": "Campbell",
+            "contacts": [{"contacts": {"email": "a@b.org"}}],
+        },
+        {
+            "id": 2,
+            "short_name": "pressure sensor",
+            "is_public": False,
+            "is_internal": True,
+            "is_private": False,
+            "archived": True,
+            "created_by_id": 2,
+            "manufacturer_name": "Vaisala",
+            "contacts": [],
+        },
+        {
+            "id": 3,
+            "short_name": "temperature logger",
+            "is_public": False,
+            "is_internal": False,
+            "is_private": True,
+            "archived": False,
+            "created_by_id": 2,
+            "manufacturer_name": None,
+            "contacts": [{"contacts": {"email": "c@d.org"}}],
+        },
+        {
+            "id": 4,
+            "short_name": "wind sensor",
+            "is_public": False,
+            "is_internal": False,
+            "is_private": True,
+            "archived": False,
+            "created_by_id": 1,
+            "manufacturer_name": "Thies",
+            "contacts": [{"contacts": {"email": "a@b.org"}}],
+        },
+    ]
+
+    def visibility(self, user_id):
+        """Return the filter that we use for the visibility of the devices."""
+        return OrFilter(
+            [
+                AndFilter(
+                    [
+                        TermEqualsExactStringFilter("is_private", True),
+                        TermEqualsExactStringFilter("created_by_id", user_id),
+                    ]
+                ),
+                TermEqualsExactStringFilter("is_public", True),
+                TermEqualsExactStringFilter("is_internal", True),
+            ]
+        )
+
+    def example_filters(self):
+        """Return some filters like the ones that we create for the requests."""
+        builder = EsQueryBuilder().with_filter_args(
+            [
+                {
+                    "name": "manufacturer_name",
+                    "op": "in_",
+                    "val": ["Campbell", "Thies", "Vaisala"],
+                },
+                {"name": "contacts.email", "op": "ne", "val": "c@d.org"},
+            ]
+        )
+        builder.q = "sensor"
+        return [
+            AndFilter(
+                [
+                    builder.to_filter(FakeModel),
+                    AndFilter(
+                        [
+                            self.visibility(1),
+                            TermEqualsExactStringFilter("archived", False),
+                        ]
+                    ),
+                ]
+            ),
+            AndFilter([self.visibility(2), MustNotFilter(ExistsFilter("archived"))]),
+            OrFilter(
+                [
+                    TermExactInListFilter("manufacturer_name", ["Thies"]),
+                    OrFilter(
+                        [
+                            TermEqualsExactStringFilter("manufacturer_name", "Vaisala"),
+                            MustNotFilter(ExistsFilter("manufacturer_name")),
+                        ]
+                    ),
+                ]
+            ),
+            MustNotFilter(MustNotFilter(TermEqualsExactStringFilter("id", 3))),
+            TermExactInListFilter("manufacturer_name", []),
+        ]
+
+    def matching_ids(self, query):
+        """Return the ids of the documents that match the query."""
+        return [d["id"] for d in self.documents if matches(query, d)]
+
+    def test_same_documents(self):
+        """Ensure that the optimized filters match the very same documents."""
+        for filter_ in self.example_filters():
+            with self.subTest(filter_=filter_):
+                optimized = FilterOptimizer.optimize(filter_)
+                self.assertEqual(
+                    self.matching_ids(optimized.to_query()),
+                    self.matching_ids(filter_.to_query()),
+                )
+
+    def test_smaller_queries(self):
+        """Ensure that the optimized queries are smaller."""
+        for filter_ in self.example_filters()[:-1]:
+            with self.subTest(filter_=filter_):
+                optimized = FilterOptimizer.optimize(filter_)
+                self.assertLess(
+                    len(json.dumps(optimized.to_query())),
+                    len(json.dumps(filter_.to_query())),
+                )
+
+    def test_terms(self):
+        """Ensure we use one terms query for the in_ filter."""
+        filter_ = TermExactInListFilter("manufacturer_name", ["A", "B", "A"])
+        self.assertEqual(
+            FilterOptimizer.optimize_filter(filter_),
+            TermsFilter("manufacturer_name", ["A", "B"]),
+        )
+        self.assertEqual(
+            FilterOptimizer.optimize_filter(TermExactInListFilter("name", ["A"])),
+            TermEqualsExactStringFilter("name", "A"),
+        )
+        # An empty should clause matches everything, so we keep it.
+        empty = TermExactInListFilter("name", [])
+        self.assertEqual(FilterOptimizer.optimize_filter(empty), empty)
+
+    def test_filter_context(self):
+        """Ensure we move the clauses that don't need a score into the filter."""
+        match_filter = MultiFieldMatchFilter(query="sensor")
+        filter_ = AndFilter(
+            [
+                AndFilter([match_filter, self.visibility(1)]),
+                AndFilter([MustNotFilter(ExistsFilter("archived"))]),
+            ]
+        )
+        optimized = FilterOptimizer.optimize(filter_)
+        self.assertEqual(
+            optimized,
+            BoolFilter(
+                must=[match_filter],
+                filters=[
+                    OrFilter(
+                        [
+                            BoolFilter(
+                                filters=[
+                                    TermEqualsExactStringFilter("is_private", True),
+                                    TermEqualsExactStringFilter("created_by_id", 1),
+                                ]
+                            ),
+                            TermEqualsExactStringFilter("is_public", True),
+                            TermEqualsExactStringFilter("is_internal", True),
+                        ]
+                    )
+                ],
+                must_not=[ExistsFilter("archived")],
+            ),
+        )
+        # Also a single term filter should end in the filter context.
+        self.assertEqual(
+            FilterOptimizer.optimize(TermEqualsExactStringFilter("is_public", True)),
+            BoolFilter(filters=[TermEqualsExactStringFilter("is_public", True)]),
+        )
+        self.assertIsNone(FilterOptimizer.optimize(None))
+
+    def test_canonical_form(self):
+        """Ensure we get the same canonical form for equivalent filters."""
+        filter1 = AndFilter(
+            [
+                TermExactInListFilter("manufacturer_name", ["A", "B"]),
+                AndFilter([self.visibility(1), ExistsFilter("serial_number")]),
+            ]
+        )
+        filter2 = AndFilter(
+            [
+                ExistsFilter("serial_number"),
+                self.visibility(1),
+                OrFilter(
+                    [
+                        TermEqualsExactStringFilter("manufacturer_name", "B"),
+                        TermEqualsExactStringFilter("manufacturer_name", "A"),
+                    ]
+                ),
+            ]
+        )
+        filter3 = AndFilter([self.visibility(2), ExistsFilter("serial_number")])
+        canonical_form1 = FilterOptimizer.canonical_form(filter1)
+        self.assertEqual(canonical_form1, FilterOptimizer.canonical_form(filter2))
+        self.assertNotEqual(canonical_form1, FilterOptimizer.canonical_form(filter3))
+        self.assertEqual(len({canonical_form1, canonical_form1}), 1)
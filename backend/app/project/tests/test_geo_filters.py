@@ -0,0 +1,265 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the geo filters of the sites & configurations."""
+
+import datetime
+import json
+from unittest.mock import MagicMock
+from urllib.parse import quote
+
+import pytz
+import shapely.wkt
+from geoalchemy2.shape import from_shape
+
+from project import base_url, db
+from project.api.models import Configuration, Contact, Site
+from project.api.models.configuration_location_actions import (
+    ConfigurationStaticLocationBeginAction,
+)
+from project.tests.base import BaseTestCase
+
+
+def filter_url(url, filters):
+    """Return the url with the filter parameter."""
+    return url + "?filter=" + quote(json.dumps(filters))
+
+
+class TestGeoFiltersWithoutElasticsearch(BaseTestCase):
+    """Tests for the geo filters with the sql fallback."""
+
+    sites_url = base_url + "/sites"
+    configurations_url = base_url + "/configurations"
+
+    def setUp(self):
+        """Set up some sites & configurations with coordinates."""
+        super().setUp()
+        self.potsdam = Site(
+            label="Potsdam",
+            is_public=True,
+            geometry=from_shape(
+                shapely.wkt.loads(
+                    "POLYGON((13.0 52.3, 13.1 52.3, 13.1 52.4, 13.0 52.4, 13.0 52.3))"
+                )
+            ),
+        )
+        self.leipzig = Site(
+            label="Leipzig",
+            is_public=True,
+            geometry=from_shape(
+                shapely.wkt.loads(
+                    "POLYGON((12.3 51.3, 12.4 51.3, 12.4 51.4, 12.3 51.4, 12.3 51.3))"
+                )
+            ),
+        )
+        # Geometries in a different reference system are not used.
+        self.projected = Site(
+            label="Projected",
+            is_public=True,
+            epsg_code="25833",
+            geometry=from_shape(
+                shapely.wkt.loads(
+                    "POLYGON((13.0 52.3, 13.1 52.3, 13.1 52.4, 13.0 52.4, 13.0 52.3))"
+                )
+            ),
+        )
+        contact = Contact(
+            given_name="first", family_name="contact", email="first.contact@localhost"
+        )
+        self.telegrafenberg = Configuration(label="Telegrafenberg", is_public=True)
+        self.other_configuration = Configuration(label="Other", is_public=True)
+        begin_date = datetime.datetime(2022, 1, 25, 0, 0, 0, tzinfo=pytz.UTC)
+        locations = [
+            ConfigurationStaticLocationBeginAction(
+                configuration=self.telegrafenberg,
+                begin_date=begin_date,
+                begin_contact=contact,
+                x=13.0642,
+                y=52.3806,
+                epsg_code="4326",
+            ),
+            # Coordinates in a different reference system are not used.
+            ConfigurationStaticLocationBeginAction(
+                configuration=self.other_configuration,
+                begin_date=begin_date,
+                begin_contact=contact,
+                x=13.0642,
+                y=52.3806,
+                epsg_code="25833",
+            ),
+        ]
+        db.session.add_all(
+            [
+                self.potsdam,
+                self.leipzig,
+                self.projected,
+                contact,
+                self.telegrafenberg,
+                self.other_configuration,
+                *locations,
+            ]
+        )
+        db.session.commit()
+
+    def get_ids(self, url, filters):
+        """Return the ids of the list response for the filters."""
+        response = self.client.get(filter_url(url, filters))
+        self.assertEqual(response.status_code, 200)
+        return {entry["id"] for entry in response.json["data"]}
+
+    def test_sites_in_bounding_box(self):
+        """Ensure we get the sites that intersect the bounding box."""
+        filters = [
+            {"name": "geometry", "op": "geo_bounding_box", "val": [13.05, 52, 14, 53]}
+        ]
+        self.assertEqual(self.get_ids(self.sites_url, filters), {str(self.potsdam.id)})
+
+    def test_sites_within_distance(self):
+        """Ensure we get the sites within the distance of a point."""
+        # Leipzig is ~ 120 km away from the Telegrafenberg in Potsdam.
+        point = {"lat": 52.3806, "lon": 13.0642}
+        filters = [
+            {
+                "name": "geometry",
+                "op": "geo_distance",
+                "val": {**point, "distance": "5km"},
+            }
+        ]
+        self.assertEqual(self.get_ids(self.sites_url, filters), {str(self.potsdam.id)})
+        filters = [
+            {
+                "name": "geometry",
+                "op": "geo_distance",
+                "val": {**point, "distance": "150km"},
+            }
+        ]
+        self.assertEqual(
+            self.get_ids(self.sites_url, filters),
+            {str(self.potsdam.id), str(self.leipzig.id)},
+        )
+
+    def test_sites_intersecting_shape(self):
+        """Ensure we get the sites that intersect the wkt shape."""
+        filters = [
+            {
+                "or": [
+                    {
+                        "name": "geometry",
+                        "op": "geo_intersects",
+                        "val": "LINESTRING(12.0 51.35, 12.35 51.35)",
+                    },
+                    {"name": "label", "op": "eq", "val": "Potsdam"},
+                ]
+            }
+        ]
+        self.assertEqual(
+            self.get_ids(self.sites_url, filters),
+            {str(self.potsdam.id), str(self.leipzig.id)},
+        )
+
+    def test_configurations_within_distance(self):
+        """Ensure we use the static locations of the configurations."""
+        filters = [
+            {
+                "name": "locations",
+                "op": "geo_distance",
+                "val": {"lat": 52.38, "lon": 13.06, "distance": "1km"},
+            }
+        ]
+        self.assertEqual(
+            self.get_ids(self.configurations_url, filters),
+            {str(self.telegrafenberg.id)},
+        )
+        filters = [
+            {"name": "locations", "op": "geo_bounding_box", "val": [12, 51, 12.5, 51.5]}
+        ]
+        self.assertEqual(self.get_ids(self.configurations_url, filters), set())
+
+    def test_invalid_filters(self):
+        """Ensure we return a 400 for invalid geo filters."""
+        for url, filters in [
+            (
+                self.sites_url,
+                [{"name": "label", "op": "geo_bounding_box", "val": [0, 0, 1, 1]}],
+            ),
+            (
+                self.sites_url,
+                [{"name": "geometry", "op": "geo_bounding_box", "val": [0, 0, 1]}],
+            ),
+            (
+                base_url + "/devices",
+                [{"name": "geometry", "op": "geo_bounding_box", "val": [0, 0, 1, 1]}],
+            ),
+        ]:
+            with self.subTest(url=url, filters=filters):
+                response = self.client.get(filter_url(url, filters))
+                self.assertEqual(response.status_code, 400)
+
+
+class TestGeoFiltersWithElasticsearch(BaseTestCase):
+    """Tests for the geo filters with the elasticsearch."""
+
+    url = base_url + "/sites"
+
+    def setUp(self):
+        """Set up the tests with a fake elasticsearch."""
+        super().setUp()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.return_value = {
+            "hits": {"total": {"value": 0}, "hits": []}
+        }
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def test_filter_context(self):
+        """Ensure we send the geo filter in the filter context."""
+        filters = [
+            {"name": "geometry", "op": "geo_bounding_box", "val": [13, 52, 14, 53]}
+        ]
+        response = self.client.get(filter_url(self.url, filters))
+        self.assertEqual(response.status_code, 200)
+        query = self.app.elasticsearch.search.call_args.kwargs["query"]
+        self.assertIn(
+            {
+                "geo_bounding_box": {
+                    "geometry": {
+                        "top_left": {"lat": 53.0, "lon": 13.0},
+                        "bottom_right": {"lat": 52.0, "lon": 14.0},
+                    }
+                }
+            },
+            query["bool"]["filter"],
+        )
+
+    def test_wgs84_geometries_only(self):
+        """Ensure the geo filters don't match the sites in other reference systems."""
+        filters = [
+            {"name": "geometry", "op": "geo_bounding_box", "val": [13, 52, 14, 53]}
+        ]
+        response = self.client.get(filter_url(self.url, filters))
+        self.assertEqual(response.status_code, 200)
+        query = self.app.elasticsearch.search.call_args.kwargs["query"]
+        self.assertIn(
+            {
+                "bool": {
+                    "should": [
+                        {"term": {"epsg_code": {"value": "4326"}}},
+                        {"bool": {"must_not": [{"exists": {"field": "epsg_code"}}]}},
+                    ]
+                }
+            },
+            query["bool"]["filter"],
+        )
+
+    def test_unsupported_field(self):
+        """Ensure we don't send geo filters for fields without coordinates."""
+        filters = [{"name": "label", "op": "geo_bounding_box", "val": [0, 0, 1, 1]}]
+        response = self.client.get(filter_url(self.url, filters))
+        self.assertEqual(response.status_code, 400)
+        self.app.elasticsearch.search.assert_not_called()
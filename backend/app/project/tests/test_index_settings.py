@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the configurable settings of the search indices."""
+
+import unittest
+
+from project.api.es_utils import IndexSettings
+from project.api.models import Device
+
+
+class TestIndexSettings(unittest.TestCase):
+    """Tests for the IndexSettings."""
+
+    def test_from_config(self):
+        """Ensure the index entries win over the default ones."""
+        config = {
+            "default": {"number_of_replicas": 1, "ngram_type": "edge_ngram"},
+            "device": {"number_of_replicas": 2},
+        }
+        settings = IndexSettings.from_config(config, "device")
+        self.assertEqual(settings.number_of_replicas, 2)
+        self.assertEqual(settings.ngram_type, "edge_ngram")
+        settings = IndexSettings.from_config(config, "site", number_of_shards=3)
+        self.assertEqual(settings.number_of_replicas, 1)
+        self.assertEqual(settings.number_of_shards, 3)
+        self.assertEqual(IndexSettings.from_config({}, "device"), IndexSettings())
+
+    def test_from_config_invalid(self):
+        """Ensure we complain about settings that we don't know."""
+        with self.assertRaises(ValueError):
+            IndexSettings.from_config({"device": {"shards": 2}}, "device")
+        with self.assertRaises(ValueError):
+            IndexSettings.from_config({"default": {"ngram_type": "shingle"}}, "device")
+
+    def test_apply_defaults(self):
+        """Ensure the default settings keep the index as it is."""
+        definition = Device.get_search_index_definition()
+        result = IndexSettings().apply(definition)
+        self.assertEqual(result["mappings"], definition["mappings"])
+        self.assertEqual(
+            result["settings"]["analysis"], definition["settings"]["analysis"]
+        )
+        self.assertEqual(result["settings"]["index"]["number_of_shards"], "1")
+        self.assertNotIn("number_of_replicas", result["settings"]["index"])
+        self.assertEqual(result["settings"]["mapping"]["total_fields"]["limit"], 2000)
+
+    def test_apply(self):
+        """Ensure we change shards, replicas, the ngrams & the refresh interval."""
+        definition = Device.get_search_index_definition()
+        settings = IndexSettings(
+            number_of_shards=2,
+            number_of_replicas=0,
+            ngram_type="edge_ngram",
+            min_ngram=2,
+            max_ngram=10,
+            total_fields_limit=500,
+            refresh_interval="-1",
+        )
+        result = settings.apply(definition)
+        index_settings = result["settings"]["index"]
+        self.assertEqual(index_settings["number_of_shards"], "2")
+        self.assertEqual(index_settings["number_of_replicas"], "0")
+        self.assertEqual(index_settings["refresh_interval"], "-1")
+        self.assertGreaterEqual(index_settings["max_ngram_diff"], 8)
+        self.assertEqual(result["settings"]["mapping"]["total_fields"]["limit"], 500)
+        for filter_definition in result["settings"]["analysis"]["filter"].values():
+            self.assertEqual(filter_definition["type"], "edge_ngram")
+            self.assertEqual(filter_definition["min_gram"], 2)
+            self.assertEqual(filter_definition["max_gram"], 10)
+        # The definition itself stays as it is.
+        self.assertEqual(definition, Device.get_search_index_definition())
+
+    def test_text_analyzer_fields(self):
+        """Ensure we keep the text_analyzer subfields for the listed fields only."""
+        definition = {
+            "mappings": {
+                "properties": {
+                    "short_name": {
+                        "type": "keyword",
+                        "fields": {
+                            "text": {"type": "text"},
+                            "text_analyzer": {"type": "text"},
+                        },
+                    },
+                    "description": {
+                        "type": "text",
+                        "fields": {"text_analyzer": {"type": "text"}},
+                    },
+                    "contacts": {
+                        "type": "nested",
+                        "properties": {
+                            "email": {
+                                "type": "keyword",
+                                "fields": {"text_analyzer": {"type": "text"}},
+                            },
+                            "website": {
+                                "type": "keyword",
+                                "fields": {"text_analyzer": {"type": "text"}},
+                            },
+                        },
+                    },
+                }
+            }
+        }
+        settings = IndexSettings(text_analyzer_fields=["short_name", "contacts.email"])
+        properties = settings.apply(definition)["mappings"]["properties"]
+        self.assertEqual(
+            properties["short_name"]["fields"].keys(), {"text", "text_analyzer"}
+        )
+        self.assertNotIn("fields", properties["description"])
+        contact_properties = properties["contacts"]["properties"]
+        self.assertIn("text_analyzer", contact_properties["email"]["fields"])
+        self.assertNotIn("fields", contact_properties["website"])
+
+        settings = IndexSettings(text_analyzer_fields=["contacts"])
+        properties = settings.apply(definition)["mappings"]["properties"]
+        self.assertEqual(properties["short_name"]["fields"].keys(), {"text"})
+        contact_properties = properties["contacts"]["properties"]
+        self.assertIn("text_analyzer", contact_properties["website"]["fields"])
@@ -0,0 +1,153 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the cache of the search results."""
+
+import unittest
+from unittest.mock import MagicMock
+
+from flask import Flask
+
+from project import base_url, db
+from project.api.models import Device
+from project.api.search import freeze_query
+from project.extensions.instances import search_cache
+from project.extensions.search_cache import SearchResultCache
+from project.tests.base import BaseTestCase
+
+
+class TestSearchResultCache(unittest.TestCase):
+    """Tests for the SearchResultCache class."""
+
+    def setUp(self):
+        """Set up a cache for the tests."""
+        app = Flask(__name__)
+        app.config["ELASTICSEARCH_SEARCH_CACHE_SIZE"] = 2
+        app.config["ELASTICSEARCH_SEARCH_CACHE_TTL"] = 60
+        self.cache = SearchResultCache(app)
+        self.cache.REFRESH_INTERVAL = 0
+
+    def test_get_and_set(self):
+        """Ensure we count the hits & the misses."""
+        self.assertIsNone(self.cache.get("device", "key"))
+        self.cache.set("device", "key", ([1, 2], 2))
+        self.assertEqual(self.cache.get("device", "key"), ([1, 2], 2))
+        self.assertIsNone(self.cache.get("platform", "key"))
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["size"], 1)
+
+    def test_invalidate(self):
+        """Ensure we invalidate the entries of the index only."""
+        self.cache.set("device", "key", ([1], 1))
+        self.cache.set("platform", "key", ([2], 1))
+        self.cache.invalidate("device")
+        self.assertIsNone(self.cache.get("device", "key"))
+        self.assertEqual(self.cache.get("platform", "key"), ([2], 1))
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    def test_no_caching_right_after_writes(self):
+        """Ensure we don't cache results that may miss the latest changes."""
+        self.cache.REFRESH_INTERVAL = 60
+        self.cache.invalidate("device")
+        self.cache.set("device", "key", ([1], 1))
+        self.assertIsNone(self.cache.get("device", "key"))
+
+    def test_bounded(self):
+        """Ensure we drop the least recently used entries."""
+        for i in range(3):
+            self.cache.set("device", i, ([i], 1))
+        self.assertEqual(self.cache.stats()["size"], 2)
+        self.assertIsNone(self.cache.get("device", 0))
+
+    def test_disabled(self):
+        """Ensure we don't cache anything if the size is 0."""
+        app = Flask(__name__)
+        app.config["ELASTICSEARCH_SEARCH_CACHE_SIZE"] = 0
+        cache = SearchResultCache(app)
+        cache.set("device", "key", ([1], 1))
+        self.assertIsNone(cache.get("device", "key"))
+        self.assertFalse(cache.stats()["enabled"])
+
+    def test_freeze_query(self):
+        """Ensure the order of the bool clauses doesn't matter for the keys."""
+        query1 = {
+            "bool": {
+                "filter": [
+                    {"term": {"is_public": {"value": True}}},
+                    {"terms": {"manufacturer_name": ["A", "B"]}},
+                ]
+            }
+        }
+        query2 = {
+            "bool": {
+                "filter": [
+                    {"terms": {"manufacturer_name": ["B", "A"]}},
+                    {"term": {"is_public": {"value": True}}},
+                ]
+            }
+        }
+        self.assertEqual(freeze_query(query1), freeze_query(query2))
+        self.assertNotEqual(
+            freeze_query([{"short_name": "asc"}, {"long_name": "asc"}]),
+            freeze_query([{"long_name": "asc"}, {"short_name": "asc"}]),
+        )
+
+
+class TestSearchCaching(BaseTestCase):
+    """Tests for the caching of the search results of the models."""
+
+    url = base_url + "/devices"
+
+    def setUp(self):
+        """Set up the tests with an active cache & a fake elasticsearch."""
+        super().setUp()
+        self.app.config["ELASTICSEARCH_SEARCH_CACHE_SIZE"] = 100
+        search_cache.init_app(self.app)
+        search_cache.clear()
+        search_cache.REFRESH_INTERVAL = 0
+        self.device = Device(short_name="dummy device", is_public=True)
+        db.session.add(self.device)
+        db.session.commit()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.return_value = {
+            "hits": {"total": {"value": 1}, "hits": [{"_id": str(self.device.id)}]}
+        }
+
+    def tearDown(self):
+        """Disable the cache & remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        self.app.config["ELASTICSEARCH_SEARCH_CACHE_SIZE"] = 0
+        search_cache.init_app(self.app)
+        del search_cache.REFRESH_INTERVAL
+        super().tearDown()
+
+    def test_repeated_search(self):
+        """Ensure we ask the elasticsearch only once for the same search."""
+        for _ in range(2):
+            response = self.client.get(self.url + "?q=dummy")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json["data"][0]["id"], str(self.device.id))
+        self.assertEqual(self.app.elasticsearch.search.call_count, 1)
+        stats = search_cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+        # Different searches use different entries.
+        self.client.get(self.url + "?q=other")
+        self.assertEqual(self.app.elasticsearch.search.call_count, 2)
+
+    def test_invalidate_on_writes(self):
+        """Ensure we search again after we changed the index."""
+        self.client.get(self.url + "?q=dummy")
+        self.device.long_name = "changed"
+        db.session.add(self.device)
+        db.session.commit()
+        self.app.elasticsearch.index.assert_called()
+
+        self.client.get(self.url + "?q=dummy")
+        self.assertEqual(self.app.elasticsearch.search.call_count, 2)
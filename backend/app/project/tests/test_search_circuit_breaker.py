@@ -0,0 +1,180 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the circuit breaker of the search requests."""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from elasticsearch import ConnectionError
+from flask import Flask
+
+from project import base_url, db
+from project.api.models import Device
+from project.api.models.search_index_outbox import SearchIndexOutboxEntry
+from project.api.search import is_search_unavailable
+from project.extensions.instances import search_circuit_breaker
+from project.extensions.search_circuit_breaker import (
+    SearchCircuitBreaker,
+    SearchCircuitOpenError,
+)
+from project.tests.base import BaseTestCase
+
+
+class TestSearchCircuitBreaker(unittest.TestCase):
+    """Tests for the SearchCircuitBreaker class."""
+
+    def setUp(self):
+        """Set up a circuit breaker for the tests."""
+        app = Flask(__name__)
+        app.config["ELASTICSEARCH_CIRCUIT_BREAKER"] = True
+        app.config["ELASTICSEARCH_CIRCUIT_BREAKER_FAILURE_RATE"] = 0.5
+        app.config["ELASTICSEARCH_CIRCUIT_BREAKER_MIN_CALLS"] = 4
+        app.config["ELASTICSEARCH_CIRCUIT_BREAKER_SLOW_CALL"] = 2.0
+        app.config["ELASTICSEARCH_CIRCUIT_BREAKER_RESET_TIMEOUT"] = 30.0
+        self.circuit_breaker = SearchCircuitBreaker(app)
+
+    def test_trip_on_failure_rate(self):
+        """Ensure we open the circuit once enough calls failed."""
+        self.circuit_breaker.record(0.1, False)
+        self.circuit_breaker.record(0.1, True)
+        self.circuit_breaker.record(0.1, False)
+        self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.CLOSED)
+        self.circuit_breaker.record(0.1, True)
+        self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.OPEN)
+        self.assertFalse(self.circuit_breaker.allow_request())
+        stats = self.circuit_breaker.stats()
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual(stats["trips"], 1)
+        self.assertEqual(stats["rejected"], 1)
+
+    def test_slow_calls(self):
+        """Ensure calls that take too long count as failed."""
+        for _ in range(3):
+            self.circuit_breaker.record(0.1, False)
+        self.circuit_breaker.record(5.0, False)
+        self.assertEqual(self.circuit_breaker.stats()["failures"], 1)
+        self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.CLOSED)
+
+    def test_half_open(self):
+        """Ensure the first call after the reset timeout decides about the state."""
+        with patch("time.monotonic", return_value=100.0):
+            for _ in range(4):
+                self.circuit_breaker.record(0.1, True)
+        with patch("time.monotonic", return_value=131.0):
+            self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.HALF_OPEN)
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.circuit_breaker.record(0.1, True)
+            self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.OPEN)
+        with patch("time.monotonic", return_value=162.0):
+            self.circuit_breaker.record(0.1, False)
+            self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.CLOSED)
+        self.assertEqual(self.circuit_breaker.stats()["trips"], 2)
+
+    def test_single_probe(self):
+        """Ensure we only let one request through while the circuit is half open."""
+        with patch("time.monotonic", return_value=100.0):
+            for _ in range(4):
+                self.circuit_breaker.record(0.1, True)
+        with patch("time.monotonic", return_value=131.0):
+            self.assertFalse(self.circuit_breaker.is_open())
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.assertTrue(self.circuit_breaker.is_open())
+            self.assertFalse(self.circuit_breaker.allow_request())
+        # We never got the result of the probe - so we try another one.
+        with patch("time.monotonic", return_value=162.0):
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.circuit_breaker.record(0.1, False)
+            self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.CLOSED)
+            self.assertTrue(self.circuit_breaker.allow_request())
+            self.assertTrue(self.circuit_breaker.allow_request())
+
+    def test_window(self):
+        """Ensure we forget the calls that are older than the window."""
+        with patch("time.monotonic", return_value=100.0):
+            for _ in range(3):
+                self.circuit_breaker.record(0.1, True)
+        with patch("time.monotonic", return_value=200.0):
+            self.circuit_breaker.record(0.1, True)
+        self.assertEqual(self.circuit_breaker.state, SearchCircuitBreaker.CLOSED)
+        self.assertEqual(self.circuit_breaker.stats()["calls"], 1)
+
+    def test_disabled(self):
+        """Ensure we always allow the requests if the breaker is disabled."""
+        circuit_breaker = SearchCircuitBreaker(Flask(__name__))
+        for _ in range(20):
+            circuit_breaker.record(0.1, True)
+        self.assertTrue(circuit_breaker.allow_request())
+        self.assertFalse(circuit_breaker.stats()["enabled"])
+
+    def test_search_unavailable(self):
+        """Ensure we handle the open circuit like an unavailable search."""
+        self.assertTrue(is_search_unavailable(SearchCircuitOpenError()))
+
+
+class TestSearchWithCircuitBreaker(BaseTestCase):
+    """Tests for the list endpoints & the commits with the circuit breaker."""
+
+    url = base_url + "/devices"
+
+    def setUp(self):
+        """Set up the tests with an active circuit breaker & a failing search."""
+        super().setUp()
+        self.app.config["ELASTICSEARCH_CIRCUIT_BREAKER"] = True
+        self.app.config["ELASTICSEARCH_CIRCUIT_BREAKER_MIN_CALLS"] = 2
+        self.app.config["SEARCH_DATABASE_FALLBACK"] = True
+        search_circuit_breaker.init_app(self.app)
+        self.device = Device(short_name="wind sensor", is_public=True)
+        db.session.add(self.device)
+        db.session.commit()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.side_effect = ConnectionError("timeout")
+
+    def tearDown(self):
+        """Disable the circuit breaker & remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        self.app.config["ELASTICSEARCH_CIRCUIT_BREAKER"] = False
+        self.app.config["SEARCH_DATABASE_FALLBACK"] = False
+        search_circuit_breaker.init_app(self.app)
+        super().tearDown()
+
+    def test_open_circuit_uses_the_database(self):
+        """Ensure we stop to ask the elasticsearch once the circuit is open."""
+        for _ in range(3):
+            response = self.client.get(self.url + "?q=wind")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json["data"][0]["id"], str(self.device.id))
+        self.assertEqual(self.app.elasticsearch.search.call_count, 2)
+        stats = search_circuit_breaker.stats()
+        self.assertEqual(stats["state"], "open")
+        self.assertEqual(stats["rejected"], 1)
+
+    def test_open_circuit_writes_to_the_outbox(self):
+        """Ensure we keep the changes in the outbox while the circuit is open."""
+        for _ in range(2):
+            self.client.get(self.url + "?q=wind")
+        self.device.long_name = "Ultrasonic anemometer"
+        db.session.add(self.device)
+        db.session.commit()
+
+        self.app.elasticsearch.index.assert_not_called()
+        entries = db.session.query(SearchIndexOutboxEntry).all()
+        self.assertEqual(
+            [(e.index_name, e.entity_id) for e in entries],
+            [("device", self.device.id)],
+        )
+
+    def test_commit_with_unavailable_search(self):
+        """Ensure we don't raise after the commit if the search is not available."""
+        self.app.elasticsearch.index.side_effect = ConnectionError("timeout")
+        self.device.long_name = "Ultrasonic anemometer"
+        db.session.add(self.device)
+        db.session.commit()
+
+        self.app.elasticsearch.index.assert_called_once()
+        self.assertEqual(
+            db.session.query(Device).one().long_name, "Ultrasonic anemometer"
+        )
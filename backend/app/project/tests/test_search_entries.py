@@ -0,0 +1,123 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for building the search entries in batches."""
+
+import datetime
+
+from project import db
+from project.api.models import (
+    ActivityLog,
+    Configuration,
+    Contact,
+    Device,
+    DeviceContactRole,
+    DeviceMountAction,
+    DeviceProperty,
+    User,
+)
+from project.api.services.search_benchmark import (
+    benchmark_search_entries,
+    count_queries,
+)
+from project.tests.base import BaseTestCase
+
+
+class TestSearchEntryBuilder(BaseTestCase):
+    """Tests for the build_search_entries methods."""
+
+    def create_devices(self, count, configuration=None):
+        """Create devices with some of the included entities."""
+        contact = Contact(given_name="A", family_name="B", email="a@b.org")
+        db.session.add(contact)
+        devices = []
+        for i in range(count):
+            device = Device(short_name=f"device {i}", is_public=True)
+            devices.append(device)
+            db.session.add_all(
+                [
+                    device,
+                    DeviceContactRole(
+                        device=device, contact=contact, role_name="Owner"
+                    ),
+                    DeviceProperty(device=device, property_name=f"prop {i}"),
+                ]
+            )
+            if configuration:
+                db.session.add(
+                    DeviceMountAction(
+                        configuration=configuration,
+                        device=device,
+                        begin_contact=contact,
+                        begin_date=datetime.datetime(
+                            2020, 1, 1, tzinfo=datetime.timezone.utc
+                        ),
+                    )
+                )
+        db.session.commit()
+        return devices
+
+    def test_same_entries(self):
+        """Ensure we get the very same entries as with the lazy loading."""
+        devices = self.create_devices(3)
+        ids = [d.id for d in devices]
+        expected = {d.id: d.to_search_entry() for d in devices}
+        db.session.expire_all()
+        self.assertEqual(Device.build_search_entries(ids, batch_size=2), expected)
+
+    def test_missing_entities_are_skipped(self):
+        """Ensure we don't fail for ids that are not in the database."""
+        devices = self.create_devices(1)
+        result = Device.build_search_entries([devices[0].id, 9999])
+        self.assertEqual(list(result.keys()), [devices[0].id])
+
+    def test_constant_number_of_queries(self):
+        """Ensure the number of queries doesn't depend on the number of entries."""
+        few = [d.id for d in self.create_devices(2)]
+        many = [d.id for d in self.create_devices(6)]
+
+        counts = []
+        for ids in [few, many]:
+            db.session.expire_all()
+            with count_queries() as counter:
+                Device.build_search_entries(ids)
+            counts.append(counter.count)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_configuration_with_mounts(self):
+        """Ensure we load the mounted devices in one go as well."""
+        configuration = Configuration(label="config", is_public=True)
+        db.session.add(configuration)
+        self.create_devices(5, configuration=configuration)
+
+        db.session.expire_all()
+        with count_queries() as counter:
+            entries = Configuration.build_search_entries([configuration.id])
+        self.assertEqual(len(entries[configuration.id]["device_mount_actions"]), 5)
+        self.assertLessEqual(
+            counter.count, len(Configuration.search_entry_relationships) + 5
+        )
+
+    def test_benchmark_search_entries(self):
+        """Ensure the batch needs fewer queries than the lazy loading."""
+        self.create_devices(5)
+        one_by_one, batch = benchmark_search_entries("device", limit=5)
+        self.assertEqual(one_by_one.method, "one_by_one")
+        self.assertEqual(batch.method, "batch")
+        self.assertEqual(batch.documents, 5)
+        self.assertLess(batch.queries, one_by_one.queries)
+
+    def test_activity_log_uses_the_search_entry(self):
+        """Ensure the activity log still contains the data of the entry."""
+        device = self.create_devices(1)[0]
+        contact = Contact(given_name="C", family_name="D", email="c@d.org")
+        user = User(subject="c@d.org", contact=contact)
+        db.session.add_all([contact, user])
+        db.session.commit()
+
+        log = ActivityLog.create(entity=device, user=user, description="update")
+        self.assertEqual(log.data["short_name"], device.short_name)
+        self.assertEqual(log.data["properties"][0]["property_name"], "prop 0")
@@ -0,0 +1,358 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the outbox of the search index changes."""
+
+import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+
+from project import db
+from project.api.models import (
+    Configuration,
+    Contact,
+    Device,
+    DeviceContactRole,
+    DeviceMountAction,
+    SearchIndexOutboxEntry,
+)
+from project.api.models.mixin import utc_now
+from project.api.services import search_outbox
+from project.api.services.search_outbox import (
+    coalesce_outbox_entries,
+    get_backoff_delay,
+    process_outbox_batch,
+    run_outbox_worker,
+)
+from project.tests.base import BaseTestCase
+
+
+class TestOutboxHelpers(unittest.TestCase):
+    """Tests for the functions that don't need a database."""
+
+    def test_coalesce_outbox_entries(self):
+        """Ensure we group the entries by index & id."""
+        entries = [
+            SearchIndexOutboxEntry(id=1, index_name="device", entity_id=1),
+            SearchIndexOutboxEntry(id=2, index_name="contact", entity_id=1),
+            SearchIndexOutboxEntry(id=3, index_name="device", entity_id=1),
+            SearchIndexOutboxEntry(id=4, index_name="device", entity_id=2),
+        ]
+        result = coalesce_outbox_entries(entries)
+        self.assertEqual(
+            list(result.keys()), [("device", 1), ("contact", 1), ("device", 2)]
+        )
+        self.assertEqual([e.id for e in result[("device", 1)]], [1, 3])
+
+    def test_get_backoff_delay(self):
+        """Ensure the delay grows exponentially, but not above the max."""
+        self.assertEqual(get_backoff_delay(0, 2, 60), 0)
+        self.assertEqual(get_backoff_delay(1, 2, 60), 2)
+        self.assertEqual(get_backoff_delay(2, 2, 60), 4)
+        self.assertEqual(get_backoff_delay(3, 2, 60), 8)
+        self.assertEqual(get_backoff_delay(10, 2, 60), 60)
+        self.assertEqual(get_backoff_delay(1000, 2, 60), 60)
+
+
+class TestSearchOutbox(BaseTestCase):
+    """Tests for writing & processing the search outbox."""
+
+    def setUp(self):
+        """Set up the tests with a (fake) elasticsearch & the outbox mode."""
+        super().setUp()
+        self.app.elasticsearch = MagicMock()
+        self.app.config["ELASTICSEARCH_USE_OUTBOX"] = True
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        self.app.config["ELASTICSEARCH_USE_OUTBOX"] = False
+        super().tearDown()
+
+    def test_commit_writes_outbox_entries(self):
+        """Ensure that we write to the outbox instead of the elasticsearch."""
+        device = Device(short_name="dummy device", is_public=True)
+        contact = Contact(given_name="A", family_name="B", email="a@b.org")
+        db.session.add_all([device, contact])
+        db.session.commit()
+
+        self.app.elasticsearch.index.assert_not_called()
+        entries = db.session.query(SearchIndexOutboxEntry).all()
+        keys = {(e.index_name, e.entity_id, e.operation) for e in entries}
+        self.assertEqual(
+            keys, {("device", device.id, "index"), ("contact", contact.id, "index")}
+        )
+
+    def test_commit_writes_delete_entries(self):
+        """Ensure we write delete entries for deleted searchables."""
+        device = Device(short_name="dummy device", is_public=True)
+        db.session.add(device)
+        db.session.commit()
+        device_id = device.id
+        db.session.query(SearchIndexOutboxEntry).delete()
+        db.session.commit()
+
+        db.session.delete(device)
+        db.session.commit()
+
+        entries = db.session.query(SearchIndexOutboxEntry).all()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0].entity_id, device_id)
+        self.assertEqual(entries[0].operation, "delete")
+
+    def test_no_outbox_entries_without_the_setting(self):
+        """Ensure we use the direct update if we don't use the outbox."""
+        self.app.config["ELASTICSEARCH_USE_OUTBOX"] = False
+        device = Device(short_name="dummy device", is_public=True)
+        db.session.add(device)
+        db.session.commit()
+
+        self.assertEqual(db.session.query(SearchIndexOutboxEntry).count(), 0)
+        self.app.elasticsearch.index.assert_called_once()
+
+    def test_process_outbox_batch(self):
+        """Ensure we send one bulk request with coalesced entries."""
+        device = Device(short_name="dummy device", is_public=True)
+        db.session.add(device)
+        db.session.commit()
+        device.long_name = "Some long name"
+        db.session.add(device)
+        db.session.commit()
+        self.assertEqual(db.session.query(SearchIndexOutboxEntry).count(), 2)
+
+        self.app.elasticsearch.bulk.return_value = {
+            "errors": False,
+            "items": [{"index": {"status": 200}}],
+        }
+        handled = process_outbox_batch()
+        self.assertEqual(handled, 2)
+        self.app.elasticsearch.bulk.assert_called_once()
+        operations = self.app.elasticsearch.bulk.call_args.kwargs["operations"]
+        self.assertEqual(len(operations), 2)
+        self.assertEqual(
+            operations[0], {"index": {"_index": "device", "_id": device.id}}
+        )
+        self.assertEqual(operations[1]["long_name"], "Some long name")
+        self.assertEqual(db.session.query(SearchIndexOutboxEntry).count(), 0)
+
+    def test_process_outbox_batch_for_deleted_entities(self):
+        """Ensure we send a delete if the entity is no longer there."""
+        entry = SearchIndexOutboxEntry(
+            index_name="device", entity_id=12345, operation="index"
+        )
+        db.session.add(entry)
+        db.session.commit()
+
+        self.app.elasticsearch.bulk.return_value = {
+            "errors": True,
+            "items": [{"delete": {"status": 404}}],
+        }
+        handled = process_outbox_batch()
+        self.assertEqual(handled, 1)
+        operations = self.app.elasticsearch.bulk.call_args.kwargs["operations"]
+        self.assertEqual(operations, [{"delete": {"_index": "device", "_id": 12345}}])
+        self.assertEqual(db.session.query(SearchIndexOutboxEntry).count(), 0)
+
+    def test_process_outbox_batch_with_errors(self):
+        """Ensure that we keep the entries & retry them later on errors."""
+        device = Device(short_name="dummy device", is_public=True)
+        db.session.add(device)
+        db.session.commit()
+
+        self.app.elasticsearch.bulk.side_effect = ConnectionError("es is down")
+        before = utc_now()
+        handled = process_outbox_batch()
+        self.assertEqual(handled, 1)
+
+        entry = db.session.query(SearchIndexOutboxEntry).one()
+        self.assertEqual(entry.attempts, 1)
+        self.assertIn("es is down", entry.last_error)
+        self.assertGreater(entry.next_attempt_at, before)
+
+        # As we need to wait, there is nothing to do for now.
+        self.assertEqual(process_outbox_batch(), 0)
+
+        entry.next_attempt_at = utc_now() - datetime.timedelta(seconds=1)
+        db.session.add(entry)
+        db.session.commit()
+        self.app.elasticsearch.bulk.side_effect = None
+        self.app.elasticsearch.bulk.return_value = {
+            "errors": False,
+            "items": [{"index": {"status": 200}}],
+        }
+        self.assertEqual(process_outbox_batch(), 1)
+        self.assertEqual(db.session.query(SearchIndexOutboxEntry).count(), 0)
+
+    def test_process_outbox_batch_with_item_errors(self):
+        """Ensure we only retry those items that failed."""
+        device1 = Device(short_name="device 1", is_public=True)
+        device2 = Device(short_name="device 2", is_public=True)
+        db.session.add_all([device1, device2])
+        db.session.commit()
+
+        self.app.elasticsearch.bulk.return_value = {
+            "errors": True,
+            "items": [
+                {"index": {"status": 200}},
+                {"index": {"status": 400, "error": {"type": "mapper_parsing"}}},
+            ],
+        }
+        self.assertEqual(process_outbox_batch(), 2)
+        entry = db.session.query(SearchIndexOutboxEntry).one()
+        operations = self.app.elasticsearch.bulk.call_args.kwargs["operations"]
+        self.assertEqual(entry.entity_id, operations[2]["index"]["_id"])
+        self.assertIn("mapper_parsing", entry.last_error)
+
+    def test_run_outbox_worker_once(self):
+        """Ensure the worker stops if there is nothing more to do."""
+        with patch.object(
+            search_outbox, "process_outbox_batch", side_effect=[3, 1, 0]
+        ) as mock:
+            sleep = MagicMock()
+            run_outbox_worker(once=True, sleep=sleep)
+            self.assertEqual(mock.call_count, 3)
+            sleep.assert_not_called()
+
+
+class TestDebouncedSearchUpdates(BaseTestCase):
+    """Tests for the debounced updates of the parents of indirect searchables."""
+
+    def setUp(self):
+        """Set up the tests with a (fake) elasticsearch & a debounce time."""
+        super().setUp()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.bulk.side_effect = lambda operations: {
+            "errors": False,
+            "items": [{"index": {"status": 200}} for _ in operations[::2]],
+        }
+        self.app.config["ELASTICSEARCH_INDIRECT_UPDATE_DEBOUNCE"] = 30
+        self.contact = Contact(given_name="A", family_name="B", email="a@b.org")
+        self.device = Device(short_name="dummy device", is_public=True)
+        self.device_contact_role = DeviceContactRole(
+            device=self.device, contact=self.contact, role_name="Owner"
+        )
+        db.session.add_all([self.contact, self.device, self.device_contact_role])
+        db.session.commit()
+        db.session.query(SearchIndexOutboxEntry).delete()
+        db.session.commit()
+        self.app.elasticsearch.reset_mock()
+
+    def tearDown(self):
+        """Remove the fake elasticsearch & the debounce time again."""
+        self.app.elasticsearch = None
+        self.app.config["ELASTICSEARCH_INDIRECT_UPDATE_DEBOUNCE"] = 0
+        super().tearDown()
+
+    def test_parent_updates_are_debounced(self):
+        """Ensure we update the contact right away - but the device later."""
+        before = utc_now()
+        self.contact.family_name = "C"
+        db.session.add(self.contact)
+        db.session.commit()
+
+        self.app.elasticsearch.index.assert_called_once()
+        self.assertEqual(
+            self.app.elasticsearch.index.call_args.kwargs["index"], "contact"
+        )
+        entry = db.session.query(SearchIndexOutboxEntry).one()
+        self.assertEqual(entry.index_name, "device")
+        self.assertEqual(entry.entity_id, self.device.id)
+        self.assertGreater(
+            entry.next_attempt_at, before + datetime.timedelta(seconds=29)
+        )
+        # Nothing to do for the worker yet.
+        self.assertEqual(process_outbox_batch(), 0)
+
+    def test_bursts_result_in_one_update(self):
+        """Ensure the worker waits for the last change of the burst."""
+        for family_name in ["C", "D", "E"]:
+            self.contact.family_name = family_name
+            db.session.add(self.contact)
+            db.session.commit()
+        entries = db.session.query(SearchIndexOutboxEntry).order_by("id").all()
+        self.assertEqual(len(entries), 3)
+        # Even if the first entries are due, we wait for the last one.
+        for entry in entries[:-1]:
+            entry.next_attempt_at = utc_now() - datetime.timedelta(seconds=1)
+            db.session.add(entry)
+        db.session.commit()
+        self.assertEqual(process_outbox_batch(), 0)
+
+        entries[-1].next_attempt_at = utc_now() - datetime.timedelta(seconds=1)
+        db.session.add(entries[-1])
+        db.session.commit()
+        self.assertEqual(process_outbox_batch(), 3)
+        self.app.elasticsearch.bulk.assert_called_once()
+        operations = self.app.elasticsearch.bulk.call_args.kwargs["operations"]
+        self.assertEqual(len(operations), 2)
+        self.assertEqual(db.session.query(SearchIndexOutboxEntry).count(), 0)
+
+    def test_max_wait(self):
+        """Ensure we don't wait forever if there are changes all the time."""
+        self.app.config["ELASTICSEARCH_INDIRECT_UPDATE_MAX_WAIT"] = 60
+        entry = SearchIndexOutboxEntry(
+            index_name="device",
+            entity_id=self.device.id,
+            operation="index",
+            created_at=utc_now() - datetime.timedelta(seconds=61),
+            next_attempt_at=utc_now() + datetime.timedelta(seconds=30),
+        )
+        db.session.add(entry)
+        db.session.commit()
+        self.assertEqual(process_outbox_batch(), 1)
+
+    def test_no_debounce_for_direct_changes(self):
+        """Ensure that we don't debounce if the parent is changed directly."""
+        self.contact.family_name = "C"
+        self.device.long_name = "changed as well"
+        db.session.add_all([self.contact, self.device])
+        db.session.commit()
+
+        self.assertEqual(
+            sorted(
+                c.kwargs["index"] for c in self.app.elasticsearch.index.call_args_list
+            ),
+            ["contact", "device"],
+        )
+        self.assertEqual(db.session.query(SearchIndexOutboxEntry).count(), 0)
+
+
+class TestSearchEntryDeduplication(BaseTestCase):
+    """Tests that we build the search entries only once per commit."""
+
+    def test_configuration_entry_is_built_once(self):
+        """Ensure multiple mounts of a device don't build the entry multiple times."""
+        self.app.elasticsearch = MagicMock()
+        try:
+            contact = Contact(given_name="A", family_name="B", email="a@b.org")
+            device = Device(short_name="dummy device", is_public=True)
+            configuration = Configuration(label="config", is_public=True)
+            mounts = [
+                DeviceMountAction(
+                    configuration=configuration,
+                    device=device,
+                    begin_contact=contact,
+                    begin_date=datetime.datetime(
+                        2020 + i, 1, 1, tzinfo=datetime.timezone.utc
+                    ),
+                    end_date=datetime.datetime(
+                        2020 + i, 6, 1, tzinfo=datetime.timezone.utc
+                    ),
+                )
+                for i in range(3)
+            ]
+            db.session.add_all([contact, device, configuration, *mounts])
+            db.session.commit()
+
+            device.long_name = "changed"
+            db.session.add(device)
+            with patch.object(
+                Configuration, "to_search_entry", return_value={}
+            ) as mock:
+                db.session.commit()
+                mock.assert_called_once()
+        finally:
+            self.app.elasticsearch = None
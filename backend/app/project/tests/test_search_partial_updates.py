@@ -0,0 +1,203 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the partial updates of embedded entries in the search index."""
+
+import datetime
+from unittest.mock import MagicMock
+
+from project import db
+from project.api.models import (
+    Configuration,
+    Contact,
+    Device,
+    DeviceContactRole,
+    DeviceMountAction,
+    DeviceProperty,
+    SearchIndexOutboxEntry,
+)
+from project.api.search import PartialSearchUpdate, update_embedded_entries
+from project.tests.base import BaseTestCase
+
+
+class TestPartialSearchUpdates(BaseTestCase):
+    """Tests for the partial updates of the parent entries."""
+
+    def setUp(self):
+        """Set up the tests with a (fake) elasticsearch."""
+        super().setUp()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.update_by_query.return_value = {
+            "updated": 1,
+            "version_conflicts": 0,
+        }
+        self.app.config["ELASTICSEARCH_PARTIAL_UPDATES"] = True
+        self.contact = Contact(given_name="A", family_name="B", email="a@b.org")
+        self.device = Device(short_name="dummy device", is_public=True)
+        self.device_contact_role = DeviceContactRole(
+            device=self.device, contact=self.contact, role_name="Owner"
+        )
+        self.device_property = DeviceProperty(
+            device=self.device, property_name="temperature"
+        )
+        self.configuration = Configuration(label="config", is_public=True)
+        self.device_mount_action = DeviceMountAction(
+            configuration=self.configuration,
+            device=self.device,
+            begin_contact=self.contact,
+            begin_date=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+        )
+        db.session.add_all(
+            [
+                self.contact,
+                self.device,
+                self.device_contact_role,
+                self.device_property,
+                self.configuration,
+                self.device_mount_action,
+            ]
+        )
+        db.session.commit()
+        self.app.elasticsearch.reset_mock()
+
+    def tearDown(self):
+        """Remove the fake elasticsearch & the setting again."""
+        self.app.elasticsearch = None
+        self.app.config["ELASTICSEARCH_PARTIAL_UPDATES"] = False
+        self.app.config["ELASTICSEARCH_USE_OUTBOX"] = False
+        super().tearDown()
+
+    def indexed(self):
+        """Return the index names for that we sent full entries."""
+        return sorted(
+            c.kwargs["index"] for c in self.app.elasticsearch.index.call_args_list
+        )
+
+    def updated_by_query(self):
+        """Return the index names for that we run partial updates."""
+        return sorted(
+            c.kwargs["index"]
+            for c in self.app.elasticsearch.update_by_query.call_args_list
+        )
+
+    def test_contact_update(self):
+        """Ensure we replace the contact in the parents only."""
+        self.contact.family_name = "C"
+        db.session.add(self.contact)
+        db.session.commit()
+
+        self.assertEqual(self.indexed(), ["contact"])
+        self.assertEqual(
+            self.updated_by_query(), ["configuration", "device", "platform", "site"]
+        )
+        for call in self.app.elasticsearch.update_by_query.call_args_list:
+            if call.kwargs["index"] == "device":
+                break
+        self.assertEqual(
+            call.kwargs["query"],
+            {"term": {"device_contact_roles_not_nested.contact.id": self.contact.id}},
+        )
+        params = call.kwargs["script"]["params"]
+        self.assertEqual(params["id"], str(self.contact.id))
+        self.assertEqual(params["entry"]["family_name"], "C")
+        self.assertEqual(
+            params["paths"],
+            [
+                {"field": "device_contact_roles", "key": "contact"},
+                {"field": "device_contact_roles_not_nested", "key": "contact"},
+            ],
+        )
+
+    def test_device_property_update(self):
+        """Ensure we replace the property in the device entry only."""
+        self.device_property.label = "air temperature"
+        db.session.add(self.device_property)
+        db.session.commit()
+
+        self.assertEqual(self.indexed(), [])
+        call = self.app.elasticsearch.update_by_query.call_args
+        self.assertEqual(call.kwargs["index"], "device")
+        self.assertEqual(call.kwargs["query"], {"ids": {"values": [self.device.id]}})
+        params = call.kwargs["script"]["params"]
+        self.assertEqual(params["paths"], [{"field": "properties", "key": None}])
+        self.assertEqual(params["entry"]["id"], self.device_property.id)
+        self.assertEqual(params["entry"]["label"], "air temperature")
+
+    def test_device_property_moved_to_other_device(self):
+        """Ensure we rebuild the entries if the property changes the device."""
+        other_device = Device(short_name="other device", is_public=True)
+        db.session.add(other_device)
+        db.session.commit()
+        self.app.elasticsearch.reset_mock()
+
+        self.device_property.device = other_device
+        db.session.add(self.device_property)
+        db.session.commit()
+
+        self.assertIn("device", self.indexed())
+        self.app.elasticsearch.update_by_query.assert_not_called()
+
+    def test_device_update(self):
+        """Ensure we replace the device in the mount actions of the configuration."""
+        self.device.long_name = "changed"
+        db.session.add(self.device)
+        db.session.commit()
+
+        self.assertEqual(self.indexed(), ["device"])
+        call = self.app.elasticsearch.update_by_query.call_args
+        self.assertEqual(call.kwargs["index"], "configuration")
+        self.assertEqual(
+            call.kwargs["query"],
+            {"term": {"device_mount_actions.device.id": self.device.id}},
+        )
+        params = call.kwargs["script"]["params"]
+        self.assertEqual(params["entry"]["long_name"], "changed")
+        self.assertNotIn("properties", params["entry"])
+
+    def test_full_rebuild_without_the_setting(self):
+        """Ensure we rebuild the parent entries if the setting is not active."""
+        self.app.config["ELASTICSEARCH_PARTIAL_UPDATES"] = False
+        self.device_property.label = "air temperature"
+        db.session.add(self.device_property)
+        db.session.commit()
+
+        self.assertEqual(self.indexed(), ["configuration", "device"])
+        self.app.elasticsearch.update_by_query.assert_not_called()
+
+    def test_no_partial_updates_with_the_outbox(self):
+        """Ensure the worker rebuilds the entries if we use the outbox."""
+        self.app.config["ELASTICSEARCH_USE_OUTBOX"] = True
+        self.contact.family_name = "C"
+        db.session.add(self.contact)
+        db.session.commit()
+
+        self.app.elasticsearch.update_by_query.assert_not_called()
+        index_names = {
+            entry.index_name for entry in db.session.query(SearchIndexOutboxEntry)
+        }
+        self.assertEqual(index_names, {"contact", "device", "configuration"})
+
+    def test_update_embedded_entries_retries_on_conflicts(self):
+        """Ensure we run the update again if documents were changed concurrently."""
+        self.app.elasticsearch.update_by_query.side_effect = [
+            {"updated": 2, "version_conflicts": 1},
+            {"updated": 1, "version_conflicts": 0},
+        ]
+        partial_update = PartialSearchUpdate(
+            index="device",
+            query={"match_all": {}},
+            paths=[("properties", None)],
+            id=1,
+            entry={"id": 1},
+        )
+        self.assertEqual(update_embedded_entries(partial_update), 3)
+
+        self.app.elasticsearch.update_by_query.side_effect = lambda **kwargs: {
+            "updated": 0,
+            "version_conflicts": 1,
+        }
+        with self.assertRaises(RuntimeError):
+            update_embedded_entries(partial_update)
@@ -0,0 +1,387 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the reindex of the full text search."""
+
+import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+
+from project import db
+from project.api.models import (
+    Configuration,
+    Contact,
+    Device,
+    DeviceContactRole,
+    DeviceMountAction,
+    DeviceParameter,
+    DeviceParameterValueChangeAction,
+    DeviceProperty,
+    Organization,
+    mixin,
+)
+from project.api.services.search_reindex import (
+    get_changed_searchable_ids,
+    get_throughput,
+    get_untracked_index_names,
+    parse_timestamp,
+    reindex_models,
+    reindex_models_incremental,
+)
+from project.tests.base import BaseTestCase
+
+
+class TestSearchReindex(BaseTestCase):
+    """Tests for the reindex with the bulk requests & the alias switch."""
+
+    def setUp(self):
+        """Set up the tests with a fake elasticsearch."""
+        super().setUp()
+        self.es = MagicMock()
+        self.es.bulk.side_effect = lambda operations: {
+            "errors": False,
+            "items": [{"index": {"status": 201}} for _ in operations[::2]],
+        }
+        self.es.indices.exists_alias.return_value = True
+        self.es.indices.get_alias.return_value = {"device_v1": {}}
+        self.app.elasticsearch = self.es
+        # The ids that are in the index - by default none.
+        yield_index_ids_patch = patch.object(
+            mixin, "yield_index_ids", return_value=iter([])
+        )
+        self.yield_index_ids = yield_index_ids_patch.start()
+        self.addCleanup(yield_index_ids_patch.stop)
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def create_devices(self, count):
+        """Create some devices with contacts & properties."""
+        contact = Contact(given_name="A", family_name="B", email="a@b.org")
+        db.session.add(contact)
+        for i in range(count):
+            device = Device(short_name=f"device {i}", is_public=True)
+            db.session.add(device)
+            db.session.add(
+                DeviceContactRole(device=device, contact=contact, role_name="Owner")
+            )
+            db.session.add(DeviceProperty(device=device, property_name=f"prop {i}"))
+        db.session.commit()
+
+    def test_reindex_uses_bulk_and_new_index(self):
+        """Ensure we fill a new index & switch the alias afterwards."""
+        self.create_devices(5)
+        progress = MagicMock()
+
+        count = Device.reindex(batch_size=2, progress=progress)
+
+        self.assertEqual(count, 5)
+        # 3 batches - and no further request for the changes in the meantime.
+        self.assertEqual(self.es.bulk.call_count, 3)
+        self.assertEqual(
+            [c.args[0] for c in progress.call_args_list],
+            [2, 4, 5],
+        )
+        new_index = self.es.indices.create.call_args.kwargs["index"]
+        self.assertTrue(new_index.startswith("device_v"))
+        for call in self.es.bulk.call_args_list:
+            operations = call.kwargs["operations"]
+            self.assertEqual(operations[0]["index"]["_index"], new_index)
+        self.es.index.assert_not_called()
+        # We never deleted the live index before the new one was ready.
+        actions = self.es.indices.update_aliases.call_args.kwargs["actions"]
+        self.assertEqual(
+            actions,
+            [
+                {"remove": {"index": "device_v1", "alias": "device"}},
+                {
+                    "add": {
+                        "index": new_index,
+                        "alias": "device",
+                        "is_write_index": True,
+                    }
+                },
+            ],
+        )
+        self.es.indices.delete.assert_called_once_with(
+            index="device_v1", ignore_unavailable=True
+        )
+
+    def test_reindex_removes_entries_deleted_in_the_meantime(self):
+        """Ensure we don't keep entries that we deleted while we filled the index."""
+        self.create_devices(2)
+        device_ids = [device.id for device in Device.query.order_by(Device.id)]
+        self.yield_index_ids.return_value = iter([*device_ids, 999])
+
+        Device.reindex()
+
+        operations = self.es.bulk.call_args.kwargs["operations"]
+        self.assertEqual(operations, [{"delete": {"_index": "device", "_id": 999}}])
+
+    def test_reindex_without_updated_at(self):
+        """Ensure we send all entries again if we can't find the changes."""
+        db.session.add(Organization(name="GFZ"))
+        db.session.commit()
+
+        count = Organization.reindex()
+
+        # Once for the new index & once more after the switch of the alias.
+        self.assertEqual(count, 2)
+        indices = [
+            call.kwargs["operations"][0]["index"]["_index"]
+            for call in self.es.bulk.call_args_list
+        ]
+        self.assertNotEqual(indices[0], "organization")
+        self.assertEqual(indices[1], "organization")
+
+    def test_reindex_with_bulk_refresh_interval(self):
+        """Ensure we don't refresh while we fill the index - but afterwards."""
+        self.create_devices(1)
+        self.app.config["ELASTICSEARCH_INDEX_SETTINGS"] = {
+            "device": {"number_of_replicas": 0, "refresh_interval": "5s"}
+        }
+        try:
+            Device.reindex()
+        finally:
+            self.app.config["ELASTICSEARCH_INDEX_SETTINGS"] = {}
+
+        create_call = self.es.indices.create.call_args.kwargs
+        new_index = create_call["index"]
+        self.assertEqual(create_call["settings"]["index"]["refresh_interval"], "-1")
+        self.assertEqual(create_call["settings"]["index"]["number_of_replicas"], "0")
+        self.es.indices.put_settings.assert_called_once_with(
+            index=new_index, settings={"index": {"refresh_interval": "5s"}}
+        )
+        self.es.indices.refresh.assert_called_once_with(index=new_index)
+
+    def test_reindex_replaces_the_old_concrete_index(self):
+        """Ensure we remove the index from the time before we used aliases."""
+        self.es.indices.exists_alias.return_value = False
+        self.es.indices.exists.return_value = True
+        self.create_devices(1)
+
+        Device.reindex()
+
+        actions = self.es.indices.update_aliases.call_args.kwargs["actions"]
+        self.assertEqual(actions[0], {"remove_index": {"index": "device"}})
+
+    def test_reindex_keeps_old_index_on_errors(self):
+        """Ensure the alias stays as it is if we couldn't index everything."""
+        self.create_devices(1)
+        self.es.bulk.side_effect = None
+        self.es.bulk.return_value = {
+            "errors": True,
+            "items": [{"index": {"status": 400, "error": "broken"}}],
+        }
+        with self.assertRaises(RuntimeError):
+            Device.reindex()
+        self.es.indices.update_aliases.assert_not_called()
+        new_index = self.es.indices.create.call_args.kwargs["index"]
+        self.es.indices.delete.assert_called_once_with(
+            index=new_index, ignore_unavailable=True
+        )
+
+    def test_search_entry_load_options(self):
+        """Ensure we can build the loader options for the search entries."""
+        self.create_devices(3)
+        query = Device.query.options(*Device.get_search_entry_load_options())
+        devices = query.all()
+        for device in devices:
+            # Those are already loaded - so no further query.
+            self.assertIn("device_contact_roles", device.__dict__)
+            self.assertIn("contact", device.device_contact_roles[0].__dict__)
+            self.assertIn("device_properties", device.__dict__)
+
+    def test_reindex_models(self):
+        """Ensure we get the results for the models."""
+        self.create_devices(2)
+        results = list(reindex_models(["device", "contact"], processes=1))
+        self.assertEqual([r.index_name for r in results], ["device", "contact"])
+        self.assertEqual([r.count for r in results], [2, 1])
+
+    def test_get_throughput(self):
+        """Ensure we don't divide by zero."""
+        self.assertEqual(get_throughput(10, 0), 0.0)
+        self.assertEqual(get_throughput(10, 2), 5.0)
+
+
+class TestParentSearchEntities(unittest.TestCase):
+    """Tests for the parents that we get from the search_parent_relationships."""
+
+    def test_single_parent(self):
+        """Ensure we follow the relationships over multiple levels."""
+        device = Device(short_name="device")
+        action = DeviceParameterValueChangeAction(
+            device_parameter=DeviceParameter(device=device)
+        )
+        self.assertEqual(action.get_parent_search_entities(), [device])
+
+    def test_lists(self):
+        """Ensure we follow the one to many relationships."""
+        configurations = [Configuration(label=f"config {i}") for i in range(2)]
+        device = Device(
+            short_name="device",
+            device_mount_actions=[
+                DeviceMountAction(configuration=configuration)
+                for configuration in configurations
+            ],
+        )
+        self.assertEqual(device.get_parent_search_entities(), configurations)
+        contact = Contact(
+            contact_device_roles=[DeviceContactRole(device=device)],
+        )
+        self.assertEqual(contact.get_parent_search_entities(), [device])
+
+    def test_missing_parent(self):
+        """Ensure we skip the relationships without an entity."""
+        self.assertEqual(DeviceProperty().get_parent_search_entities(), [])
+
+
+class TestIncrementalSearchReindex(BaseTestCase):
+    """Tests for the reindex of the changed entries only."""
+
+    def setUp(self):
+        """Set up the tests with a fake elasticsearch."""
+        super().setUp()
+        self.es = MagicMock()
+        self.es.bulk.side_effect = lambda operations: {
+            "errors": False,
+            "items": [{"index": {"status": 201}} for _ in operations[::2]],
+        }
+        self.app.elasticsearch = self.es
+        # The ids that are in the index - by default none.
+        yield_index_ids_patch = patch.object(
+            mixin, "yield_index_ids", return_value=iter([])
+        )
+        self.yield_index_ids = yield_index_ids_patch.start()
+        self.addCleanup(yield_index_ids_patch.stop)
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def set_updated_at(self, entity, updated_at):
+        """Set the updated_at value (without triggering the onupdate)."""
+        model = type(entity)
+        db.session.query(model).filter(model.id == entity.id).update(
+            {"updated_at": updated_at}, synchronize_session=False
+        )
+        db.session.commit()
+
+    def test_parse_timestamp(self):
+        """Ensure we use utc if there is no timezone."""
+        self.assertEqual(
+            parse_timestamp("2026-01-02T03:04:05"),
+            datetime.datetime(2026, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(
+            parse_timestamp("2026-01-02T03:04:05+02:00").utcoffset(),
+            datetime.timedelta(hours=2),
+        )
+
+    def test_get_changed_searchable_ids(self):
+        """Ensure we find the changed entities & the parents of changed children."""
+        old = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        since = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        unchanged_device = Device(short_name="unchanged", is_public=True)
+        changed_device = Device(short_name="changed", is_public=True)
+        device_with_changed_property = Device(short_name="property", is_public=True)
+        device_property = DeviceProperty(
+            device=device_with_changed_property, property_name="temperature"
+        )
+        db.session.add_all(
+            [
+                unchanged_device,
+                changed_device,
+                device_with_changed_property,
+                device_property,
+            ]
+        )
+        db.session.commit()
+        for entity in [unchanged_device, device_with_changed_property]:
+            self.set_updated_at(entity, old)
+
+        result = get_changed_searchable_ids({"device": since})
+        self.assertEqual(
+            result["device"], {changed_device.id, device_with_changed_property.id}
+        )
+
+    def test_get_changed_searchable_ids_for_deleted_children(self):
+        """Ensure we find the parents of deleted children."""
+        old = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        since = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        device = Device(short_name="device", is_public=True)
+        device_property = DeviceProperty(device=device, property_name="temperature")
+        db.session.add_all([device, device_property])
+        db.session.commit()
+        self.set_updated_at(device, old)
+        self.set_updated_at(device_property, old)
+        self.assertEqual(get_changed_searchable_ids({"device": since})["device"], set())
+
+        db.session.delete(device_property)
+        db.session.commit()
+
+        result = get_changed_searchable_ids({"device": since})
+        self.assertEqual(result["device"], {device.id})
+
+    def test_get_untracked_index_names(self):
+        """Ensure we find the indices with entities without updated_at."""
+        result = get_untracked_index_names()
+        # The organizations themselves have no updated_at.
+        self.assertIn("organization", result)
+        # The device includes the contact roles that have no updated_at.
+        self.assertIn("device", result)
+        self.assertNotIn("contact", result)
+
+    def test_reindex_models_incremental(self):
+        """Ensure we send the changed entries & delete the removed ones."""
+        contact = Contact(given_name="A", family_name="B", email="a@b.org")
+        db.session.add(contact)
+        db.session.commit()
+        watermark = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        self.es.indices.get_mapping.return_value = {
+            "contact_v1": {
+                "mappings": {"_meta": {"reindex_watermark": watermark.isoformat()}}
+            }
+        }
+
+        self.yield_index_ids.return_value = iter([contact.id, 999])
+        results = list(reindex_models_incremental(["contact"]))
+
+        self.assertEqual(len(results), 1)
+        # One updated, one deleted.
+        self.assertEqual(results[0].count, 2)
+        operations = [call.kwargs["operations"] for call in self.es.bulk.call_args_list]
+        self.assertEqual(
+            operations[0][0], {"index": {"_index": "contact", "_id": contact.id}}
+        )
+        self.assertEqual(operations[1], [{"delete": {"_index": "contact", "_id": 999}}])
+        meta = self.es.indices.put_mapping.call_args.kwargs["meta"]
+        self.assertGreater(
+            datetime.datetime.fromisoformat(meta["reindex_watermark"]), watermark
+        )
+
+    def test_reindex_models_incremental_without_updated_at(self):
+        """Ensure we run the full reindex if we can't find the changes."""
+        db.session.add(Organization(name="GFZ"))
+        db.session.commit()
+        watermark = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+        self.es.indices.get_mapping.return_value = {
+            "organization_v1": {
+                "mappings": {"_meta": {"reindex_watermark": watermark.isoformat()}}
+            }
+        }
+
+        with patch.object(Organization, "reindex", return_value=1) as reindex:
+            results = list(reindex_models_incremental(["organization"]))
+
+        reindex.assert_called_once()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].index_name, "organization")
+        self.assertEqual(results[0].count, 1)
@@ -0,0 +1,298 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""Tests for the endpoints that use the full text search directly."""
+
+from unittest.mock import MagicMock
+
+from elasticsearch import ConnectionError
+
+from project import base_url, db
+from project.api.models import Device
+from project.tests.base import BaseTestCase
+
+
+class TestFacetedSearch(BaseTestCase):
+    """Tests for the faceted search endpoints."""
+
+    url = base_url + "/devices/facets"
+
+    def setUp(self):
+        """Set up the tests with a device & a fake elasticsearch."""
+        super().setUp()
+        self.device = Device(
+            short_name="dummy device", manufacturer_name="Campbell", is_public=True
+        )
+        db.session.add(self.device)
+        db.session.commit()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.return_value = {
+            "hits": {"total": {"value": 1}, "hits": [{"_id": str(self.device.id)}]},
+            "aggregations": {
+                "manufacturer_name": {
+                    "buckets": [{"key": "Campbell", "doc_count": 1}],
+                },
+                "status_name": {"buckets": []},
+            },
+        }
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def test_hits_and_facets(self):
+        """Ensure we get the hits & the facets in one search request."""
+        response = self.client.get(
+            self.url + "?q=dummy&facets=manufacturer_name,status_name&facet_size=5"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["data"][0]["id"], str(self.device.id))
+        self.assertEqual(
+            response.json["data"][0]["attributes"]["short_name"], "dummy device"
+        )
+        self.assertEqual(response.json["meta"]["count"], 1)
+        self.assertEqual(
+            response.json["meta"]["facets"],
+            {
+                "manufacturer_name": [{"value": "Campbell", "count": 1}],
+                "status_name": [],
+            },
+        )
+        self.assertEqual(self.app.elasticsearch.search.call_count, 1)
+        call = self.app.elasticsearch.search.call_args
+        self.assertEqual(
+            call.kwargs["aggregations"],
+            {
+                "manufacturer_name": {
+                    "terms": {"field": "manufacturer_name", "size": 5}
+                },
+                "status_name": {"terms": {"field": "status_name", "size": 5}},
+            },
+        )
+        # The facets are scoped to the visibility of the user.
+        self.assertIn(
+            {"term": {"is_public": {"value": True}}},
+            call.kwargs["query"]["bool"]["filter"],
+        )
+
+    def test_all_facets_of_the_model(self):
+        """Ensure we compute all the facets if we don't ask for some."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        call = self.app.elasticsearch.search.call_args
+        self.assertEqual(
+            sorted(call.kwargs["aggregations"].keys()),
+            sorted(Device.search_facet_fields),
+        )
+
+    def test_invalid_parameters(self):
+        """Ensure we return a 400 for facets & sizes that we don't support."""
+        for query_string in [
+            "?facets=description",
+            "?facet_size=abc",
+            "?facet_size=0",
+            "?sort=not_a_field",
+        ]:
+            with self.subTest(query_string=query_string):
+                response = self.client.get(self.url + query_string)
+                self.assertEqual(response.status_code, 400)
+
+    def test_without_elasticsearch(self):
+        """Ensure we return a 400 if we have no full text search."""
+        self.app.elasticsearch = None
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_not_available(self):
+        """Ensure we get a 503 if the elasticsearch is not available."""
+        self.app.elasticsearch.search.side_effect = ConnectionError("timeout")
+        response = self.client.get(self.url + "?q=dummy&facets=manufacturer_name")
+        self.assertEqual(response.status_code, 503)
+
+
+class TestGlobalSearch(BaseTestCase):
+    """Tests for the search over all the models."""
+
+    url = base_url + "/search"
+
+    def setUp(self):
+        """Set up the tests with a fake elasticsearch."""
+        super().setUp()
+        self.app.elasticsearch = MagicMock()
+        empty = {"hits": {"total": {"value": 0}, "hits": []}}
+        self.app.elasticsearch.msearch.return_value = {
+            "responses": [
+                {
+                    "hits": {
+                        "total": {"value": 12},
+                        "hits": [
+                            {"_id": "1", "_source": {"short_name": "dummy device"}}
+                        ],
+                    }
+                },
+                empty,
+                empty,
+                {"error": {"type": "index_not_found_exception"}},
+                empty,
+            ]
+        }
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def test_grouped_hits(self):
+        """Ensure we get the hits per type from one msearch request."""
+        response = self.client.get(self.url + "?q=dummy&size=3")
+        self.assertEqual(response.status_code, 200)
+        data = response.json["data"]
+        self.assertEqual(
+            sorted(data.keys()),
+            ["configuration", "contact", "device", "platform", "site"],
+        )
+        self.assertEqual(data["device"]["count"], 12)
+        self.assertEqual(
+            data["device"]["hits"],
+            [{"id": "1", "attributes": {"short_name": "dummy device"}}],
+        )
+        self.assertEqual(data["site"], {"count": 0, "hits": []})
+
+        self.app.elasticsearch.msearch.assert_called_once()
+        searches = self.app.elasticsearch.msearch.call_args.kwargs["searches"]
+        self.assertEqual(
+            [s["index"] for s in searches[::2]],
+            ["device", "platform", "configuration", "site", "contact"],
+        )
+        device_search = searches[1]
+        self.assertEqual(device_search["size"], 3)
+        self.assertEqual(device_search["_source"], Device.search_label_fields)
+        # The visibility filter for anonymous users.
+        self.assertIn(
+            {"term": {"is_public": {"value": True}}},
+            device_search["query"]["bool"]["filter"],
+        )
+
+    def test_invalid_size(self):
+        """Ensure we return a 400 for sizes that we don't support."""
+        response = self.client.get(self.url + "?q=dummy&size=1000")
+        self.assertEqual(response.status_code, 400)
+
+    def test_without_elasticsearch(self):
+        """Ensure we return a 400 if we have no full text search."""
+        self.app.elasticsearch = None
+        response = self.client.get(self.url + "?q=dummy")
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_not_available(self):
+        """Ensure we get a 503 if the elasticsearch is not available."""
+        self.app.elasticsearch.msearch.side_effect = ConnectionError("timeout")
+        response = self.client.get(self.url + "?q=dummy")
+        self.assertEqual(response.status_code, 503)
+
+
+class TestSuggest(BaseTestCase):
+    """Tests for the suggestions while typing."""
+
+    url = base_url + "/controller/suggest"
+
+    def setUp(self):
+        """Set up the tests with a fake elasticsearch."""
+        super().setUp()
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.return_value = {
+            "hits": {
+                "hits": [
+                    {"_id": "3", "_source": {"short_name": "Temperature sensor"}},
+                    {"_id": "7", "_source": {"short_name": "Temperature logger"}},
+                ]
+            }
+        }
+
+    def tearDown(self):
+        """Remove the fake elasticsearch again."""
+        self.app.elasticsearch = None
+        super().tearDown()
+
+    def test_suggestions(self):
+        """Ensure we get the ids & labels from one lightweight search."""
+        response = self.client.get(
+            self.url + "?model=device&field=short_name&prefix=Temperature%20se&size=2"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json["data"],
+            [
+                {"id": "3", "label": "Temperature sensor"},
+                {"id": "7", "label": "Temperature logger"},
+            ],
+        )
+        call = self.app.elasticsearch.search.call_args
+        self.assertEqual(call.kwargs["index"], "device")
+        self.assertEqual(call.kwargs["size"], 2)
+        self.assertEqual(call.kwargs["source"], ["short_name"])
+        self.assertFalse(call.kwargs["track_total_hits"])
+        self.assertEqual(
+            call.kwargs["query"]["bool"]["must"],
+            [
+                {
+                    "multi_match": {
+                        "query": "Temperature se",
+                        "type": "bool_prefix",
+                        "fields": [
+                            "short_name.text",
+                            "short_name.text._2gram",
+                            "short_name.text._3gram",
+                        ],
+                    }
+                }
+            ],
+        )
+        self.assertIn(
+            {"term": {"is_public": {"value": True}}},
+            call.kwargs["query"]["bool"]["filter"],
+        )
+
+    def test_no_hits(self):
+        """Ensure we handle the response if the filter_path removes everything."""
+        self.app.elasticsearch.search.return_value = {}
+        response = self.client.get(
+            self.url + "?model=contact&field=family_name&prefix=xyz"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["data"], [])
+
+    def test_invalid_parameters(self):
+        """Ensure we return a 400 for parameters that we don't support."""
+        for query_string in [
+            "?field=short_name&prefix=abc",
+            "?model=user&field=short_name&prefix=abc",
+            "?model=device&field=id&prefix=abc",
+            "?model=device&field=short_name",
+            "?model=device&field=short_name&prefix=%20",
+            "?model=device&field=short_name&prefix=abc&size=0",
+            "?model=device&field=short_name&prefix=abc&size=abc",
+        ]:
+            with self.subTest(query_string=query_string):
+                response = self.client.get(self.url + query_string)
+                self.assertEqual(response.status_code, 400)
+
+    def test_without_elasticsearch(self):
+        """Ensure we return a 400 if we have no full text search."""
+        self.app.elasticsearch = None
+        response = self.client.get(
+            self.url + "?model=device&field=short_name&prefix=abc"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_not_available(self):
+        """Ensure we get a 503 if the elasticsearch is not available."""
+        self.app.elasticsearch.search.side_effect = ConnectionError("timeout")
+        response = self.client.get(
+            self.url + "?model=device&field=short_name&prefix=Temperature"
+        )
+        self.assertEqual(response.status_code, 503)
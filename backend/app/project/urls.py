@@ -269,6 +269,26 @@ api.route(
     "platform_availabilities",
     "/controller/platform-availabilities",
 )
+api.route(
+    DeviceBulkAvailabilities,
+    "device_bulk_availabilities",
+    "/controller/device-availabilities/bulk",
+)
+api.route(
+    PlatformBulkAvailabilities,
+    "platform_bulk_availabilities",
+    "/controller/platform-availabilities/bulk",
+)
+api.route(
+    DeviceFreeBusyTimelines,
+    "device_free_busy_timelines",
+    "/controller/device-free-busy",
+)
+api.route(
+    PlatformFreeBusyTimelines,
+    "platform_free_busy_timelines",
+    "/controller/platform-free-busy",
+)
 # User Info
 api.route(
     UserInfo,
@@ -21,5 +21,6 @@ from .free_text_field_routes import free_text_field_routes  # noqa: F401
 from .generator_routes import generator_routes  # noqa: F401
 from .login import login_routes  # noqa: F401
 from .proxy import proxy_routes  # noqa: F401
+from .search_routes import search_routes  # noqa: F401
 from .sensorml import sensor_ml_routes  # noqa: F401
 from .upload_files import upload_routes  # noqa: F401
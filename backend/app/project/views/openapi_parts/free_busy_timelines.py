@@ -0,0 +1,80 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""External openapi spec file for the free & busy timelines."""
+paths = {
+    "/controller/device-free-busy": {
+        "get": {
+            "tags": ["Controller"],
+            "parameters": [
+                {"$ref": "#/components/parameters/ids"},
+                {"$ref": "#/components/parameters/from"},
+                {"$ref": "#/components/parameters/to"},
+            ],
+            "responses": {
+                "200": {"$ref": "#/components/responses/FreeBusyTimelines_coll"}
+            },
+        }
+    },
+    "/controller/platform-free-busy": {
+        "get": {
+            "tags": ["Controller"],
+            "parameters": [
+                {"$ref": "#/components/parameters/ids"},
+                {"$ref": "#/components/parameters/from"},
+                {"$ref": "#/components/parameters/to"},
+            ],
+            "responses": {
+                "200": {"$ref": "#/components/responses/FreeBusyTimelines_coll"}
+            },
+        }
+    },
+}
+components = {
+    "responses": {
+        "FreeBusyTimelines_coll": {
+            "content": {
+                "application/vnd.api+json": {
+                    "schema": {
+                        "example": [
+                            {
+                                "id": "1",
+                                "next_free": "2021-02-28T10:00:00Z",
+                                "busy": [
+                                    {
+                                        "begin_date": "2021-01-31T10:00:00Z",
+                                        "end_date": "2021-02-28T10:00:00Z",
+                                        "configuration_id": "3",
+                                        "configuration_label": "Test configuration",
+                                        "mounts": ["123", "124"],
+                                    }
+                                ],
+                                "free": [
+                                    {
+                                        "begin_date": "2021-02-28T10:00:00Z",
+                                        "end_date": "2021-12-31T00:00:00Z",
+                                    }
+                                ],
+                            },
+                            {
+                                "id": "2",
+                                "next_free": "2021-01-01T00:00:00Z",
+                                "busy": [],
+                                "free": [
+                                    {
+                                        "begin_date": "2021-01-01T00:00:00Z",
+                                        "end_date": "2021-12-31T00:00:00Z",
+                                    }
+                                ],
+                            },
+                        ]
+                    }
+                }
+            },
+            "description": "Busy intervals (with their configurations) & free gaps within the time range.",
+        }
+    }
+}
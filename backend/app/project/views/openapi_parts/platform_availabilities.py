@@ -20,10 +20,96 @@ paths = {
                 "200": {"$ref": "#/components/responses/PlatformAvailabilities_coll"}
             },
         }
-    }
+    },
+    "/controller/platform-availabilities/bulk": {
+        "post": {
+            "tags": ["Controller"],
+            "requestBody": {
+                "$ref": "#/components/requestBodies/PlatformBulkAvailabilities_post"
+            },
+            "responses": {
+                "200": {
+                    "$ref": "#/components/responses/PlatformBulkAvailabilities_coll"
+                }
+            },
+        }
+    },
 }
 components = {
+    "requestBodies": {
+        "PlatformBulkAvailabilities_post": {
+            "description": "The platform ids & the time ranges to check the availabilities for.",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "properties": {
+                            "ids": {"type": "array", "items": {"type": "integer"}},
+                            "time_ranges": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "from": {
+                                            "type": "string",
+                                            "format": "date-time",
+                                        },
+                                        "to": {"type": "string", "format": "date-time"},
+                                    },
+                                    "required": ["from"],
+                                },
+                            },
+                        },
+                        "required": ["ids", "time_ranges"],
+                        "example": {
+                            "ids": [1, 2],
+                            "time_ranges": [
+                                {
+                                    "from": "2021-01-01T00:00:00Z",
+                                    "to": "2021-02-01T00:00:00Z",
+                                },
+                                {"from": "2022-01-01T00:00:00Z"},
+                            ],
+                        },
+                    }
+                }
+            },
+        }
+    },
     "responses": {
+        "PlatformBulkAvailabilities_coll": {
+            "content": {
+                "application/vnd.api+json": {
+                    "schema": {
+                        "example": [
+                            {
+                                "id": "1",
+                                "available": False,
+                                "mount": "123",
+                                "configuration_id": "3",
+                                "configuration_label": "Test configuration",
+                                "begin_date": "2021-01-31T10:00:00Z",
+                                "end_date": "2021-02-28T10:00:00Z",
+                                "from": "2021-01-01T00:00:00Z",
+                                "to": "2021-02-01T00:00:00Z",
+                            },
+                            {
+                                "id": "2",
+                                "available": True,
+                                "from": "2021-01-01T00:00:00Z",
+                                "to": "2021-02-01T00:00:00Z",
+                            },
+                            {
+                                "id": "1",
+                                "available": True,
+                                "from": "2022-01-01T00:00:00Z",
+                                "to": None,
+                            },
+                        ]
+                    }
+                }
+            },
+            "description": "Streamed list with one entry per blocking mount or available id & time range.",
+        },
         "PlatformAvailabilities_coll": {
             "content": {
                 "application/vnd.api+json": {
@@ -57,6 +143,6 @@ components = {
                 }
             },
             "description": "",
-        }
-    }
+        },
+    },
 }
@@ -0,0 +1,246 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""External openapi spec file for the endpoints that use the full text search."""
+
+
+def faceted_search(tag, entity_name, operation_id):
+    """Return the spec for the faceted search endpoint of one model."""
+    return {
+        "get": {
+            "tags": [tag],
+            "parameters": [
+                {"$ref": "#/components/parameters/q"},
+                {"$ref": "#/components/parameters/include"},
+                {"$ref": "#/components/parameters/page_number"},
+                {"$ref": "#/components/parameters/page_size"},
+                {"$ref": "#/components/parameters/sort"},
+                {"$ref": "#/components/parameters/filter"},
+                {"$ref": "#/components/parameters/hide_archived"},
+                {"$ref": "#/components/parameters/facets"},
+                {"$ref": "#/components/parameters/facet_size"},
+            ],
+            "responses": {
+                "200": {"$ref": "#/components/responses/FacetedSearch"},
+                "400": {"$ref": "#/components/responses/FacetedSearch_400"},
+            },
+            "description": (
+                f"Search for {entity_name} & return the terms aggregations "
+                + "for the facets of the very same search."
+            ),
+            "operationId": operation_id,
+        }
+    }
+
+
+paths = {
+    "/devices/facets": faceted_search("Devices", "devices", "FacetedSearchDevices"),
+    "/platforms/facets": faceted_search(
+        "Platforms", "platforms", "FacetedSearchPlatforms"
+    ),
+    "/configurations/facets": faceted_search(
+        "Configurations", "configurations", "FacetedSearchConfigurations"
+    ),
+    "/sites/facets": faceted_search("Sites", "sites", "FacetedSearchSites"),
+    "/contacts/facets": faceted_search("Contacts", "contacts", "FacetedSearchContacts"),
+    "/search": {
+        "get": {
+            "tags": ["Controller"],
+            "parameters": [
+                {"$ref": "#/components/parameters/q"},
+                {"$ref": "#/components/parameters/global_search_size"},
+                {"$ref": "#/components/parameters/hide_archived"},
+            ],
+            "responses": {
+                "200": {"$ref": "#/components/responses/GlobalSearch"},
+                "400": {"$ref": "#/components/responses/FacetedSearch_400"},
+            },
+            "description": (
+                "Search in devices, platforms, configurations, sites & contacts "
+                + "at once & return the top hits & the counts per type."
+            ),
+            "operationId": "GlobalSearch",
+        }
+    },
+    "/controller/suggest": {
+        "get": {
+            "tags": ["Controller"],
+            "parameters": [
+                {
+                    "name": "model",
+                    "description": "Model to get the suggestions for.",
+                    "in": "query",
+                    "required": True,
+                    "schema": {
+                        "type": "string",
+                        "enum": [
+                            "device",
+                            "platform",
+                            "configuration",
+                            "site",
+                            "contact",
+                        ],
+                    },
+                },
+                {
+                    "name": "field",
+                    "description": "Search field to get the suggestions for (for example short_name).",
+                    "in": "query",
+                    "required": True,
+                    "schema": {"type": "string"},
+                },
+                {
+                    "name": "prefix",
+                    "description": "Text that the user typed so far.",
+                    "in": "query",
+                    "required": True,
+                    "schema": {"type": "string"},
+                },
+                {
+                    "name": "size",
+                    "description": "Maximum number of suggestions.",
+                    "in": "query",
+                    "required": False,
+                    "schema": {
+                        "type": "integer",
+                        "default": 10,
+                        "minimum": 1,
+                        "maximum": 50,
+                    },
+                },
+                {"$ref": "#/components/parameters/hide_archived"},
+            ],
+            "responses": {
+                "200": {"$ref": "#/components/responses/Suggest"},
+                "400": {"$ref": "#/components/responses/FacetedSearch_400"},
+            },
+            "description": (
+                "Return the ids & the values of the field for the entries "
+                + "that match the prefix (search as you type)."
+            ),
+            "operationId": "Suggest",
+        }
+    },
+}
+components = {
+    "parameters": {
+        "q": {
+            "name": "q",
+            "description": "Search string for the full text search.",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "string"},
+        },
+        "facets": {
+            "name": "facets",
+            "description": "Comma separated list of the facets that we want to get (default: all of the model).",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "string"},
+        },
+        "global_search_size": {
+            "name": "size",
+            "description": "Maximum number of hits per type.",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "integer", "default": 5, "minimum": 0, "maximum": 50},
+        },
+        "facet_size": {
+            "name": "facet_size",
+            "description": "Maximum number of values per facet.",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "integer", "default": 20, "minimum": 1, "maximum": 500},
+        },
+    },
+    "responses": {
+        "FacetedSearch": {
+            "description": "Page of the search hits & the facets.",
+            "content": {
+                "application/vnd.api+json": {
+                    "schema": {
+                        "properties": {
+                            "data": {"type": "array", "items": {"type": "object"}},
+                            "meta": {
+                                "type": "object",
+                                "properties": {
+                                    "count": {"type": "integer"},
+                                    "facets": {"type": "object"},
+                                },
+                                "example": {
+                                    "count": 42,
+                                    "facets": {
+                                        "manufacturer_name": [
+                                            {"value": "Campbell", "count": 12},
+                                            {"value": "Vaisala", "count": 7},
+                                        ]
+                                    },
+                                },
+                            },
+                        }
+                    }
+                }
+            },
+        },
+        "GlobalSearch": {
+            "description": "Top hits & counts per type.",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "properties": {
+                            "data": {
+                                "type": "object",
+                                "example": {
+                                    "device": {
+                                        "count": 12,
+                                        "hits": [
+                                            {
+                                                "id": "1",
+                                                "attributes": {
+                                                    "short_name": "Sensor",
+                                                    "long_name": "Temperature sensor",
+                                                },
+                                            }
+                                        ],
+                                    },
+                                    "site": {"count": 0, "hits": []},
+                                },
+                            }
+                        }
+                    }
+                }
+            },
+        },
+        "Suggest": {
+            "description": "Ids & values of the field for the suggestions.",
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "properties": {
+                            "data": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "id": {"type": "string"},
+                                        "label": {},
+                                    },
+                                },
+                                "example": [
+                                    {"id": "1", "label": "Temperature sensor"},
+                                    {"id": "7", "label": "Temperature logger"},
+                                ],
+                            }
+                        }
+                    }
+                }
+            },
+        },
+        "FacetedSearch_400": {
+            "description": "Invalid parameters or no full text search available.",
+        },
+    },
+}
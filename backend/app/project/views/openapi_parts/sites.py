@@ -18,6 +18,7 @@ paths = {
             "parameters": [
                 {"$ref": "#/components/parameters/include"},
                 {"$ref": "#/components/parameters/page_number"},
+                {"$ref": "#/components/parameters/page_cursor"},
                 {"$ref": "#/components/parameters/page_size"},
                 {"$ref": "#/components/parameters/sort"},
                 *schema_mapper.filters(),
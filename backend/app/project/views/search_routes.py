@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: 2026
+# - Nils Brinckmann <nils.brinckmann@gfz.de>
+# - GFZ - Helmholtz Centre for Geosciences (GFZ, https://www.gfz.de)
+#
+# SPDX-License-Identifier: EUPL-1.2
+
+"""
+Endpoints that use the full text search directly.
+
+Those are endpoints that go beyond the list endpoints of the json api,
+like the faceted search that returns the page of hits together with
+the aggregations for the filter options, the global search over
+all the searchable models or the suggestions for the search fields.
+"""
+
+from flask import Blueprint, current_app, request
+from flask_rest_jsonapi import JsonApiException
+from flask_rest_jsonapi.querystring import QueryStringManager
+from flask_rest_jsonapi.schema import compute_schema
+
+from ..api.datalayers.esalchemy import (
+    AndFilter,
+    EsQueryBuilder,
+    FilterOptimizer,
+    MultiFieldBoolPrefixFilter,
+)
+from ..api.helpers.errors import BadRequestError, ErrorResponse
+from ..api.resources import (
+    ConfigurationList,
+    ContactList,
+    DeviceList,
+    PlatformList,
+    SiteList,
+)
+from ..api.search import (
+    multi_query_index_sources,
+    query_index_labels,
+    search_unavailable_as_error,
+)
+from ..config import env
+from ..restframework.views.classbased import BaseView, class_based_view
+
+search_routes = Blueprint(
+    "search_routes",
+    __name__,
+    url_prefix=env("URL_PREFIX", "/rdm/svm-api/v1"),
+)
+
+# The list resources of the models that we have in the search index.
+searchable_list_resources = [
+    DeviceList,
+    PlatformList,
+    ConfigurationList,
+    SiteList,
+    ContactList,
+]
+
+
+class AbstractFacetedSearchView(BaseView):
+    """
+    Base class for the faceted search endpoints.
+
+    The endpoints accept the very same parameters as the list endpoints
+    (q, filter, sort, page, fields, include, hide_archived...) and return
+    the very same documents. In addition we return terms aggregations
+    for the facets of the model in the meta data:
+
+    {
+        "data": [...],
+        "meta": {
+            "count": 42,
+            "facets": {
+                "manufacturer_name": [{"value": "Campbell", "count": 12}, ...],
+                ...
+            }
+        }
+    }
+
+    With facets=a,b we can restrict the facets & with facet_size
+    the number of values per facet.
+
+    The configuration is done with the resource entry on the
+    class itself: This is the list resource for the model.
+    """
+
+    resource = None
+    default_facet_size = 20
+    max_facet_size = 500
+
+    def get_facets(self):
+        """Return the facet names that we want to compute."""
+        facet_fields = self.resource._data_layer.model.search_facet_fields
+        requested = request.args.get("facets")
+        if not requested:
+            return list(facet_fields)
+        facets = [f.strip() for f in requested.split(",") if f.strip()]
+        for facet in facets:
+            if facet not in facet_fields:
+                raise BadRequestError(f"Facet {facet} is not supported.")
+        return facets
+
+    def get_facet_size(self):
+        """Return the number of values that we want per facet."""
+        try:
+            facet_size = int(request.args.get("facet_size", self.default_facet_size))
+        except ValueError:
+            raise BadRequestError("facet_size must be an integer.")
+        if facet_size < 1 or facet_size > self.max_facet_size:
+            raise BadRequestError(
+                f"facet_size must be between 1 and {self.max_facet_size}."
+            )
+        return facet_size
+
+    def get(self):
+        """Run the search & return the hits with the facets."""
+        try:
+            qs = QueryStringManager(request.args, self.resource.schema)
+            (
+                objects_count,
+                objects,
+                facets,
+            ) = self.resource._data_layer.get_faceted_collection(
+                qs, {}, self.get_facets(), self.get_facet_size()
+            )
+            schema = compute_schema(
+                self.resource.schema, {"many": True}, qs, qs.include
+            )
+            result = schema.dump(objects)
+        except ErrorResponse:
+            raise
+        except JsonApiException as e:
+            # Invalid filters or sort parameters.
+            raise BadRequestError(e.detail)
+        result["meta"] = {"count": objects_count, "facets": facets}
+        return result
+
+
+@search_routes.route("/devices/facets", methods=["GET"])
+@class_based_view
+class DeviceFacetedSearchView(AbstractFacetedSearchView):
+    """Faceted search for the devices."""
+
+    resource = DeviceList
+
+
+@search_routes.route("/platforms/facets", methods=["GET"])
+@class_based_view
+class PlatformFacetedSearchView(AbstractFacetedSearchView):
+    """Faceted search for the platforms."""
+
+    resource = PlatformList
+
+
+@search_routes.route("/configurations/facets", methods=["GET"])
+@class_based_view
+class ConfigurationFacetedSearchView(AbstractFacetedSearchView):
+    """Faceted search for the configurations."""
+
+    resource = ConfigurationList
+
+
+@search_routes.route("/sites/facets", methods=["GET"])
+@class_based_view
+class SiteFacetedSearchView(AbstractFacetedSearchView):
+    """Faceted search for the sites."""
+
+    resource = SiteList
+
+
+@search_routes.route("/contacts/facets", methods=["GET"])
+@class_based_view
+class ContactFacetedSearchView(AbstractFacetedSearchView):
+    """Faceted search for the contacts."""
+
+    resource = ContactList
+
+
+@search_routes.route("/search", methods=["GET"])
+@class_based_view
+class GlobalSearchView(BaseView):
+    """
+    Search in all the searchable models at once.
+
+    We run the searches for all the models in one msearch request -
+    with the text search fields & the visibility filter of each model.
+    The hits contain the label fields of the search index only, so we
+    don't need to query the database:
+
+    {
+        "data": {
+            "device": {
+                "count": 12,
+                "hits": [
+                    {"id": "1", "attributes": {"short_name": "...", ...}},
+                    ...
+                ]
+            },
+            "platform": {...},
+            ...
+        }
+    }
+    """
+
+    resources = searchable_list_resources
+    default_size = 5
+    max_size = 50
+
+    def get_size(self):
+        """Return the number of hits that we want per model."""
+        try:
+            size = int(request.args.get("size", self.default_size))
+        except ValueError:
+            raise BadRequestError("size must be an integer.")
+        if size < 0 or size > self.max_size:
+            raise BadRequestError(f"size must be between 0 and {self.max_size}.")
+        return size
+
+    def get(self):
+        """Run the searches & return the hits grouped by type."""
+        if current_app.elasticsearch is None:
+            raise BadRequestError("The global search needs the full text search.")
+        size = self.get_size()
+        searches = []
+        for resource in self.resources:
+            data_layer = resource._data_layer
+            query_builder = EsQueryBuilder().with_request_args(request.args)
+            search_query = data_layer.get_search_query(
+                query_builder, data_layer.es_query({})
+            )
+            model = data_layer.model
+            searches.append(
+                (model.__tablename__, search_query, model.search_label_fields)
+            )
+        with search_unavailable_as_error():
+            results = multi_query_index_sources(searches, size)
+        data = {}
+        for resource, (hits, total) in zip(self.resources, results):
+            data[resource.schema.Meta.type_] = {
+                "count": total,
+                "hits": [
+                    {"id": str(id_), "attributes": document} for id_, document in hits
+                ],
+            }
+        return {"data": data}
+
+
+@search_routes.route("/controller/suggest", methods=["GET"])
+@class_based_view
+class SuggestView(BaseView):
+    """
+    Suggestions for a search field while the user is typing.
+
+    We use the search_as_you_type fields of the index (with their
+    _2gram & _3gram subfields) in a bool_prefix multi_match query.
+    The last word of the prefix is handled as prefix, all the others as
+    complete words.
+
+    For speed we don't touch the database & we return only the ids & the
+    values of the field:
+
+    {
+        "data": [
+            {"id": "1", "label": "Temperature sensor"},
+            ...
+        ]
+    }
+    """
+
+    default_size = 10
+    max_size = 50
+
+    def get_resource(self):
+        """Return the list resource for the model parameter."""
+        model_name = request.args.get("model")
+        for resource in searchable_list_resources:
+            if resource._data_layer.model.__tablename__ == model_name:
+                return resource
+        raise BadRequestError(f"Model {model_name} is not supported.")
+
+    def get_size(self):
+        """Return the number of suggestions that we want."""
+        try:
+            size = int(request.args.get("size", self.default_size))
+        except ValueError:
+            raise BadRequestError("size must be an integer.")
+        if size < 1 or size > self.max_size:
+            raise BadRequestError(f"size must be between 1 and {self.max_size}.")
+        return size
+
+    def get(self):
+        """Return the suggestions for the prefix."""
+        if current_app.elasticsearch is None:
+            raise BadRequestError("The suggestions need the full text search.")
+        resource = self.get_resource()
+        data_layer = resource._data_layer
+        model = data_layer.model
+        field = request.args.get("field")
+        search_as_you_type_fields = model.search_as_you_type_fields()
+        if field not in search_as_you_type_fields:
+            raise BadRequestError(f"Field {field} is not supported.")
+        prefix = request.args.get("prefix", "").strip()
+        if not prefix:
+            raise BadRequestError("prefix must not be empty.")
+        size = self.get_size()
+
+        path = search_as_you_type_fields[field]
+        prefix_filter = MultiFieldBoolPrefixFilter(
+            query=prefix, fields=[path, f"{path}._2gram", f"{path}._3gram"]
+        )
+        # The visibility & the hide_archived filter of the list endpoint.
+        search_filter = AndFilter.combine_optionals(
+            [prefix_filter, data_layer.es_query({})]
+        )
+        search_query = FilterOptimizer.optimize(search_filter).to_query()
+        with search_unavailable_as_error():
+            hits = query_index_labels(model.__tablename__, search_query, field, size)
+        return {"data": [{"id": str(id_), "label": label} for id_, label in hits]}